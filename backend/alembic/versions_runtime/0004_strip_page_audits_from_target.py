@@ -0,0 +1,122 @@
+"""Move per-page audits out of audits.target_audit into audited_pages.
+
+Revision ID: 0004_strip_page_audits
+Revises: 0003_ai_content_strategy_runs
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004_strip_page_audits"
+down_revision = "0003_ai_content_strategy_runs"
+branch_labels = None
+depends_on = None
+
+PAGE_AUDITS_KEY = "_individual_page_audits"
+BATCH_SIZE = 50
+
+audits_table = sa.table(
+    "audits",
+    sa.column("id", sa.Integer),
+    sa.column("target_audit", sa.JSON),
+)
+audited_pages_table = sa.table(
+    "audited_pages",
+    sa.column("audit_id", sa.Integer),
+    sa.column("url", sa.String),
+    sa.column("path", sa.String),
+    sa.column("h1_score", sa.Float),
+    sa.column("structure_score", sa.Float),
+    sa.column("content_score", sa.Float),
+    sa.column("eeat_score", sa.Float),
+    sa.column("schema_score", sa.Float),
+    sa.column("overall_score", sa.Float),
+    sa.column("critical_issues", sa.Integer),
+    sa.column("high_issues", sa.Integer),
+    sa.column("medium_issues", sa.Integer),
+    sa.column("low_issues", sa.Integer),
+    sa.column("audit_data", sa.JSON),
+    sa.column("created_at", sa.DateTime),
+)
+
+
+def _table_names(bind) -> set[str]:
+    return set(sa.inspect(bind).get_table_names())
+
+
+def _page_row(audit_id: int, page_audit: dict) -> dict | None:
+    from app.services.audit_service import AuditService
+
+    if not isinstance(page_audit, dict):
+        return None
+    page_url = page_audit.get("url")
+    page_data = AuditService._sanitize_json_value(page_audit.get("data") or {})
+    if not page_url or not isinstance(page_data, dict) or not page_data:
+        return None
+    row = AuditService._build_audited_page_row(audit_id, str(page_url)[:500], page_data)
+    row["path"] = row["path"][:500]
+    row["created_at"] = datetime.now(timezone.utc)
+    return row
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not {"audits", "audited_pages"} <= _table_names(bind):
+        return
+
+    candidates = (
+        sa.select(audits_table.c.id)
+        .where(
+            sa.cast(audits_table.c.target_audit, sa.Text).like(f"%{PAGE_AUDITS_KEY}%")
+        )
+        .order_by(audits_table.c.id)
+    )
+    audit_ids = [row[0] for row in bind.execute(candidates)]
+
+    # Lotes pequeños: cada target_audit legacy puede pesar varios MB.
+    for start in range(0, len(audit_ids), BATCH_SIZE):
+        batch_ids = audit_ids[start : start + BATCH_SIZE]
+        rows = bind.execute(
+            sa.select(audits_table.c.id, audits_table.c.target_audit).where(
+                audits_table.c.id.in_(batch_ids)
+            )
+        ).all()
+        pages_present = {
+            row[0]
+            for row in bind.execute(
+                sa.select(audited_pages_table.c.audit_id)
+                .where(audited_pages_table.c.audit_id.in_(batch_ids))
+                .distinct()
+            )
+        }
+        for audit_id, target_audit in rows:
+            if (
+                not isinstance(target_audit, dict)
+                or PAGE_AUDITS_KEY not in target_audit
+            ):
+                continue
+            stripped = dict(target_audit)
+            page_audits = stripped.pop(PAGE_AUDITS_KEY) or []
+            if audit_id not in pages_present:
+                page_rows = [
+                    row
+                    for row in (_page_row(audit_id, item) for item in page_audits)
+                    if row is not None
+                ]
+                if page_rows:
+                    bind.execute(audited_pages_table.insert(), page_rows)
+            bind.execute(
+                audits_table.update()
+                .where(audits_table.c.id == audit_id)
+                .values(target_audit=stripped)
+            )
+
+
+def downgrade() -> None:
+    # Los datos por pagina quedan en audited_pages; no se re-embeben en target_audit.
+    pass
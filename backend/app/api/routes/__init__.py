@@ -6,7 +6,18 @@ All routes are imported with error handling to prevent single module failures fr
 from app.core.logger import get_logger
 
 # Core routes (always available)
-from . import analytics, audits, health, pagespeed, realtime, reports, search, sse
+from . import (
+    admin,
+    analytics,
+    audits,
+    health,
+    metrics,
+    pagespeed,
+    realtime,
+    reports,
+    search,
+    sse,
+)
 
 logger = get_logger(__name__)
 
@@ -85,10 +96,12 @@ except ImportError as e:
     logger.warning(f"content_editor module not available: {e}")
 
 __all__ = [
+    "admin",
     "audits",
     "reports",
     "analytics",
     "health",
+    "metrics",
     "search",
     "pagespeed",
     "realtime",
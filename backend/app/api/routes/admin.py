@@ -0,0 +1,70 @@
+"""
+Admin Routes - Operación interna (solo administradores)
+"""
+
+from app.core.auth import AuthUser, get_current_user
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.workers.queues import (
+    ALL_QUEUES,
+    TASK_LANES,
+    WORKER_LANES,
+    get_queue_depths,
+    lane_for_queue,
+)
+from fastapi import APIRouter, Depends, HTTPException
+from starlette.concurrency import run_in_threadpool
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def require_admin(current_user: AuthUser = Depends(get_current_user)) -> AuthUser:
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return current_user
+
+
+@router.get("/queues")
+async def get_queue_depth(_admin: AuthUser = Depends(require_admin)):
+    """
+    Profundidad de cada cola de Celery, agrupada por carril.
+
+    ``depth`` es ``null`` si el broker no respondió para esa cola.
+    """
+    from app.workers.celery_app import celery_app
+
+    try:
+        depths = await run_in_threadpool(
+            get_queue_depths,
+            celery_app,
+            settings.CELERY_QUEUE_DEPTH_TIMEOUT_SECONDS,
+        )
+    except Exception as exc:
+        logger.warning(f"Could not read Celery queue depths: {exc}")
+        raise HTTPException(status_code=503, detail="Broker unavailable") from exc
+
+    queues = []
+    for queue in ALL_QUEUES:
+        lane_name = lane_for_queue(queue)
+        lane = WORKER_LANES.get(lane_name or "", {})
+        queues.append(
+            {
+                "queue": queue,
+                "lane": lane_name,
+                "depth": depths.get(queue),
+                "concurrency": lane.get("concurrency"),
+                "prefetch_multiplier": lane.get("prefetch_multiplier"),
+                "tasks": sorted(
+                    name
+                    for name, (task_queue, _level) in TASK_LANES.items()
+                    if task_queue == queue
+                ),
+            }
+        )
+
+    return {
+        "total_pending": sum(depth or 0 for depth in depths.values()),
+        "queues": queues,
+    }
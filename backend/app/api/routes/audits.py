@@ -21,6 +21,7 @@ from app.schemas import (
     PDFDownloadUrlResponse,
 )
 from app.services import pdf_job_service as pdf_job_service_module
+from app.services.audit_fanout_service import AuditFanoutService
 from app.services.audit_local_service import AuditLocalService
 from app.services.audit_service import AuditService
 from app.services.competitor_filters import (
@@ -33,7 +34,6 @@ from app.services.pagespeed_job_service import (
     PageSpeedJobService,
 )
 from app.services.pdf_job_service import DEFAULT_PDF_RETRY_AFTER_SECONDS, PDFJobService
-from app.services.pipeline_service import PipelineService
 
 # Importar la tarea de Celery
 from app.workers.tasks import run_audit_task
@@ -522,6 +522,8 @@ async def run_audit_sync(audit_id: int):
         search_results = result.get("search_results", {})
         competitor_audits = result.get("competitor_audits", [])
 
+        AuditService.save_page_audits(db, audit_id, result.get("page_audits") or [])
+
         await AuditService.set_audit_results(
             db=db,
             audit_id=audit_id,
@@ -825,6 +827,7 @@ def get_audit_diagnostics(
     return {
         "audit_id": audit.id,
         "diagnostics": diagnostics,
+        "page_shards": AuditFanoutService.get_shard_progress(audit.id),
     }
 
 
@@ -1041,6 +1044,7 @@ def get_competitors(
     Limitado a 10 por defecto para evitar memory issues.
     """
     from app.services.audit_service import CompetitorService
+    from app.services.pipeline_service import PipelineService
 
     audit = _get_owned_audit(db, audit_id, current_user)
 
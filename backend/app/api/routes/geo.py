@@ -24,13 +24,6 @@ from app.services.audit_service import AuditService
 from app.services.citation_tracker_service import CitationTrackerService
 from app.services.competitor_citation_service import CompetitorCitationService
 from app.services.content_template_service import ContentTemplateService
-from app.services.geo_article_engine_service import (
-    ArticleDataPackIncompleteError,
-    ArticleStrategyRequiredError,
-    GeoArticleEngineService,
-    InsufficientAuthoritySourcesError,
-    LegacyBatchReadOnlyError,
-)
 from app.services.geo_commerce_service import GeoCommerceService
 from app.services.query_discovery_service import QueryDiscoveryService
 from app.services.schema_optimizer_service import SchemaOptimizerService
@@ -179,6 +172,8 @@ def _parse_iso_datetime(value: Any) -> Optional[datetime]:
 def _reconcile_article_batch_runtime_state(
     db: Session, batch: GeoArticleBatch
 ) -> GeoArticleBatch:
+    from app.services.geo_article_engine_service import GeoArticleEngineService
+
     if batch.status in _TERMINAL_ARTICLE_BATCH_STATUSES:
         return batch
 
@@ -367,6 +362,8 @@ def _cleanup_generated_strategy_run(
     audit_id: int,
     seed_data: dict[str, Any] | None,
 ) -> None:
+    from app.services.geo_article_engine_service import GeoArticleEngineService
+
     if not seed_data:
         return
 
@@ -647,6 +644,7 @@ async def discover_queries_legacy(
             industry=(audit.category or "general"),
             keywords=keywords,
             llm_function=None,
+            audit_id=request.audit_id,
         )
         QueryDiscoveryService.save_discovered_queries(
             db, request.audit_id, discovered[:20]
@@ -1304,6 +1302,13 @@ async def generate_article_batch(
     current_user: AuthUser = Depends(get_current_user),
 ):
     """Create and process article-engine batch with strict GEO/SEO data-pack rules."""
+    from app.services.geo_article_engine_service import (
+        ArticleDataPackIncompleteError,
+        ArticleStrategyRequiredError,
+        GeoArticleEngineService,
+        InsufficientAuthoritySourcesError,
+    )
+
     seed_data: dict[str, Any] | None = None
     batch = None
     try:
@@ -1473,6 +1478,8 @@ def get_article_batch_status(
     current_user: AuthUser = Depends(get_current_user),
 ):
     """Fetch processing/completion status for an article batch."""
+    from app.services.geo_article_engine_service import GeoArticleEngineService
+
     try:
         batch_meta = GeoArticleEngineService.get_batch_status_projection(db, batch_id)
         if not batch_meta:
@@ -1517,6 +1524,8 @@ def get_latest_article_batch(
     current_user: AuthUser = Depends(get_current_user),
 ):
     """Fetch latest generated article batch for the audit."""
+    from app.services.geo_article_engine_service import GeoArticleEngineService
+
     try:
         _get_owned_audit(db, audit_id, current_user)
         batch = GeoArticleEngineService.get_latest_batch(db, audit_id)
@@ -1537,6 +1546,14 @@ async def regenerate_article(
     current_user: AuthUser = Depends(get_current_user),
 ):
     """Regenerate a single article slot using optional authority URLs."""
+    from app.services.geo_article_engine_service import (
+        ArticleDataPackIncompleteError,
+        ArticleStrategyRequiredError,
+        GeoArticleEngineService,
+        InsufficientAuthoritySourcesError,
+        LegacyBatchReadOnlyError,
+    )
+
     try:
         batch = GeoArticleEngineService.get_batch(db, batch_id)
         if not batch:
@@ -1598,6 +1615,8 @@ async def get_geo_dashboard(
     current_user: AuthUser = Depends(get_current_user),
 ):
     """Obtiene resumen completo de GEO para el dashboard."""
+    from app.services.geo_article_engine_service import GeoArticleEngineService
+
     try:
         _get_owned_audit(db, audit_id, current_user)
         citation_history: Dict[str, Any] = {}
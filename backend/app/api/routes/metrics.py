@@ -0,0 +1,41 @@
+"""
+Metrics Endpoint - Exposición Prometheus del proceso de la API
+"""
+
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request
+from starlette.responses import Response
+
+from ...core.config import _is_development_like_environment, settings
+from ...core.metrics import CONTENT_TYPE_LATEST, render_latest
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """
+    Métricas en formato de texto Prometheus.
+
+    Si ``METRICS_AUTH_TOKEN`` está configurado, el scraper debe enviarlo como
+    ``Authorization: Bearer <token>``. Sin token el endpoint solo existe en
+    entornos de desarrollo: expone nombres de servicios, prompts y tráfico.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    expected_token = (settings.METRICS_AUTH_TOKEN or "").strip()
+    if not expected_token and not _is_development_like_environment(
+        settings.ENVIRONMENT
+    ):
+        raise HTTPException(status_code=404, detail="Not Found")
+    if expected_token:
+        authorization = request.headers.get("authorization", "")
+        scheme, _, provided = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(
+            provided.strip(), expected_token
+        ):
+            raise HTTPException(status_code=401, detail="Unauthorized")
+
+    return Response(content=render_latest(), media_type=CONTENT_TYPE_LATEST)
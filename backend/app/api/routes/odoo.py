@@ -467,14 +467,18 @@ async def assign_odoo_connection_to_audit(
 @router.post("/sync/{audit_id}", response_model=OdooSyncResponse)
 async def sync_odoo_records(
     audit_id: int,
+    full: bool = False,
     db: Session = Depends(get_db),
     current_user: AuthUser = Depends(get_current_user),
 ):
+    """``full=true`` ignora las marcas de write_date y relee todos los registros."""
     audit = _get_completed_audit(db, audit_id, current_user)
     connection = _get_selected_connection_for_audit(db, audit, current_user)
     service = OdooSyncService(db)
     try:
-        summary = await service.sync_audit(audit=audit, connection=connection)
+        summary = await service.sync_audit(
+            audit=audit, connection=connection, full=full
+        )
         return {
             "audit_id": audit.id,
             "connection_id": connection.id,
@@ -0,0 +1,31 @@
+"""
+Helpers para middlewares ASGI puros.
+
+Los middlewares del stack HTTP no usan ``BaseHTTPMiddleware``: ese wrapper
+crea una task y re-empaqueta el stream de cada respuesta (costoso en polling e
+incompatible con SSE). En su lugar interceptan el mensaje
+``http.response.start`` para ajustar headers y dejan pasar el body intacto.
+"""
+
+from typing import Callable
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import Message, Send
+
+ResponseStartHook = Callable[[MutableHeaders, Message], None]
+
+
+def send_with_headers(send: Send, on_response_start: ResponseStartHook) -> Send:
+    """
+    Envuelve ``send`` para mutar los headers de la respuesta antes de enviarlos.
+
+    ``on_response_start`` recibe los headers mutables y el mensaje de inicio
+    (con ``status``); los mensajes de body se reenvían sin tocar.
+    """
+
+    async def _send(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            on_response_start(MutableHeaders(scope=message), message)
+        await send(message)
+
+    return _send
@@ -10,11 +10,12 @@ Test-only compatibility:
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import threading
 import time
-from collections import Counter
+from collections import Counter, OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
@@ -40,7 +41,22 @@ AUTH_ERROR_HEADER = "X-Auth-Error-Code"
 _ALLOW_INTERNAL_TEST_JWT_ENV = "ALLOW_INTERNAL_TEST_JWT"
 
 _jwks_lock = threading.Lock()
-_jwks_cache: dict[str, Any] = {"keys_by_kid": {}, "expires_at": 0.0}
+_jwks_cache: dict[str, Any] = {
+    "issuer": None,
+    "keys_by_kid": {},
+    "expires_at": 0.0,
+    "fetched_at": 0.0,
+    "next_background_refresh_at": 0.0,
+}
+# Single-flight: un solo fetch de JWKS en curso por proceso.
+_jwks_refresh_done: Optional[threading.Event] = None
+# kid -> instante hasta el que se responde "desconocido" sin ir a Auth0.
+_unknown_kids: dict[str, float] = {}
+_UNKNOWN_KIDS_MAX_ENTRIES = 1024
+
+# sha256(token) -> (claims, exp); solo tokens ya verificados.
+_claims_cache: "OrderedDict[str, tuple[Dict[str, Any], float]]" = OrderedDict()
+_claims_cache_lock = threading.Lock()
 _auth_failure_counts: Counter[str] = Counter()
 _auth_failure_counts_lock = threading.Lock()
 _DEFAULT_ADMIN_ROLE_NAMES = frozenset({"admin", "ops-admin"})
@@ -268,36 +284,196 @@ def _fetch_jwks(issuer: str) -> dict[str, dict[str, Any]]:
     return keys_by_kid
 
 
+def _jwks_snapshot(issuer: str) -> tuple[dict[str, dict[str, Any]], float, float]:
+    with _jwks_lock:
+        if _jwks_cache.get("issuer") != issuer:
+            return {}, 0.0, 0.0
+        return (
+            _jwks_cache.get("keys_by_kid") or {},
+            float(_jwks_cache.get("expires_at") or 0.0),
+            float(_jwks_cache.get("fetched_at") or 0.0),
+        )
+
+
 def _refresh_jwks_cache(issuer: str) -> dict[str, dict[str, Any]]:
-    keys_by_kid = _fetch_jwks(issuer)
-    ttl_seconds = max(1, int(settings.AUTH0_JWKS_CACHE_TTL_SECONDS))
-    expires_at = time.time() + ttl_seconds
+    """
+    Fetch JWKS and store it; concurrent callers share a single in-flight fetch.
+
+    Followers wait for the leader and return whatever the cache holds then
+    (the previous keys if the leader failed). Only the leader sees fetch errors.
+    """
+    global _jwks_refresh_done
 
     with _jwks_lock:
-        _jwks_cache["keys_by_kid"] = keys_by_kid
-        _jwks_cache["expires_at"] = expires_at
+        done = _jwks_refresh_done
+        leader = done is None
+        if leader:
+            done = _jwks_refresh_done = threading.Event()
 
-    return keys_by_kid
+    if not leader:
+        timeout_ms = max(1, int(settings.AUTH0_JWKS_FETCH_TIMEOUT_MS))
+        done.wait(timeout=timeout_ms / 1000.0 + 1.0)
+        return _jwks_snapshot(issuer)[0]
+
+    try:
+        keys_by_kid = _fetch_jwks(issuer)
+        ttl_seconds = max(1, int(settings.AUTH0_JWKS_CACHE_TTL_SECONDS))
+        now = time.time()
+
+        with _jwks_lock:
+            _jwks_cache["issuer"] = issuer
+            _jwks_cache["keys_by_kid"] = keys_by_kid
+            _jwks_cache["expires_at"] = now + ttl_seconds
+            _jwks_cache["fetched_at"] = now
+            for kid in keys_by_kid:
+                _unknown_kids.pop(kid, None)
+
+        return keys_by_kid
+    finally:
+        with _jwks_lock:
+            _jwks_refresh_done = None
+        done.set()
+
+
+def _background_refresh_jwks(issuer: str) -> None:
+    try:
+        _refresh_jwks_cache(issuer)
+    except Exception as exc:
+        logger.warning(f"Background JWKS refresh failed, serving stale keys: {exc}")
+
+
+def _schedule_background_refresh(issuer: str, now: float) -> None:
+    min_interval = max(1, int(settings.AUTH0_JWKS_MIN_REFRESH_INTERVAL_SECONDS))
+    with _jwks_lock:
+        if _jwks_refresh_done is not None:
+            return
+        if now < float(_jwks_cache.get("next_background_refresh_at") or 0.0):
+            return
+        _jwks_cache["next_background_refresh_at"] = now + min_interval
+
+    threading.Thread(
+        target=_background_refresh_jwks,
+        args=(issuer,),
+        name="jwks-refresh",
+        daemon=True,
+    ).start()
+
+
+def _remember_unknown_kid(kid: str, now: float) -> None:
+    ttl_seconds = max(1, int(settings.AUTH0_JWKS_UNKNOWN_KID_TTL_SECONDS))
+    with _jwks_lock:
+        if len(_unknown_kids) >= _UNKNOWN_KIDS_MAX_ENTRIES:
+            for stale_kid in [k for k, until in _unknown_kids.items() if until <= now]:
+                _unknown_kids.pop(stale_kid, None)
+            if len(_unknown_kids) >= _UNKNOWN_KIDS_MAX_ENTRIES:
+                _unknown_kids.pop(next(iter(_unknown_kids)))
+        _unknown_kids[kid] = now + ttl_seconds
 
 
 def _get_jwk_for_kid(kid: str, issuer: str) -> Optional[dict[str, Any]]:
+    """
+    Resolve a signing key by kid (stale-while-revalidate).
+
+    - Fresh cache hit: served directly.
+    - Expired but within AUTH0_JWKS_STALE_TTL_SECONDS: served stale while a
+      background thread revalidates.
+    - Missing/too-stale cache or unknown kid (key rotation): one blocking,
+      single-flight refresh. Unknown kids are negative-cached and forced
+      refreshes are throttled by AUTH0_JWKS_MIN_REFRESH_INTERVAL_SECONDS.
+    """
     now = time.time()
-    with _jwks_lock:
-        keys_by_kid = dict(_jwks_cache.get("keys_by_kid") or {})
-        expires_at = float(_jwks_cache.get("expires_at") or 0.0)
+    keys_by_kid, expires_at, fetched_at = _jwks_snapshot(issuer)
+    stale_limit = expires_at + max(0, int(settings.AUTH0_JWKS_STALE_TTL_SECONDS))
 
-    # Fast path: valid cache hit.
-    if expires_at > now and kid in keys_by_kid:
-        return keys_by_kid[kid]
+    if kid in keys_by_kid:
+        if expires_at > now:
+            return keys_by_kid[kid]
+        if stale_limit > now:
+            _schedule_background_refresh(issuer, now)
+            return keys_by_kid[kid]
+    elif keys_by_kid and stale_limit > now:
+        with _jwks_lock:
+            negative_until = _unknown_kids.get(kid, 0.0)
+        if negative_until > now:
+            return None
+        min_interval = max(1, int(settings.AUTH0_JWKS_MIN_REFRESH_INTERVAL_SECONDS))
+        if now - fetched_at < min_interval:
+            # Recién refrescado: un kid ausente no justifica otro fetch.
+            _remember_unknown_kid(kid, now)
+            return None
 
-    # 1st fetch path (expired/missing cache).
     keys_by_kid = _refresh_jwks_cache(issuer)
     if kid in keys_by_kid:
         return keys_by_kid[kid]
 
-    # 2nd fetch path: unknown kid refresh on-demand (key rotation).
-    keys_by_kid = _refresh_jwks_cache(issuer)
-    return keys_by_kid.get(kid)
+    # Solo se recuerda como desconocido si el set de claves es recién obtenido
+    # (no tras un fetch fallido de otro thread).
+    _, _, fetched_at = _jwks_snapshot(issuer)
+    now = time.time()
+    if keys_by_kid and now - fetched_at < max(
+        1, int(settings.AUTH0_JWKS_MIN_REFRESH_INTERVAL_SECONDS)
+    ):
+        _remember_unknown_kid(kid, now)
+    return None
+
+
+def _claims_cache_key(token: str) -> str:
+    # Ligado a la configuración de validación vigente además del token.
+    material = "|".join(
+        [
+            token,
+            _expected_issuer(),
+            _expected_audience(),
+            (settings.AUTH0_EXPECTED_CLIENT_ID or "").strip(),
+        ]
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _get_cached_claims(cache_key: str) -> Optional[Dict[str, Any]]:
+    now = time.time()
+    with _claims_cache_lock:
+        entry = _claims_cache.get(cache_key)
+        if entry is None:
+            return None
+        claims, exp = entry
+        if exp <= now:
+            _claims_cache.pop(cache_key, None)
+            return None
+        _claims_cache.move_to_end(cache_key)
+        return dict(claims)
+
+
+def _store_cached_claims(cache_key: str, claims: Dict[str, Any]) -> None:
+    try:
+        exp = float(claims.get("exp"))
+    except (TypeError, ValueError):
+        return
+    max_entries = max(0, int(settings.AUTH0_CLAIMS_CACHE_MAX_ENTRIES))
+    if max_entries == 0 or exp <= time.time():
+        return
+    with _claims_cache_lock:
+        _claims_cache[cache_key] = (dict(claims), exp)
+        _claims_cache.move_to_end(cache_key)
+        while len(_claims_cache) > max_entries:
+            _claims_cache.popitem(last=False)
+
+
+def clear_auth_caches() -> None:
+    """Reset JWKS, unknown-kid and verified-claims caches (tests/diagnostics)."""
+    with _jwks_lock:
+        _jwks_cache.update(
+            {
+                "issuer": None,
+                "keys_by_kid": {},
+                "expires_at": 0.0,
+                "fetched_at": 0.0,
+                "next_background_refresh_at": 0.0,
+            }
+        )
+        _unknown_kids.clear()
+    with _claims_cache_lock:
+        _claims_cache.clear()
 
 
 def _decode_internal_test_token(token: str, context: dict[str, Any]) -> Dict[str, Any]:
@@ -325,6 +501,12 @@ def _decode_auth0_access_token(token: str, context: dict[str, Any]) -> Dict[str,
     expected_issuer = _expected_issuer()
     expected_audience = _expected_audience()
 
+    # Token ya verificado (firma, iss, aud, client) y aún no expirado.
+    cache_key = _claims_cache_key(token)
+    cached_claims = _get_cached_claims(cache_key)
+    if cached_claims is not None:
+        return cached_claims
+
     got_issuer = _normalize_issuer(context.get("iss"))
     if got_issuer != expected_issuer:
         raise _auth_exception(
@@ -418,6 +600,7 @@ def _decode_auth0_access_token(token: str, context: dict[str, Any]) -> Dict[str,
                 context=context,
             )
 
+    _store_cached_claims(cache_key, payload)
     return payload
 
 
@@ -10,7 +10,7 @@ from app.core.auth import get_user_from_bearer_token
 from app.core.config import _is_development_like_environment, settings
 from fastapi import HTTPException, Request
 from fastapi.concurrency import run_in_threadpool
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 
 def _legacy_user_header_enabled() -> bool:
@@ -24,8 +24,17 @@ def _legacy_user_header_enabled() -> bool:
     return _is_development_like_environment(raw_environment)
 
 
-class AuthContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class AuthContextMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # request.state vive en scope["state"]: lo ven los middlewares y rutas internas
+        request = Request(scope)
         request.state.auth_user = None
         request.state.auth_error = None
         request.state.legacy_user_id = None
@@ -47,4 +56,4 @@ class AuthContextMiddleware(BaseHTTPMiddleware):
                 # come from validated bearer auth, not a client-supplied header.
                 request.state.legacy_user_id = legacy_user_id
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
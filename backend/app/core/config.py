@@ -115,7 +115,18 @@ class Settings(BaseSettings):
     )
     NV_MAX_CONTEXT_TOKENS: int = int(os.getenv("NV_MAX_CONTEXT_TOKENS", "262144"))
     NV_CONTEXT_SAFETY_RATIO: float = float(os.getenv("NV_CONTEXT_SAFETY_RATIO", "0.7"))
+    # Encoding tiktoken (p.ej. "o200k_base") para medir prompts; vacío = estimación local
+    LLM_TOKENIZER_ENCODING: str = os.getenv("LLM_TOKENIZER_ENCODING", "")
     NVIDIA_TIMEOUT_SECONDS: float = float(os.getenv("NVIDIA_TIMEOUT_SECONDS", "300"))
+    # Probes GEO (citation tracking, query discovery, competidores)
+    LLM_PROBE_MAX_CONCURRENCY: int = int(os.getenv("LLM_PROBE_MAX_CONCURRENCY", "8"))
+    LLM_PROBE_RATE_PER_SECOND: float = float(
+        os.getenv("LLM_PROBE_RATE_PER_SECOND", "4")
+    )
+    LLM_PROBE_RATE_BURST: int = int(os.getenv("LLM_PROBE_RATE_BURST", "8"))
+    LLM_PROBE_CACHE_TTL_SECONDS: int = int(
+        os.getenv("LLM_PROBE_CACHE_TTL_SECONDS", "900")
+    )
     NV_KIMI_SEARCH_ENABLED: bool = (
         os.getenv("NV_KIMI_SEARCH_ENABLED", "False").lower() == "true"
     )
@@ -191,6 +202,14 @@ class Settings(BaseSettings):
     )
     ENCRYPTION_KEY: str = os.getenv("ENCRYPTION_KEY", "CHANGE_ME_IN_PRODUCTION")
 
+    # Odoo sync: tamaño de página de search_read, modelos en paralelo y tope
+    # de registros por modelo (se avisa en warnings si se alcanza)
+    ODOO_SYNC_PAGE_SIZE: int = int(os.getenv("ODOO_SYNC_PAGE_SIZE", "500"))
+    ODOO_SYNC_MAX_CONCURRENCY: int = int(os.getenv("ODOO_SYNC_MAX_CONCURRENCY", "4"))
+    ODOO_SYNC_MAX_RECORDS_PER_MODEL: int = int(
+        os.getenv("ODOO_SYNC_MAX_RECORDS_PER_MODEL", "50000")
+    )
+
     # GitHub Configuration
     GITHUB_CLIENT_ID: Optional[str] = os.getenv("GITHUB_CLIENT_ID")
     GITHUB_CLIENT_SECRET: Optional[str] = os.getenv("GITHUB_CLIENT_SECRET")
@@ -199,6 +218,9 @@ class Settings(BaseSettings):
     GITHUB_API_TIMEOUT_SECONDS: float = float(
         os.getenv("GITHUB_API_TIMEOUT_SECONDS", "30")
     )
+    # Lecturas concurrentes de blobs al preparar un PR y tope de archivos por PR
+    GITHUB_FETCH_CONCURRENCY: int = int(os.getenv("GITHUB_FETCH_CONCURRENCY", "8"))
+    GITHUB_PR_MAX_FILES: int = int(os.getenv("GITHUB_PR_MAX_FILES", "200"))
 
     # Redis (Docker service name is 'redis')
     REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
@@ -210,6 +232,11 @@ class Settings(BaseSettings):
     CELERY_RESULT_BACKEND: Optional[str] = os.getenv(
         "CELERY_RESULT_BACKEND"
     ) or os.getenv("CELERY_BACKEND")
+    # Carril del worker (audits, reports, content, webhooks); vacío = todas las colas
+    CELERY_WORKER_LANE: str = os.getenv("CELERY_WORKER_LANE", "").strip().lower()
+    CELERY_QUEUE_DEPTH_TIMEOUT_SECONDS: float = float(
+        os.getenv("CELERY_QUEUE_DEPTH_TIMEOUT_SECONDS", "2")
+    )
 
     # Directorios
     REPORTS_DIR: str = "reports"
@@ -221,11 +248,51 @@ class Settings(BaseSettings):
     # Configuración de auditoría
     MAX_CRAWL_PAGES: int = int(os.getenv("MAX_CRAWL_PAGES", "50"))
     MAX_AUDIT_PAGES: int = int(os.getenv("MAX_AUDIT_PAGES", "50"))
+    # Fan-out distribuido: sitios con >= AUDIT_FANOUT_MIN_PAGES páginas a auditar
+    # se reparten en shards (chord de Celery) en lugar de un único worker.
+    AUDIT_FANOUT_ENABLED: bool = (
+        os.getenv("AUDIT_FANOUT_ENABLED", "False").lower() == "true"
+    )
+    AUDIT_FANOUT_MIN_PAGES: int = int(os.getenv("AUDIT_FANOUT_MIN_PAGES", "200"))
+    AUDIT_FANOUT_SHARD_SIZE: int = int(os.getenv("AUDIT_FANOUT_SHARD_SIZE", "100"))
+    AUDIT_FANOUT_SHARD_CONCURRENCY: int = int(
+        os.getenv("AUDIT_FANOUT_SHARD_CONCURRENCY", "5")
+    )
     ENABLE_PAGESPEED: bool = os.getenv("ENABLE_PAGESPEED", "True").lower() == "true"
     ALLOW_INSECURE_SSL_FALLBACK: bool = (
         os.getenv("ALLOW_INSECURE_SSL_FALLBACK", "False").lower() == "true"
     )
     PDF_LOCK_TTL_SECONDS: int = int(os.getenv("PDF_LOCK_TTL_SECONDS", "1800"))
+    # Una ejecución concurrente del mismo job espera al lock (y reutiliza el
+    # PDF cacheado) en lugar de descartarse; 0 mantiene el descarte inmediato.
+    PDF_LOCK_COALESCE_WAIT_SECONDS: float = float(
+        os.getenv("PDF_LOCK_COALESCE_WAIT_SECONDS", "60")
+    )
+    # Solo depuración: si se define, los artefactos en memoria que recibe el
+    # renderer de PDF también se vuelcan a <dir>/audit_<id>/.
+    PDF_DEBUG_ARTIFACTS_DIR: Optional[str] = os.getenv("PDF_DEBUG_ARTIFACTS_DIR")
+    # Pool de procesos de larga vida para renderizar PDFs fuera del hilo de la
+    # tarea (ver app/services/pdf_render_pool.py). El tamaño es por proceso: en
+    # la API es PDF_RENDER_POOL_WORKERS; en cada hijo prefork de Celery es 1, así
+    # que por nodo hay --concurrency del worker ``reports`` renderers (más un
+    # forkserver por hijo). Los renders concurrentes se limitan con esa
+    # concurrencia (perfil ``reports`` en app/workers/queues.py), no con este valor.
+    PDF_RENDER_POOL_ENABLED: bool = (
+        os.getenv("PDF_RENDER_POOL_ENABLED", "True").lower() == "true"
+    )
+    PDF_RENDER_POOL_WORKERS: int = int(os.getenv("PDF_RENDER_POOL_WORKERS", "2"))
+    PDF_RENDER_POOL_START_METHOD: str = os.getenv(
+        "PDF_RENDER_POOL_START_METHOD", "forkserver"
+    )
+    PDF_RENDER_MAX_TASKS_PER_WORKER: int = int(
+        os.getenv("PDF_RENDER_MAX_TASKS_PER_WORKER", "50")
+    )
+    PDF_RENDER_MEMORY_LIMIT_MB: int = int(
+        os.getenv("PDF_RENDER_MEMORY_LIMIT_MB", "1536")
+    )
+    PDF_RENDER_TIMEOUT_SECONDS: float = float(
+        os.getenv("PDF_RENDER_TIMEOUT_SECONDS", "300")
+    )
     PAGESPEED_LOCK_TTL_SECONDS: int = int(
         os.getenv("PAGESPEED_LOCK_TTL_SECONDS", "300")
     )
@@ -286,6 +353,20 @@ class Settings(BaseSettings):
     AUTH0_JWKS_FETCH_TIMEOUT_MS: int = int(
         os.getenv("AUTH0_JWKS_FETCH_TIMEOUT_MS", "2000")
     )
+    # Tras el TTL las claves se siguen sirviendo (stale) mientras se revalidan
+    # en background, hasta este máximo.
+    AUTH0_JWKS_STALE_TTL_SECONDS: int = int(
+        os.getenv("AUTH0_JWKS_STALE_TTL_SECONDS", "86400")
+    )
+    AUTH0_JWKS_MIN_REFRESH_INTERVAL_SECONDS: int = int(
+        os.getenv("AUTH0_JWKS_MIN_REFRESH_INTERVAL_SECONDS", "30")
+    )
+    AUTH0_JWKS_UNKNOWN_KID_TTL_SECONDS: int = int(
+        os.getenv("AUTH0_JWKS_UNKNOWN_KID_TTL_SECONDS", "300")
+    )
+    AUTH0_CLAIMS_CACHE_MAX_ENTRIES: int = int(
+        os.getenv("AUTH0_CLAIMS_CACHE_MAX_ENTRIES", "10000")
+    )
     AUTH0_ADMIN_EMAILS: list[str] = []
     AUTH0_ADMIN_ROLE_NAMES: list[str] = []
     AUTH0_ADMIN_PERMISSIONS: list[str] = []
@@ -308,6 +389,32 @@ class Settings(BaseSettings):
     PAGESPEED_TIMEOUT_SECONDS: float = float(
         os.getenv("PAGESPEED_TIMEOUT_SECONDS", "180")
     )
+    # Presupuesto por herramienta GEO en run_geo_analysis_task (corren en paralelo)
+    GEO_RANKINGS_TIMEOUT_SECONDS: float = float(
+        os.getenv("GEO_RANKINGS_TIMEOUT_SECONDS", "300")
+    )
+    GEO_BACKLINKS_TIMEOUT_SECONDS: float = float(
+        os.getenv("GEO_BACKLINKS_TIMEOUT_SECONDS", "420")
+    )
+    GEO_VISIBILITY_TIMEOUT_SECONDS: float = float(
+        os.getenv("GEO_VISIBILITY_TIMEOUT_SECONDS", "420")
+    )
+    # Cuota PSI (default de Google: 400 consultas / 100 s por proyecto)
+    PAGESPEED_RATE_PER_SECOND: float = float(
+        os.getenv("PAGESPEED_RATE_PER_SECOND", "2")
+    )
+    PAGESPEED_RATE_BURST: int = int(os.getenv("PAGESPEED_RATE_BURST", "4"))
+    PAGESPEED_CACHE_ENABLED: bool = (
+        os.getenv("PAGESPEED_CACHE_ENABLED", "True").lower() == "true"
+    )
+    PAGESPEED_CACHE_MAX_AGE_HOURS: int = int(
+        os.getenv("PAGESPEED_CACHE_MAX_AGE_HOURS", "24")
+    )
+    # Muestreo multi-URL por auditoría (1 = solo la URL auditada)
+    PAGESPEED_SAMPLE_SIZE: int = int(os.getenv("PAGESPEED_SAMPLE_SIZE", "5"))
+    PAGESPEED_SAMPLE_CONCURRENCY: int = int(
+        os.getenv("PAGESPEED_SAMPLE_CONCURRENCY", "4")
+    )
 
     # External resilience
     CIRCUIT_BREAKER_ENABLED: bool = (
@@ -321,6 +428,19 @@ class Settings(BaseSettings):
         os.getenv("CIRCUIT_BREAKER_SUCCESS_THRESHOLD", "2")
     )
 
+    # Métricas Prometheus: /metrics en la API y push a un Pushgateway desde los
+    # workers de Celery. Fuera de entornos de desarrollo /metrics exige
+    # METRICS_AUTH_TOKEN (sin token responde 404).
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+    METRICS_AUTH_TOKEN: Optional[str] = os.getenv("METRICS_AUTH_TOKEN")
+    METRICS_PUSHGATEWAY_URL: Optional[str] = os.getenv("METRICS_PUSHGATEWAY_URL")
+    METRICS_PUSH_INTERVAL_SECONDS: float = float(
+        os.getenv("METRICS_PUSH_INTERVAL_SECONDS", "15")
+    )
+    METRICS_PUSH_TIMEOUT_SECONDS: float = float(
+        os.getenv("METRICS_PUSH_TIMEOUT_SECONDS", "2")
+    )
+
     # HTTPS redirect (enable in production with SSL)
     FORCE_HTTPS: bool = False
 
@@ -342,6 +462,22 @@ class Settings(BaseSettings):
     SUPABASE_JWT_SECRET: Optional[str] = os.getenv("SUPABASE_JWT_SECRET")
     SUPABASE_STORAGE_BUCKET: str = os.getenv("SUPABASE_STORAGE_BUCKET", "audit-reports")
     SUPABASE_TIMEOUT_SECONDS: float = float(os.getenv("SUPABASE_TIMEOUT_SECONDS", "30"))
+    # Archivos por encima de este tamaño se suben con el protocolo resumable
+    # (TUS) en chunks de 6 MB; 0 desactiva el modo resumable.
+    SUPABASE_RESUMABLE_UPLOAD_THRESHOLD_MB: int = int(
+        os.getenv("SUPABASE_RESUMABLE_UPLOAD_THRESHOLD_MB", "6")
+    )
+    SUPABASE_RESUMABLE_UPLOAD_MAX_RETRIES: int = int(
+        os.getenv("SUPABASE_RESUMABLE_UPLOAD_MAX_RETRIES", "3")
+    )
+    # Las signed URLs se cachean hasta este tiempo; se firman con este margen
+    # extra para que la URL servida siga válida el `expiry_seconds` pedido.
+    SUPABASE_SIGNED_URL_CACHE_SECONDS: int = int(
+        os.getenv("SUPABASE_SIGNED_URL_CACHE_SECONDS", "600")
+    )
+    SUPABASE_SIGNED_URL_CACHE_MAX_ENTRIES: int = int(
+        os.getenv("SUPABASE_SIGNED_URL_CACHE_MAX_ENTRIES", "1024")
+    )
 
     # ===== WEBHOOK SETTINGS =====
     SENTRY_DSN: Optional[str] = os.getenv("SENTRY_DSN")
@@ -502,6 +638,14 @@ def validate_environment():
     # 3. Monitoring
     if not settings.SENTRY_DSN:
         warnings.append("Sentry DSN not set. Error tracking is local only.")
+    if (
+        is_non_dev
+        and settings.METRICS_ENABLED
+        and not (settings.METRICS_AUTH_TOKEN or "").strip()
+    ):
+        warnings.append(
+            "METRICS_AUTH_TOKEN not set. /metrics is disabled outside development."
+        )
 
     # 4. Security Check
     if is_production:
@@ -14,10 +14,12 @@ from sqlalchemy.pool import StaticPool
 
 from .config import settings
 from .logger import get_logger
+from .metrics import instrument_sqlalchemy_flushes
 
 logger = get_logger(__name__)
 
 Base = declarative_base()
+instrument_sqlalchemy_flushes()
 
 _engine_instance = None
 _session_factory = None
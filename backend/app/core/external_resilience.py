@@ -1,10 +1,12 @@
 """
-External service resilience helpers (timeouts + circuit breaker).
+External service resilience helpers (timeouts + circuit breaker + rate limiting).
 """
 
 from __future__ import annotations
 
 import asyncio
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FuturesTimeoutError
 from typing import Awaitable, Callable, Dict, TypeVar
@@ -13,6 +15,7 @@ import pybreaker
 
 from .config import settings
 from .logger import get_logger
+from .metrics import EXTERNAL_CALL_SECONDS, metrics_enabled
 
 logger = get_logger(__name__)
 
@@ -36,6 +39,8 @@ class ExternalRequestError(ExternalServiceError):
 
 
 _breakers: Dict[str, pybreaker.CircuitBreaker] = {}
+_rate_limiters: Dict[str, "TokenBucket"] = {}
+_rate_limiters_lock = threading.Lock()
 
 
 def _normalize_service_name(service_name: str) -> str:
@@ -71,6 +76,15 @@ def get_circuit_breaker(service_name: str) -> pybreaker.CircuitBreaker | None:
     return breaker
 
 
+def _observe_external_call(service_name: str, started: float, outcome: str) -> None:
+    if metrics_enabled():
+        EXTERNAL_CALL_SECONDS.observe(
+            time.perf_counter() - started,
+            service=_normalize_service_name(service_name),
+            outcome=outcome,
+        )
+
+
 async def run_external_call(
     service_name: str,
     operation: Callable[[], Awaitable[T]],
@@ -88,24 +102,35 @@ async def run_external_call(
             return await operation()
         return await asyncio.wait_for(operation(), timeout=effective_timeout)
 
+    started = time.perf_counter()
+    outcome = "ok"
     try:
         if breaker is not None:
             return await breaker.call_async(_wrapped_operation)
         return await _wrapped_operation()
     except asyncio.TimeoutError as exc:
+        outcome = "timeout"
         raise ExternalServiceTimeout(
             f"{service_name} request timed out after {effective_timeout}s"
         ) from exc
     except pybreaker.CircuitBreakerError as exc:
+        outcome = "circuit_open"
         raise ExternalCircuitOpenError(
             f"Circuit is open for external service '{service_name}'"
         ) from exc
     except ExternalServiceError:
+        outcome = "error"
         raise
     except Exception as exc:
+        outcome = "error"
         raise ExternalRequestError(
             f"External service '{service_name}' request failed: {exc}"
         ) from exc
+    except BaseException:
+        outcome = "cancelled"
+        raise
+    finally:
+        _observe_external_call(service_name, started, outcome)
 
 
 def run_external_call_sync(
@@ -127,24 +152,32 @@ def run_external_call_sync(
             future = executor.submit(operation)
             return future.result(timeout=effective_timeout)
 
+    started = time.perf_counter()
+    outcome = "ok"
     try:
         if breaker is not None:
             return breaker.call(_wrapped_operation)
         return _wrapped_operation()
     except FuturesTimeoutError as exc:
+        outcome = "timeout"
         raise ExternalServiceTimeout(
             f"{service_name} request timed out after {effective_timeout}s"
         ) from exc
     except pybreaker.CircuitBreakerError as exc:
+        outcome = "circuit_open"
         raise ExternalCircuitOpenError(
             f"Circuit is open for external service '{service_name}'"
         ) from exc
     except ExternalServiceError:
+        outcome = "error"
         raise
     except Exception as exc:
+        outcome = "error"
         raise ExternalRequestError(
             f"External service '{service_name}' request failed: {exc}"
         ) from exc
+    finally:
+        _observe_external_call(service_name, started, outcome)
 
 
 def get_circuit_breaker_states() -> Dict[str, str]:
@@ -159,3 +192,131 @@ def get_circuit_breaker_states() -> Dict[str, str]:
             logger.warning(f"Unable to read breaker state for {name}: {exc}")
             states[name] = "unknown"
     return states
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every event loop in the process.
+
+    Tokens are reserved under a lock (the balance may go negative) and the
+    caller sleeps for its own wait time, so concurrent callers are spaced out
+    at ``rate`` per second after an initial burst of ``capacity``.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = max(float(rate), 1e-6)
+        self.capacity = max(float(capacity), 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Reserve tokens and return how many seconds the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        wait_seconds = self.reserve(tokens)
+        if wait_seconds > 0:
+            await asyncio.sleep(wait_seconds)
+        return wait_seconds
+
+
+def get_rate_limiter(service_name: str, rate: float, capacity: float) -> TokenBucket:
+    """
+    Process-wide token bucket per provider (e.g. the PageSpeed quota).
+    """
+    key = _normalize_service_name(service_name)
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            limiter = TokenBucket(rate, capacity)
+            _rate_limiters[key] = limiter
+        return limiter
+
+
+# Same reservation semantics as TokenBucket.reserve, evaluated atomically in
+# Redis with the server clock so every worker process draws from one balance.
+_REDIS_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+tokens = tokens - requested
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated_at", tostring(now))
+redis.call("EXPIRE", KEYS[1], math.ceil((capacity - tokens) / rate) + 60)
+if tokens >= 0 then
+    return "0"
+end
+return tostring(-tokens / rate)
+"""
+
+
+class SharedTokenBucket:
+    """
+    Token bucket stored in Redis and shared by every worker process.
+
+    Falls back to the process-local bucket when Redis is not configured or a
+    call fails; in that case the limit applies per process again.
+    """
+
+    def __init__(self, key: str, redis_client, fallback: TokenBucket):
+        self.key = key
+        self.rate = fallback.rate
+        self.capacity = fallback.capacity
+        self._redis = redis_client
+        self._fallback = fallback
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Reserve tokens and return how many seconds the caller must wait."""
+        if self._redis is not None:
+            try:
+                wait_seconds = self._redis.eval(
+                    _REDIS_TOKEN_BUCKET_SCRIPT,
+                    1,
+                    self.key,
+                    self.rate,
+                    self.capacity,
+                    float(tokens),
+                )
+                if isinstance(wait_seconds, bytes):
+                    wait_seconds = wait_seconds.decode()
+                return max(0.0, float(wait_seconds))
+            except Exception as exc:
+                logger.warning(
+                    f"Shared rate limiter {self.key} unavailable, using local bucket: {exc}"
+                )
+        return self._fallback.reserve(tokens)
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        wait_seconds = self.reserve(tokens)
+        if wait_seconds > 0:
+            await asyncio.sleep(wait_seconds)
+        return wait_seconds
+
+
+def get_shared_rate_limiter(
+    service_name: str, rate: float, capacity: float, redis_client=None
+) -> SharedTokenBucket:
+    """
+    Cross-process token bucket per provider, backed by ``redis_client``.
+    """
+    key = _normalize_service_name(service_name)
+    return SharedTokenBucket(
+        f"rate_limit:{key}",
+        redis_client,
+        fallback=get_rate_limiter(service_name, rate, capacity),
+    )
@@ -2,7 +2,6 @@ import logging
 
 from app.core.config import settings
 from app.core.external_resilience import run_external_call
-from openai import AsyncOpenAI
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +18,8 @@ async def call_kimi_api(name: str, system_prompt: str, user_message: str) -> str
         logger.error("NVIDIA API key no está configurada. No se puede llamar a KIMI.")
         return "Error: API key no configurada."
 
+    from openai import AsyncOpenAI
+
     client = None
     try:
         provider_timeout = float(settings.NVIDIA_TIMEOUT_SECONDS)
@@ -6,11 +6,11 @@ from __future__ import annotations
 
 import asyncio
 import json
+import time
 from typing import Any, Dict, List
 from urllib.parse import urlparse
 
 import httpx
-from openai import AsyncOpenAI
 
 from ..core.config import settings
 from ..core.external_resilience import (
@@ -19,6 +19,7 @@ from ..core.external_resilience import (
     run_external_call,
 )
 from ..core.logger import get_logger
+from ..core.metrics import record_llm_call
 
 logger = get_logger(__name__)
 
@@ -228,6 +229,9 @@ async def kimi_function(
             "Kimi provider is not configured. Set NV_API_KEY_ANALYSIS or NVIDIA_API_KEY or NV_API_KEY."
         )
 
+    # openai se importa al primer uso: pesa ~0.3s en el arranque en frío
+    from openai import AsyncOpenAI
+
     client = None
     try:
         provider_timeout = float(settings.NVIDIA_TIMEOUT_SECONDS)
@@ -268,10 +272,22 @@ async def kimi_function(
                 stream=False,
             )
 
-        completion = await run_external_call(
-            "nvidia-kimi-generation",
-            _call_kimi_generation,
-            timeout_seconds=provider_timeout,
+        llm_started = time.perf_counter()
+        try:
+            completion = await run_external_call(
+                "nvidia-kimi-generation",
+                _call_kimi_generation,
+                timeout_seconds=provider_timeout,
+            )
+        except BaseException:
+            record_llm_call(time.perf_counter() - llm_started, outcome="error")
+            raise
+        usage = getattr(completion, "usage", None)
+        record_llm_call(
+            time.perf_counter() - llm_started,
+            outcome="ok",
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None),
         )
 
         content = completion.choices[0].message.content
@@ -418,6 +434,8 @@ async def kimi_search_serp(
     )
     system_prompt = "You are Kimi 2.5 Search. Always perform web search and return strict JSON only."
 
+    from openai import AsyncOpenAI
+
     client = None
     try:
         client = AsyncOpenAI(
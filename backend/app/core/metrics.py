@@ -0,0 +1,471 @@
+"""
+Métricas de proceso en formato de exposición Prometheus (text/plain 0.0.4).
+
+Registro en memoria, thread-safe y sin dependencias: la API lo expone en
+``GET /metrics`` y los workers de Celery lo empujan a un Pushgateway
+(``METRICS_PUSHGATEWAY_URL``) al terminar cada tarea, porque cada proceso del
+pool tiene su propio registro y no sirve HTTP.
+
+Uso típico en el pipeline:
+
+    with stage_timer("crawl"):
+        ...
+    @with_llm_prompt("report_generation")
+    async def generate_report(...): ...
+    record_cache("pagespeed", hit=True)
+"""
+
+from __future__ import annotations
+
+import abc
+import contextvars
+import functools
+import math
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .config import settings
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STAGE_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 180, 300, 600)
+LLM_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 90, 120, 180, 300)
+RATE_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 50)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label(str(value))}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric(abc.ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    @abc.abstractmethod
+    def render(self) -> List[str]:
+        """Líneas de exposición (HELP/TYPE + muestras) de la métrica."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Descarta las muestras acumuladas."""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self._header()
+        for key, value in items:
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, key)} "
+                f"{_format_value(value)}"
+            )
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets)) + (math.inf,)
+        # key -> (conteos por bucket, suma, total)
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        value = float(value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = [0.0] * (len(self.buckets) + 2)
+                self._values[key] = state
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self, **labels: str) -> Tuple[float, float]:
+        """(count, sum) de una serie; útil en tests y diagnósticos."""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return (state[-1], state[-2]) if state else (0.0, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        lines = self._header()
+        bucket_labels = self.labelnames + ("le",)
+        for key, state in items:
+            cumulative = 0.0
+            for index, bound in enumerate(self.buckets):
+                cumulative += state[index]
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{_format_labels(bucket_labels, key + (_format_value(bound),))} "
+                    f"{_format_value(cumulative)}"
+                )
+            suffix = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{suffix} {_format_value(state[-1])}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"Metric {metric.name} already registered")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Resetea los valores (no las definiciones); pensado para tests."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+AUDIT_STAGE_SECONDS = REGISTRY.histogram(
+    "audit_stage_duration_seconds",
+    "Wall time of each audit pipeline stage.",
+    ("stage", "outcome"),
+    buckets=STAGE_BUCKETS,
+)
+CRAWL_PAGES = REGISTRY.counter(
+    "audit_crawl_pages_total", "URLs discovered by the site crawler."
+)
+CRAWL_PAGES_PER_SECOND = REGISTRY.histogram(
+    "audit_crawl_pages_per_second",
+    "Crawler throughput per audit run.",
+    buckets=RATE_BUCKETS,
+)
+HTML_PARSE_SECONDS = REGISTRY.histogram(
+    "html_parse_duration_seconds",
+    "Time spent building the BeautifulSoup tree of a page.",
+    ("source",),
+)
+LLM_REQUEST_SECONDS = REGISTRY.histogram(
+    "llm_request_duration_seconds",
+    "LLM completion latency by prompt.",
+    ("prompt", "outcome"),
+    buckets=LLM_BUCKETS,
+)
+LLM_TOKENS = REGISTRY.counter(
+    "llm_tokens_total",
+    "Tokens reported by the LLM provider, by prompt and direction.",
+    ("prompt", "kind"),
+)
+EXTERNAL_CALL_SECONDS = REGISTRY.histogram(
+    "external_call_duration_seconds",
+    "Latency of calls routed through run_external_call (SERP, LLM, CMS APIs).",
+    ("service", "outcome"),
+    buckets=LLM_BUCKETS,
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total",
+    "Cache lookups by cache name and result (hit/miss).",
+    ("cache", "result"),
+)
+DB_FLUSH_SECONDS = REGISTRY.histogram(
+    "db_flush_duration_seconds", "SQLAlchemy session flush time."
+)
+CELERY_TASK_SECONDS = REGISTRY.histogram(
+    "celery_task_duration_seconds",
+    "Celery task run time by task name and final state.",
+    ("task", "state"),
+    buckets=STAGE_BUCKETS,
+)
+
+_current_llm_prompt: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "llm_prompt", default="unlabeled"
+)
+
+
+def metrics_enabled() -> bool:
+    return bool(settings.METRICS_ENABLED)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """
+    Mide una etapa del pipeline (``outcome`` = ok/error) y deja una traza en
+    el log con su duración, para poder reconstruir una auditoría concreta.
+    """
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        if metrics_enabled():
+            AUDIT_STAGE_SECONDS.observe(elapsed, stage=stage, outcome=outcome)
+        logger.info(f"audit stage {stage} finished: {outcome} in {elapsed:.2f}s")
+
+
+@contextmanager
+def llm_prompt(name: str) -> Iterator[None]:
+    """Etiqueta con ``name`` las llamadas LLM hechas dentro del bloque."""
+    token = _current_llm_prompt.set(name)
+    try:
+        yield
+    finally:
+        _current_llm_prompt.reset(token)
+
+
+def with_llm_prompt(name: str):
+    """Decorador: ``llm_prompt(name)`` alrededor de una corrutina."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with llm_prompt(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_llm_prompt() -> str:
+    return _current_llm_prompt.get()
+
+
+def record_llm_call(
+    elapsed: float,
+    *,
+    outcome: str,
+    prompt_tokens: Optional[int] = None,
+    completion_tokens: Optional[int] = None,
+) -> None:
+    if not metrics_enabled():
+        return
+    prompt = current_llm_prompt()
+    LLM_REQUEST_SECONDS.observe(elapsed, prompt=prompt, outcome=outcome)
+    if prompt_tokens:
+        LLM_TOKENS.inc(prompt_tokens, prompt=prompt, kind="prompt")
+    if completion_tokens:
+        LLM_TOKENS.inc(completion_tokens, prompt=prompt, kind="completion")
+
+
+def record_cache(cache: str, *, hit: bool) -> None:
+    if metrics_enabled():
+        CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def record_crawl(pages: int, elapsed: float) -> None:
+    if not metrics_enabled() or pages <= 0:
+        return
+    CRAWL_PAGES.inc(pages)
+    if elapsed > 0:
+        CRAWL_PAGES_PER_SECOND.observe(pages / elapsed)
+
+
+_flush_instrumented = False
+
+
+def instrument_sqlalchemy_flushes() -> None:
+    """Registra (una vez) el tiempo de flush de todas las sesiones ORM."""
+    global _flush_instrumented
+    if _flush_instrumented:
+        return
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    def _before_flush(session, _flush_context, _instances):
+        session.info["_metrics_flush_started"] = time.perf_counter()
+
+    def _after_flush_postexec(session, _flush_context):
+        started = session.info.pop("_metrics_flush_started", None)
+        if started is not None and metrics_enabled():
+            DB_FLUSH_SECONDS.observe(time.perf_counter() - started)
+
+    event.listen(Session, "before_flush", _before_flush)
+    event.listen(Session, "after_flush_postexec", _after_flush_postexec)
+    _flush_instrumented = True
+
+
+def render_latest() -> str:
+    return REGISTRY.render()
+
+
+_last_push_at = 0.0
+_push_lock = threading.Lock()
+
+
+def _push_instance() -> str:
+    """
+    ``host:slot`` estable por proceso del pool de Celery.
+
+    El Pushgateway nunca expira grupos: con el pid, cada hijo reciclado por
+    ``--max-tasks-per-child`` dejaría un grupo huérfano. El índice del slot del
+    pool (el mismo de ``%i`` en Celery) lo reutiliza el hijo que lo reemplaza,
+    que sobrescribe el grupo; Prometheus toma la vuelta a cero como reset de
+    contador. Fuera de un pool (API, ``--pool=solo``) se usa el pid.
+    """
+    try:
+        from billiard.process import current_process
+
+        index = getattr(current_process(), "index", None)
+    except Exception:
+        index = None
+    slot = f"slot{index}" if isinstance(index, int) else str(os.getpid())
+    return f"{socket.gethostname()}:{slot}"
+
+
+def push_to_gateway(job: str = "celery_worker", *, force: bool = False) -> bool:
+    """
+    Empuja el registro del proceso al Pushgateway configurado.
+
+    Agrupa por ``job`` + ``instance`` (host:slot del pool) para que cada proceso
+    conserve sus propias series; se limita a un push cada
+    ``METRICS_PUSH_INTERVAL_SECONDS`` salvo ``force``.
+    """
+    global _last_push_at
+    gateway = (settings.METRICS_PUSHGATEWAY_URL or "").strip().rstrip("/")
+    if not gateway or not metrics_enabled():
+        return False
+    now = time.monotonic()
+    with _push_lock:
+        interval = float(settings.METRICS_PUSH_INTERVAL_SECONDS)
+        if not force and now - _last_push_at < interval:
+            return False
+        _last_push_at = now
+
+    import httpx
+
+    instance = _push_instance()
+    url = f"{gateway}/metrics/job/{job}/instance/{instance}"
+    try:
+        response = httpx.put(
+            url,
+            content=render_latest().encode("utf-8"),
+            headers={"Content-Type": CONTENT_TYPE_LATEST},
+            timeout=float(settings.METRICS_PUSH_TIMEOUT_SECONDS),
+        )
+        response.raise_for_status()
+        return True
+    except Exception as exc:
+        logger.warning(f"Metrics push to {gateway} failed: {exc}")
+        return False
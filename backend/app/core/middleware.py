@@ -5,8 +5,10 @@ Incluye rate limiting, security headers, trusted hosts, y HTTPS redirect.
 
 import time
 from collections import defaultdict
-from typing import Callable, Dict, Optional, Tuple
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote
 
+from app.core.asgi import send_with_headers
 from app.core.logger import get_logger
 from app.core.rate_limit_policy import (
     is_rate_limit_exempt,
@@ -14,16 +16,16 @@ from app.core.rate_limit_policy import (
     resolve_rate_limit_policy,
 )
 from app.core.request_identity import get_client_ip
-from fastapi import Request, Response
+from fastapi import Request
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 logger = get_logger(__name__)
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
     Rate limiting middleware with sliding window counter.
     Supports different limits for different endpoints.
@@ -37,7 +39,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         endpoint_limits: Optional[Dict[str, Tuple[int, int]]] = None,
         trusted_ips: Optional[list] = None,
     ):
-        super().__init__(app)
+        self.app = app
         self.default_limit = default_limit
         self.default_window = default_window
         self.endpoint_limits = endpoint_limits or {}
@@ -110,15 +112,23 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self.rate_limits[key] = valid_entries + [(current_time, 1)]
         return (True, remaining, reset_time)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+
         # Skip rate limiting for health checks and SSE only
         if is_rate_limit_exempt(request.url.path) or "/sse/" in request.url.path:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         # Skip for trusted IPs
         client_host = get_client_ip(request)
         if client_host in self.trusted_ips:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         current_time = time.time()
         self._cleanup_old_entries(current_time)
@@ -163,7 +173,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             logger.warning(
                 f"Rate limit exceeded for client {client_key}: {request.url.path}"
             )
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=429,
                 content={"detail": "Too many requests. Please slow down."},
                 headers={
@@ -174,44 +184,43 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     "X-RateLimit-Bucket": policy.bucket,
                 },
             )
+            await response(scope, receive, send)
+            return
 
-        response = await call_next(request)
-
-        # Add rate limit headers to response (use the same path_for_limit logic)
-        response.headers["X-RateLimit-Limit"] = str(limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(reset_time)
-        response.headers["X-RateLimit-Bucket"] = policy.bucket
+        def add_rate_limit_headers(headers, _message) -> None:
+            # Add rate limit headers to response (use the same path_for_limit logic)
+            headers["X-RateLimit-Limit"] = str(limit)
+            headers["X-RateLimit-Remaining"] = str(remaining)
+            headers["X-RateLimit-Reset"] = str(reset_time)
+            headers["X-RateLimit-Bucket"] = policy.bucket
 
-        return response
+        await self.app(scope, receive, send_with_headers(send, add_rate_limit_headers))
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """
     Add security headers to all responses.
     """
 
-    def __init__(self, app, csp_enabled: bool = True, frame_ancestors: str = "'none'"):
-        super().__init__(app)
+    def __init__(
+        self, app: ASGIApp, csp_enabled: bool = True, frame_ancestors: str = "'none'"
+    ):
+        self.app = app
         self.csp_enabled = csp_enabled
         self.frame_ancestors = frame_ancestors
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-
-        # Standard Security Headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), microphone=(), camera=()"
-        )
-
-        # HSTS (only in production with HTTPS)
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=31536000; includeSubDomains; preload"
-        )
+        self.security_headers = self._build_security_headers()
+
+    def _build_security_headers(self) -> Dict[str, str]:
+        headers = {
+            # Standard Security Headers
+            "X-Content-Type-Options": "nosniff",
+            "X-Frame-Options": "DENY",
+            "X-XSS-Protection": "1; mode=block",
+            "Referrer-Policy": "strict-origin-when-cross-origin",
+            "Permissions-Policy": "geolocation=(), microphone=(), camera=()",
+            # HSTS (only in production with HTTPS)
+            "Strict-Transport-Security": "max-age=31536000; includeSubDomains; preload",
+        }
 
         # Content Security Policy (CSP)
         if self.csp_enabled:
@@ -227,12 +236,22 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
                 "base-uri 'self'",
                 "object-src 'none'",
             ]
-            response.headers["Content-Security-Policy"] = "; ".join(csp_directives)
+            headers["Content-Security-Policy"] = "; ".join(csp_directives)
+
+        return headers
 
-        return response
+    def _apply_headers(self, headers, _message) -> None:
+        for name, value in self.security_headers.items():
+            headers[name] = value
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, send_with_headers(send, self._apply_headers))
 
 
-class RequestValidationMiddleware(BaseHTTPMiddleware):
+class RequestValidationMiddleware:
     """
     Validate incoming requests for security issues.
     """
@@ -240,9 +259,24 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
     MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10 MB
     MAX_URL_LENGTH = 2048
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    # Block suspicious patterns in URL
+    SUSPICIOUS_PATTERNS = (
+        "../",  # Path traversal
+        "..\\",  # Windows path traversal
+        "<script",  # XSS attempt
+        "javascript:",  # XSS attempt
+        "vbscript:",  # XSS attempt
+        "data:text/html",  # XSS attempt
+    )
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    def _rejection(self, request: Request) -> Optional[JSONResponse]:
+        url = str(request.url)
+
         # Check URL length
-        if len(str(request.url)) > self.MAX_URL_LENGTH:
+        if len(url) > self.MAX_URL_LENGTH:
             return JSONResponse(status_code=414, content={"detail": "URI too long"})
 
         # Check content length
@@ -252,59 +286,71 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
                 status_code=413, content={"detail": "Request entity too large"}
             )
 
-        # Block suspicious patterns in URL
-        suspicious_patterns = [
-            "../",  # Path traversal
-            "..\\",  # Windows path traversal
-            "<script",  # XSS attempt
-            "javascript:",  # XSS attempt
-            "vbscript:",  # XSS attempt
-            "data:text/html",  # XSS attempt
-        ]
-
-        from urllib.parse import unquote
+        url_decoded = unquote(url).lower()
 
-        url_decoded = unquote(str(request.url)).lower()
-
-        for pattern in suspicious_patterns:
+        for pattern in self.SUSPICIOUS_PATTERNS:
             if pattern in url_decoded:
                 logger.warning(f"Blocked suspicious request: {request.url}")
                 return JSONResponse(
                     status_code=400, content={"detail": "Invalid request"}
                 )
 
-        return await call_next(request)
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response = self._rejection(Request(scope))
+        if response is not None:
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """
     Log incoming requests for security auditing.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start_time = time.time()
 
+        request = Request(scope)
         client_ip = get_client_ip(request)
 
-        # Process request
-        response = await call_next(request)
-
-        # Calculate duration
-        duration = time.time() - start_time
-
-        # Log request (skip health checks)
-        if request.url.path not in {"/health", "/health/live", "/health/ready"}:
-            logger.info(
-                f"{request.method} {request.url.path} "
-                f"- {response.status_code} "
-                f"- {client_ip} "
-                f"- {duration:.3f}s"
-            )
+        def log_response(headers, message) -> None:
+            # Calculate duration (hasta los headers, igual que call_next)
+            duration = time.time() - start_time
+
+            # Log request (skip health checks)
+            if request.url.path not in {
+                "/health",
+                "/health/live",
+                "/health/ready",
+                "/metrics",
+            }:
+                logger.info(
+                    f"{request.method} {request.url.path} "
+                    f"- {message['status']} "
+                    f"- {client_ip} "
+                    f"- {duration:.3f}s"
+                )
 
-        # Add timing header
-        response.headers["X-Response-Time"] = f"{duration:.3f}s"
+            # Add timing header
+            headers["X-Response-Time"] = f"{duration:.3f}s"
 
-        return response
+        # Process request
+        await self.app(scope, receive, send_with_headers(send, log_response))
 
 
 def configure_security_middleware(app, settings, enable_rate_limiting: bool = True):
@@ -33,6 +33,7 @@ def is_rate_limit_exempt(path: str) -> bool:
         "/health",
         "/health/live",
         "/health/ready",
+        "/metrics",
         "/docs",
         "/openapi.json",
     }
@@ -2,11 +2,35 @@
 GitHub Integration Module
 """
 
-from .blog_auditor import BlogAuditorService as BlogAuditorService
-from .client import GitHubClient as GitHubClient
-from .geo_blog_auditor import GEOBlogAuditor as GEOBlogAuditor
-from .oauth import GitHubOAuth as GitHubOAuth
-from .service import GitHubService as GitHubService
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Exports resueltos al primer acceso: importar ``.oauth`` o ``.service`` no
+# debe arrastrar PyGithub ni los auditores de blog en el arranque de la API.
+_LAZY_EXPORTS = {
+    "BlogAuditorService": ".blog_auditor",
+    "GitHubClient": ".client",
+    "GEOBlogAuditor": ".geo_blog_auditor",
+    "GitHubOAuth": ".oauth",
+    "GitHubService": ".service",
+}
+
+if TYPE_CHECKING:
+    from .blog_auditor import BlogAuditorService as BlogAuditorService
+    from .client import GitHubClient as GitHubClient
+    from .geo_blog_auditor import GEOBlogAuditor as GEOBlogAuditor
+    from .oauth import GitHubOAuth as GitHubOAuth
+    from .service import GitHubService as GitHubService
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "BlogAuditorService",
@@ -207,20 +207,17 @@ class BlogAuditorService:
                 # Buscar archivos principales en raíz
                 try:
                     logger.info("Attempting to scan root directory...")
-                    root_contents = repo.get_contents("")
+                    root_contents = self.client.get_repo_tree(repo).list_dir("")
                     logger.info(f"Found {len(root_contents)} items in root")
-                    for content in root_contents:
-                        logger.info(f"Item: {content.name}, Type: {content.type}")
-                        if content.type == "file" and content.name.endswith(
-                            (".tsx", ".jsx")
-                        ):
+                    for path, item_type in root_contents:
+                        if item_type == "file" and path.endswith((".tsx", ".jsx")):
                             # Excluir archivos de configuración comunes
-                            if content.name not in [
+                            if path not in [
                                 "vite.config.tsx",
                                 "vite.config.jsx",
                             ]:
-                                logger.info(f"Found file: {content.path}")
-                                blog_files.append(content.path)
+                                logger.info(f"Found file: {path}")
+                                blog_files.append(path)
                 except Exception as e:
                     logger.error(f"Error scanning root: {e}")
 
@@ -247,39 +244,23 @@ class BlogAuditorService:
         self, repo, path: str, patterns: List[str]
     ) -> List[str]:
         """Escanea directorio buscando archivos con nombres específicos"""
-        files = []
         try:
-            contents = repo.get_contents(path)
-            for content in contents:
-                if content.type == "dir":
-                    files.extend(
-                        self._scan_directory_for_pattern(repo, content.path, patterns)
-                    )
-                elif content.name in patterns:
-                    files.append(content.path)
+            return self.client.get_repo_tree(repo).files_under(
+                path, lambda name: name in patterns
+            )
         except Exception:  # nosec B110
-            pass
-        return files
+            return []
 
     def _scan_directory_for_extension(
         self, repo, path: str, extensions: List[str]
     ) -> List[str]:
         """Escanea directorio buscando archivos con extensiones específicas"""
-        files = []
         try:
-            contents = repo.get_contents(path)
-            for content in contents:
-                if content.type == "dir":
-                    files.extend(
-                        self._scan_directory_for_extension(
-                            repo, content.path, extensions
-                        )
-                    )
-                elif any(content.name.endswith(ext) for ext in extensions):
-                    files.append(content.path)
+            return self.client.get_repo_tree(repo).files_under(
+                path, lambda name: name.endswith(tuple(extensions))
+            )
         except Exception:  # nosec B110
-            pass
-        return files
+            return []
 
     async def _audit_single_blog(
         self, repo, file_path: str, site_type: str
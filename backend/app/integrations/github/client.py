@@ -2,13 +2,20 @@
 GitHub API Client - Professional wrapper around PyGithub
 """
 
+from __future__ import annotations
+
 import base64
 import json
-from typing import Any, Dict, List
-
-from github import Github, GithubException, Repository
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from ...core.config import settings
 from ...core.logger import get_logger
+from .repo_tree import RepoTreeIndex, get_repo_tree, resolve_commit_sha
+
+# PyGithub se importa al crear el primer cliente, no al levantar la API.
+if TYPE_CHECKING:
+    from github import Repository
 
 logger = get_logger(__name__)
 
@@ -23,9 +30,18 @@ class GitHubClient:
         Args:
             access_token: Token de acceso OAuth
         """
-        self.gh = Github(access_token, per_page=100)
+        from github import Github
+
+        # El pool HTTP acompaña a las lecturas concurrentes (conexiones reutilizadas)
+        self.gh = Github(
+            access_token,
+            per_page=100,
+            pool_size=max(10, int(settings.GITHUB_FETCH_CONCURRENCY)),
+        )
         self.access_token = access_token
         self._user = None
+        # (full_name, ref) -> commit SHA, para no resolver la misma branch por escaneo
+        self._ref_shas: Dict[tuple, str] = {}
 
     def get_authenticated_user(self) -> Dict:
         """Obtiene info del usuario autenticado"""
@@ -80,6 +96,26 @@ class GitHubClient:
         """
         return self.gh.get_repo(full_name)
 
+    def get_repo_tree(
+        self, repo: Repository.Repository, ref: Optional[str] = None
+    ) -> RepoTreeIndex:
+        """
+        Obtiene el índice de paths del repo con una sola llamada a la Git Trees API
+
+        Args:
+            repo: Objeto Repository
+            ref: Branch o commit SHA (default: default_branch)
+
+        Returns:
+            RepoTreeIndex cacheado por commit SHA
+        """
+        key = (repo.full_name, ref or repo.default_branch)
+        commit_sha = self._ref_shas.get(key)
+        if commit_sha is None:
+            commit_sha = resolve_commit_sha(repo, ref)
+            self._ref_shas[key] = commit_sha
+        return get_repo_tree(repo, commit_sha)
+
     def detect_site_type(self, repo: Repository.Repository) -> Dict[str, Any]:
         """
         Detecta el tipo de sitio y su configuración
@@ -99,14 +135,13 @@ class GitHubClient:
         }
 
         try:
-            contents = repo.get_contents("")
-            file_names = {c.name.lower(): c for c in contents if c.type == "file"}
+            tree = self.get_repo_tree(repo)
+            file_names = tree.root_file_names()
 
             # 1. Frameworks modernos (Next.js, Gatsby, Astro, etc)
             if "package.json" in file_names:
-                pkg_content = base64.b64decode(
-                    file_names["package.json"].content
-                ).decode("utf-8")
+                pkg_blob = repo.get_git_blob(tree.blob_sha(file_names["package.json"]))
+                pkg_content = base64.b64decode(pkg_blob.content).decode("utf-8")
                 pkg = json.loads(pkg_content)
 
                 deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
@@ -116,11 +151,7 @@ class GitHubClient:
                     config["build_command"] = "npm run build"
                     config["output_dir"] = ".next"
                     config["framework_version"] = deps["next"]
-                    try:
-                        repo.get_contents("app")
-                        config["router_type"] = "app"
-                    except Exception:
-                        config["router_type"] = "pages"
+                    config["router_type"] = "app" if tree.is_dir("app") else "pages"
 
                 elif "gatsby" in deps:
                     config["site_type"] = "gatsby"
@@ -214,7 +245,7 @@ class GitHubClient:
             elif site_type in ["vite", "create-react-app", "html", "unknown"]:
                 # Para SPAs, index.html es crítico para SEO
                 try:
-                    if "index.html" in [c.name for c in repo.get_contents("")]:
+                    if self.get_repo_tree(repo).is_file("index.html"):
                         files.append("index.html")
                 except Exception:  # nosec B110
                     pass
@@ -252,6 +283,8 @@ class GitHubClient:
         if not base_branch:
             base_branch = repo.default_branch
 
+        from github import GithubException
+
         base = repo.get_branch(base_branch)
 
         # Verificar si el branch ya existe
@@ -291,6 +324,8 @@ class GitHubClient:
             branch: Branch donde hacer el commit
             message: Mensaje del commit
         """
+        from github import GithubException
+
         try:
             # Intentar obtener archivo existente
             file = repo.get_contents(file_path, ref=branch)
@@ -312,6 +347,94 @@ class GitHubClient:
             else:
                 raise
 
+    def get_files_content(
+        self,
+        repo: Repository.Repository,
+        file_paths: List[str],
+        ref: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """
+        Obtiene el contenido de varios archivos en paralelo vía Git blobs
+
+        Args:
+            repo: Repository object
+            file_paths: Paths de los archivos
+            ref: Branch/commit (default: default_branch)
+            max_workers: Lecturas concurrentes (default: GITHUB_FETCH_CONCURRENCY)
+
+        Returns:
+            Dict {path: contenido}; los archivos ilegibles se omiten
+        """
+        tree = self.get_repo_tree(repo, ref)
+        paths = list(dict.fromkeys(file_paths))
+
+        def _fetch(path: str) -> Optional[str]:
+            try:
+                blob_sha = tree.blob_sha(path)
+                if blob_sha:
+                    blob = repo.get_git_blob(blob_sha)
+                    return base64.b64decode(blob.content).decode("utf-8")
+                return self.get_file_content(repo, path, tree.sha)
+            except Exception as e:
+                logger.error(f"Error reading {path} from {repo.full_name}: {e}")
+                return None
+
+        if not paths:
+            return {}
+        workers = max(
+            1, min(len(paths), max_workers or int(settings.GITHUB_FETCH_CONCURRENCY))
+        )
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            contents = list(executor.map(_fetch, paths))
+
+        return {
+            path: content
+            for path, content in zip(paths, contents)
+            if content is not None
+        }
+
+    def commit_files(
+        self,
+        repo: Repository.Repository,
+        branch: str,
+        files: Dict[str, str],
+        message: str,
+        parent_sha: Optional[str] = None,
+    ) -> str:
+        """
+        Crea un único commit con varios archivos usando la Git Data API
+
+        Args:
+            repo: Repository object
+            branch: Branch a actualizar
+            files: Dict {path: contenido nuevo}
+            message: Mensaje del commit
+            parent_sha: Commit padre (default: HEAD actual de la branch)
+
+        Returns:
+            SHA del commit creado
+        """
+        if not files:
+            raise ValueError("No files to commit")
+
+        from github import InputGitTreeElement
+
+        ref = repo.get_git_ref(f"heads/{branch}")
+        parent = repo.get_git_commit(parent_sha or ref.object.sha)
+        elements = [
+            InputGitTreeElement(path, "100644", "blob", content=content)
+            for path, content in files.items()
+        ]
+        tree = repo.create_git_tree(elements, base_tree=parent.tree)
+        commit = repo.create_git_commit(message, tree, [parent])
+        ref.edit(commit.sha)
+
+        logger.info(
+            f"Committed {len(files)} files to {repo.full_name}/{branch} ({commit.sha[:7]})"
+        )
+        return commit.sha
+
     def create_pull_request(
         self,
         repo: Repository.Repository,
@@ -396,69 +519,51 @@ class GitHubClient:
         self, repo: Repository.Repository, base_path: str
     ) -> List[str]:
         """Escanea recursivamente buscando page.tsx/jsx en Next.js App Router"""
-        files = []
         try:
-            contents = repo.get_contents(base_path)
-            for content in contents:
-                if content.type == "dir":
-                    files.extend(self._scan_for_nextjs_pages(repo, content.path))
-                elif content.name in ["page.tsx", "page.jsx", "page.js"]:
-                    files.append(content.path)
+            return self.get_repo_tree(repo).files_under(
+                base_path, lambda name: name in ["page.tsx", "page.jsx", "page.js"]
+            )
         except Exception:  # nosec B110
-            pass
-        return files
+            return []
 
     def _scan_for_react_files(
         self, repo: Repository.Repository, base_path: str
     ) -> List[str]:
         """Escanea archivos React/JSX/TSX"""
-        files = []
         try:
-            contents = repo.get_contents(base_path)
-            for content in contents:
-                if content.type == "dir":
-                    files.extend(self._scan_for_react_files(repo, content.path))
-                elif content.name.endswith((".tsx", ".jsx", ".js")):
-                    files.append(content.path)
+            return self.get_repo_tree(repo).files_under(
+                base_path, lambda name: name.endswith((".tsx", ".jsx", ".js"))
+            )
         except Exception:  # nosec B110
-            pass
-        return files
+            return []
 
     def _scan_for_astro_files(
         self, repo: Repository.Repository, base_path: str
     ) -> List[str]:
         """Escanea archivos Astro"""
-        files = []
         try:
             logger.info(f"Scanning for Astro files in {base_path}")
-            contents = repo.get_contents(base_path)
-            for content in contents:
-                if content.type == "dir":
-                    files.extend(self._scan_for_astro_files(repo, content.path))
-                elif content.name.endswith(".astro"):
-                    logger.info(f"Found Astro file: {content.path}")
-                    files.append(content.path)
+            files = self.get_repo_tree(repo).files_under(
+                base_path, lambda name: name.endswith(".astro")
+            )
+            logger.info(f"Found {len(files)} Astro files in {base_path}")
+            return files
         except Exception as e:
             logger.error(f"Error scanning Astro files in {base_path}: {e}")
-        return files
+            return []
 
     def _scan_for_html_files(
         self, repo: Repository.Repository, base_path: str
     ) -> List[str]:
         """Escanea archivos HTML"""
-        files = []
         try:
-            contents = (
-                repo.get_contents(base_path) if base_path else repo.get_contents("")
+            return self.get_repo_tree(repo).files_under(
+                base_path,
+                lambda name: name.endswith(".html"),
+                skip_hidden_dirs=True,
             )
-            for content in contents:
-                if content.type == "dir" and not content.name.startswith("."):
-                    files.extend(self._scan_for_html_files(repo, content.path))
-                elif content.name.endswith(".html"):
-                    files.append(content.path)
         except Exception:  # nosec B110
-            pass
-        return files
+            return []
 
     def get_file_content(
         self, repo: Repository.Repository, file_path: str, ref: str = None
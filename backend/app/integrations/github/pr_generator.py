@@ -262,6 +262,27 @@ class PRGeneratorService:
         message = type_messages.get(fix_type, "SEO improvements")
         return f"chore(seo): {message} in {file_path}"
 
+    @staticmethod
+    def generate_batch_commit_message(file_paths: List[str], fix_type: str) -> str:
+        """
+        Genera el mensaje del commit único que agrupa todos los archivos del PR
+
+        Args:
+            file_paths: Paths de los archivos modificados
+            fix_type: Tipo de fix principal
+
+        Returns:
+            Mensaje de commit (subject + lista de archivos)
+        """
+        if len(file_paths) == 1:
+            return PRGeneratorService.generate_commit_message(file_paths[0], fix_type)
+
+        subject = PRGeneratorService.generate_commit_message(
+            f"{len(file_paths)} files", fix_type
+        )
+        body = "\n".join(f"- {path}" for path in file_paths)
+        return f"{subject}\n\n{body}"
+
     @staticmethod
     def generate_branch_name(audit_id: int) -> str:
         """
@@ -0,0 +1,160 @@
+"""
+Índice en memoria del árbol de un repositorio (Git Trees API).
+
+En lugar de recorrer el repo con ``repo.get_contents`` (una llamada por
+carpeta), se pide el árbol recursivo completo de un commit una sola vez y se
+consultan los paths localmente. Los árboles son inmutables por commit SHA, así
+que se cachean por ``(full_name, sha)``.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from ...core.logger import get_logger
+
+if TYPE_CHECKING:
+    from github import Repository
+
+logger = get_logger(__name__)
+
+_SHA_RE = re.compile(r"^[0-9a-f]{40}$")
+
+# Árboles por (full_name, commit_sha); LRU acotado para monorepos grandes.
+TREE_CACHE_MAX_ENTRIES = 32
+_tree_cache: "OrderedDict[Tuple[str, str], RepoTreeIndex]" = OrderedDict()
+_tree_cache_lock = threading.Lock()
+
+
+class RepoTreeIndex:
+    """Índice de paths de un commit: archivos, directorios e hijos directos."""
+
+    def __init__(
+        self,
+        sha: str,
+        entries: List[Tuple[str, str, Optional[str]]],
+        truncated: bool = False,
+    ):
+        """
+        Args:
+            sha: Commit SHA del árbol
+            entries: Tuplas (path, type, blob_sha) en el orden de la Trees API
+                (pre-orden, igual que el recorrido recursivo con get_contents)
+            truncated: True si GitHub truncó el árbol (>100k entradas)
+        """
+        self.sha = sha
+        self.truncated = truncated
+        self._files: Dict[str, Optional[str]] = {}
+        self._dirs = {""}
+        self._children: Dict[str, List[Tuple[str, str]]] = {"": []}
+
+        for path, entry_type, blob_sha in entries:
+            parent = path.rsplit("/", 1)[0] if "/" in path else ""
+            if entry_type == "tree":
+                self._dirs.add(path)
+                self._children.setdefault(path, [])
+                self._children.setdefault(parent, []).append((path, "dir"))
+            elif entry_type == "blob":
+                self._files[path] = blob_sha
+                self._children.setdefault(parent, []).append((path, "file"))
+
+    @classmethod
+    def from_git_tree(cls, sha: str, git_tree) -> "RepoTreeIndex":
+        """Construye el índice desde un ``GitTree`` de PyGithub."""
+        entries = [(item.path, item.type, item.sha) for item in git_tree.tree]
+        truncated = bool((getattr(git_tree, "raw_data", None) or {}).get("truncated"))
+        return cls(sha, entries, truncated=truncated)
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return (path or "").strip("/")
+
+    def is_file(self, path: str) -> bool:
+        return self._normalize(path) in self._files
+
+    def is_dir(self, path: str) -> bool:
+        return self._normalize(path) in self._dirs
+
+    def blob_sha(self, path: str) -> Optional[str]:
+        return self._files.get(self._normalize(path))
+
+    def list_dir(self, path: str = "") -> List[Tuple[str, str]]:
+        """Hijos directos de un directorio como tuplas (path, "file" | "dir")."""
+        return list(self._children.get(self._normalize(path), []))
+
+    def root_file_names(self) -> Dict[str, str]:
+        """Archivos de la raíz: nombre en minúsculas -> path real."""
+        return {
+            path.lower(): path for path, kind in self.list_dir("") if kind == "file"
+        }
+
+    def files_under(
+        self,
+        base_path: str = "",
+        name_filter: Optional[Callable[[str], bool]] = None,
+        skip_hidden_dirs: bool = False,
+    ) -> List[str]:
+        """
+        Archivos bajo ``base_path`` (recursivo), opcionalmente filtrados por nombre.
+
+        Args:
+            base_path: Directorio base ("" = raíz)
+            name_filter: Predicado sobre el nombre del archivo (sin directorio)
+            skip_hidden_dirs: Ignorar subdirectorios que empiezan con "."
+        """
+        base = self._normalize(base_path)
+        if base not in self._dirs:
+            return []
+        prefix = f"{base}/" if base else ""
+        files = []
+        for path in self._files:
+            if not path.startswith(prefix):
+                continue
+            parts = path[len(prefix) :].split("/")
+            if skip_hidden_dirs and any(part.startswith(".") for part in parts[:-1]):
+                continue
+            if name_filter is None or name_filter(parts[-1]):
+                files.append(path)
+        return files
+
+
+def resolve_commit_sha(repo: Repository.Repository, ref: Optional[str] = None) -> str:
+    """Resuelve una branch (default: default_branch) a su commit SHA."""
+    ref = ref or repo.default_branch
+    if _SHA_RE.match(ref):
+        return ref
+    return repo.get_branch(ref).commit.sha
+
+
+def get_repo_tree(repo: Repository.Repository, commit_sha: str) -> RepoTreeIndex:
+    """Árbol recursivo de un commit, cacheado por (repo, SHA)."""
+    key = (repo.full_name, commit_sha)
+    with _tree_cache_lock:
+        index = _tree_cache.get(key)
+        if index is not None:
+            _tree_cache.move_to_end(key)
+            return index
+
+    index = RepoTreeIndex.from_git_tree(
+        commit_sha, repo.get_git_tree(commit_sha, recursive=True)
+    )
+    if index.truncated:
+        logger.warning(
+            f"Git tree for {repo.full_name}@{commit_sha[:7]} is truncated; "
+            "scan results may be incomplete"
+        )
+
+    with _tree_cache_lock:
+        _tree_cache[key] = index
+        _tree_cache.move_to_end(key)
+        while len(_tree_cache) > TREE_CACHE_MAX_ENTRIES:
+            _tree_cache.popitem(last=False)
+    return index
+
+
+def clear_repo_tree_cache() -> None:
+    with _tree_cache_lock:
+        _tree_cache.clear()
@@ -2,6 +2,7 @@
 GitHub Service - Main orchestration service
 """
 
+import asyncio
 from datetime import datetime
 from typing import Any, Dict, List
 
@@ -534,11 +535,11 @@ class GitHubService:
         if not repo:
             raise ValueError("Repository not found")
 
-        # Obtener objeto Repository de PyGithub
-        gh_repo = client.get_repo(repo.full_name)
+        # Obtener objeto Repository de PyGithub (PyGithub es bloqueante)
+        gh_repo = await asyncio.to_thread(client.get_repo, repo.full_name)
 
         # Detectar tipo de sitio
-        site_config = client.detect_site_type(gh_repo)
+        site_config = await asyncio.to_thread(client.detect_site_type, gh_repo)
 
         # Actualizar en BD
         repo.site_type = site_config["site_type"]
@@ -563,7 +564,7 @@ class GitHubService:
         1. Obtiene datos del repo y la auditoría
         2. Encuentra archivos a modificar
         3. Aplica fixes
-        4. Crea branch y commits
+        4. Crea branch y un único commit con todos los archivos
         5. Crea PR
 
         Args:
@@ -596,18 +597,22 @@ class GitHubService:
             await self.analyze_repository(connection_id, repo_id)
             self.db.refresh(repo)
 
-        # 2. Obtener objeto Repository de PyGithub
-        gh_repo = client.get_repo(repo.full_name)
+        # 2. Obtener objeto Repository de PyGithub (llamadas bloqueantes fuera del loop)
+        gh_repo = await asyncio.to_thread(client.get_repo, repo.full_name)
 
         # 3. Generar nombre de branch
         branch_name = PRGeneratorService.generate_branch_name(audit_id)
 
         # 4. Crear branch (client.create_branch handles deletion if exists)
         logger.info(f"Creating/Resetting branch: {branch_name}")
-        client.create_branch(gh_repo, branch_name, repo.default_branch)
+        base_sha = await asyncio.to_thread(
+            client.create_branch, gh_repo, branch_name, repo.default_branch
+        )
 
         # 5. Encontrar archivos a modificar
-        page_files = client.find_page_files(gh_repo, repo.site_type)
+        page_files = await asyncio.to_thread(
+            client.find_page_files, gh_repo, repo.site_type
+        )
 
         if not page_files:
             logger.warning(f"No page files found in {repo.full_name}")
@@ -807,48 +812,61 @@ class GitHubService:
             except Exception as e:
                 logger.warning(f"Failed to extract rich audit context: {e}")
 
-        for file_path in page_files[:10]:  # Limitar a 10 archivos para el MVP
-            try:
-                # Obtener contenido actual
-                original_content = client.get_file_content(
-                    gh_repo, file_path, repo.default_branch
-                )
+        max_files = int(settings.GITHUB_PR_MAX_FILES)
+        if len(page_files) > max_files:
+            logger.warning(
+                f"{len(page_files)} page files in {repo.full_name}, using first {max_files}"
+            )
+            page_files = page_files[:max_files]
+
+        # Leer todos los blobs en paralelo desde el commit base de la branch
+        original_contents = await asyncio.to_thread(
+            client.get_files_content, gh_repo, page_files, base_sha
+        )
 
+        updated_contents = {}
+        for file_path in page_files:
+            original_content = original_contents.get(file_path)
+            if original_content is None:
+                continue
+            try:
                 # Aplicar fixes
                 modified_content = CodeModifierService.apply_fixes(
                     original_content, file_path, fixes, repo.site_type, audit_context
                 )
-
-                # Si hubo cambios, actualizar archivo
-                if modified_content != original_content:
-                    commit_message = PRGeneratorService.generate_commit_message(
-                        file_path, fixes[0].get("type") if fixes else "seo"
-                    )
-
-                    client.update_file(
-                        gh_repo,
-                        file_path,
-                        modified_content,
-                        branch_name,
-                        commit_message,
-                    )
-
-                    modified_files.append(file_path)
-                    file_changes[file_path] = [
-                        {
-                            "type": fix.get("type"),
-                            "before": "",
-                            "after": fix.get("value"),
-                        }
-                        for fix in fixes
-                    ]
-
-                    logger.info(f"Modified file: {file_path}")
-
             except Exception as e:
                 logger.error(f"Error modifying {file_path}: {e}")
                 continue
 
+            # Si hubo cambios, incluir el archivo en el commit
+            if modified_content != original_content:
+                updated_contents[file_path] = modified_content
+                modified_files.append(file_path)
+                file_changes[file_path] = [
+                    {
+                        "type": fix.get("type"),
+                        "before": "",
+                        "after": fix.get("value"),
+                    }
+                    for fix in fixes
+                ]
+
+                logger.info(f"Modified file: {file_path}")
+
+        if modified_files:
+            # Un solo tree + commit para todos los archivos (Git Data API)
+            commit_message = PRGeneratorService.generate_batch_commit_message(
+                modified_files, fixes[0].get("type") if fixes else "seo"
+            )
+            await asyncio.to_thread(
+                client.commit_files,
+                gh_repo,
+                branch_name,
+                updated_contents,
+                commit_message,
+                base_sha,
+            )
+
         if not modified_files:
             raise ValueError("No files were modified")
 
@@ -867,8 +885,13 @@ class GitHubService:
 
         # 9. Crear Pull Request
         logger.info(f"Creating PR: {pr_title}")
-        pr_data = client.create_pull_request(
-            gh_repo, pr_title, pr_body, branch_name, repo.default_branch
+        pr_data = await asyncio.to_thread(
+            client.create_pull_request,
+            gh_repo,
+            pr_title,
+            pr_body,
+            branch_name,
+            repo.default_branch,
         )
 
         # 10. Guardar PR en BD
@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List
 
 import httpx
 
@@ -23,15 +23,15 @@ class HubSpotClient:
             timeout=timeout_seconds,
         )
 
-    async def get_all_pages(self, limit: int = 100) -> List[Dict]:
+    async def iter_page_batches(self, limit: int = 100) -> AsyncIterator[List[Dict]]:
         """
-        Obtiene todas las páginas del portal de HubSpot (CMS Pages)
+        Recorre las páginas del portal (CMS Pages) y las entrega lote a lote,
+        tal como llegan de cada request paginada, sin acumularlas en memoria.
         """
-        pages = []
+        url = "/cms/v3/pages/site-pages"
         after = None
 
         while True:
-            url = "/cms/v3/pages/site-pages"
             params = {"limit": limit}
 
             if after:
@@ -50,15 +50,6 @@ class HubSpotClient:
 
                 response.raise_for_status()
                 data = response.json()
-
-                pages.extend(data.get("results", []))
-
-                paging = data.get("paging", {})
-                after = paging.get("next", {}).get("after")
-
-                if not after:
-                    break
-
             except httpx.HTTPStatusError as e:
                 print(f"Error fetching HubSpot pages: {e}")
                 raise
@@ -66,6 +57,23 @@ class HubSpotClient:
                 print(f"Unexpected error: {e}")
                 raise
 
+            results = data.get("results", [])
+            if results:
+                yield results
+
+            paging = data.get("paging", {})
+            after = paging.get("next", {}).get("after")
+
+            if not after:
+                break
+
+    async def get_all_pages(self, limit: int = 100) -> List[Dict]:
+        """
+        Obtiene todas las páginas del portal de HubSpot (CMS Pages)
+        """
+        pages = []
+        async for batch in self.iter_page_batches(limit=limit):
+            pages.extend(batch)
         return pages
 
     async def get_page(self, page_id: str) -> Dict:
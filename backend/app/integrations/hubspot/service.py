@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
 
 from sqlalchemy.orm import Session
@@ -127,45 +127,91 @@ class HubSpotService:
         access_token = HubSpotAuth.decrypt_token(connection.access_token)
         return HubSpotClient(access_token)
 
+    @staticmethod
+    def _parse_updated(value) -> Optional[datetime]:
+        """``updated`` de HubSpot (ISO 8601 o epoch en ms) como datetime UTC naive."""
+        if value in (None, ""):
+            return None
+        try:
+            if isinstance(value, (int, float)) or str(value).isdigit():
+                parsed = datetime.fromtimestamp(int(value) / 1000, tz=timezone.utc)
+            else:
+                parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except (TypeError, ValueError, OverflowError):
+            return None
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+
+    @staticmethod
+    def _apply_page_fields(page: HubSpotPage, hp: Dict) -> bool:
+        """Escribe solo los campos que cambiaron; devuelve si hubo cambios."""
+        values = {
+            "url": hp.get("url", ""),
+            "title": hp.get("name", ""),  # Internal name
+            "html_title": hp.get("htmlTitle", ""),
+            "meta_description": hp.get("metaDescription", ""),
+        }
+        changed = False
+        for attr, value in values.items():
+            if getattr(page, attr) != value:
+                setattr(page, attr, value)
+                changed = True
+        return changed
+
     async def sync_pages(self, connection_id: str) -> List[HubSpotPage]:
-        """Sincroniza las páginas de HubSpot con la base de datos local"""
+        """
+        Sincroniza las páginas de HubSpot con la base de datos local.
+
+        Procesa el listado lote a lote según llega de la API. Las filas
+        existentes se precargan en un dict por ``hubspot_id`` (una sola query);
+        una página cuyo ``updated`` no cambió no se reescribe, y las nuevas se
+        insertan en bloque por lote.
+        """
         client = await self.get_valid_client(connection_id)
 
-        # Fetch pages from HubSpot
-        hubspot_pages = await client.get_all_pages()
+        existing: Dict[str, HubSpotPage] = {
+            page.hubspot_id: page
+            for page in self.db.query(HubSpotPage)
+            .filter(HubSpotPage.connection_id == connection_id)
+            .all()
+        }
 
         synced_pages = []
-        for hp in hubspot_pages:
-            # Buscar si ya existe
-            page = (
-                self.db.query(HubSpotPage)
-                .filter(
-                    HubSpotPage.connection_id == connection_id,
-                    HubSpotPage.hubspot_id == hp["id"],
-                )
-                .first()
-            )
-
-            if not page:
-                page = HubSpotPage(connection_id=connection_id, hubspot_id=hp["id"])
-                self.db.add(page)
-
-            # Actualizar datos
-            page.url = hp.get("url", "")
-            page.title = hp.get("name", "")  # Internal name
-            page.html_title = hp.get("htmlTitle", "")
-            page.meta_description = hp.get("metaDescription", "")
-
-            # Handle timestamps safely
-            updated_ts = hp.get("updated")
-            if updated_ts:
-                # HubSpot returns timestamps in milliseconds usually, sometimes ISO strings
-                # Assuming ISO string or timestamp. If timestamp, convert.
-                # For simplicity, let's assume it might need parsing if it's a string
-                pass
-
-            page.last_synced_at = datetime.utcnow()
-            synced_pages.append(page)
+        try:
+            async for batch in client.iter_page_batches():
+                now = datetime.utcnow()
+                new_pages = []
+                for hp in batch:
+                    hubspot_id = str(hp["id"])
+                    updated_at = self._parse_updated(hp.get("updated"))
+                    page = existing.get(hubspot_id)
+
+                    if page is None:
+                        page = HubSpotPage(
+                            connection_id=connection_id, hubspot_id=hubspot_id
+                        )
+                        self._apply_page_fields(page, hp)
+                        page.hubspot_updated_at = updated_at
+                        page.last_synced_at = now
+                        existing[hubspot_id] = page
+                        new_pages.append(page)
+                    elif (
+                        updated_at is None
+                        or page.hubspot_updated_at is None
+                        or updated_at != page.hubspot_updated_at
+                    ):
+                        if self._apply_page_fields(page, hp):
+                            page.last_synced_at = now
+                        page.hubspot_updated_at = updated_at
+
+                    synced_pages.append(page)
+
+                if new_pages:
+                    self.db.add_all(new_pages)
+                self.db.flush()
+        finally:
+            await client.close()
 
         self.db.commit()
         return synced_pages
@@ -141,6 +141,22 @@ class OdooJSON2Client:
         result = await self.call(model, "search_read", payload)
         return result if isinstance(result, list) else []
 
+    async def search(
+        self,
+        model: str,
+        *,
+        domain: Optional[list] = None,
+        limit: Optional[int] = None,
+        order: Optional[str] = None,
+    ) -> list[int]:
+        payload: Dict[str, Any] = {"domain": domain or []}
+        if limit is not None:
+            payload["limit"] = int(limit)
+        if order:
+            payload["order"] = order
+        result = await self.call(model, "search", payload)
+        return result if isinstance(result, list) else []
+
     async def search_count(self, model: str, *, domain: Optional[list] = None) -> int:
         result = await self.call(model, "search_count", {"domain": domain or []})
         try:
@@ -16,7 +16,6 @@ from ...models.odoo import (
     OdooRecordSnapshot,
     OdooSyncRun,
 )
-from ...services.geo_article_engine_service import GeoArticleEngineService
 from ...services.odoo_delivery_service import OdooDeliveryService
 from .client import OdooAPIError
 from .service import OdooConnectionService
@@ -436,6 +435,8 @@ class OdooDraftService:
         sync_run: Optional[OdooSyncRun],
         plan: Dict[str, Any],
     ) -> None:
+        from ...services.geo_article_engine_service import GeoArticleEngineService
+
         article_deliverables = list(plan.get("article_deliverables") or [])
         if not article_deliverables:
             return
@@ -780,6 +781,7 @@ class OdooDraftService:
         Calls KIMI to adapt the article markdown to LinkedIn format.
         """
         from ...core.llm_kimi import get_llm_function, KimiGenerationError, KimiUnavailableError
+        from ...services.geo_article_engine_service import GeoArticleEngineService
 
         plan = await OdooDeliveryService.build_plan(self.db, audit)
         article_deliverables = list(plan.get("article_deliverables") or [])
@@ -1,17 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 from urllib.parse import urlparse
 
 from sqlalchemy.orm import Session
 
+from ...core.config import settings
 from ...models import Audit
-from ...models.odoo import OdooConnection, OdooRecordSnapshot, OdooSyncRun
+from ...models.odoo import (
+    OdooConnection,
+    OdooDraftAction,
+    OdooRecordSnapshot,
+    OdooSyncRun,
+)
 from .client import OdooAPIError
 from .service import OdooConnectionService
 
 
+@dataclass
+class _ModelFetch:
+    records: list[dict[str, Any]]
+    fields_meta: Dict[str, Any]
+    incremental: bool
+    truncated: bool
+    # ids vigentes en Odoo; None si no se pudo saber (lectura truncada)
+    live_ids: Optional[set[str]] = None
+
+
 class OdooSyncService:
     MODEL_CONFIG = {
         "website.page": {
@@ -106,40 +124,22 @@ class OdooSyncService:
                 return value
         return None
 
-    def _upsert_snapshot(
-        self,
+    @staticmethod
+    def _apply_record(
+        snapshot: OdooRecordSnapshot,
         *,
-        connection: OdooConnection,
-        audit: Audit,
         sync_run: OdooSyncRun,
-        model_name: str,
         record: Dict[str, Any],
         fields_meta: Dict[str, Any],
         config: Dict[str, Any],
         base_url: str,
+        synced_at: datetime,
     ) -> OdooRecordSnapshot:
         odoo_record_id = str(record.get("id"))
-        snapshot = (
-            self.db.query(OdooRecordSnapshot)
-            .filter(
-                OdooRecordSnapshot.connection_id == connection.id,
-                OdooRecordSnapshot.audit_id == audit.id,
-                OdooRecordSnapshot.odoo_model == model_name,
-                OdooRecordSnapshot.odoo_record_id == odoo_record_id,
-            )
-            .first()
+        path_value = OdooSyncService._pick_first(
+            record, config.get("path_fields") or ()
         )
-        if not snapshot:
-            snapshot = OdooRecordSnapshot(
-                connection_id=connection.id,
-                audit_id=audit.id,
-                odoo_model=model_name,
-                odoo_record_id=odoo_record_id,
-            )
-            self.db.add(snapshot)
-
-        path_value = self._pick_first(record, config.get("path_fields") or ())
-        record_path = self._normalize_path(path_value)
+        record_path = OdooSyncService._normalize_path(path_value)
         snapshot.sync_run_id = sync_run.id
         snapshot.record_path = record_path
         snapshot.record_url = (
@@ -148,10 +148,12 @@ class OdooSyncService:
             else f"{base_url.rstrip('/')}{record_path or ''}" if record_path else None
         )
         snapshot.record_name = str(
-            self._pick_first(record, config.get("name_fields") or ()) or odoo_record_id
+            OdooSyncService._pick_first(record, config.get("name_fields") or ())
+            or odoo_record_id
         )
         snapshot.is_published = bool(
-            self._pick_first(record, config.get("published_fields") or ()) or False
+            OdooSyncService._pick_first(record, config.get("published_fields") or ())
+            or False
         )
         snapshot.field_snapshot = record
         snapshot.write_capabilities = {
@@ -179,12 +181,228 @@ class OdooSyncService:
             ),
         }
         snapshot.external_updated_at = str(record.get("write_date") or "")
-        snapshot.last_synced_at = datetime.now(timezone.utc)
+        snapshot.last_synced_at = synced_at
         return snapshot
 
+    def _load_snapshots(
+        self, *, connection: OdooConnection, audit: Audit, model_names: Iterable[str]
+    ) -> Dict[Tuple[str, str], OdooRecordSnapshot]:
+        """Snapshots existentes de la auditoría en una sola query."""
+        model_names = list(model_names)
+        if not model_names:
+            return {}
+        rows = (
+            self.db.query(OdooRecordSnapshot)
+            .filter(
+                OdooRecordSnapshot.connection_id == connection.id,
+                OdooRecordSnapshot.audit_id == audit.id,
+                OdooRecordSnapshot.odoo_model.in_(model_names),
+            )
+            .all()
+        )
+        return {(row.odoo_model, str(row.odoo_record_id)): row for row in rows}
+
+    def _upsert_snapshots(
+        self,
+        *,
+        connection: OdooConnection,
+        audit: Audit,
+        sync_run: OdooSyncRun,
+        fetched: Dict[str, _ModelFetch],
+    ) -> Dict[Tuple[str, str], OdooRecordSnapshot]:
+        """
+        Upsert en bloque: prefetch de los snapshots existentes, actualización en
+        memoria y un único flush (los INSERT nuevos van en lote vía add_all).
+        """
+        existing = self._load_snapshots(
+            connection=connection, audit=audit, model_names=fetched.keys()
+        )
+        synced_at = datetime.now(timezone.utc)
+        created: list[OdooRecordSnapshot] = []
+        for model_name, result in fetched.items():
+            for record in result.records:
+                key = (model_name, str(record.get("id")))
+                snapshot = existing.get(key)
+                if snapshot is None:
+                    snapshot = OdooRecordSnapshot(
+                        connection_id=connection.id,
+                        audit_id=audit.id,
+                        odoo_model=model_name,
+                        odoo_record_id=key[1],
+                    )
+                    existing[key] = snapshot
+                    created.append(snapshot)
+                self._apply_record(
+                    snapshot,
+                    sync_run=sync_run,
+                    record=record,
+                    fields_meta=result.fields_meta,
+                    config=self.MODEL_CONFIG[model_name],
+                    base_url=connection.base_url,
+                    synced_at=synced_at,
+                )
+        if created:
+            self.db.add_all(created)
+        self.db.flush()
+        return existing
+
+    def _previous_watermarks(
+        self, *, connection: OdooConnection, audit: Audit
+    ) -> Dict[str, str]:
+        previous = (
+            self.db.query(OdooSyncRun)
+            .filter(
+                OdooSyncRun.audit_id == audit.id,
+                OdooSyncRun.connection_id == connection.id,
+                OdooSyncRun.status == "completed",
+            )
+            .order_by(OdooSyncRun.started_at.desc(), OdooSyncRun.id.desc())
+            .first()
+        )
+        summary = getattr(previous, "summary", None)
+        watermarks = summary.get("watermarks") if isinstance(summary, dict) else None
+        return dict(watermarks) if isinstance(watermarks, dict) else {}
+
+    @staticmethod
+    async def _fetch_model(
+        client: Any,
+        model_name: str,
+        config: Dict[str, Any],
+        *,
+        since: Optional[str],
+        page_size: int,
+        max_records: int,
+    ) -> _ModelFetch:
+        """
+        Lee todos los registros del modelo paginando por ``id`` (keyset), de
+        modo que los registros creados durante el sync no desplazan páginas.
+        Con ``since`` solo pide los modificados desde ese ``write_date``.
+        """
+        fields_meta = await client.fields_get(
+            model_name,
+            attributes=("type", "string", "readonly"),
+        )
+        query_fields = [field for field in config["fields"] if field in fields_meta]
+        incremental = bool(since) and "write_date" in fields_meta
+        base_domain: list = [["write_date", ">=", since]] if incremental else []
+
+        records: list[dict[str, Any]] = []
+        last_id = 0
+        truncated = False
+        while True:
+            limit = min(page_size, max_records - len(records))
+            if limit <= 0:
+                truncated = True
+                break
+            page = await client.search_read(
+                model_name,
+                domain=base_domain + ([["id", ">", last_id]] if last_id else []),
+                fields=query_fields,
+                limit=limit,
+                order="id asc",
+            )
+            records.extend(page)
+            if len(page) < limit:
+                break
+            next_id = page[-1].get("id")
+            if not isinstance(next_id, int) or next_id <= last_id:
+                break
+            last_id = next_id
+        if incremental:
+            # Los borrados en Odoo no aparecen por write_date: se reconcilian
+            # contra la lista de ids vigentes (solo ids, sin campos).
+            live_ids = await OdooSyncService._fetch_live_ids(
+                client, model_name, page_size=page_size, max_records=max_records
+            )
+        else:
+            live_ids = (
+                None if truncated else {str(record.get("id")) for record in records}
+            )
+        return _ModelFetch(
+            records=records,
+            fields_meta=fields_meta,
+            incremental=incremental,
+            truncated=truncated,
+            live_ids=live_ids,
+        )
+
+    @staticmethod
+    async def _fetch_live_ids(
+        client: Any, model_name: str, *, page_size: int, max_records: int
+    ) -> Optional[set[str]]:
+        """Todos los ids del modelo en Odoo (keyset por id); None si supera el tope."""
+        live_ids: set[str] = set()
+        last_id = 0
+        # Una página de ids pesa mucho menos que una de registros.
+        id_page_size = max(page_size, 1000)
+        while True:
+            page = await client.search(
+                model_name,
+                domain=[["id", ">", last_id]] if last_id else [],
+                limit=id_page_size,
+                order="id asc",
+            )
+            live_ids.update(str(record_id) for record_id in page)
+            if len(live_ids) > max_records:
+                return None
+            if len(page) < id_page_size:
+                return live_ids
+            next_id = page[-1]
+            if not isinstance(next_id, int) or next_id <= last_id:
+                return live_ids
+            last_id = next_id
+
+    def _drop_stale_snapshots(
+        self,
+        snapshots: Dict[Tuple[str, str], OdooRecordSnapshot],
+        fetched: Dict[str, _ModelFetch],
+    ) -> Dict[str, int]:
+        """
+        Eliminar los snapshots de registros que ya no existen en Odoo.
+
+        Los draft actions que apuntaban a ellos se conservan desvinculados.
+        Retorna la cantidad eliminada por modelo.
+        """
+        stale_keys = [
+            key
+            for key in snapshots
+            if fetched[key[0]].live_ids is not None
+            and key[1] not in fetched[key[0]].live_ids
+        ]
+        if not stale_keys:
+            return {}
+        stale = [snapshots.pop(key) for key in stale_keys]
+        stale_ids = [snapshot.id for snapshot in stale]
+        self.db.query(OdooDraftAction).filter(
+            OdooDraftAction.snapshot_id.in_(stale_ids)
+        ).update({OdooDraftAction.snapshot_id: None}, synchronize_session=False)
+        self.db.query(OdooRecordSnapshot).filter(
+            OdooRecordSnapshot.id.in_(stale_ids)
+        ).delete(synchronize_session=False)
+        for snapshot in stale:
+            self.db.expunge(snapshot)
+        removed: Dict[str, int] = {}
+        for model_name, _record_id in stale_keys:
+            removed[model_name] = removed.get(model_name, 0) + 1
+        return removed
+
     async def sync_audit(
-        self, *, audit: Audit, connection: OdooConnection
+        self, *, audit: Audit, connection: OdooConnection, full: bool = False
     ) -> Dict[str, Any]:
+        """
+        Sincroniza los modelos del sitio Odoo en snapshots de la auditoría.
+
+        Los modelos se leen en paralelo (``ODOO_SYNC_MAX_CONCURRENCY``) y
+        paginados. Si hay un sync completado previo, solo se piden los
+        registros con ``write_date`` >= la marca guardada en su resumen, más
+        la lista de ids vigentes para descartar los registros borrados;
+        ``full=True`` fuerza una lectura completa.
+        """
+        previous_watermarks = (
+            {}
+            if full
+            else self._previous_watermarks(connection=connection, audit=audit)
+        )
         sync_run = OdooSyncRun(
             connection_id=connection.id,
             audit_id=audit.id,
@@ -198,48 +416,84 @@ class OdooSyncService:
         self.db.refresh(sync_run)
 
         counts_by_model: Dict[str, int] = {}
+        fetched_by_model: Dict[str, int] = {}
+        watermarks: Dict[str, str] = {}
         mapped_paths: set[str] = set()
         warnings: list[str] = []
 
         try:
+            capabilities = connection.capabilities or {}
+            model_capabilities = (
+                capabilities.get("models") if isinstance(capabilities, dict) else {}
+            ) or {}
+            model_names = [
+                model_name
+                for model_name in self.MODEL_CONFIG
+                if (model_capabilities.get(model_name) or {}).get("available")
+            ]
+            page_size = max(1, int(settings.ODOO_SYNC_PAGE_SIZE))
+            max_records = max(1, int(settings.ODOO_SYNC_MAX_RECORDS_PER_MODEL))
+            semaphore = asyncio.Semaphore(
+                max(1, int(settings.ODOO_SYNC_MAX_CONCURRENCY))
+            )
+
             async with await self.connection_service.build_client(connection) as client:
-                capabilities = connection.capabilities or {}
-                model_capabilities = (
-                    capabilities.get("models") if isinstance(capabilities, dict) else {}
-                ) or {}
 
-                for model_name, config in self.MODEL_CONFIG.items():
-                    model_state = model_capabilities.get(model_name) or {}
-                    if not model_state.get("available"):
-                        continue
+                async def _bounded_fetch(model_name: str) -> _ModelFetch:
+                    async with semaphore:
+                        return await self._fetch_model(
+                            client,
+                            model_name,
+                            self.MODEL_CONFIG[model_name],
+                            since=previous_watermarks.get(model_name),
+                            page_size=page_size,
+                            max_records=max_records,
+                        )
 
-                    fields_meta = await client.fields_get(
-                        model_name,
-                        attributes=("type", "string", "readonly"),
-                    )
-                    query_fields = [
-                        field for field in config["fields"] if field in fields_meta
-                    ]
-                    records = await client.search_read(
-                        model_name,
-                        fields=query_fields,
-                        limit=250,
-                        order="id desc",
+                results = await asyncio.gather(
+                    *(_bounded_fetch(model_name) for model_name in model_names),
+                    return_exceptions=True,
+                )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            fetched = dict(zip(model_names, results))
+
+            snapshots = self._upsert_snapshots(
+                connection=connection,
+                audit=audit,
+                sync_run=sync_run,
+                fetched=fetched,
+            )
+            removed_by_model = self._drop_stale_snapshots(snapshots, fetched)
+
+            for model_name, result in fetched.items():
+                fetched_by_model[model_name] = len(result.records)
+                if result.truncated:
+                    warnings.append(
+                        f"{model_name}: sync truncated at {max_records} records"
                     )
-                    counts_by_model[model_name] = len(records)
-                    for record in records:
-                        snapshot = self._upsert_snapshot(
-                            connection=connection,
-                            audit=audit,
-                            sync_run=sync_run,
-                            model_name=model_name,
-                            record=record,
-                            fields_meta=fields_meta,
-                            config=config,
-                            base_url=connection.base_url,
-                        )
-                        if snapshot.record_path:
-                            mapped_paths.add(snapshot.record_path)
+                # En un sync incremental los snapshots no modificados siguen
+                # vigentes; en uno completo solo cuentan los leídos ahora.
+                model_snapshots = [
+                    snapshot
+                    for (snapshot_model, _), snapshot in snapshots.items()
+                    if snapshot_model == model_name
+                    and (result.incremental or snapshot.sync_run_id == sync_run.id)
+                ]
+                counts_by_model[model_name] = len(model_snapshots)
+                mapped_paths.update(
+                    snapshot.record_path
+                    for snapshot in model_snapshots
+                    if snapshot.record_path
+                )
+                write_dates = [
+                    str(snapshot.external_updated_at)
+                    for snapshot in model_snapshots
+                    if snapshot.external_updated_at
+                ]
+                if write_dates and not result.truncated:
+                    watermarks[model_name] = max(write_dates)
 
             audit_paths: set[str] = set()
             for page in list(audit.pages or []):
@@ -253,7 +507,15 @@ class OdooSyncService:
 
             summary = {
                 "status": "completed",
+                "sync_mode": (
+                    "incremental"
+                    if any(result.incremental for result in fetched.values())
+                    else "full"
+                ),
                 "counts_by_model": counts_by_model,
+                "fetched_by_model": fetched_by_model,
+                "removed_by_model": removed_by_model,
+                "watermarks": watermarks,
                 "mapped_audit_paths": mapped_audit_paths,
                 "mapped_count": len(mapped_audit_paths),
                 "unmapped_paths": unmapped_paths,
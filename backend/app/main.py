@@ -42,6 +42,7 @@ if settings.SENTRY_DSN:
 
 # Import routes - the __init__.py handles missing dependencies gracefully
 from .api.routes import (  # noqa: E402
+    admin,
     ai_content,
     analytics,
     audits,
@@ -54,6 +55,7 @@ from .api.routes import (  # noqa: E402
     hubspot,
     keywords,
     llm_visibility,
+    metrics,
     odoo,
     pagespeed,
     rank_tracking,
@@ -104,6 +106,10 @@ async def lifespan(app: FastAPI):
     logger.info(f"🛑 Apagando {settings.APP_NAME}...")
     logger.info("=" * 40)
 
+    from .services.pdf_render_pool import shutdown_render_pool
+
+    shutdown_render_pool(wait=False)
+
 
 def create_app() -> FastAPI:
     """Factory para crear la aplicación FastAPI - Level 3"""
@@ -194,6 +200,7 @@ def create_app() -> FastAPI:
         odoo,
         webhooks,
         sse,
+        admin,
     ]
     if score_history:
         api_route_modules.append(score_history)
@@ -206,6 +213,7 @@ def create_app() -> FastAPI:
 
     # Global non-versioned routes
     app.include_router(health.router)
+    app.include_router(metrics.router)
     if realtime:
         app.include_router(realtime.router)
 
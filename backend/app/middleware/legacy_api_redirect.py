@@ -1,11 +1,11 @@
 """Legacy API redirect middleware for local/debug compatibility only."""
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import RedirectResponse, Response
+from starlette.datastructures import URL
+from starlette.responses import RedirectResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 
-class LegacyApiRedirectMiddleware(BaseHTTPMiddleware):
+class LegacyApiRedirectMiddleware:
     """
     Redirects legacy /api/* paths to /api/v1/* with HTTP 307.
 
@@ -14,14 +14,24 @@ class LegacyApiRedirectMiddleware(BaseHTTPMiddleware):
     - Excludes /api/v1/* and /api/sse/*.
     """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        path = request.url.path
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        url = URL(scope=scope)
+        path = url.path
 
         if path.startswith("/api/v1/") or path == "/api/v1":
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         if path.startswith("/api/sse/") or path == "/api/sse":
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         if path.startswith("/api/"):
             suffix = path[len("/api/") :]
@@ -29,10 +39,12 @@ class LegacyApiRedirectMiddleware(BaseHTTPMiddleware):
         elif path == "/api":
             target_path = "/api/v1"
         else:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         redirect_url = target_path
-        if request.url.query:
-            redirect_url = f"{target_path}?{request.url.query}"
+        if url.query:
+            redirect_url = f"{target_path}?{url.query}"
 
-        return RedirectResponse(url=redirect_url, status_code=307)
+        response = RedirectResponse(url=redirect_url, status_code=307)
+        await response(scope, receive, send)
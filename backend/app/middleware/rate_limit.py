@@ -14,22 +14,23 @@ from app.core.rate_limit_policy import (
 )
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from ..core.asgi import send_with_headers
 from ..core.config import settings
 from ..core.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
     Production-ready Rate Limiter using Redis.
     Falls back to in-memory if Redis is unavailable.
     """
 
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
         self.use_redis = False
         self.redis_client = None
         self.memory_requests: Dict[str, list] = defaultdict(list)
@@ -124,10 +125,17 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self.memory_requests[key].append(now)
         return True, current_count + 1, window
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+
         # Skip rate limit for health, docs, and metrics
         if is_rate_limit_exempt(request.url.path):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         policy = resolve_rate_limit_policy(request, settings)
         request_path = request.url.path
@@ -167,7 +175,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         if not allowed:
             logger.warning(f"Rate limit exceeded: {identity} on {request_path}")
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={
                     "error": "Rate limit exceeded",
@@ -183,16 +191,15 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     "X-RateLimit-Bucket": policy.bucket,
                 },
             )
+            await response(scope, receive, send)
+            return
 
-        response = await call_next(request)
-
-        # Add rate limit headers
-        response.headers["X-RateLimit-Limit"] = str(max_requests)
-        response.headers["X-RateLimit-Remaining"] = str(max(0, max_requests - count))
-        response.headers["X-RateLimit-Reset"] = str(
-            int(time.time() + max(0, reset_after))
-        )
-        response.headers["X-RateLimit-Mode"] = rate_limit_mode
-        response.headers["X-RateLimit-Bucket"] = policy.bucket
+        def add_rate_limit_headers(headers, _message) -> None:
+            # Add rate limit headers
+            headers["X-RateLimit-Limit"] = str(max_requests)
+            headers["X-RateLimit-Remaining"] = str(max(0, max_requests - count))
+            headers["X-RateLimit-Reset"] = str(int(time.time() + max(0, reset_after)))
+            headers["X-RateLimit-Mode"] = rate_limit_mode
+            headers["X-RateLimit-Bucket"] = policy.bucket
 
-        return response
+        await self.app(scope, receive, send_with_headers(send, add_rate_limit_headers))
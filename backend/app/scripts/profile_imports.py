@@ -0,0 +1,107 @@
+"""
+Perfil de tiempo de import (arranque en frío) de la API y los workers.
+
+Ejecuta ``python -X importtime -c "import <módulo>"`` en un proceso limpio por
+cada entrypoint y lista los módulos más lentos, por tiempo acumulado (incluye
+sus dependencias) y por tiempo propio.
+
+Uso:
+    python -m app.scripts.profile_imports
+    python -m app.scripts.profile_imports app.main --top 15 --sort self
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List
+
+DEFAULT_ENTRYPOINTS = ("app.main", "app.workers.tasks")
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """Parsea la salida de ``-X importtime`` (stderr)."""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # cabecera "self [us] | cumulative | imported package"
+        name = parts[2].rstrip()
+        stripped = name.lstrip(" ")
+        timings.append(
+            ImportTiming(
+                module=stripped,
+                self_us=int(parts[0]),
+                cumulative_us=int(parts[1]),
+                depth=(len(name) - len(stripped) - 1) // 2,
+            )
+        )
+    return timings
+
+
+def profile_entrypoint(module: str) -> List[ImportTiming]:
+    """Importa ``module`` en un intérprete nuevo y devuelve sus tiempos."""
+    env = dict(os.environ)
+    env.setdefault("ENVIRONMENT", "testing")
+    env.setdefault("CELERY_BROKER_URL", "memory://")
+    env.setdefault("CELERY_RESULT_BACKEND", "cache+memory://")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"import {module} failed: {(proc.stderr.strip().splitlines() or [''])[-1]}"
+        )
+    return parse_importtime(proc.stderr)
+
+
+def format_report(module: str, timings: List[ImportTiming], top: int, sort: str) -> str:
+    total = next((t for t in timings if t.module == module and t.depth == 0), None)
+    key = (lambda t: t.self_us) if sort == "self" else (lambda t: t.cumulative_us)
+    rows = sorted(timings, key=key, reverse=True)[:top]
+    lines = [
+        f"== {module}: "
+        f"{(total.cumulative_us / 1000) if total else 0:.1f} ms total, "
+        f"{len(timings)} modules (top {top} by {sort})",
+        f"{'cumulative ms':>14} {'self ms':>9}  module",
+    ]
+    for timing in rows:
+        lines.append(
+            f"{timing.cumulative_us / 1000:>14.1f} {timing.self_us / 1000:>9.1f}  "
+            f"{timing.module}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time profile")
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_ENTRYPOINTS))
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--sort", choices=("cumulative", "self"), default="cumulative")
+    args = parser.parse_args(argv)
+
+    for module in args.modules:
+        print(format_report(module, profile_entrypoint(module), args.top, args.sort))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,371 @@
+"""
+Bundle de artefactos de auditoría comprimido y direccionado por contenido.
+
+Reemplaza el árbol de JSONs con ``indent=2`` (aggregated_summary, fix_plan,
+competidores, final_llm_context, ...) por un único archivo:
+
+    HEADER | blob_0 | blob_1 | ... | manifest | TRAILER
+
+- Cada blob es un sub-documento JSON compacto, comprimido de forma independiente
+  (zstd, con zlib como fallback) para permitir lectura aleatoria.
+- Los blobs se identifican por el sha256 de su contenido, de modo que los
+  sub-documentos repetidos (p.ej. ``target_audit`` dentro de
+  ``final_llm_context.json``) se guardan una sola vez.
+- El manifest describe cada entrada lógica (``"fix_plan.json"``,
+  ``"competitors/competitor_x.json"``) como un árbol de referencias a blobs.
+"""
+
+from __future__ import annotations
+
+import copy
+import fnmatch
+import hashlib
+import json
+import os
+import struct
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:  # pragma: no cover - depende del entorno
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+ARTIFACT_BUNDLE_FILENAME = "audit_artifacts.bundle"
+ARTIFACT_BUNDLE_VERSION = 1
+
+_HEADER_MAGIC = b"LGEOABv1"
+_TRAILER_MAGIC = b"LGAB"
+# manifest_offset, manifest_length, codec, magic
+_TRAILER_STRUCT = struct.Struct("<QQ4s4s")
+_CODEC_ZSTD = b"zstd"
+_CODEC_ZLIB = b"zlib"
+
+# Contenedores por debajo de este tamaño serializado se guardan como un único blob.
+DEFAULT_MIN_SPLIT_BYTES = 4096
+# Valores muy pequeños se guardan inline en el manifest en lugar de como blob.
+DEFAULT_INLINE_BYTES = 128
+# Listas/dicts con más hijos que esto no se dividen (evita miles de blobs diminutos).
+DEFAULT_MAX_FANOUT = 256
+
+
+class ArtifactBundleError(Exception):
+    """Bundle ilegible, truncado o con un codec no soportado."""
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _compressor(codec: bytes, level: int):
+    if codec == _CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=level).compress
+    return lambda data: zlib.compress(data, min(max(level, 1), 9))
+
+
+def _decompressor(codec: bytes):
+    if codec == _CODEC_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise ArtifactBundleError(
+                "Bundle comprimido con zstd pero 'zstandard' no está instalado."
+            )
+        return zstandard.ZstdDecompressor().decompress
+    if codec == _CODEC_ZLIB:
+        return zlib.decompress
+    raise ArtifactBundleError(f"Codec de bundle no soportado: {codec!r}")
+
+
+class ArtifactBundleWriter:
+    """Acumula documentos JSON y los escribe como un bundle deduplicado."""
+
+    def __init__(
+        self,
+        *,
+        level: int = 10,
+        min_split_bytes: int = DEFAULT_MIN_SPLIT_BYTES,
+        inline_bytes: int = DEFAULT_INLINE_BYTES,
+        max_fanout: int = DEFAULT_MAX_FANOUT,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.codec = _CODEC_ZSTD if ZSTD_AVAILABLE else _CODEC_ZLIB
+        self._compress = _compressor(self.codec, level)
+        self.min_split_bytes = min_split_bytes
+        self.inline_bytes = inline_bytes
+        self.max_fanout = max_fanout
+        self.metadata = dict(metadata or {})
+        self._entries: Dict[str, Any] = {}
+        self._blobs: Dict[str, bytes] = {}
+        self._blob_sizes: Dict[str, int] = {}
+        self._logical_bytes = 0
+        self._dedup_hits = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def add(self, name: str, value: Any) -> None:
+        """Agregar un documento JSON (dict, list, str, ...) bajo un nombre lógico."""
+        name = str(name).replace("\\", "/").lstrip("/")
+        if not name:
+            raise ValueError("Artifact name is required")
+        sizes: Dict[int, int] = {}
+        payloads: Dict[int, str] = {}
+        self._logical_bytes += self._measure(value, sizes, payloads)
+        self._entries[name] = self._encode(value, sizes, payloads)
+
+    def copy_entries_from(
+        self, reader: "ArtifactBundleReader", exclude: Iterable[str] = ()
+    ) -> None:
+        """Copiar entradas de un bundle existente sin recomprimir sus blobs."""
+        excluded = set(exclude)
+        same_codec = reader.codec.encode("ascii") == self.codec
+        for name in reader.names():
+            if name in excluded:
+                continue
+            if not same_codec:
+                self.add(name, reader.get(name))
+                continue
+            node = reader._entries[name]
+            for digest in _node_digests(node):
+                if digest in self._blobs:
+                    self._dedup_hits += 1
+                    continue
+                blob, raw_size = reader._read_compressed(digest)
+                self._blobs[digest] = blob
+                self._blob_sizes[digest] = raw_size
+                self._logical_bytes += raw_size
+            self._entries[name] = node
+
+    def _splittable(self, value: Any) -> bool:
+        return isinstance(value, (dict, list)) and 0 < len(value) <= self.max_fanout
+
+    def _measure(
+        self, value: Any, sizes: Dict[int, int], payloads: Dict[int, str]
+    ) -> int:
+        """Tamaño serializado aproximado (memo por id()); guarda el JSON de las hojas."""
+        if self._splittable(value):
+            if isinstance(value, dict):
+                size = sum(
+                    len(_dumps(str(key))) + 1 + self._measure(child, sizes, payloads)
+                    for key, child in value.items()
+                )
+            else:
+                size = sum(self._measure(child, sizes, payloads) for child in value)
+            size += len(value) + 1
+        else:
+            payload = _dumps(value)
+            payloads[id(value)] = payload
+            size = len(payload)
+        sizes[id(value)] = size
+        return size
+
+    def _encode(
+        self, value: Any, sizes: Dict[int, int], payloads: Dict[int, str]
+    ) -> Any:
+        # La decisión depende solo del contenido, así un mismo sub-documento
+        # produce los mismos blobs sin importar dónde aparezca.
+        payload = payloads.get(id(value))
+        if payload is None:
+            if sizes[id(value)] >= self.min_split_bytes:
+                if isinstance(value, dict):
+                    return {
+                        "d": [
+                            [str(key), self._encode(child, sizes, payloads)]
+                            for key, child in value.items()
+                        ]
+                    }
+                return {"l": [self._encode(child, sizes, payloads) for child in value]}
+            payload = _dumps(value)
+        if len(payload) <= self.inline_bytes:
+            return {"v": value}
+        return self._store(payload)
+
+    def _store(self, payload: str) -> str:
+        raw = payload.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest in self._blobs:
+            self._dedup_hits += 1
+        else:
+            self._blobs[digest] = self._compress(raw)
+            self._blob_sizes[digest] = len(raw)
+        return digest
+
+    def write(self, path: str | os.PathLike) -> Dict[str, Any]:
+        """Escribir el bundle de forma atómica. Retorna estadísticas de escritura."""
+        target = os.fspath(path)
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        tmp_path = f"{target}.tmp"
+        blob_index: Dict[str, List[int]] = {}
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER_MAGIC)
+            offset = len(_HEADER_MAGIC)
+            for digest, blob in self._blobs.items():
+                f.write(blob)
+                blob_index[digest] = [offset, len(blob), self._blob_sizes[digest]]
+                offset += len(blob)
+            manifest = {
+                "version": ARTIFACT_BUNDLE_VERSION,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "metadata": self.metadata,
+                "blobs": blob_index,
+                "entries": self._entries,
+            }
+            manifest_blob = self._compress(_dumps(manifest).encode("utf-8"))
+            f.write(manifest_blob)
+            f.write(
+                _TRAILER_STRUCT.pack(
+                    offset, len(manifest_blob), self.codec, _TRAILER_MAGIC
+                )
+            )
+            stored_bytes = offset + len(manifest_blob) + _TRAILER_STRUCT.size
+        os.replace(tmp_path, target)
+        return {
+            "entries": len(self._entries),
+            "blobs": len(self._blobs),
+            "dedup_hits": self._dedup_hits,
+            "logical_bytes": self._logical_bytes,
+            "stored_bytes": stored_bytes,
+            "codec": self.codec.decode("ascii"),
+        }
+
+
+class ArtifactBundleReader:
+    """Lector con acceso aleatorio: solo descomprime los blobs de la entrada pedida."""
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            if f.read(len(_HEADER_MAGIC)) != _HEADER_MAGIC:
+                raise ArtifactBundleError(f"Not an artifact bundle: {self.path}")
+            f.seek(0, os.SEEK_END)
+            file_size = f.tell()
+            if file_size < len(_HEADER_MAGIC) + _TRAILER_STRUCT.size:
+                raise ArtifactBundleError(f"Truncated artifact bundle: {self.path}")
+            f.seek(file_size - _TRAILER_STRUCT.size)
+            offset, length, codec, magic = _TRAILER_STRUCT.unpack(
+                f.read(_TRAILER_STRUCT.size)
+            )
+            if magic != _TRAILER_MAGIC:
+                raise ArtifactBundleError(f"Truncated artifact bundle: {self.path}")
+            self._decompress = _decompressor(codec)
+            f.seek(offset)
+            try:
+                manifest = json.loads(self._decompress(f.read(length)))
+            except Exception as exc:
+                raise ArtifactBundleError(
+                    f"Corrupt artifact bundle manifest: {self.path}"
+                ) from exc
+        self.codec = codec.decode("ascii")
+        self.manifest: Dict[str, Any] = manifest
+        self._entries: Dict[str, Any] = manifest.get("entries") or {}
+        self._blobs: Dict[str, List[int]] = manifest.get("blobs") or {}
+        self._blob_cache: Dict[str, bytes] = {}
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.manifest.get("metadata") or {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def names(self, pattern: Optional[str] = None) -> List[str]:
+        """Nombres de entradas, opcionalmente filtrados con un glob (``pages/page_*.json``)."""
+        names = sorted(self._entries)
+        if pattern is None:
+            return names
+        return [name for name in names if fnmatch.fnmatchcase(name, pattern)]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        node = self._entries.get(name)
+        if node is None:
+            return default
+        return self._decode(node)
+
+    def _read_compressed(self, digest: str) -> Tuple[bytes, int]:
+        location = self._blobs.get(digest)
+        if not location:
+            raise ArtifactBundleError(f"Missing blob {digest} in {self.path}")
+        offset, length, raw_size = location
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return f.read(length), raw_size
+
+    def _read_blob(self, digest: str) -> bytes:
+        raw = self._blob_cache.get(digest)
+        if raw is not None:
+            return raw
+        location = self._blobs.get(digest)
+        if not location:
+            raise ArtifactBundleError(f"Missing blob {digest} in {self.path}")
+        offset, length, _raw_size = location
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            raw = self._decompress(f.read(length))
+        if hashlib.sha256(raw).hexdigest() != digest:
+            raise ArtifactBundleError(f"Blob hash mismatch {digest} in {self.path}")
+        self._blob_cache[digest] = raw
+        return raw
+
+    def _decode(self, node: Any) -> Any:
+        if isinstance(node, str):
+            return json.loads(self._read_blob(node))
+        if "v" in node:
+            return copy.deepcopy(node["v"])
+        if "d" in node:
+            return {key: self._decode(child) for key, child in node["d"]}
+        return [self._decode(child) for child in node["l"]]
+
+
+def _node_digests(node: Any) -> Iterable[str]:
+    if isinstance(node, str):
+        yield node
+    elif "d" in node:
+        for _key, child in node["d"]:
+            yield from _node_digests(child)
+    elif "l" in node:
+        for child in node["l"]:
+            yield from _node_digests(child)
+
+
+def bundle_path_for(report_dir: str | os.PathLike) -> str:
+    return os.path.join(os.fspath(report_dir), ARTIFACT_BUNDLE_FILENAME)
+
+
+def open_artifact_bundle(
+    report_dir: str | os.PathLike,
+) -> Optional[ArtifactBundleReader]:
+    """Abrir el bundle de una carpeta de reporte si existe; None si no hay o está dañado."""
+    path = bundle_path_for(report_dir)
+    if not os.path.isfile(path):
+        return None
+    try:
+        return ArtifactBundleReader(path)
+    except (OSError, ArtifactBundleError) as exc:
+        logger.warning(f"Could not open artifact bundle {path}: {exc}")
+        return None
+
+
+def update_artifact_bundle(
+    report_dir: str | os.PathLike, documents: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Reemplazar o agregar documentos en el bundle existente de una carpeta.
+
+    Las demás entradas se copian con sus blobs ya comprimidos. Retorna las
+    estadísticas de escritura, o None si la carpeta todavía no tiene bundle.
+    """
+    reader = open_artifact_bundle(report_dir)
+    if reader is None:
+        return None
+    writer = ArtifactBundleWriter(metadata=reader.metadata)
+    writer.copy_entries_from(reader, exclude=documents)
+    for name, document in documents.items():
+        writer.add(name, document)
+    return writer.write(bundle_path_for(report_dir))
@@ -0,0 +1,124 @@
+"""
+Fan-out distribuido de auditorías por página.
+
+Para sitios grandes (miles de páginas) ``run_audit_task`` reparte las URLs en
+shards que auditan workers distintos (chord de Celery). Cada shard persiste sus
+páginas y devuelve solo registros compactos de ``SummaryAggregator``; el
+callback los agrega vía ``run_initial_audit``.
+Aquí viven el particionado y el seguimiento de progreso por shard (Redis).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.services.cache_service import cache
+
+logger = get_logger(__name__)
+
+SHARD_PROGRESS_TTL_SECONDS = 24 * 3600
+# Progreso global de la auditoría mientras corren los shards (el resto del
+# pipeline arranca en 30, igual que el camino sin fan-out).
+FANOUT_PROGRESS_START = 10.0
+FANOUT_PROGRESS_END = 30.0
+
+
+class AuditFanoutService:
+    """Particionado de URLs y progreso por shard del fan-out de auditorías."""
+
+    @staticmethod
+    def should_fan_out(page_count: int) -> bool:
+        return bool(settings.AUDIT_FANOUT_ENABLED) and page_count >= max(
+            1, int(settings.AUDIT_FANOUT_MIN_PAGES)
+        )
+
+    @staticmethod
+    def shard_urls(
+        urls: List[str], shard_size: Optional[int] = None
+    ) -> List[List[str]]:
+        size = max(1, int(shard_size or settings.AUDIT_FANOUT_SHARD_SIZE or 1))
+        return [list(urls[i : i + size]) for i in range(0, len(urls), size)]
+
+    @staticmethod
+    def _meta_key(audit_id: int) -> str:
+        return f"audit:shards:{audit_id}"
+
+    @staticmethod
+    def _shard_key(audit_id: int, shard_index: int) -> str:
+        return f"audit:shards:{audit_id}:{shard_index}"
+
+    @staticmethod
+    def start(audit_id: int, shard_sizes: List[int]) -> None:
+        """Registra los shards de una auditoría como pendientes."""
+        cache.set(
+            AuditFanoutService._meta_key(audit_id),
+            {"shards": len(shard_sizes), "pages": sum(shard_sizes)},
+            ttl=SHARD_PROGRESS_TTL_SECONDS,
+        )
+        for index, size in enumerate(shard_sizes):
+            AuditFanoutService.record_shard_progress(
+                audit_id, index, done=0, total=size, status="pending"
+            )
+
+    @staticmethod
+    def record_shard_progress(
+        audit_id: int,
+        shard_index: int,
+        *,
+        done: int,
+        total: int,
+        status: str = "running",
+        failed: int = 0,
+    ) -> None:
+        # Una clave por shard: los workers nunca escriben el mismo valor.
+        cache.set(
+            AuditFanoutService._shard_key(audit_id, shard_index),
+            {
+                "shard": shard_index,
+                "status": status,
+                "done": int(done),
+                "total": int(total),
+                "failed": int(failed),
+            },
+            ttl=SHARD_PROGRESS_TTL_SECONDS,
+        )
+
+    @staticmethod
+    def get_shard_progress(audit_id: int) -> Dict[str, Any]:
+        """Estado de cada shard y totales; vacío si la auditoría no usó fan-out."""
+        meta = cache.get(AuditFanoutService._meta_key(audit_id))
+        if not isinstance(meta, dict):
+            return {}
+        shards: List[Dict[str, Any]] = []
+        for index in range(int(meta.get("shards") or 0)):
+            entry = cache.get(AuditFanoutService._shard_key(audit_id, index))
+            shards.append(
+                entry
+                if isinstance(entry, dict)
+                else {"shard": index, "status": "unknown", "done": 0, "total": 0}
+            )
+        return {
+            "shards_total": len(shards),
+            "shards_completed": sum(
+                1 for s in shards if s.get("status") == "completed"
+            ),
+            "pages_total": int(meta.get("pages") or 0),
+            "pages_done": sum(int(s.get("done") or 0) for s in shards),
+            "shards": shards,
+        }
+
+    @staticmethod
+    def overall_progress(audit_id: int) -> Optional[float]:
+        """Progreso global (10-30) según las páginas auditadas en todos los shards."""
+        progress = AuditFanoutService.get_shard_progress(audit_id)
+        pages_total = progress.get("pages_total") or 0
+        if not pages_total:
+            return None
+        ratio = min(1.0, progress["pages_done"] / pages_total)
+        return round(
+            FANOUT_PROGRESS_START
+            + (FANOUT_PROGRESS_END - FANOUT_PROGRESS_START) * ratio,
+            1,
+        )
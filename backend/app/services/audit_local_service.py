@@ -26,6 +26,7 @@ import aiohttp
 from bs4 import BeautifulSoup
 
 from ..core.config import settings
+from ..core.metrics import HTML_PARSE_SECONDS
 
 logger = logging.getLogger(__name__)
 
@@ -634,7 +635,8 @@ class AuditLocalService:
             if status is None:
                 status = 500
 
-            soup = BeautifulSoup(html or "", "html.parser")
+            with HTML_PARSE_SECONDS.time(source="audit_local"):
+                soup = BeautifulSoup(html or "", "html.parser")
 
             # Ejecutar análisis
             structure = AuditLocalService.analyze_structure(soup)
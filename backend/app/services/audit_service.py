@@ -11,7 +11,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
 
-from sqlalchemy import desc, or_
+from sqlalchemy import desc, insert, or_
 from sqlalchemy.orm import Session, load_only
 
 from ..core.config import settings
@@ -29,10 +29,29 @@ from ..models import (
 from ..schemas import AuditCreate
 
 # Importar servicios adicionales
-from .pipeline_service import PipelineService
+from .artifact_bundle import (
+    ARTIFACT_BUNDLE_FILENAME,
+    ArtifactBundleWriter,
+    update_artifact_bundle,
+)
 
 logger = get_logger(__name__)
 
+# Clave legacy con snapshots de cada pagina embebidos en Audit.target_audit.
+PAGE_AUDITS_LEGACY_KEY = "_individual_page_audits"
+
+# JSONs que se escribian sueltos por auditoria antes del bundle de artefactos.
+_LEGACY_AUDIT_ARTIFACT_FILES = (
+    "aggregated_summary.json",
+    "fix_plan.json",
+    "pagespeed.json",
+    "keywords.json",
+    "backlinks.json",
+    "rankings.json",
+    "llm_visibility.json",
+    "final_llm_context.json",
+)
+
 _PUBLIC_ARTIFACT_PAYLOAD_KEYS = frozenset(
     {
         "audit_id",
@@ -100,6 +119,14 @@ _PUBLIC_OVERVIEW_PAYLOAD_KEYS = frozenset(
 
 class AuditService:
     MAX_RUNTIME_DIAGNOSTICS = 12
+    # Pesos del score general de cada pagina auditada
+    PAGE_SCORE_WEIGHTS = {
+        "h1": 0.15,
+        "structure": 0.20,
+        "content": 0.20,
+        "eeat": 0.25,
+        "schema": 0.20,
+    }
 
     @staticmethod
     def _local_artifacts_enabled() -> bool:
@@ -1277,6 +1304,8 @@ class AuditService:
         llm_visibility: List[Dict[str, Any]] = None,
     ):
         """Guardar resultados de auditorÃ­a completa (Async version)"""
+        from .pipeline_service import PipelineService
+
         audit = db.query(Audit).filter(Audit.id == audit_id).first()
         if not audit:
             return None
@@ -1316,6 +1345,8 @@ class AuditService:
         normalized_target_audit = (
             dict(safe_target_audit) if isinstance(safe_target_audit, dict) else {}
         )
+        # Los datos por pagina viven solo en AuditedPage.
+        normalized_target_audit.pop(PAGE_AUDITS_LEGACY_KEY, None)
         target_geo = CompetitorService._calculate_geo_score_with_provenance(
             normalized_target_audit
         )
@@ -1451,6 +1482,8 @@ class AuditService:
                         geo_score=comp_data.get("geo_score", 0),
                         audit_data=comp_data,
                         commit=False,
+                        # _save_audit_files los escribe en el bundle.
+                        write_artifact=False,
                     )
                 except Exception as e:
                     logger.error(
@@ -1527,57 +1560,26 @@ class AuditService:
         safe_rankings: List[Dict[str, Any]],
         safe_llm_visibility: List[Dict[str, Any]],
     ):
-        """Sincrona: Escribir archivos JSON al disco"""
+        """Sincrona: Escribir el bundle de artefactos de la auditoria al disco"""
         try:
-            # Crear directorio de reportes
             reports_dir = AuditService._reports_dir_for_audit(audit_id)
-            pages_dir = reports_dir / "pages"
-            competitors_dir = reports_dir / "competitors"
             reports_dir.mkdir(parents=True, exist_ok=True)
-            pages_dir.mkdir(parents=True, exist_ok=True)
-            competitors_dir.mkdir(parents=True, exist_ok=True)
-
-            # Guardar resumen agregado
-            aggregated_path = reports_dir / "aggregated_summary.json"
-            with open(aggregated_path, "w", encoding="utf-8") as f:
-                json.dump(safe_target_audit, f, ensure_ascii=False, indent=2)
-
-            # Guardar fix_plan
-            fix_plan_path = reports_dir / "fix_plan.json"
-            with open(fix_plan_path, "w", encoding="utf-8") as f:
-                json.dump(safe_fix_plan, f, ensure_ascii=False, indent=2)
-
-            # Guardar PageSpeed
-            if safe_pagespeed_data:
-                pagespeed_path = reports_dir / "pagespeed.json"
-                with open(pagespeed_path, "w", encoding="utf-8") as f:
-                    json.dump(safe_pagespeed_data, f, ensure_ascii=False, indent=2)
-
-            # Guardar Keywords
-            if safe_keywords:
-                keywords_path = reports_dir / "keywords.json"
-                with open(keywords_path, "w", encoding="utf-8") as f:
-                    json.dump(safe_keywords, f, ensure_ascii=False, indent=2)
-
-            # Guardar Backlinks
-            if safe_backlinks:
-                backlinks_path = reports_dir / "backlinks.json"
-                with open(backlinks_path, "w", encoding="utf-8") as f:
-                    json.dump(safe_backlinks, f, ensure_ascii=False, indent=2)
-
-            # Guardar Rankings
-            if safe_rankings:
-                rankings_path = reports_dir / "rankings.json"
-                with open(rankings_path, "w", encoding="utf-8") as f:
-                    json.dump(safe_rankings, f, ensure_ascii=False, indent=2)
-
-            # Guardar LLM Visibility
-            if safe_llm_visibility:
-                visibility_path = reports_dir / "llm_visibility.json"
-                with open(visibility_path, "w", encoding="utf-8") as f:
-                    json.dump(safe_llm_visibility, f, ensure_ascii=False, indent=2)
-
-            # Guardar competidores individuales
+            writer = ArtifactBundleWriter(metadata={"audit_id": int(audit_id)})
+
+            writer.add("aggregated_summary.json", safe_target_audit)
+            writer.add("fix_plan.json", safe_fix_plan)
+            optional_documents = (
+                ("pagespeed.json", safe_pagespeed_data),
+                ("keywords.json", safe_keywords),
+                ("backlinks.json", safe_backlinks),
+                ("rankings.json", safe_rankings),
+                ("llm_visibility.json", safe_llm_visibility),
+            )
+            for name, document in optional_documents:
+                if document:
+                    writer.add(name, document)
+
+            # Competidores individuales
             for i, comp in enumerate(safe_competitor_audits):
                 try:
                     if not CompetitorService.is_benchmark_available_competitor(comp):
@@ -1592,35 +1594,93 @@ class AuditService:
                         comp = CompetitorService.normalize_competitor_audit_payload(
                             comp
                         )
-                    comp_path = os.path.join(
-                        competitors_dir, f"competitor_{safe_domain}.json"
-                    )
-                    with open(comp_path, "w", encoding="utf-8") as f:
-                        json.dump(comp, f, ensure_ascii=False, indent=2)
+                    writer.add(f"competitors/competitor_{safe_domain}.json", comp)
                 except Exception:  # nosec B110
                     pass
 
-            # Guardar contexto final del LLM
-            final_context = {
-                "target_audit": safe_target_audit,
-                "external_intelligence": safe_external_intelligence,
-                "search_results": safe_search_results,
-                "competitor_audits": safe_competitor_audits,
-                "pagespeed": safe_pagespeed_data,
-                "keywords": safe_keywords,
-                "backlinks": safe_backlinks,
-                "rank_tracking": safe_rankings,
-                "llm_visibility": safe_llm_visibility,
-            }
-            context_path = reports_dir / "final_llm_context.json"
-            with open(context_path, "w", encoding="utf-8") as f:
-                json.dump(final_context, f, ensure_ascii=False, indent=2)
+            # Contexto final del LLM: sus sub-documentos se deduplican contra
+            # las entradas anteriores dentro del bundle.
+            writer.add(
+                "final_llm_context.json",
+                {
+                    "target_audit": safe_target_audit,
+                    "external_intelligence": safe_external_intelligence,
+                    "search_results": safe_search_results,
+                    "competitor_audits": safe_competitor_audits,
+                    "pagespeed": safe_pagespeed_data,
+                    "keywords": safe_keywords,
+                    "backlinks": safe_backlinks,
+                    "rank_tracking": safe_rankings,
+                    "llm_visibility": safe_llm_visibility,
+                },
+            )
+
+            # Paginas individuales escritas durante el crawl
+            pages_dir = reports_dir / "pages"
+            page_files = sorted(pages_dir.glob("*.json")) if pages_dir.is_dir() else []
+            for page_path in page_files:
+                try:
+                    with open(page_path, "r", encoding="utf-8") as f:
+                        writer.add(f"pages/{page_path.name}", json.load(f))
+                except Exception as e:
+                    logger.warning(f"No se pudo empaquetar {page_path}: {e}")
 
-            logger.info(f"Archivos JSON guardados en {reports_dir}")
-        except Exception as e:
-            logger.error(
-                f"Error guardando archivos JSON para auditorÃ­a {audit_id}: {e}"
+            bundle_path = reports_dir / ARTIFACT_BUNDLE_FILENAME
+            stats = writer.write(bundle_path)
+            AuditService._remove_loose_audit_files(reports_dir, writer)
+            logger.info(
+                f"Bundle de artefactos guardado en {bundle_path}: "
+                f"{stats['entries']} entradas, {stats['blobs']} blobs, "
+                f"{stats['logical_bytes']} -> {stats['stored_bytes']} bytes "
+                f"({stats['codec']}, dedup={stats['dedup_hits']})"
             )
+        except Exception as e:
+            logger.error(f"Error guardando artefactos para auditoría {audit_id}: {e}")
+
+    @staticmethod
+    def _write_audit_artifacts(audit_id: int, documents: Dict[str, Any]) -> None:
+        """
+        Guardar documentos sueltos de una auditoria dentro de su bundle.
+
+        Si el bundle aun no existe se escriben como JSON compacto; el bundle
+        los absorbe al crearse. Un JSON suelto tiene prioridad sobre el bundle
+        al leer, asi que nunca se deja uno junto a un bundle existente.
+        """
+        reports_dir = AuditService._reports_dir_for_audit(audit_id)
+        reports_dir.mkdir(parents=True, exist_ok=True)
+        if update_artifact_bundle(reports_dir, documents) is not None:
+            for name in documents:
+                (reports_dir / name).unlink(missing_ok=True)
+            return
+        for name, document in documents.items():
+            path = reports_dir / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(document, f, ensure_ascii=False, separators=(",", ":"))
+
+    @staticmethod
+    def _remove_loose_audit_files(
+        reports_dir: Path, writer: ArtifactBundleWriter
+    ) -> None:
+        """Eliminar los JSON sueltos que ya quedaron dentro del bundle."""
+        candidates = [
+            reports_dir / name
+            for name in _LEGACY_AUDIT_ARTIFACT_FILES
+            if name in writer
+        ]
+        for subdir in ("pages", "competitors"):
+            folder = reports_dir / subdir
+            if folder.is_dir():
+                candidates.extend(
+                    path
+                    for path in folder.glob("*.json")
+                    if f"{subdir}/{path.name}" in writer
+                )
+        for path in candidates:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"No se pudo eliminar artefacto suelto {path}: {e}")
 
     @staticmethod
     async def _save_audit_files(
@@ -1680,6 +1740,21 @@ class AuditService:
             safe_llm_visibility,
         )
 
+    @staticmethod
+    def _write_page_artifact(
+        audit_id: int, page_url: str, safe_audit_data: Dict[str, Any], page_index: int
+    ) -> Path:
+        pages_dir = AuditService._reports_dir_for_audit(audit_id) / "pages"
+        pages_dir.mkdir(parents=True, exist_ok=True)
+        raw_filename = (
+            str(page_url or "").replace("https://", "").replace("http://", "")
+        )
+        safe_filename = AuditService._safe_fs_name(raw_filename)
+        page_json_path = pages_dir / f"report_{page_index}_{safe_filename}.json"
+        with open(page_json_path, "w", encoding="utf-8") as f:
+            json.dump(safe_audit_data, f, ensure_ascii=False, indent=2)
+        return page_json_path
+
     @staticmethod
     def save_page_audit(
         db: Session,
@@ -1709,15 +1784,9 @@ class AuditService:
             )
 
             if AuditService._local_artifacts_enabled():
-                pages_dir = AuditService._reports_dir_for_audit(audit_id) / "pages"
-                pages_dir.mkdir(parents=True, exist_ok=True)
-                raw_filename = (
-                    str(page_url or "").replace("https://", "").replace("http://", "")
+                page_json_path = AuditService._write_page_artifact(
+                    audit_id, page_url, safe_audit_data, page_index
                 )
-                safe_filename = AuditService._safe_fs_name(raw_filename)
-                page_json_path = pages_dir / f"report_{page_index}_{safe_filename}.json"
-                with open(page_json_path, "w", encoding="utf-8") as f:
-                    json.dump(safe_audit_data, f, ensure_ascii=False, indent=2)
                 logger.info(f"Pagina auditada guardada: {page_url} -> {page_json_path}")
             else:
                 logger.info(
@@ -1729,39 +1798,132 @@ class AuditService:
             logger.error(f"Error guardando auditoria de pagina {page_url}: {e}")
             raise
 
+    @staticmethod
+    def save_page_audits(
+        db: Session,
+        audit_id: int,
+        page_audits: List[Dict[str, Any]],
+        replace: bool = False,
+    ) -> int:
+        """
+        Persistir en bloque los reportes por pagina ({index, url, data}) del pipeline.
+
+        Calcula los scores de cada pagina una sola vez y escribe todas las filas
+        de AuditedPage con un unico INSERT multi-fila dentro de una transaccion.
+        Con ``replace`` borra antes las filas de esas mismas URLs (un shard del
+        fan-out que se re-entrega no duplica paginas).
+        """
+        rows: List[Dict[str, Any]] = []
+        artifacts: List[tuple] = []
+        for page_audit in page_audits or []:
+            if not isinstance(page_audit, dict):
+                continue
+            page_url = page_audit.get("url")
+            page_data = page_audit.get("data", {})
+            if not page_url or not page_data:
+                continue
+            try:
+                safe_page_data = AuditService._sanitize_json_value(page_data)
+                rows.append(
+                    AuditService._build_audited_page_row(
+                        audit_id, page_url, safe_page_data
+                    )
+                )
+                artifacts.append((page_url, safe_page_data, page_audit.get("index", 0)))
+            except Exception as e:
+                logger.error(f"Error guardando página {page_url}: {e}")
+
+        if rows:
+            try:
+                if replace:
+                    db.query(AuditedPage).filter(
+                        AuditedPage.audit_id == audit_id,
+                        AuditedPage.url.in_([row["url"] for row in rows]),
+                    ).delete(synchronize_session=False)
+                db.execute(insert(AuditedPage), rows)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(
+                    f"Error guardando {len(rows)} páginas auditadas para audit {audit_id}: {e}"
+                )
+                return 0
+
+        if AuditService._local_artifacts_enabled():
+            for page_url, safe_page_data, page_index in artifacts:
+                try:
+                    AuditService._write_page_artifact(
+                        audit_id, page_url, safe_page_data, page_index
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Error guardando artefacto de página {page_url}: {e}"
+                    )
+
+        logger.info(f"Guardadas {len(rows)} páginas auditadas para audit {audit_id}")
+        return len(rows)
+
+    @staticmethod
+    def _weighted_overall_score(scores: Dict[str, float]) -> float:
+        overall = sum(
+            scores[name] * weight
+            for name, weight in AuditService.PAGE_SCORE_WEIGHTS.items()
+        )
+        return round(overall, 1)
+
     @staticmethod
     def _calculate_overall_score(audit_data: Dict[str, Any]) -> float:
         """Calcular score general de la pÃ¡gina basado en los datos de auditorÃ­a"""
         try:
             # Usar los extractores individuales para obtener scores de 0-100
-            h1 = AuditService._extract_h1_score(audit_data)
-            structure = AuditService._extract_structure_score(audit_data)
-            content = AuditService._extract_content_score(audit_data)
-            eeat = AuditService._extract_eeat_score(audit_data)
-            schema = AuditService._extract_schema_score(audit_data)
-
-            # Pesos para el promedio ponderado
-            weights = {
-                "h1": 0.15,
-                "structure": 0.20,
-                "content": 0.20,
-                "eeat": 0.25,
-                "schema": 0.20,
-            }
-
-            overall = (
-                h1 * weights["h1"]
-                + structure * weights["structure"]
-                + content * weights["content"]
-                + eeat * weights["eeat"]
-                + schema * weights["schema"]
+            return AuditService._weighted_overall_score(
+                {
+                    "h1": AuditService._extract_h1_score(audit_data),
+                    "structure": AuditService._extract_structure_score(audit_data),
+                    "content": AuditService._extract_content_score(audit_data),
+                    "eeat": AuditService._extract_eeat_score(audit_data),
+                    "schema": AuditService._extract_schema_score(audit_data),
+                }
             )
-
-            return round(overall, 1)
         except Exception as e:
             logger.error(f"Error en _calculate_overall_score: {e}")
             return 50.0  # Score por defecto
 
+    @staticmethod
+    def _build_audited_page_row(
+        audit_id: int, page_url: str, audit_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Columnas de AuditedPage en una sola pasada (audit_data ya saneado)."""
+        scores = {
+            "h1": AuditService._extract_h1_score(audit_data),
+            "structure": AuditService._extract_structure_score(audit_data),
+            "content": AuditService._extract_content_score(audit_data),
+            "eeat": AuditService._extract_eeat_score(audit_data),
+            "schema": AuditService._extract_schema_score(audit_data),
+        }
+        try:
+            overall_score = AuditService._weighted_overall_score(scores)
+        except Exception as e:
+            logger.error(f"Error en _calculate_overall_score: {e}")
+            overall_score = 50.0
+        critical, high, medium, low = AuditService._count_page_issues(audit_data)
+        return {
+            "audit_id": audit_id,
+            "url": page_url,
+            "path": urlparse(page_url).path or "/",
+            "audit_data": audit_data,
+            "overall_score": overall_score,
+            "h1_score": scores["h1"],
+            "structure_score": scores["structure"],
+            "content_score": scores["content"],
+            "eeat_score": scores["eeat"],
+            "schema_score": scores["schema"],
+            "critical_issues": critical,
+            "high_issues": high,
+            "medium_issues": medium,
+            "low_issues": low,
+        }
+
     @staticmethod
     def add_audited_page(
         db: Session,
@@ -2281,6 +2443,8 @@ class AuditService:
         """
         Ensure fix_plan exists for audit. Generates and persists one if missing/short.
         """
+        from .pipeline_service import PipelineService
+
         audit = db.query(Audit).filter(Audit.id == audit_id).first()
         if not audit:
             raise ValueError("Audit not found")
@@ -2373,11 +2537,9 @@ class AuditService:
 
         if AuditService._local_artifacts_enabled():
             try:
-                reports_dir = AuditService._reports_dir_for_audit(audit_id)
-                reports_dir.mkdir(parents=True, exist_ok=True)
-                fix_plan_path = reports_dir / "fix_plan.json"
-                with open(fix_plan_path, "w", encoding="utf-8") as f:
-                    json.dump(audit.fix_plan or [], f, ensure_ascii=False, indent=2)
+                AuditService._write_audit_artifacts(
+                    audit_id, {"fix_plan.json": audit.fix_plan or []}
+                )
             except Exception as e:
                 logger.warning(f"Failed to persist fix_plan.json: {e}")
 
@@ -2862,11 +3024,9 @@ class AuditService:
 
         if AuditService._local_artifacts_enabled():
             try:
-                reports_dir = AuditService._reports_dir_for_audit(audit_id)
-                reports_dir.mkdir(parents=True, exist_ok=True)
-                fix_plan_path = reports_dir / "fix_plan.json"
-                with open(fix_plan_path, "w", encoding="utf-8") as f:
-                    json.dump(audit.fix_plan or [], f, ensure_ascii=False, indent=2)
+                AuditService._write_audit_artifacts(
+                    audit_id, {"fix_plan.json": audit.fix_plan or []}
+                )
             except Exception as e:
                 logger.warning(f"Failed to persist fix_plan.json: {e}")
 
@@ -3446,8 +3606,14 @@ class CompetitorService:
         audit_data: Dict[str, Any],
         *,
         commit: bool = True,
+        write_artifact: bool = True,
     ) -> Competitor:
-        """AÃ±adir competidor analizado"""
+        """
+        Añadir competidor analizado.
+
+        ``write_artifact=False`` cuando el llamador empaqueta los competidores
+        en el bundle de la auditoria por su cuenta.
+        """
         domain = url.replace("https://", "").replace("http://", "").split("/")[0]
 
         # Si no se proporciona geo_score, calcularlo
@@ -3465,16 +3631,10 @@ class CompetitorService:
         safe_audit_data = AuditService._sanitize_json_value(raw_audit_data)
 
         # Guardar JSON local solo en modo legacy de artefactos.
-        if AuditService._local_artifacts_enabled():
+        if write_artifact and AuditService._local_artifacts_enabled():
             try:
-                competitors_dir = (
-                    AuditService._reports_dir_for_audit(audit_id) / "competitors"
-                )
-                competitors_dir.mkdir(parents=True, exist_ok=True)
                 safe_domain = re.sub(r"[^\w\-_.]", "_", domain)
-                competitor_json_path = (
-                    competitors_dir / f"competitor_{safe_domain}.json"
-                )
+                competitor_name = f"competitors/competitor_{safe_domain}.json"
                 competitor_full_data = {
                     "url": url,
                     "domain": domain,
@@ -3482,10 +3642,11 @@ class CompetitorService:
                     "audit_data": safe_audit_data,
                     "analyzed_at": datetime.now(timezone.utc).isoformat(),
                 }
-                with open(competitor_json_path, "w", encoding="utf-8") as f:
-                    json.dump(competitor_full_data, f, ensure_ascii=False, indent=2)
+                AuditService._write_audit_artifacts(
+                    audit_id, {competitor_name: competitor_full_data}
+                )
                 logger.info(
-                    f"Competidor guardado: {domain} -> {competitor_json_path} (GEO Score: {geo_score})"
+                    f"Competidor guardado: {domain} -> {competitor_name} (GEO Score: {geo_score})"
                 )
             except Exception as e:
                 logger.error(
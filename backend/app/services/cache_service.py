@@ -9,10 +9,21 @@ import redis
 
 from ..core.config import settings
 from ..core.logger import get_logger
+from ..core.metrics import record_cache
 
 logger = get_logger(__name__)
 
 
+def _cache_name(key: str) -> str:
+    """Prefijo estable de la clave para métricas ("audit:artifacts:12" -> "audit:artifacts")."""
+    parts = []
+    for part in str(key).split(":")[:2]:
+        if any(ch.isdigit() for ch in part):
+            break
+        parts.append(part)
+    return ":".join(parts) or "redis"
+
+
 class CacheService:
     """Simple Redis cache service"""
 
@@ -37,12 +48,15 @@ class CacheService:
         if not self.enabled:
             return None
 
+        cache_name = _cache_name(key)
         try:
             value = self.redis_client.get(key)
             if value:
+                record_cache(cache_name, hit=True)
                 return json.loads(value)
         except Exception as e:
             logger.error(f"Cache get error: {e}")
+        record_cache(cache_name, hit=False)
         return None
 
     def set(self, key: str, value: Any, ttl: int = 300):
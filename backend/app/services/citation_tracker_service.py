@@ -76,7 +76,9 @@ class CitationTrackerService:
         Returns:
             Lista de citaciones encontradas
         """
-        from app.services.llm_visibility_service import LLMVisibilityService
+        from app.core.llm_kimi import get_llm_function
+        from app.services.llm_probe_executor import get_probe_executor
+        from app.services.mention_matcher import BRAND_KEY, MentionMatcher
 
         logger.info(f"Iniciando citation tracking para {brand_name}")
 
@@ -86,27 +88,27 @@ class CitationTrackerService:
         )
 
         citations = []
-        visibility_service = LLMVisibilityService(db)
+        matcher = MentionMatcher.for_brands(brand_name, domain)
 
-        for query in queries:
+        # Consultar el LLM con todas las queries en paralelo (dedup por auditoría)
+        executor = get_probe_executor(audit_id, get_llm_function())
+        responses = await executor.run(queries)
+
+        for query, response_text in zip(queries, responses):
             try:
-                # Consultar LLM
-                result = await visibility_service._query_llm(query, llm_name)
+                if isinstance(response_text, Exception):
+                    raise response_text
 
-                if not result:
+                if not response_text:
                     continue
 
-                response_text = result.get("response", "")
-
-                # Detectar si la marca fue mencionada
-                is_mentioned = CitationTrackerService._is_brand_mentioned(
-                    response_text, brand_name, domain
-                )
+                # Detectar si la marca fue mencionada (una sola pasada)
+                mention = matcher.first_mentions(response_text).get(BRAND_KEY)
 
-                if is_mentioned:
+                if mention is not None:
                     # Extraer contexto de la citación
                     citation_context = CitationTrackerService._extract_citation_context(
-                        response_text, brand_name, domain
+                        response_text, mention.start
                     )
 
                     # Analizar sentimiento
@@ -114,10 +116,9 @@ class CitationTrackerService:
                         citation_context
                     )
 
-                    # Detectar posición en la respuesta
-                    position = CitationTrackerService._get_mention_position(
-                        response_text, brand_name, domain
-                    )
+                    # Oración de la primera mención del nombre (0 si solo
+                    # aparece el dominio)
+                    position = mention.sentence if mention.primary else 0
 
                     citation = {
                         "query": query,
@@ -204,32 +205,9 @@ class CitationTrackerService:
         return queries[:15]
 
     @staticmethod
-    def _is_brand_mentioned(text: str, brand_name: str, domain: str) -> bool:
-        """Detecta si la marca fue mencionada."""
-        text_lower = text.lower()
-        brand_lower = brand_name.lower()
-        domain_clean = domain.replace("www.", "").replace(".com", "").replace(".io", "")
-
-        # Buscar nombre de marca o dominio
-        return brand_lower in text_lower or domain_clean in text_lower
-
-    @staticmethod
-    def _extract_citation_context(text: str, brand_name: str, domain: str) -> str:
+    def _extract_citation_context(text: str, pos: int) -> str:
         """Extrae el contexto de la citación (±100 caracteres)."""
-        text_lower = text.lower()
-        brand_lower = brand_name.lower()
-
-        # Buscar posición de la mención
-        pos = text_lower.find(brand_lower)
-
-        if pos == -1:
-            # Buscar por dominio
-            domain_clean = (
-                domain.replace("www.", "").replace(".com", "").replace(".io", "")
-            )
-            pos = text_lower.find(domain_clean)
-
-        if pos == -1:
+        if pos < 0:
             return text[:200]  # Fallback
 
         # Extraer ±100 caracteres
@@ -277,20 +255,6 @@ class CitationTrackerService:
         else:
             return "neutral"
 
-    @staticmethod
-    def _get_mention_position(text: str, brand_name: str, domain: str) -> int:
-        """Obtiene la posición de la mención (1=primero, 2=segundo, etc)."""
-        # Dividir en oraciones o párrafos
-        sentences = text.split(".")
-
-        brand_lower = brand_name.lower()
-
-        for i, sentence in enumerate(sentences):
-            if brand_lower in sentence.lower():
-                return i + 1
-
-        return 0
-
     @staticmethod
     def _save_citations(db: Session, audit_id: int, citations: List[Dict]):
         """Guarda citaciones en la base de datos."""
@@ -81,77 +81,58 @@ class CompetitorCitationService:
             "competitors": [],
         }
 
+        from app.services.llm_probe_executor import get_probe_executor
+        from app.services.mention_matcher import BRAND_KEY, MentionMatcher
+
+        # Un solo matcher para marca + competidores; cada respuesta se recorre una vez
+        competitor_domains = list(dict.fromkeys(d for d in competitor_domains if d))
+        matcher = MentionMatcher.for_brands(brand_name, domain, competitor_domains)
+        competitors_by_domain: Dict[str, Dict[str, Any]] = {}
+
+        # Consultar el LLM con todas las queries en paralelo (dedup por auditoría)
+        responses = await get_probe_executor(audit_id, llm_function).run(queries)
+
         # Analizar cada query
-        for query in queries:
+        for query, response in zip(queries, responses):
             try:
-                response = await llm_function(query)
+                if isinstance(response, Exception):
+                    raise response
 
                 if not response:
                     continue
 
-                # Verificar tu marca
-                your_mentioned = CompetitorCitationService._is_mentioned(
-                    response, brand_name, domain
-                )
-
-                if your_mentioned:
-                    results["your_brand"]["mentions"] += 1
-                    results["your_brand"]["queries_mentioned"].append(query)
-
-                    position = CompetitorCitationService._get_mention_position(
-                        response, brand_name
-                    )
-                    results["your_brand"]["avg_position"] += position
-
-                # Verificar competidores
-                for comp_domain in competitor_domains:
-                    comp_name = (
-                        comp_domain.replace("www.", "")
-                        .replace(".com", "")
-                        .replace(".io", "")
-                    )
-
-                    comp_mentioned = CompetitorCitationService._is_mentioned(
-                        response, comp_name, comp_domain
-                    )
-
-                    if comp_mentioned:
-                        # Buscar o crear entrada del competidor
-                        comp_data = next(
-                            (
-                                c
-                                for c in results["competitors"]
-                                if c["domain"] == comp_domain
-                            ),
-                            None,
-                        )
-
-                        if not comp_data:
-                            comp_data = {
-                                "name": comp_name,
-                                "domain": comp_domain,
+                for key, mention in matcher.first_mentions(response).items():
+                    if key == BRAND_KEY:
+                        entry = results["your_brand"]
+                    else:
+                        entry = competitors_by_domain.get(key)
+                        if entry is None:
+                            entry = {
+                                "name": key.replace("www.", "")
+                                .replace(".com", "")
+                                .replace(".io", ""),
+                                "domain": key,
                                 "mentions": 0,
                                 "queries_mentioned": [],
                                 "avg_position": 0,
                                 "reasons": [],
                             }
-                            results["competitors"].append(comp_data)
-
-                        comp_data["mentions"] += 1
-                        comp_data["queries_mentioned"].append(query)
+                            competitors_by_domain[key] = entry
 
-                        position = CompetitorCitationService._get_mention_position(
-                            response, comp_name
-                        )
-                        comp_data["avg_position"] += position
+                    entry["mentions"] += 1
+                    entry["queries_mentioned"].append(query)
+                    # Oración del nombre; 999 si solo aparece el dominio
+                    entry["avg_position"] += (
+                        mention.sentence if mention.primary else 999
+                    )
 
             except Exception as e:
                 logger.error(f"Error analizando query '{query}': {e}")
                 continue
 
-        # Calcular posiciones promedio
-        len(queries)
+        results["competitors"] = list(competitors_by_domain.values())
 
+        # Calcular posiciones promedio
         if results["your_brand"]["mentions"] > 0:
             results["your_brand"]["avg_position"] /= results["your_brand"]["mentions"]
 
@@ -178,29 +159,6 @@ class CompetitorCitationService:
 
         return results
 
-    @staticmethod
-    def _is_mentioned(text: str, brand_name: str, domain: str) -> bool:
-        """Verifica si una marca está mencionada."""
-        text_lower = text.lower()
-        brand_lower = brand_name.lower()
-        domain_clean = (
-            domain.replace("www.", "").replace(".com", "").replace(".io", "").lower()
-        )
-
-        return brand_lower in text_lower or domain_clean in text_lower
-
-    @staticmethod
-    def _get_mention_position(text: str, brand_name: str) -> int:
-        """Obtiene la posición de la mención (1=primero)."""
-        sentences = text.split(".")
-        brand_lower = brand_name.lower()
-
-        for i, sentence in enumerate(sentences):
-            if brand_lower in sentence.lower():
-                return i + 1
-
-        return 999  # No encontrado
-
     @staticmethod
     async def _analyze_citation_gaps(
         results: Dict, queries: List[str], llm_function: callable
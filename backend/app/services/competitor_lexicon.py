@@ -0,0 +1,379 @@
+"""
+Léxico precompilado para el filtrado de competidores y queries (Agente 1).
+
+``filter_competitor_urls``, ``_prune_competitor_queries`` y los helpers de
+``_query_core_match_details`` tokenizan los mismos títulos, snippets y queries
+muchas veces por auditoría. Aquí viven los patrones compilados, las raíces de
+token memoizadas y los conjuntos de términos inmutables que comparten, más
+``CompetitorLexicon``: el perfil de negocio de una auditoría ya normalizado a
+raíces, cacheado por contenido para reutilizarlo entre filtros.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Pattern, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9áéíóúñ]{2,}")
+WORD_RE = re.compile(r"\b\w+\b")
+ALNUM_RE = re.compile(r"[a-z0-9]+")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+# Tope de textos tokenizados que guarda cada léxico (títulos/snippets de SERP).
+TEXT_ROOTS_CACHE_SIZE = 4096
+
+GENERIC_BUSINESS_TERMS: FrozenSet[str] = frozenset(
+    {
+        "digital",
+        "online",
+        "platform",
+        "service",
+        "services",
+        "solutions",
+        "company",
+        "companies",
+        "empresa",
+        "empresas",
+        "official",
+        "site",
+        "website",
+        "store",
+        "shop",
+        "product",
+        "products",
+        "business",
+        "producto",
+        "productos",
+        "mas",
+        "más",
+        "gratis",
+        "free",
+        "ars",
+        "usd",
+        "mxn",
+        "clp",
+        "brl",
+        "superando",
+        "supera",
+        "superar",
+        "insight",
+        "insights",
+        "webinar",
+        "webinars",
+        "newsroom",
+        "overview",
+        "blog",
+        "news",
+        "event",
+        "events",
+        "research",
+        "report",
+        "reports",
+        "que",
+        "no",
+        "servicio",
+        "servicios",
+        "consultora",
+        "consultoras",
+        "nuestra",
+        "nuestro",
+        "nuestras",
+        "nuestros",
+        "sobre",
+        "contacto",
+        "somos",
+        "somo",
+        "global",
+    }
+)
+
+WEAK_SUPPORT_TERMS: FrozenSet[str] = frozenset(
+    {
+        "ai",
+        "artificial",
+        "intelligence",
+        "assistant",
+        "assistants",
+        "tool",
+        "tools",
+        "platform",
+        "platforms",
+        "app",
+        "apps",
+        "software",
+        "code",
+        "coding",
+        "developer",
+        "developers",
+        "productivity",
+        "workflow",
+        "automation",
+        "cloud",
+        "api",
+        "apis",
+        "system",
+        "systems",
+        "service",
+        "services",
+        "solution",
+        "solutions",
+        "digital",
+        "online",
+    }
+)
+
+TRANSACTIONAL_INTENT_TERMS: FrozenSet[str] = frozenset(
+    {
+        "online",
+        "shop",
+        "store",
+        "tienda",
+        "buy",
+        "comprar",
+        "delivery",
+        "shipping",
+        "envio",
+        "envío",
+        "stock",
+        "precio",
+        "price",
+        "pharmacy",
+        "farmacia",
+        "retail",
+        "venta",
+        "order",
+        "pedido",
+    }
+)
+
+
+@lru_cache(maxsize=16384)
+def token_root(token: str) -> str:
+    """Raíz de un token: minúsculas, sin acentos ni símbolos y sin plural simple."""
+    normalized = unicodedata.normalize("NFKD", token.lower())
+    ascii_folded = "".join(ch for ch in normalized if not unicodedata.combining(ch))
+    raw = _NON_ALNUM_RE.sub("", ascii_folded)
+    if not raw:
+        return ""
+    if raw.endswith("es") and len(raw) > 5:
+        return raw[:-2]
+    if raw.endswith("s") and len(raw) > 4:
+        return raw[:-1]
+    return raw
+
+
+def terms_to_roots(terms: Iterable[Any]) -> Tuple[str, ...]:
+    """Raíces únicas (en orden de aparición) de una lista de términos."""
+    roots: Dict[str, None] = {}
+    for term in terms or ():
+        if not term:
+            continue
+        root = token_root(str(term))
+        if root:
+            roots[root] = None
+    return tuple(roots)
+
+
+def text_roots(text: Any) -> FrozenSet[str]:
+    return frozenset(
+        root
+        for root in (
+            token_root(token) for token in TOKEN_RE.findall(str(text or "").lower())
+        )
+        if root
+    )
+
+
+@lru_cache(maxsize=1)
+def transactional_intent_roots() -> FrozenSet[str]:
+    return frozenset(terms_to_roots(TRANSACTIONAL_INTENT_TERMS))
+
+
+@lru_cache(maxsize=32)
+def weak_support_roots(vertical_hint: str = "") -> FrozenSet[str]:
+    """Raíces de términos que por sí solos no identifican a un competidor."""
+    weak_terms = set(WEAK_SUPPORT_TERMS)
+    if vertical_hint == "software":
+        weak_terms.update({"workspace", "suite"})
+    return frozenset(terms_to_roots(weak_terms | GENERIC_BUSINESS_TERMS))
+
+
+@lru_cache(maxsize=1024)
+def banned_term_pattern(term: str) -> Optional[Pattern]:
+    """Patrón con límites de palabra para términos alfanuméricos simples."""
+    if not ALNUM_RE.fullmatch(term):
+        return None
+    return re.compile(rf"(?<![a-z0-9]){re.escape(term)}(?![a-z0-9])")
+
+
+def contains_banned_term(text: str, term: str) -> bool:
+    hay = (text or "").lower()
+    needle = (term or "").strip().lower()
+    if not hay or not needle:
+        return False
+    if " " in needle:
+        return needle in hay
+    pattern = banned_term_pattern(needle)
+    if pattern is not None:
+        return pattern.search(hay) is not None
+    return needle in hay
+
+
+@lru_cache(maxsize=32)
+def banned_terms_pattern(terms: Tuple[str, ...]) -> Optional[Pattern]:
+    """Un solo patrón para toda una lista de términos prohibidos."""
+    alternatives = []
+    for term in terms:
+        needle = (term or "").strip().lower()
+        if not needle:
+            continue
+        if " " not in needle and ALNUM_RE.fullmatch(needle):
+            alternatives.append(rf"(?<![a-z0-9]){re.escape(needle)}(?![a-z0-9])")
+        else:
+            alternatives.append(re.escape(needle))
+    return re.compile("|".join(alternatives)) if alternatives else None
+
+
+def first_banned_term(text: str, terms: Tuple[str, ...]) -> Optional[str]:
+    """Primer término (en orden de la lista) presente en ``text``."""
+    pattern = banned_terms_pattern(terms)
+    if pattern is None or not text or pattern.search(text.lower()) is None:
+        return None
+    return next((term for term in terms if contains_banned_term(text, term)), None)
+
+
+def roots_match(term_root: str, roots: FrozenSet[str]) -> bool:
+    """Match exacto de raíz o por prefijo común (>=5 letras) para variantes."""
+    if not term_root or not roots:
+        return False
+    if term_root in roots:
+        return True
+    if len(term_root) < 5:
+        return False
+    for root in roots:
+        if len(root) < 5:
+            continue
+        prefix_len = min(7, len(term_root), len(root))
+        if prefix_len >= 5 and term_root[:prefix_len] == root[:prefix_len]:
+            return True
+    return False
+
+
+class CompetitorLexicon:
+    """
+    Términos de negocio de una auditoría normalizados a raíces.
+
+    Se obtiene con ``CompetitorLexicon.for_terms`` / ``for_profile`` (cacheados
+    por contenido), así que todas las queries e items de búsqueda de una misma
+    auditoría comparten las raíces ya calculadas y la tokenización de textos.
+    """
+
+    __slots__ = (
+        "vertical_hint",
+        "core_terms",
+        "strong_terms",
+        "weak_terms",
+        "market_terms",
+        "outlier_terms",
+        "anchor_terms",
+        "_text_roots",
+    )
+
+    def __init__(
+        self,
+        core_terms: Tuple[str, ...] = (),
+        strong_terms: Tuple[str, ...] = (),
+        weak_terms: Tuple[str, ...] = (),
+        market_terms: Tuple[str, ...] = (),
+        outlier_terms: Tuple[str, ...] = (),
+        anchor_terms: Tuple[str, ...] = (),
+        vertical_hint: str = "other",
+    ):
+        self.vertical_hint = vertical_hint or "other"
+        # Tuplas ordenadas: los contadores de match recorren las raíces en orden.
+        self.core_terms = terms_to_roots(core_terms)
+        self.strong_terms = terms_to_roots(strong_terms)
+        self.market_terms = terms_to_roots(market_terms)
+        self.outlier_terms = terms_to_roots(outlier_terms)
+        self.anchor_terms = terms_to_roots(anchor_terms)
+        self.weak_terms = weak_support_roots(self.vertical_hint).union(
+            terms_to_roots(weak_terms)
+        )
+        self._text_roots: Dict[str, FrozenSet[str]] = {}
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def for_terms(
+        core_terms: Tuple[str, ...] = (),
+        strong_terms: Tuple[str, ...] = (),
+        weak_terms: Tuple[str, ...] = (),
+        market_terms: Tuple[str, ...] = (),
+        outlier_terms: Tuple[str, ...] = (),
+        anchor_terms: Tuple[str, ...] = (),
+        vertical_hint: str = "other",
+    ) -> "CompetitorLexicon":
+        return CompetitorLexicon(
+            core_terms=core_terms,
+            strong_terms=strong_terms,
+            weak_terms=weak_terms,
+            market_terms=market_terms,
+            outlier_terms=outlier_terms,
+            anchor_terms=anchor_terms,
+            vertical_hint=vertical_hint,
+        )
+
+    @staticmethod
+    def for_profile(core_profile: Optional[Dict[str, Any]]) -> "CompetitorLexicon":
+        """Léxico del perfil de ``_build_core_business_profile``."""
+        profile = core_profile if isinstance(core_profile, dict) else {}
+
+        def _terms(key: str) -> Tuple[str, ...]:
+            return tuple(str(term) for term in (profile.get(key) or []) if term)
+
+        return CompetitorLexicon.for_terms(
+            core_terms=_terms("core_terms"),
+            strong_terms=_terms("strong_core_terms"),
+            weak_terms=_terms("weak_core_terms"),
+            market_terms=_terms("market_terms"),
+            outlier_terms=_terms("outlier_terms"),
+            vertical_hint=str(profile.get("vertical_hint") or "other").lower(),
+        )
+
+    def roots(self, text: Any) -> FrozenSet[str]:
+        """Raíces de un texto; memoizadas por léxico."""
+        key = str(text or "").lower()
+        cached = self._text_roots.get(key)
+        if cached is None:
+            if len(self._text_roots) >= TEXT_ROOTS_CACHE_SIZE:
+                self._text_roots.clear()
+            cached = text_roots(key)
+            self._text_roots[key] = cached
+        return cached
+
+    def count_matches(self, term_roots: Tuple[str, ...], text: Any) -> int:
+        if not term_roots:
+            return 0
+        roots = self.roots(text)
+        return sum(1 for term_root in term_roots if roots_match(term_root, roots))
+
+    def match_details(self, query: str) -> Dict[str, Any]:
+        """Cruce de una query con el perfil (ver ``_query_core_match_details``)."""
+        query_terms = self.roots(query)
+        core_terms = frozenset(self.core_terms)
+        core_matches = core_terms.intersection(query_terms)
+        return {
+            "vertical_hint": self.vertical_hint,
+            "query_terms": query_terms,
+            "core_terms": core_terms,
+            "strong_terms": frozenset(self.strong_terms),
+            "weak_terms": self.weak_terms,
+            "market_terms": frozenset(self.market_terms),
+            "core_matches": core_matches,
+            "strong_matches": query_terms.intersection(self.strong_terms),
+            "effective_matches": {
+                match for match in core_matches if match not in self.weak_terms
+            },
+            "weak_matches": query_terms.intersection(self.weak_terms),
+        }
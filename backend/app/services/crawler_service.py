@@ -26,6 +26,7 @@ from bs4 import BeautifulSoup
 from defusedxml import ElementTree as DefusedET
 
 from ..core.config import settings
+from ..core.metrics import HTML_PARSE_SECONDS
 from ..core.security import is_safe_outbound_url, normalize_outbound_url
 
 logger = logging.getLogger(__name__)
@@ -179,7 +180,8 @@ class CrawlerService:
             Set de URLs encontradas y normalizadas
         """
         try:
-            soup = BeautifulSoup(html, "html.parser")
+            with HTML_PARSE_SECONDS.time(source="crawler"):
+                soup = BeautifulSoup(html, "html.parser")
             found_links = set()
 
             for a_tag in soup.find_all("a", href=True):
@@ -7,15 +7,19 @@
 # - Actualizado a la API moderna de fpdf2 (XPos/YPos) para eliminar warnings
 # - Añadido pdf.add_page() antes de cada Anexo para forzar saltos de página
 
-import glob
+import hashlib
 import json
 import logging
 import math
 import os
 import re
 import sys
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
+from app.services.report_artifacts import ReportArtifacts
+
 # --- INICIO DE LA CORRECCIÓN ---
 # Definir FPDF_AVAILABLE para que otros scripts puedan importarlo
 try:
@@ -164,6 +168,122 @@ def clean_string_for_pdf(text):
     )
 
 
+# --- Caches de parseo y layout ---
+# Viven lo que vive el proceso: en el pool de render (pdf_render_pool) los
+# workers son de larga vida y reutilizan bloques markdown y alturas de tabla
+# entre PDFs con el mismo contenido.
+MARKDOWN_BLOCK_CACHE_SIZE = 64
+TABLE_LAYOUT_CACHE_SIZE = 4096
+
+_HEADING_RE = re.compile(r"^\s*(#{1,4})\s+(.*)")
+_TABLE_SEPARATOR_RE = re.compile(r"^:?-+:?$")
+_BOLD_ASTERISK_RE = re.compile(r"\*\*(.*?)\*\*")
+_BOLD_UNDERSCORE_RE = re.compile(r"__(.*?)__")
+
+
+class _LRUCache:
+    """LRU acotado y thread-safe."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+_MARKDOWN_BLOCK_CACHE = _LRUCache(MARKDOWN_BLOCK_CACHE_SIZE)
+_TABLE_LAYOUT_CACHE = _LRUCache(TABLE_LAYOUT_CACHE_SIZE)
+
+
+def clear_layout_caches():
+    """Vacía los caches de bloques markdown y layouts de tabla."""
+    _MARKDOWN_BLOCK_CACHE.clear()
+    _TABLE_LAYOUT_CACHE.clear()
+
+
+def strip_markdown_bold(text):
+    """Elimina marcadores de negrita markdown (**texto** / __texto__)."""
+    if not text:
+        return text
+    cleaned = _BOLD_ASTERISK_RE.sub(r"\1", text)
+    cleaned = _BOLD_UNDERSCORE_RE.sub(r"\1", cleaned)
+    return cleaned.replace("**", "").replace("__", "")
+
+
+def parse_markdown_blocks(text):
+    """
+    Parsea markdown (ya sanitizado) en bloques por línea:
+    - ("blank",)
+    - ("heading", level, title)
+    - ("text", line)
+    - ("table_sep", cells, aligns) separador ``|---|:--:|``
+    - ("table_row", cells)
+    El estado de tabla (cabecera vs filas) lo resuelve el renderer.
+    """
+    blocks = []
+    for line in text.splitlines():
+        cleaned_line = strip_markdown_bold(line)
+        line_stripped = cleaned_line.strip()
+
+        if line_stripped.startswith("|") and line_stripped.endswith("|"):
+            cells = tuple(
+                strip_markdown_bold(c.strip()) for c in line_stripped[1:-1].split("|")
+            )
+            if all(_TABLE_SEPARATOR_RE.match(c.strip()) for c in cells):
+                aligns = []
+                for c in cells:
+                    cs = c.strip()
+                    if cs.startswith(":") and cs.endswith(":"):
+                        aligns.append("C")
+                    elif cs.endswith(":"):
+                        aligns.append("R")
+                    else:
+                        aligns.append("L")
+                blocks.append(("table_sep", cells, tuple(aligns)))
+            else:
+                blocks.append(("table_row", cells))
+            continue
+
+        if not line.strip():
+            blocks.append(("blank",))
+            continue
+
+        m = _HEADING_RE.match(line)
+        if m:
+            title = strip_markdown_bold(m.group(2).strip())
+            blocks.append(("heading", min(len(m.group(1)), 4), title))
+            continue
+
+        blocks.append(("text", cleaned_line))
+    return tuple(blocks)
+
+
 def summarize_fix_plan(fix_plan_data, top_n=3):
     """Genera un resumen simple del fix_plan (fallback útil en auditorías)."""
     if not fix_plan_data:
@@ -435,12 +555,60 @@ class PDFReport(FPDF):
 
     def _strip_markdown_bold(self, text):
         """Elimina marcadores de negrita markdown (**texto** / __texto__)."""
+        return strip_markdown_bold(text)
+
+    def markdown_blocks(self, text):
+        """Bloques markdown sanitizados para la fuente activa, cacheados por hash."""
+        latin1_only = "Roboto" not in self._fonts_added
+        key = (hashlib.sha256((text or "").encode("utf-8")).digest(), latin1_only)
+        blocks = _MARKDOWN_BLOCK_CACHE.get(key)
+        if blocks is None:
+            blocks = parse_markdown_blocks(self._sanitize_for_current_font(text))
+            _MARKDOWN_BLOCK_CACHE.put(key, blocks)
+        return blocks
+
+    def count_markdown_headings(self, text):
+        """Headings H1..H4 del markdown (estimación de entradas del TOC)."""
         if not text:
-            return text
-        cleaned = re.sub(r"\*\*(.*?)\*\*", r"\1", text)
-        cleaned = re.sub(r"__(.*?)__", r"\1", cleaned)
-        cleaned = cleaned.replace("**", "").replace("__", "")
-        return cleaned
+            return 0
+        return sum(1 for block in self.markdown_blocks(text) if block[0] == "heading")
+
+    def _font_key(self):
+        return (self.font_family, self.font_style, self.font_size_pt)
+
+    def _table_column_widths(self, headers, num_cols, page_width):
+        """Anchos de columna estimados a partir de la cabecera (cacheados)."""
+        if not headers:
+            return [page_width / max(1, num_cols)] * num_cols
+        key = ("widths", self._font_key(), page_width, tuple(headers), num_cols)
+        widths = _TABLE_LAYOUT_CACHE.get(key)
+        if widths is None:
+            guessed_widths = [
+                max(30, min((self.get_string_width(h) + 2 * 3), page_width * 0.5))
+                for h in headers
+            ]
+            total_guess = sum(guessed_widths)
+            if total_guess < page_width:
+                widths = tuple((w / total_guess) * page_width for w in guessed_widths)
+            else:
+                widths = tuple([page_width / num_cols] * num_cols)
+            _TABLE_LAYOUT_CACHE.put(key, widths)
+        return list(widths)
+
+    def _table_cell_heights(self, texts, widths, line_height):
+        """Altura estimada de cada celda (texto envuelto + padding), cacheada."""
+        key = ("heights", self._font_key(), line_height, tuple(zip(texts, widths)))
+        heights = _TABLE_LAYOUT_CACHE.get(key)
+        if heights is None:
+            heights = []
+            for text, w in zip(texts, widths):
+                eff_w = max(6.0, w - 6)
+                text_width = max(1.0, self.get_string_width(text))
+                lines_est = max(1, math.ceil(text_width / eff_w))
+                heights.append(max(9, (lines_est * line_height) + 6))
+            heights = tuple(heights)
+            _TABLE_LAYOUT_CACHE.put(key, heights)
+        return heights
 
     def _is_toc_page(self, page_no=None):
         if self._toc_page_no is None or self._toc_page_count <= 0:
@@ -469,7 +637,7 @@ class PDFReport(FPDF):
         """Render simple de markdown básico y tablas estilo markdown.
         Mantiene sangrías y márgenes consistentes con la portada y TOC.
         """
-        text = self._sanitize_for_current_font(text)
+        blocks = self.markdown_blocks(text)
 
         fam = "Roboto" if "Roboto" in self._fonts_added else "helvetica"
         self.set_font(fam, "", BASE_FONT_SIZE)
@@ -489,65 +657,28 @@ class PDFReport(FPDF):
             current_is_toc = False
 
         if current_is_toc:
-            # encontrar primer non-empty line
-            first_non_empty = None
-            for line in text.splitlines():
-                if line.strip():
-                    first_non_empty = line.strip()
-                    break
-            if first_non_empty:
-                # si primer bloque NO es H1, crear página de contenido ahora
-                if not re.match(r"^(#{1})\s+", first_non_empty):
-                    self.add_page()
-            else:
+            first_block = next((block for block in blocks if block[0] != "blank"), None)
+            if first_block is None:
                 return
+            # si primer bloque NO es H1, crear página de contenido ahora
+            if not (first_block[0] == "heading" and first_block[1] == 1):
+                self.add_page()
 
-        for line in text.splitlines():
-            cleaned_line = self._strip_markdown_bold(line)
-            line_stripped = cleaned_line.strip()
+        for block in blocks:
+            kind = block[0]
 
             # Tablas markdown simples
-            if line_stripped.startswith("|") and line_stripped.endswith("|"):
-                cells = [
-                    self._strip_markdown_bold(c.strip())
-                    for c in line_stripped[1:-1].split("|")
-                ]
+            if kind in ("table_sep", "table_row"):
+                cells = list(block[1])
                 num_cols = len(cells)
 
-                if all(bool(re.match(r"^:?-+:?$", c.strip())) for c in cells):
+                if kind == "table_sep":
                     # inicio de tabla: definir alineaciones y anchos
                     in_table = True
-                    table_aligns = []
-                    if table_headers:
-                        guessed_widths = []
-                        for h in table_headers:
-                            guessed_widths.append(
-                                max(
-                                    30,
-                                    min(
-                                        (self.get_string_width(h) + 2 * 3),
-                                        page_width * 0.5,
-                                    ),
-                                )
-                            )
-                        total_guess = sum(guessed_widths)
-                        if total_guess < page_width:
-                            table_col_widths = [
-                                (w / total_guess) * page_width for w in guessed_widths
-                            ]
-                        else:
-                            table_col_widths = [page_width / num_cols] * num_cols
-                    else:
-                        table_col_widths = [page_width / max(1, num_cols)] * num_cols
-
-                    for c in cells:
-                        cs = c.strip()
-                        if cs.startswith(":") and cs.endswith(":"):
-                            table_aligns.append("C")
-                        elif cs.endswith(":"):
-                            table_aligns.append("R")
-                        else:
-                            table_aligns.append("L")
+                    table_aligns = list(block[2])
+                    table_col_widths = self._table_column_widths(
+                        table_headers, num_cols, page_width
+                    )
 
                     # render cabecera si existe
                     if table_headers:
@@ -555,14 +686,11 @@ class PDFReport(FPDF):
                         self.set_font(fam, "B", TABLE_FONT_SIZE)
                         self.set_fill_color(245, 245, 245)
                         self.set_draw_color(210, 210, 210)
-                        cell_heights = []
-                        for i, header in enumerate(table_headers):
-                            w = table_col_widths[i]
-                            eff_w = max(6.0, w - 6)
-                            text_width = max(1.0, self.get_string_width(header))
-                            lines_est = max(1, math.ceil(text_width / eff_w))
-                            cell_h = max(9, (lines_est * table_line_height) + 6)
-                            cell_heights.append(cell_h)
+                        cell_heights = self._table_cell_heights(
+                            table_headers,
+                            [table_col_widths[i] for i in range(len(table_headers))],
+                            table_line_height,
+                        )
                         max_h = max(cell_heights) if cell_heights else 9
                         self.ensure_space(max_h + 6)
                         start_x = self.get_x()
@@ -587,23 +715,20 @@ class PDFReport(FPDF):
                 elif in_table:
                     # filas de tabla
                     self.set_font(fam, "", TABLE_FONT_SIZE)
-                    cell_heights = []
-                    wrap_infos = []
-                    for i, cell_text in enumerate(cells):
-                        w = table_col_widths[min(i, len(table_col_widths) - 1)]
-                        eff_w = max(6.0, w - 6)
-                        text_width = max(1.0, self.get_string_width(cell_text))
-                        lines_est = max(1, math.ceil(text_width / eff_w))
-                        cell_h = max(9, (lines_est * table_line_height) + 6)
-                        cell_heights.append(cell_h)
-                        wrap_infos.append((cell_text, lines_est, eff_w))
+                    cell_widths = [
+                        table_col_widths[min(i, len(table_col_widths) - 1)]
+                        for i in range(num_cols)
+                    ]
+                    cell_heights = self._table_cell_heights(
+                        cells, cell_widths, table_line_height
+                    )
                     row_h = max(cell_heights) if cell_heights else 9
                     self.ensure_space(row_h + 6)
                     start_x = self.get_x()
                     row_start_y = self.get_y()
                     self.set_draw_color(210, 210, 210)
-                    for i, (cell_text, _, _) in enumerate(wrap_infos):
-                        w = table_col_widths[min(i, len(table_col_widths) - 1)]
+                    for i, cell_text in enumerate(cells):
+                        w = cell_widths[i]
                         align = table_aligns[i] if i < len(table_aligns) else "L"
                         try:
                             self.rect(start_x, row_start_y, w, row_h)
@@ -654,16 +779,13 @@ class PDFReport(FPDF):
                     self.ln(4)
 
                 self.set_font(fam, "", BASE_FONT_SIZE)
-                if not line.strip():
+                if kind == "blank":
                     self.ln(4)
                     continue
 
-                # Detect headings h1..h4
-                m = re.match(r"^\s*(#{1,4})\s+(.*)", line)
-                if m:
-                    hashes = len(m.group(1))
-                    title = self._strip_markdown_bold(m.group(2).strip())
-                    level = min(hashes, 4)
+                # Headings h1..h4
+                if kind == "heading":
+                    level, title = block[1], block[2]
                     try:
                         if level == 1:
                             self.begin_section(title, level=1, render_title=True)
@@ -707,7 +829,7 @@ class PDFReport(FPDF):
 
                 # texto plano
                 self.set_x(self.l_margin)
-                self.multi_cell(0, LINE_HEIGHT, cleaned_line, 0, "L")
+                self.multi_cell(0, LINE_HEIGHT, block[1], 0, "L")
 
     # -------------------- JSON rendering (mejorada) --------------------
     def write_json_raw(self, data):
@@ -1041,61 +1163,47 @@ class PDFReport(FPDF):
 
 # ---------------- Main generator (mejorado y minimalista) ----------------
 def create_comprehensive_pdf(report_folder_path, metadata=None):
-    """Genera el PDF consolidado a partir de la carpeta de reporte."""
-    try:
-        if not os.path.isdir(report_folder_path):
-            logger.error("La carpeta no existe: %s", report_folder_path)
-            raise FileNotFoundError(f"Report folder not found: {report_folder_path}")
+    """
+    Genera el PDF consolidado a partir de la carpeta de reporte (modo
+    depuración / CLI). El PDF se guarda dentro de la misma carpeta.
+    """
+    if not os.path.isdir(report_folder_path):
+        logger.error("La carpeta no existe: %s", report_folder_path)
+        raise FileNotFoundError(f"Report folder not found: {report_folder_path}")
+    artifacts = ReportArtifacts.from_folder(report_folder_path)
+    pdf_file_path = os.path.join(
+        report_folder_path, f"Reporte_Consolidado_{artifacts.report_name}.pdf"
+    )
+    return render_comprehensive_pdf(artifacts, pdf_file_path, metadata=metadata)
 
-        # Definir rutas
-        pdf_file_name = (
-            f"Reporte_Consolidado_{os.path.basename(report_folder_path)}.pdf"
-        )
-        pdf_file_path = os.path.join(report_folder_path, pdf_file_name)
-        md_file = os.path.join(report_folder_path, "ag2_report.md")
-        json_fix_plan_file = os.path.join(report_folder_path, "fix_plan.json")
-        json_agg_summary_file = os.path.join(
-            report_folder_path, "aggregated_summary.json"
-        )
-        json_pagespeed_file = os.path.join(report_folder_path, "pagespeed.json")
-        json_keywords_file = os.path.join(report_folder_path, "keywords.json")
-        json_backlinks_file = os.path.join(report_folder_path, "backlinks.json")
-        json_rankings_file = os.path.join(report_folder_path, "rankings.json")
-        json_llm_visibility_file = os.path.join(
-            report_folder_path, "llm_visibility.json"
-        )
 
-        # DEBUG: Logs para páginas
-        pages_dir = os.path.join(report_folder_path, "pages")
-        page_json_files = sorted(glob.glob(os.path.join(pages_dir, "page_*.json")))
+def render_comprehensive_pdf(artifacts, pdf_file_path, metadata=None):
+    """
+    Genera el PDF consolidado a partir de un ``ReportArtifacts`` en memoria
+    y lo escribe en ``pdf_file_path``.
+    """
+    try:
+        page_json_files = artifacts.names("pages/page_*.json")
         if not page_json_files:
             # Legacy fallback: report_*.json
-            page_json_files = sorted(
-                glob.glob(os.path.join(pages_dir, "report_*.json"))
-            )
-        logger.info(f"DEBUG: Buscando reportes de páginas en: {pages_dir}")
+            page_json_files = artifacts.names("pages/report_*.json")
         logger.info(
-            f"DEBUG: Encontrados {len(page_json_files)} archivos: {[os.path.basename(f) for f in page_json_files]}"
+            f"DEBUG: Encontrados {len(page_json_files)} reportes de páginas: {[os.path.basename(f) for f in page_json_files]}"
         )
 
         # Leer Markdown
-        markdown_text = ""
-        if os.path.exists(md_file):
-            with open(md_file, "r", encoding="utf-8") as f:
-                markdown_text = f.read()
+        markdown_text = artifacts.get("ag2_report.md") or ""
 
         # Leer Fix Plan
         try:
-            with open(json_fix_plan_file, "r", encoding="utf-8") as f:
-                fix_plan_data = json.load(f)
+            fix_plan_data = artifacts.read("fix_plan.json")
         except Exception:
             logger.warning("No se pudo leer fix_plan.json -> se usará lista vacía")
             fix_plan_data = []
 
         # Leer Aggregated Summary
         try:
-            with open(json_agg_summary_file, "r", encoding="utf-8") as f:
-                agg_summary_data = json.load(f)
+            agg_summary_data = artifacts.read("aggregated_summary.json")
         except Exception:
             logger.warning(
                 "No se pudo leer aggregated_summary.json -> se usará diccionario vacío"
@@ -1104,8 +1212,7 @@ def create_comprehensive_pdf(report_folder_path, metadata=None):
 
         # Leer PageSpeed
         try:
-            with open(json_pagespeed_file, "r", encoding="utf-8") as f:
-                pagespeed_data = json.load(f)
+            pagespeed_data = artifacts.read("pagespeed.json")
         except Exception:
             logger.warning(
                 "No se pudo leer pagespeed.json -> se usará diccionario vacío"
@@ -1114,29 +1221,25 @@ def create_comprehensive_pdf(report_folder_path, metadata=None):
 
         # Leer Keywords
         try:
-            with open(json_keywords_file, "r", encoding="utf-8") as f:
-                keywords_data = json.load(f)
+            keywords_data = artifacts.read("keywords.json")
         except Exception:
             keywords_data = []
 
         # Leer Backlinks
         try:
-            with open(json_backlinks_file, "r", encoding="utf-8") as f:
-                backlinks_data = json.load(f)
+            backlinks_data = artifacts.read("backlinks.json")
         except Exception:
             backlinks_data = []
 
         # Leer Rankings
         try:
-            with open(json_rankings_file, "r", encoding="utf-8") as f:
-                rankings_data = json.load(f)
+            rankings_data = artifacts.read("rankings.json")
         except Exception:
             rankings_data = []
 
         # Leer LLM Visibility
         try:
-            with open(json_llm_visibility_file, "r", encoding="utf-8") as f:
-                llm_visibility_data = json.load(f)
+            llm_visibility_data = artifacts.read("llm_visibility.json")
         except Exception:
             llm_visibility_data = []
 
@@ -1172,7 +1275,7 @@ def create_comprehensive_pdf(report_folder_path, metadata=None):
             else ""
         )
         cover_title = raw_cover_title or (
-            f"{report_title_prefix}\n{os.path.basename(report_folder_path)}"
+            f"{report_title_prefix}\n{artifacts.report_name}"
         )
 
         # --- Cover ---
@@ -1184,22 +1287,11 @@ def create_comprehensive_pdf(report_folder_path, metadata=None):
         )
 
         # --- Table of contents pages (placeholder, multi-page safe) ---
-        def _estimate_markdown_toc_entries(markdown: str) -> int:
-            if not markdown:
-                return 0
-            count = 0
-            for line in markdown.splitlines():
-                if re.match(r"^\s*#{1,4}\s+", line):
-                    count += 1
-            return count
-
         static_toc_entries = 0
         if not markdown_text:
             static_toc_entries += 1  # Executive Summary (Fallback)
-        pagespeed_analysis_file = os.path.join(
-            report_folder_path, "pagespeed_analysis.md"
-        )
-        if os.path.exists(pagespeed_analysis_file):
+        ps_analysis = artifacts.get("pagespeed_analysis.md") or ""
+        if ps_analysis:
             static_toc_entries += 1
 
         # Appendices and data sections
@@ -1222,7 +1314,7 @@ def create_comprehensive_pdf(report_folder_path, metadata=None):
         static_toc_entries += 1  # Appendix F
 
         toc_entry_estimate = (
-            _estimate_markdown_toc_entries(markdown_text) + static_toc_entries
+            pdf.count_markdown_headings(markdown_text) + static_toc_entries
         )
         toc_pages = pdf.estimate_toc_pages(toc_entry_estimate)
         for _ in range(max(1, toc_pages)):
@@ -1269,13 +1361,8 @@ def create_comprehensive_pdf(report_folder_path, metadata=None):
             pdf.ln(4)
 
         # --- PageSpeed analysis ---
-        pagespeed_analysis_file = os.path.join(
-            report_folder_path, "pagespeed_analysis.md"
-        )
-        if os.path.exists(pagespeed_analysis_file):
+        if ps_analysis:
             try:
-                with open(pagespeed_analysis_file, "r", encoding="utf-8") as f:
-                    ps_analysis = f.read()
                 pdf.add_page()
                 pdf.begin_section("Performance Analysis (PageSpeed Insights)", level=1)
                 pdf.write_markdown_text(ps_analysis)
@@ -1498,8 +1585,7 @@ def create_comprehensive_pdf(report_folder_path, metadata=None):
         page_summaries = []
         for page_file in page_json_files:
             try:
-                with open(page_file, "r", encoding="utf-8") as f:
-                    page_data = json.load(f)
+                page_data = artifacts.read(page_file)
                 logger.info(
                     f"DEBUG: Cargado {os.path.basename(page_file)}. Keys: {list(page_data.keys()) if isinstance(page_data, dict) else 'No dict'}"
                 )
@@ -1666,16 +1752,9 @@ def create_comprehensive_pdf(report_folder_path, metadata=None):
         pdf.add_page()
         pdf.begin_section("Appendix F: Detailed Competitor Analysis", level=1)
 
-        # Buscar archivos JSON de competidores
-        competitors_dir = os.path.join(report_folder_path, "competitors")
-        competitor_json_files = []
-
-        logger.info(f"DEBUG: Buscando competidores en: {competitors_dir}")
-
-        if os.path.isdir(competitors_dir):
-            competitor_json_files = sorted(
-                glob.glob(os.path.join(competitors_dir, "competitor_*.json"))
-            )
+        # Buscar JSON de competidores
+        competitor_json_files = artifacts.names("competitors/competitor_*.json")
+        if competitor_json_files:
             logger.info(
                 f"DEBUG: Encontrados {len(competitor_json_files)} competidores: {[os.path.basename(f) for f in competitor_json_files]}"
             )
@@ -1720,72 +1799,71 @@ def create_comprehensive_pdf(report_folder_path, metadata=None):
             competitor_map = {}
             for comp_file in competitor_json_files:
                 try:
-                    with open(comp_file, "r", encoding="utf-8") as f:
-                        comp_data = json.load(f)
+                    comp_data = artifacts.read(comp_file)
 
-                        # 1. Try to get domain from field
-                        raw_domain = comp_data.get("domain")
+                    # 1. Try to get domain from field
+                    raw_domain = comp_data.get("domain")
 
-                        # 2. If missing, extract from URL
-                        url = comp_data.get("url", "")
-
-                        if not raw_domain and url:
-                            from urllib.parse import urlparse
+                    # 2. If missing, extract from URL
+                    url = comp_data.get("url", "")
 
-                            # Handle cases where url is just "mercadolibre.cl" without scheme
-                            if "://" not in url:
-                                url_for_parse = "http://" + url
-                            else:
-                                url_for_parse = url
-                            raw_domain = urlparse(url_for_parse).netloc
-
-                        if not raw_domain:
-                            raw_domain = f"competitor_{len(competitor_map) + 1}"
-
-                        # 3. Normalize: lowercase, strip, remove www.
-                        normalized_key = raw_domain.lower().strip().replace("www.", "")
-
-                        # 4. Display domain (keep original casing or nicely formatted?)
-                        # We use raw_domain but maybe stripped of www for display
-                        display_domain = raw_domain.replace("www.", "")
-
-                        # 5. Deduplicate
-                        # If exists, keep the one with higher score or more data
-                        existing = competitor_map.get(normalized_key)
-                        current_score = comp_data.get("geo_score", None)
-                        if not isinstance(current_score, (int, float)):
-                            current_score = None
-                        if current_score is None or current_score == 0:
-                            try:
-                                from app.services.audit_service import CompetitorService
+                    if not raw_domain and url:
+                        from urllib.parse import urlparse
 
-                                current_score = CompetitorService._calculate_geo_score(
-                                    comp_data
-                                )
-                            except Exception:
-                                current_score = current_score or 0
+                        # Handle cases where url is just "mercadolibre.cl" without scheme
+                        if "://" not in url:
+                            url_for_parse = "http://" + url
+                        else:
+                            url_for_parse = url
+                        raw_domain = urlparse(url_for_parse).netloc
+
+                    if not raw_domain:
+                        raw_domain = f"competitor_{len(competitor_map) + 1}"
+
+                    # 3. Normalize: lowercase, strip, remove www.
+                    normalized_key = raw_domain.lower().strip().replace("www.", "")
+
+                    # 4. Display domain (keep original casing or nicely formatted?)
+                    # We use raw_domain but maybe stripped of www for display
+                    display_domain = raw_domain.replace("www.", "")
+
+                    # 5. Deduplicate
+                    # If exists, keep the one with higher score or more data
+                    existing = competitor_map.get(normalized_key)
+                    current_score = comp_data.get("geo_score", None)
+                    if not isinstance(current_score, (int, float)):
+                        current_score = None
+                    if current_score is None or current_score == 0:
+                        try:
+                            from app.services.audit_service import CompetitorService
 
-                        if existing:
-                            logger.info(
-                                f"Duplicate competitor found for key '{normalized_key}': {display_domain} vs {existing['domain']}"
+                            current_score = CompetitorService._calculate_geo_score(
+                                comp_data
                             )
-                            if current_score > existing["geo_score"]:
-                                # Update with better score
-                                competitor_map[normalized_key] = {
-                                    "domain": display_domain,
-                                    "geo_score": current_score,
-                                    "url": url,
-                                    "audit_data": comp_data.get(
-                                        "audit_data", {}
-                                    ),  # Keep audit data if needed later
-                                }
-                        else:
+                        except Exception:
+                            current_score = current_score or 0
+
+                    if existing:
+                        logger.info(
+                            f"Duplicate competitor found for key '{normalized_key}': {display_domain} vs {existing['domain']}"
+                        )
+                        if current_score > existing["geo_score"]:
+                            # Update with better score
                             competitor_map[normalized_key] = {
                                 "domain": display_domain,
                                 "geo_score": current_score,
                                 "url": url,
-                                "audit_data": comp_data.get("audit_data", {}),
+                                "audit_data": comp_data.get(
+                                    "audit_data", {}
+                                ),  # Keep audit data if needed later
                             }
+                    else:
+                        competitor_map[normalized_key] = {
+                            "domain": display_domain,
+                            "geo_score": current_score,
+                            "url": url,
+                            "audit_data": comp_data.get("audit_data", {}),
+                        }
 
                 except Exception as e:
                     logger.error(f"Error loading competitor {comp_file}: {e}")
@@ -1838,8 +1916,7 @@ def create_comprehensive_pdf(report_folder_path, metadata=None):
             # Individual competitor reports
             for i, comp_file in enumerate(competitor_json_files):
                 try:
-                    with open(comp_file, "r", encoding="utf-8") as f:
-                        comp_data = json.load(f)
+                    comp_data = artifacts.read(comp_file)
 
                     domain = comp_data.get("domain")
                     if not domain:
@@ -23,7 +23,6 @@ from app.core.logger import get_logger
 from app.models import Audit, GeoCommerceCampaign
 from app.services.audit_service import AuditService
 from app.services.competitive_intel_service import CompetitiveIntelService
-from app.services.pipeline_service import PipelineService
 from app.services.product_intelligence_service import ProductIntelligenceService
 from sqlalchemy.orm import Session
 
@@ -712,6 +711,8 @@ class GeoCommerceService:
     def _build_technical_watchouts(
         pagespeed_data: Dict[str, Any],
     ) -> List[Dict[str, str]]:
+        from app.services.pipeline_service import PipelineService
+
         watchouts: List[Dict[str, str]] = []
         for fix in PipelineService._extract_pagespeed_fixes(pagespeed_data)[:6]:
             issue_code = str(fix.get("issue_code") or "")
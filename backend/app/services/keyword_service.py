@@ -3,7 +3,6 @@ import logging
 import re
 from typing import Any, Dict, List
 
-from openai import AsyncOpenAI
 from sqlalchemy.orm import Session
 
 from ..core.config import settings
@@ -26,6 +25,8 @@ class KeywordService:
         # Primary: Usar Kimi vía NVIDIA
         self.nvidia_api_key = resolve_kimi_api_key()
         if self.nvidia_api_key:
+            from openai import AsyncOpenAI
+
             self.client = AsyncOpenAI(
                 api_key=self.nvidia_api_key,
                 base_url=settings.NV_BASE_URL,
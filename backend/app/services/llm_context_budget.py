@@ -0,0 +1,130 @@
+"""
+Presupuesto de contexto para prompts LLM.
+
+``ContextBudget`` serializa cada clave de primer nivel del contexto una sola vez
+y lleva su tamaño en tokens; al recortar (por prioridad) solo re-serializa las
+claves que tocó cada paso, en vez de volcar y medir el contexto completo tras
+cada reducción. El prompt final es el mismo JSON que ``json.dumps`` del
+contexto.
+
+``estimate_tokens`` usa tiktoken si está instalado y ``LLM_TOKENIZER_ENCODING``
+lo pide; si no, una estimación sin dependencias que pondera la puntuación
+estructural del JSON y los caracteres no ASCII en lugar de ``len // 4``.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:  # pragma: no cover - depende del entorno
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+CYCLE_MARKER = "<CYCLE_REF>"
+
+# Caracteres estructurales de JSON: casi siempre van en tokens propios o de a
+# dos (``": "``, ``"],``), mientras que el texto corrido rinde ~4 chars/token.
+_JSON_STRUCTURAL_BYTES = b'{}[]":,'
+_TEXT_CHARS_PER_TOKEN = 4
+_STRUCTURAL_CHARS_PER_TOKEN = 2
+# Bytes UTF-8 extra (acentos, ñ, emojis): BPE los parte en más tokens.
+_EXTRA_BYTES_PER_TOKEN = 2
+
+
+@lru_cache(maxsize=4)
+def _get_encoder(encoding_name: str):
+    if not encoding_name or not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as exc:
+        logger.warning(
+            f"Tokenizer '{encoding_name}' unavailable, using estimate: {exc}"
+        )
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoder = _get_encoder(str(getattr(settings, "LLM_TOKENIZER_ENCODING", "") or ""))
+    if encoder is not None:
+        return max(1, len(encoder.encode(text, disallowed_special=())))
+
+    # Solo pasadas en C sobre los bytes: medir no debe costar más que serializar.
+    data = text.encode("utf-8", "surrogatepass")
+    structural = len(data) - len(data.translate(None, _JSON_STRUCTURAL_BYTES))
+    extra_bytes = len(data) - len(text)
+    tokens = (
+        (len(text) - structural) / _TEXT_CHARS_PER_TOKEN
+        + structural / _STRUCTURAL_CHARS_PER_TOKEN
+        + extra_bytes / _EXTRA_BYTES_PER_TOKEN
+    )
+    return max(1, math.ceil(tokens))
+
+
+def strip_cycles(obj: Any, seen: Optional[set] = None) -> Any:
+    """Copia JSON-serializable; las referencias repetidas quedan como marcador."""
+    if seen is None:
+        seen = set()
+    obj_id = id(obj)
+    if obj_id in seen:
+        return CYCLE_MARKER
+    if isinstance(obj, dict):
+        seen.add(obj_id)
+        return {k: strip_cycles(v, seen) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        seen.add(obj_id)
+        return [strip_cycles(v, seen) for v in obj]
+    return obj
+
+
+class ContextBudget:
+    """
+    Contexto JSON con tamaño en tokens llevado por clave de primer nivel.
+
+    ``context`` es una copia (sin ciclos) que los reductores pueden modificar;
+    después de cada paso basta ``refresh(*claves_tocadas)``.
+    """
+
+    def __init__(self, context: Dict[str, Any], budget_tokens: int):
+        self.budget_tokens = budget_tokens
+        self.context: Dict[str, Any] = strip_cycles(context)
+        self._pieces: Dict[Any, Tuple[str, int]] = {}
+        self.refresh(*self.context.keys())
+
+    def refresh(self, *keys: Any) -> None:
+        for key in keys:
+            if key not in self.context:
+                self._pieces.pop(key, None)
+                continue
+            # '"clave": valor' tal cual lo escribe json.dumps del dict completo.
+            piece = json.dumps(
+                {key: self.context[key]}, ensure_ascii=False, default=str
+            )[1:-1]
+            self._pieces[key] = (piece, estimate_tokens(piece))
+
+    @property
+    def tokens(self) -> int:
+        # Llaves y separadores ", " entre claves.
+        return (
+            sum(tokens for _, tokens in self._pieces.values()) + len(self._pieces) + 1
+        )
+
+    def fits(self) -> bool:
+        return self.tokens <= self.budget_tokens
+
+    def render(self) -> str:
+        return "{" + ", ".join(self._pieces[key][0] for key in self.context) + "}"
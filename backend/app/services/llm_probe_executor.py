@@ -0,0 +1,165 @@
+"""
+llm_probe_executor.py - Ejecutor compartido de "probes" LLM para GEO.
+
+Citation tracking, query discovery y el análisis de citaciones de competidores
+lanzan decenas de prompts independientes contra el mismo LLM. Este ejecutor:
+
+- deduplica prompts idénticos dentro de una auditoría (y entre servicios),
+- los ejecuta con concurrencia acotada y rate limiting por proveedor,
+- devuelve las respuestas en el mismo orden de entrada.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.external_resilience import get_rate_limiter
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+LLMFunction = Callable[[str], Awaitable[str]]
+
+_executors: Dict[Tuple[int, int, str], "LLMProbeExecutor"] = {}
+_executors_lock = threading.Lock()
+
+
+def _prompt_key(prompt: str) -> str:
+    return " ".join(str(prompt or "").split())
+
+
+class LLMProbeExecutor:
+    """Ejecuta prompts con dedup, concurrencia acotada y rate limit del proveedor."""
+
+    def __init__(
+        self,
+        llm_function: LLMFunction,
+        *,
+        provider: str = "kimi",
+        max_concurrency: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.llm_function = llm_function
+        self.provider = provider
+        self.max_concurrency = max(
+            1, int(max_concurrency or settings.LLM_PROBE_MAX_CONCURRENCY)
+        )
+        self.ttl_seconds = float(
+            settings.LLM_PROBE_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self.limiter = get_rate_limiter(
+            f"llm:{provider}",
+            rate=float(settings.LLM_PROBE_RATE_PER_SECOND),
+            capacity=float(settings.LLM_PROBE_RATE_BURST),
+        )
+        self.last_used = time.monotonic()
+        self.calls = 0
+        self.dedup_hits = 0
+        self._results: Dict[str, str] = {}
+        self._inflight: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Task]] = {}
+        self._semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() - self.last_used > self.ttl_seconds
+
+    def _semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            # Un semáforo por loop: Celery crea un loop nuevo por tarea.
+            self._semaphores = {
+                known: sem
+                for known, sem in self._semaphores.items()
+                if not known.is_closed()
+            }
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def _call(self, prompt: str, semaphore: asyncio.Semaphore) -> str:
+        async with semaphore:
+            await self.limiter.acquire()
+            self.calls += 1
+            response = await self.llm_function(prompt)
+        return response if isinstance(response, str) else str(response or "")
+
+    async def probe(self, prompt: str) -> str:
+        """Respuesta del LLM para un prompt; reutiliza corridas idénticas."""
+        self.last_used = time.monotonic()
+        key = _prompt_key(prompt)
+        if key in self._results:
+            self.dedup_hits += 1
+            return self._results[key]
+
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[0] is loop:
+            self.dedup_hits += 1
+            return await asyncio.shield(inflight[1])
+
+        task = loop.create_task(self._call(prompt, self._semaphore(loop)))
+        self._inflight[key] = (loop, task)
+        try:
+            response = await asyncio.shield(task)
+        finally:
+            if self._inflight.get(key, (None, None))[1] is task:
+                self._inflight.pop(key, None)
+        # Solo se cachean respuestas exitosas; los errores se reintentan.
+        self._results[key] = response
+        return response
+
+    async def run(
+        self, prompts: List[str], return_exceptions: bool = True
+    ) -> List[Any]:
+        """
+        Ejecuta todos los prompts y devuelve las respuestas en orden de entrada.
+
+        Con ``return_exceptions`` los errores se devuelven en su posición en
+        lugar de cancelar el lote.
+        """
+        started = time.perf_counter()
+        responses = await asyncio.gather(
+            *(self.probe(prompt) for prompt in prompts),
+            return_exceptions=return_exceptions,
+        )
+        logger.info(
+            f"LLM probes: {len(prompts)} prompts, {self.calls} provider calls, "
+            f"{self.dedup_hits} dedup hits in {time.perf_counter() - started:.1f}s"
+        )
+        return list(responses)
+
+
+def get_probe_executor(
+    audit_id: Optional[int],
+    llm_function: LLMFunction,
+    *,
+    provider: str = "kimi",
+) -> LLMProbeExecutor:
+    """
+    Ejecutor compartido por auditoría y función LLM.
+
+    Los servicios de una misma auditoría que usan la misma función LLM
+    comparten respuestas; sin ``audit_id`` se crea un ejecutor aislado.
+    """
+    if audit_id is None:
+        return LLMProbeExecutor(llm_function, provider=provider)
+
+    key = (int(audit_id), id(llm_function), provider)
+    with _executors_lock:
+        for stale_key in [k for k, ex in _executors.items() if ex.expired]:
+            _executors.pop(stale_key, None)
+        executor = _executors.get(key)
+        if executor is None or executor.llm_function is not llm_function:
+            executor = LLMProbeExecutor(llm_function, provider=provider)
+            _executors[key] = executor
+        executor.last_used = time.monotonic()
+        return executor
+
+
+def clear_probe_executors() -> None:
+    with _executors_lock:
+        _executors.clear()
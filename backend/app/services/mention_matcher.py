@@ -0,0 +1,190 @@
+"""
+mention_matcher.py - Detección de menciones de marcas en respuestas de LLMs.
+
+Normaliza una sola vez (por auditoría) los nombres de marca, variantes de
+dominio y alias de la marca propia y de los competidores, y en cada respuesta
+pasa la versión en minúsculas una sola vez y busca cada término con
+``str.find`` (en C), devolviendo todas las menciones con su posición y el
+índice de oración (1 = primera). Las oraciones salen de una única lista de
+puntos por respuesta.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BRAND_KEY = "__brand__"
+
+_DOT_RE = re.compile(r"\.")
+
+
+def clean_domain(domain: str) -> str:
+    """Variante del dominio que se busca en texto libre (``www.acme.com`` -> ``acme``)."""
+    return (
+        (domain or "")
+        .replace("www.", "")
+        .replace(".com", "")
+        .replace(".io", "")
+        .strip()
+        .lower()
+    )
+
+
+@dataclass(frozen=True)
+class Mention:
+    key: str
+    term: str
+    start: int
+    end: int
+    sentence: int
+    # True si ``term`` es el nombre principal de la entidad (no dominio ni alias)
+    primary: bool = False
+
+
+@lru_cache(maxsize=64)
+def _compile(
+    entries: Tuple[Tuple[str, Tuple[str, ...]], ...],
+) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """Términos únicos (más largos primero) con las entidades que los usan."""
+    owners: Dict[str, List[str]] = {}
+    for key, terms in entries:
+        for term in terms:
+            keys = owners.setdefault(term, [])
+            if key not in keys:
+                keys.append(key)
+    terms = sorted(owners, key=lambda term: (-len(term), term))
+    return tuple((term, tuple(owners[term])) for term in terms)
+
+
+class MentionMatcher:
+    """Matcher multi-marca precompilado; ``scan`` recorre el texto una sola vez."""
+
+    def __init__(
+        self,
+        entities: Dict[str, Iterable[str]],
+        primary_terms: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            entities: clave de la entidad -> nombres, variantes de dominio y alias
+            primary_terms: clave -> nombre principal; sus menciones salen con
+                ``primary=True`` y ``first_mentions`` las prefiere
+        """
+        entries = []
+        for key, terms in entities.items():
+            cleaned = sorted(
+                {str(term).strip().lower() for term in terms if str(term or "").strip()}
+            )
+            entries.append((key, tuple(cleaned)))
+        self.keys = [key for key, _terms in entries]
+        self._terms = _compile(tuple(entries))
+        self._primary = {
+            (key, str(term).strip().lower())
+            for key, term in (primary_terms or {}).items()
+            if str(term or "").strip()
+        }
+
+    @classmethod
+    def for_brands(
+        cls,
+        brand_name: str,
+        domain: str,
+        competitor_domains: Iterable[str] = (),
+        aliases: Optional[Dict[str, Iterable[str]]] = None,
+    ) -> "MentionMatcher":
+        """
+        Matcher para la marca propia (``BRAND_KEY``) y cada dominio competidor.
+
+        Args:
+            aliases: alias extra por clave (``BRAND_KEY`` o dominio competidor)
+        """
+        aliases = aliases or {}
+        entities: Dict[str, List[str]] = {
+            BRAND_KEY: [brand_name, clean_domain(domain), *aliases.get(BRAND_KEY, ())]
+        }
+        primary_terms = {BRAND_KEY: brand_name}
+        for comp_domain in competitor_domains:
+            if comp_domain and comp_domain not in entities:
+                entities[comp_domain] = [
+                    clean_domain(comp_domain),
+                    *aliases.get(comp_domain, ()),
+                ]
+                primary_terms[comp_domain] = clean_domain(comp_domain)
+        return cls(entities, primary_terms)
+
+    def scan(self, text: str) -> List[Mention]:
+        """Todas las menciones del texto ordenadas por posición."""
+        if not text or not self._terms:
+            return []
+
+        lowered = text.lower()
+        dots: Optional[List[int]] = None
+        mentions = []
+        for term, keys in self._terms:
+            start = lowered.find(term)
+            if start < 0:
+                continue
+            if dots is None:
+                dots = [dot.start() for dot in _DOT_RE.finditer(text)]
+            while start >= 0:
+                sentence = bisect_left(dots, start) + 1
+                for key in keys:
+                    mentions.append(
+                        Mention(
+                            key,
+                            term,
+                            start,
+                            start + len(term),
+                            sentence,
+                            (key, term) in self._primary,
+                        )
+                    )
+                start = lowered.find(term, start + 1)
+        # Estable: en una misma posición queda primero el término más largo.
+        mentions.sort(key=lambda mention: mention.start)
+        return mentions
+
+    def first_mentions(self, text: str) -> Dict[str, Mention]:
+        """
+        Primera mención de cada entidad presente en el texto.
+
+        Si el nombre principal aparece se devuelve su primera mención aunque
+        un dominio o alias aparezca antes, como la búsqueda por nombre previa.
+        Solo busca el primer hit de cada término.
+        """
+        if not text or not self._terms:
+            return {}
+
+        lowered = text.lower()
+        # clave -> (primer hit de cualquier término, primer hit del principal)
+        hits: Dict[str, List[Optional[Tuple[int, str]]]] = {}
+        for term, keys in self._terms:
+            start = lowered.find(term)
+            if start < 0:
+                continue
+            for key in keys:
+                slot = hits.setdefault(key, [None, None])
+                # Términos de mayor a menor longitud: ante empate gana el largo.
+                if slot[0] is None or start < slot[0][0]:
+                    slot[0] = (start, term)
+                if (key, term) in self._primary:
+                    slot[1] = (start, term)
+
+        first: Dict[str, Mention] = {}
+        for key, (earliest, primary) in sorted(
+            hits.items(), key=lambda item: item[1][0][0]
+        ):
+            start, term = primary or earliest
+            first[key] = Mention(
+                key,
+                term,
+                start,
+                start + len(term),
+                text.count(".", 0, start) + 1,
+                primary is not None,
+            )
+        return first
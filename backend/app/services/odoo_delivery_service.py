@@ -21,7 +21,6 @@ from typing import Any, Dict, List, Optional
 from app.models import AIContentSuggestion, Audit
 from app.models.odoo import OdooConnection, OdooDraftAction, OdooSyncRun
 from app.services.audit_service import AuditService
-from app.services.geo_article_engine_service import GeoArticleEngineService
 from app.services.geo_commerce_service import GeoCommerceService
 from sqlalchemy.orm import Session
 
@@ -643,6 +642,8 @@ class OdooDeliveryService:
 
     @staticmethod
     async def build_plan(db: Session, audit: Audit) -> Dict[str, Any]:
+        from app.services.geo_article_engine_service import GeoArticleEngineService
+
         selected_connection = (
             db.query(OdooConnection)
             .filter(
@@ -404,19 +404,24 @@ class PageSpeedJobService:
         job: AuditPageSpeedJob | None = None,
         pdf_job: AuditPdfJob | None = None,
         pdf_report: Report | None = None,
+        pagespeed_progress: dict[str, Any] | None = None,
     ) -> None:
         from app.services.pdf_job_service import PDFJobService
 
-        AuditService.publish_artifact_event(
-            audit.id,
-            AuditService.build_artifact_payload(
-                audit,
-                pagespeed_job=job or PageSpeedJobService.get_job(db, audit.id),
-                pdf_job=pdf_job or PDFJobService.get_job(db, audit.id),
-                pdf_report=pdf_report
-                or PDFJobService.get_latest_pdf_report(db, audit.id),
-            ),
+        payload = AuditService.build_artifact_payload(
+            audit,
+            pagespeed_job=job or PageSpeedJobService.get_job(db, audit.id),
+            pdf_job=pdf_job or PDFJobService.get_job(db, audit.id),
+            pdf_report=pdf_report or PDFJobService.get_latest_pdf_report(db, audit.id),
         )
+        if pagespeed_progress is not None:
+            # Resultados parciales del muestreo multi-URL mientras el job corre.
+            payload["pagespeed_sample"] = pagespeed_progress
+            payload["pagespeed_message"] = (
+                f"PageSpeed sample: {pagespeed_progress.get('completed_runs', 0)}"
+                f"/{pagespeed_progress.get('total_runs', 0)} runs completed"
+            )
+        AuditService.publish_artifact_event(audit.id, payload)
 
     @staticmethod
     def queue_job(
@@ -684,6 +689,56 @@ class PageSpeedJobService:
                 exc,
             )
 
+    @staticmethod
+    async def _run_sampled_pagespeed(
+        db: Session,
+        audit: Audit,
+        job: AuditPageSpeedJob,
+        sample_size: int,
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """
+        Mide la URL auditada junto con una muestra de URLs representativas.
+
+        Retorna ``({"mobile", "desktop"} de la URL auditada, resumen del sitio)``;
+        cada run terminado se publica como progreso parcial del job.
+        """
+        from app.services.pagespeed_sampling_service import (
+            PageSpeedSamplingService,
+        )
+
+        if not settings.GOOGLE_PAGESPEED_API_KEY:
+            return {}, {}
+
+        base_url = str(audit.url)
+        sample_urls = PageSpeedSamplingService.select_sample_urls(
+            base_url,
+            PageSpeedSamplingService.candidate_urls(db, audit),
+            sample_size,
+        )
+        partial: dict[str, dict[str, Any]] = {"mobile": {}, "desktop": {}}
+
+        async def _publish_partial(url: str, strategy: str, payload: dict) -> None:
+            partial[strategy][url] = payload
+            PageSpeedJobService.publish_status_event(
+                db,
+                audit,
+                job=job,
+                pagespeed_progress=PageSpeedSamplingService.aggregate(
+                    partial, sample_urls
+                ),
+            )
+
+        results = await PageSpeedSamplingService.run_sample(
+            sample_urls,
+            settings.GOOGLE_PAGESPEED_API_KEY,
+            force_refresh=bool(job.force_refresh),
+            on_result=_publish_partial,
+        )
+        pagespeed_data = {
+            strategy: results[strategy].get(base_url) for strategy in partial
+        }
+        return pagespeed_data, PageSpeedSamplingService.aggregate(results, sample_urls)
+
     @staticmethod
     async def execute_job(db: Session, job_id: int) -> AuditPageSpeedJob:
         from app.core.llm_kimi import get_llm_function
@@ -728,16 +783,26 @@ class PageSpeedJobService:
                 else "both"
             )
 
-            if strategy == "both":
+            site_sample = None
+            sample_size = int(settings.PAGESPEED_SAMPLE_SIZE)
+            if strategy == "both" and sample_size > 1 and settings.ENABLE_PAGESPEED:
+                pagespeed_data, site_sample = (
+                    await PageSpeedJobService._run_sampled_pagespeed(
+                        db, audit, job, sample_size
+                    )
+                )
+            elif strategy == "both":
                 pagespeed_data = await PageSpeedService.analyze_both_strategies(
                     url=str(audit.url),
                     api_key=settings.GOOGLE_PAGESPEED_API_KEY,
+                    force_refresh=bool(job.force_refresh),
                 )
             else:
-                result = await PageSpeedService.analyze_url(
+                result = await PageSpeedService.analyze_url_cached(
                     url=str(audit.url),
                     api_key=settings.GOOGLE_PAGESPEED_API_KEY,
                     strategy=strategy,
+                    force_refresh=bool(job.force_refresh),
                 )
                 pagespeed_data = {strategy: result}
 
@@ -754,6 +819,8 @@ class PageSpeedJobService:
             merged_pagespeed = dict(audit.pagespeed_data or {})
             if successful_results:
                 merged_pagespeed.update(successful_results)
+                if site_sample is not None:
+                    merged_pagespeed["site_sample"] = site_sample
                 audit.pagespeed_data = merged_pagespeed
                 db.add(audit)
                 db.commit()
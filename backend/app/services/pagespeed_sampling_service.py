@@ -0,0 +1,204 @@
+"""
+Muestreo multi-URL de PageSpeed para métricas de rendimiento a nivel sitio.
+
+Selecciona N URLs representativas de una auditoría, las programa sobre una
+cola compartida (las llamadas a PSI pasan por el token bucket de
+``PageSpeedService``) y agrega percentiles de Core Web Vitals por grupo de
+path/template.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.logger import get_logger
+from ..models import Audit, AuditedPage
+from .pagespeed_service import PageSpeedService
+
+logger = get_logger(__name__)
+
+STRATEGIES = ("mobile", "desktop")
+PERCENTILES = (50, 75, 90)
+SITE_GROUP = "*"
+
+ResultCallback = Callable[[str, str, Dict[str, Any]], Awaitable[None]]
+
+
+def _metric_values(result: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    cwv = result.get("core_web_vitals") or {}
+    metrics = result.get("metrics") or {}
+    return {
+        "performance_score": result.get("performance_score"),
+        "lcp": cwv.get("lcp"),
+        "cls": cwv.get("cls"),
+        "fcp": cwv.get("fcp"),
+        "ttfb": cwv.get("ttfb"),
+        "tbt": metrics.get("tbt"),
+    }
+
+
+class PageSpeedSamplingService:
+    """Motor de muestreo PageSpeed por auditoría."""
+
+    @staticmethod
+    def candidate_urls(db: Session, audit: Audit) -> List[str]:
+        """URL auditada + páginas crawleadas/auditadas de la auditoría."""
+        rows = (
+            db.query(AuditedPage.url)
+            .filter(AuditedPage.audit_id == audit.id)
+            .order_by(AuditedPage.id)
+            .all()
+        )
+        urls = [str(audit.url)] + [row[0] for row in rows if row[0]]
+        return list(dict.fromkeys(urls))
+
+    @staticmethod
+    def select_sample_urls(
+        base_url: str, candidate_urls: List[str], max_sample: int
+    ) -> List[str]:
+        """Muestra representativa; la URL auditada siempre va primero."""
+        from .pipeline_service import PipelineService
+
+        others = [url for url in candidate_urls if url != base_url]
+        if max_sample <= 1 or not others:
+            return [base_url]
+        selected = PipelineService.select_important_urls(
+            others, base_url, max_sample=max_sample
+        )
+        return list(dict.fromkeys([base_url] + selected))[:max_sample]
+
+    @staticmethod
+    def path_group(url: str) -> str:
+        """Agrupa URLs por template: ``/``, ``/blog`` o ``/blog/*``."""
+        segments = [s for s in urlsplit(url).path.split("/") if s]
+        if not segments or segments[0].lower() in {"index.html", "index.htm"}:
+            return "/"
+        head = f"/{segments[0].lower()}"
+        return f"{head}/*" if len(segments) > 1 else head
+
+    @staticmethod
+    def percentile(values: List[float], pct: float) -> Optional[float]:
+        """Percentil con interpolación lineal (mismo criterio que numpy)."""
+        if not values:
+            return None
+        ordered = sorted(values)
+        rank = (len(ordered) - 1) * pct / 100
+        low = int(rank)
+        high = min(low + 1, len(ordered) - 1)
+        value = ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+        return round(value, 4)
+
+    @staticmethod
+    def aggregate(
+        results: Dict[str, Dict[str, Dict[str, Any]]], planned_urls: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Agrega percentiles de CWV por strategy y grupo de path.
+
+        Args:
+            results: {strategy: {url: payload de PageSpeedService.analyze_url}}
+            planned_urls: URLs de la muestra (para reportar progreso)
+        """
+        summary: Dict[str, Any] = {
+            "sampled_urls": list(planned_urls),
+            "groups": {
+                url: PageSpeedSamplingService.path_group(url) for url in planned_urls
+            },
+            "strategies": {},
+            "completed_runs": 0,
+            "failed_runs": 0,
+            "total_runs": len(planned_urls) * len(STRATEGIES),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        for strategy in STRATEGIES:
+            by_group: Dict[str, Dict[str, List[float]]] = {}
+            for url, payload in (results.get(strategy) or {}).items():
+                summary["completed_runs"] += 1
+                if not isinstance(payload, dict) or payload.get("error"):
+                    summary["failed_runs"] += 1
+                    continue
+                group = PageSpeedSamplingService.path_group(url)
+                for bucket in (group, SITE_GROUP):
+                    metrics = by_group.setdefault(bucket, {})
+                    for name, value in _metric_values(payload).items():
+                        if isinstance(value, (int, float)):
+                            metrics.setdefault(name, []).append(float(value))
+
+            strategy_summary = {}
+            for group, metrics in sorted(by_group.items()):
+                strategy_summary[group] = {
+                    "samples": max((len(v) for v in metrics.values()), default=0),
+                    **{
+                        name: {
+                            f"p{pct}": PageSpeedSamplingService.percentile(values, pct)
+                            for pct in PERCENTILES
+                        }
+                        for name, values in metrics.items()
+                    },
+                }
+            summary["strategies"][strategy] = strategy_summary
+
+        return summary
+
+    @staticmethod
+    async def run_sample(
+        urls: List[str],
+        api_key: Optional[str],
+        *,
+        concurrency: Optional[int] = None,
+        force_refresh: bool = False,
+        on_result: Optional[ResultCallback] = None,
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Ejecuta URL x strategy sobre una cola compartida con ``concurrency`` workers.
+
+        La cuota PSI la respeta el token bucket de PageSpeedService; los
+        resultados frescos de otras auditorías salen de su cache.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for url in urls:
+            for strategy in STRATEGIES:
+                queue.put_nowait((url, strategy))
+
+        results: Dict[str, Dict[str, Dict[str, Any]]] = {s: {} for s in STRATEGIES}
+        workers = max(
+            1,
+            min(
+                queue.qsize(),
+                int(concurrency or settings.PAGESPEED_SAMPLE_CONCURRENCY),
+            ),
+        )
+
+        async def _worker() -> None:
+            while True:
+                try:
+                    url, strategy = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    payload = await PageSpeedService.analyze_url_cached(
+                        url, api_key, strategy, force_refresh=force_refresh
+                    )
+                except Exception as exc:
+                    logger.warning(
+                        f"PageSpeed sample failed for {url} ({strategy}): {exc}"
+                    )
+                    payload = {"error": str(exc), "url": url, "strategy": strategy}
+                results[strategy][url] = payload
+                if on_result is not None:
+                    try:
+                        await on_result(url, strategy, payload)
+                    except Exception as exc:
+                        logger.warning(
+                            f"PageSpeed sample progress callback failed: {exc}"
+                        )
+
+        await asyncio.gather(*(_worker() for _ in range(workers)))
+        return results
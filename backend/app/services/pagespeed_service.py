@@ -1,9 +1,18 @@
+import asyncio
+import copy
+import hashlib
 import logging
-from typing import Dict, Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from urllib.parse import urldefrag, urlsplit, urlunsplit
 
 import aiohttp
 
 from ..core.config import settings
+from ..core.external_resilience import SharedTokenBucket, get_shared_rate_limiter
+from ..core.metrics import record_cache
+from .pagespeed_freshness import is_pagespeed_stale
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +65,59 @@ def _build_error_payload(
     return payload
 
 
+_PAGESPEED_CACHE_PREFIX = "pagespeed:result:"
+_LOCAL_CACHE_MAX_ENTRIES = 256
+
+# Fallback en proceso cuando Redis no está disponible.
+_local_result_cache: "OrderedDict[str, Dict]" = OrderedDict()
+_local_result_cache_lock = threading.Lock()
+# Corridas en curso por URL+strategy (solo se comparten dentro del mismo loop).
+_inflight_runs: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Task]] = {}
+
+
+def pagespeed_rate_limiter() -> SharedTokenBucket:
+    """
+    Token bucket de la cuota PSI compartido entre workers vía Redis.
+
+    Sin Redis cae al bucket en memoria y el límite pasa a ser por proceso.
+    """
+    shared_cache = _shared_cache()
+    return get_shared_rate_limiter(
+        "pagespeed",
+        rate=float(settings.PAGESPEED_RATE_PER_SECOND),
+        capacity=float(settings.PAGESPEED_RATE_BURST),
+        redis_client=shared_cache.redis_client if shared_cache else None,
+    )
+
+
+def pagespeed_cache_key(url: str, strategy: str) -> str:
+    """Clave URL+strategy; ignora fragmento y mayúsculas del host."""
+    parts = urlsplit(urldefrag(str(url).strip())[0])
+    normalized = urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path or "/",
+            parts.query,
+            "",
+        )
+    )
+    digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+    return f"{_PAGESPEED_CACHE_PREFIX}{strategy}:{digest}"
+
+
+def clear_pagespeed_cache() -> None:
+    """Vaciar el fallback en proceso (tests / mantenimiento)."""
+    with _local_result_cache_lock:
+        _local_result_cache.clear()
+
+
+def _shared_cache():
+    from .cache_service import cache
+
+    return cache if cache.enabled else None
+
+
 class PageSpeedService:
     BASE_URL = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
 
@@ -72,13 +134,12 @@ class PageSpeedService:
                 "GOOGLE_PAGESPEED_API_KEY is required for real analysis. Mock data is disabled."
             )
 
-        import asyncio
-
         max_retries = 3
         retry_delay = 5
 
         for attempt in range(max_retries):
             try:
+                await pagespeed_rate_limiter().acquire()
                 logger.info(
                     f"PageSpeed API call attempt {attempt+1}/{max_retries} for {url} ({strategy})"
                 )
@@ -457,15 +518,105 @@ class PageSpeedService:
                 )
 
     @staticmethod
-    async def analyze_both_strategies(url: str, api_key: Optional[str] = None) -> Dict:
-        """Analiza desktop y mobile"""
+    def get_cached_result(url: str, strategy: str) -> Optional[Dict]:
+        """Resultado cacheado de otra auditoría si sigue fresco, o None."""
+        key = pagespeed_cache_key(url, strategy)
+        shared = _shared_cache()
+        cached = shared.get(key) if shared else None
+        if cached is None:
+            with _local_result_cache_lock:
+                cached = copy.deepcopy(_local_result_cache.get(key))
+        if not isinstance(cached, dict) or is_pagespeed_stale(
+            {strategy: cached},
+            max_age_hours=int(settings.PAGESPEED_CACHE_MAX_AGE_HOURS),
+        ):
+            record_cache("pagespeed", hit=False)
+            return None
+        record_cache("pagespeed", hit=True)
+        return cached
+
+    @staticmethod
+    def store_cached_result(url: str, strategy: str, result: Dict) -> None:
+        # Errores y payloads sin fetch_time se consideran stale: no se cachean.
+        if not isinstance(result, dict) or is_pagespeed_stale(
+            {strategy: result},
+            max_age_hours=int(settings.PAGESPEED_CACHE_MAX_AGE_HOURS),
+        ):
+            return
+        key = pagespeed_cache_key(url, strategy)
+        shared = _shared_cache()
+        if shared:
+            shared.set(
+                key, result, ttl=int(settings.PAGESPEED_CACHE_MAX_AGE_HOURS) * 3600
+            )
+            return
+        with _local_result_cache_lock:
+            _local_result_cache[key] = copy.deepcopy(result)
+            _local_result_cache.move_to_end(key)
+            while len(_local_result_cache) > _LOCAL_CACHE_MAX_ENTRIES:
+                _local_result_cache.popitem(last=False)
+
+    @staticmethod
+    async def analyze_url_cached(
+        url: str,
+        api_key: Optional[str] = None,
+        strategy: str = "mobile",
+        force_refresh: bool = False,
+    ) -> Dict:
+        """
+        analyze_url con cache URL+strategy entre auditorías.
+
+        Dentro de la ventana de frescura (misma semántica que
+        ``is_pagespeed_stale``) se reutiliza el último Lighthouse run; corridas
+        concurrentes de la misma URL en el proceso comparten una sola llamada.
+        """
+        if not settings.PAGESPEED_CACHE_ENABLED:
+            return await PageSpeedService.analyze_url(url, api_key, strategy)
+
+        if not force_refresh:
+            cached = PageSpeedService.get_cached_result(url, strategy)
+            if cached is not None:
+                logger.info(f"PageSpeed cache hit for {url} ({strategy})")
+                return cached
+
+        key = pagespeed_cache_key(url, strategy)
+        loop = asyncio.get_running_loop()
+        inflight = _inflight_runs.get(key)
+        if inflight is not None and inflight[0] is loop and not inflight[1].done():
+            logger.info(f"Joining in-flight PageSpeed run for {url} ({strategy})")
+            return copy.deepcopy(await asyncio.shield(inflight[1]))
+
+        async def _run_and_store() -> Dict:
+            result = await PageSpeedService.analyze_url(url, api_key, strategy)
+            PageSpeedService.store_cached_result(url, strategy, result)
+            return result
+
+        task = loop.create_task(_run_and_store())
+        _inflight_runs[key] = (loop, task)
+        task.add_done_callback(
+            lambda done: (
+                _inflight_runs.pop(key, None)
+                if _inflight_runs.get(key, (None, None))[1] is done
+                else None
+            )
+        )
+        return copy.deepcopy(await asyncio.shield(task))
+
+    @staticmethod
+    async def analyze_both_strategies(
+        url: str, api_key: Optional[str] = None, force_refresh: bool = False
+    ) -> Dict:
+        """Analiza desktop y mobile en paralelo (el token bucket respeta la cuota PSI)"""
         if not settings.ENABLE_PAGESPEED or not api_key:
             logger.info("PageSpeed analysis disabled or no API key. Skipping.")
             return {}
 
-        import asyncio
-
-        mobile = await PageSpeedService.analyze_url(url, api_key, "mobile")
-        await asyncio.sleep(3)
-        desktop = await PageSpeedService.analyze_url(url, api_key, "desktop")
+        mobile, desktop = await asyncio.gather(
+            PageSpeedService.analyze_url_cached(
+                url, api_key, "mobile", force_refresh=force_refresh
+            ),
+            PageSpeedService.analyze_url_cached(
+                url, api_key, "desktop", force_refresh=force_refresh
+            ),
+        )
         return {"mobile": mobile, "desktop": desktop}
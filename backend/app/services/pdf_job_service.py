@@ -4,7 +4,9 @@ Persistent PDF job orchestration helpers.
 
 from __future__ import annotations
 
+import asyncio
 import re
+import time
 import uuid
 from datetime import UTC, datetime, timedelta
 from typing import Any, Iterable, Optional
@@ -96,6 +98,23 @@ def acquire_pdf_generation_lock(audit_id: int) -> tuple[bool, str | None, str |
     return True, token, "local"
 
 
+async def wait_for_pdf_generation_lock(
+    audit_id: int,
+    timeout_seconds: float,
+    poll_seconds: float = 1.0,
+) -> tuple[bool, str | None, str | None]:
+    """
+    Retry acquire_pdf_generation_lock until the current holder releases it or
+    the timeout expires. Used to coalesce concurrent generations of one audit.
+    """
+    deadline = time.monotonic() + max(0.0, float(timeout_seconds or 0.0))
+    acquired, token, mode = acquire_pdf_generation_lock(audit_id)
+    while not acquired and mode != "unavailable" and time.monotonic() < deadline:
+        await asyncio.sleep(poll_seconds)
+        acquired, token, mode = acquire_pdf_generation_lock(audit_id)
+    return acquired, token, mode
+
+
 def release_pdf_generation_lock(
     audit_id: int, token: str | None, mode: str | None
 ) -> None:
@@ -797,6 +816,28 @@ class PDFJobService:
         acquired_lock, lock_token, lock_mode = acquire_pdf_generation_lock(
             audit_id_for_lock
         )
+        if (
+            not acquired_lock
+            and lock_mode != "unavailable"
+            and settings.PDF_LOCK_COALESCE_WAIT_SECONDS > 0
+        ):
+            # Another worker is generating this audit's PDF: wait for it and
+            # reuse its result (or the render cache) instead of dropping the job.
+            acquired_lock, lock_token, lock_mode = await wait_for_pdf_generation_lock(
+                audit_id_for_lock, settings.PDF_LOCK_COALESCE_WAIT_SECONDS
+            )
+            if acquired_lock:
+                db.refresh(job)
+                if job.status == AuditPdfJobStatus.COMPLETED.value:
+                    release_pdf_generation_lock(
+                        audit_id_for_lock, lock_token, lock_mode
+                    )
+                    logger.info(
+                        "PDF job %s coalesced with a concurrent generation for audit %s",
+                        job_id,
+                        audit.id,
+                    )
+                    return job
         if not acquired_lock:
             if lock_mode == "unavailable":
                 error_code = "lock_unavailable"
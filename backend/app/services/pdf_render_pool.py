@@ -0,0 +1,233 @@
+"""
+Pool de procesos dedicado al render de PDFs.
+
+Renderizar un PDF es CPU-bound y su pico de memoria depende del reporte. Hacerlo
+dentro del hilo de la tarea (Celery o request) compite con el resto del trabajo
+del proceso y varios renders simultáneos disparan el RSS del nodo. El pool:
+
+- Mantiene workers de larga vida con fpdf2/fontTools ya importados y los caches
+  de bloques markdown / layouts de tabla de ``create_pdf`` calientes.
+- Acota la concurrencia (``PDF_RENDER_POOL_WORKERS``) por proceso. Cada hijo
+  prefork de Celery corre una tarea a la vez, así que ahí el pool tiene un solo
+  worker y el techo por nodo es la concurrencia del carril ``reports``.
+- Aplica un techo duro de memoria por worker (``RLIMIT_AS``); un render que lo
+  supera falla con ``PDFRenderPoolError`` en lugar de tumbar el proceso padre.
+- Recicla cada worker tras ``PDF_RENDER_MAX_TASKS_PER_WORKER`` renders para
+  devolver la memoria fragmentada.
+- Un render colgado que agota el timeout obliga a matar el executor entero; los
+  renders ajenos que estaban en vuelo se reintentan en el executor nuevo.
+
+Si el proceso no puede crear hijos (p.ej. procesos daemon), se renderiza inline.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+_WARMUP_MARKDOWN = "# Warmup\n\n| a | b |\n|---|---|\n| 1 | 2 |\n"
+
+
+class PDFRenderPoolError(RuntimeError):
+    """El render en el pool falló por timeout, memoria o worker caído."""
+
+
+def _apply_memory_limit(memory_limit_mb: int) -> None:
+    if memory_limit_mb <= 0:
+        return
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return
+    limit = int(memory_limit_mb) * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError) as e:
+        logger.warning(f"No se pudo aplicar limite de memoria al render de PDF: {e}")
+
+
+def _init_worker(memory_limit_mb: int) -> None:
+    """Inicializa un worker: carga el renderer y calienta fuentes y caches."""
+    from app.services import create_pdf
+
+    try:
+        pdf = create_pdf.PDFReport()
+        pdf.add_page()
+        pdf.write_markdown_text(_WARMUP_MARKDOWN)
+    except Exception as e:  # nosec B110 - el warmup nunca debe impedir renderizar
+        logger.debug(f"Warmup del render de PDF fallo: {e}")
+    _apply_memory_limit(memory_limit_mb)
+
+
+def _render_job(artifacts, output_path: str, metadata: Optional[Dict[str, Any]]):
+    from app.services.create_pdf import render_comprehensive_pdf
+
+    return render_comprehensive_pdf(artifacts, output_path, metadata=metadata)
+
+
+class PDFRenderPool:
+    """Pool de procesos de larga vida para ``create_pdf.render_comprehensive_pdf``."""
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        memory_limit_mb: int = 1536,
+        max_tasks_per_worker: int = 50,
+        start_method: str = "forkserver",
+        timeout_seconds: float = 300.0,
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self.memory_limit_mb = int(memory_limit_mb)
+        self.max_tasks_per_worker = max(1, int(max_tasks_per_worker))
+        self.start_method = start_method
+        self.timeout_seconds = timeout_seconds
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._inline_only = False
+        # Executors matados por el timeout de otro render.
+        self._killed_executors: "weakref.WeakSet" = weakref.WeakSet()
+
+    def _create_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        start_method = self.start_method
+        if start_method not in multiprocessing.get_all_start_methods():
+            start_method = "spawn"
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(self.memory_limit_mb,),
+            max_tasks_per_child=self.max_tasks_per_worker,
+        )
+
+    def _get_executor(self) -> Optional[concurrent.futures.ProcessPoolExecutor]:
+        with self._lock:
+            if self._inline_only:
+                return None
+            if self._executor is None:
+                try:
+                    self._executor = self._create_executor()
+                except (AssertionError, OSError, ValueError) as e:
+                    logger.warning(
+                        f"Pool de render de PDF no disponible, se renderiza inline: {e}"
+                    )
+                    self._inline_only = True
+                    return None
+            return self._executor
+
+    def _discard_executor(self, executor, kill: bool = False) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        if kill:
+            # Un worker colgado no se puede cancelar: se terminan los procesos.
+            # Se marca antes de matar para que los renders ajenos lo vean.
+            with self._lock:
+                self._killed_executors.add(executor)
+            for process in list(getattr(executor, "_processes", {}).values()):
+                try:
+                    process.terminate()
+                except Exception:  # nosec B110
+                    pass
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def render(
+        self,
+        artifacts,
+        output_path: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Renderiza el PDF en un worker del pool y devuelve ``output_path``."""
+        executor = self._get_executor()
+        if executor is None:
+            return _render_job(artifacts, output_path, metadata)
+
+        try:
+            future = executor.submit(_render_job, artifacts, output_path, metadata)
+        except (AssertionError, OSError) as e:
+            # p.ej. "daemonic processes are not allowed to have children"
+            logger.warning(
+                f"Pool de render de PDF no disponible, se renderiza inline: {e}"
+            )
+            self._discard_executor(executor)
+            with self._lock:
+                self._inline_only = True
+            return _render_job(artifacts, output_path, metadata)
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            return self.render(artifacts, output_path, metadata=metadata)
+
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except concurrent.futures.TimeoutError as e:
+            self._discard_executor(executor, kill=True)
+            raise PDFRenderPoolError(
+                f"PDF render exceeded {self.timeout_seconds}s"
+            ) from e
+        except MemoryError as e:
+            raise PDFRenderPoolError(
+                f"PDF render exceeded memory limit ({self.memory_limit_mb} MB)"
+            ) from e
+        except (BrokenProcessPool, concurrent.futures.CancelledError) as e:
+            with self._lock:
+                killed_by_timeout = executor in self._killed_executors
+            if killed_by_timeout:
+                # Otro render colgado se llevó el executor: este no tuvo la culpa.
+                logger.info("Reintentando render de PDF tras reciclar el pool")
+                return self.render(artifacts, output_path, metadata=metadata)
+            # El worker murió (OOM killer, segfault): se recrea en el próximo render.
+            self._discard_executor(executor)
+            raise PDFRenderPoolError("PDF render worker died") from e
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_pool: Optional[PDFRenderPool] = None
+_pool_lock = threading.Lock()
+_pool_pid: Optional[int] = None
+_pool_workers: Optional[int] = None
+
+
+def set_render_pool_workers(max_workers: Optional[int]) -> None:
+    """Fija el tamaño del pool de este proceso; ``None`` vuelve a la config."""
+    global _pool_workers
+    with _pool_lock:
+        _pool_workers = max_workers
+
+
+def get_render_pool() -> PDFRenderPool:
+    """Pool compartido del proceso actual (se recrea tras un fork)."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            from app.core.config import settings
+
+            _pool = PDFRenderPool(
+                max_workers=_pool_workers or settings.PDF_RENDER_POOL_WORKERS,
+                memory_limit_mb=settings.PDF_RENDER_MEMORY_LIMIT_MB,
+                max_tasks_per_worker=settings.PDF_RENDER_MAX_TASKS_PER_WORKER,
+                start_method=settings.PDF_RENDER_POOL_START_METHOD,
+                timeout_seconds=settings.PDF_RENDER_TIMEOUT_SECONDS,
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def shutdown_render_pool(wait: bool = True) -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None and _pool_pid == os.getpid():
+        pool.shutdown(wait=wait)
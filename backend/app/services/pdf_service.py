@@ -4,6 +4,7 @@ Servicio para la generaciÃ³n de reportes en PDF.
 
 import asyncio
 import hashlib
+import importlib.util
 import json
 import os
 import re
@@ -19,25 +20,40 @@ from ..core.config import settings
 from ..core.database import SessionLocal
 from ..core.llm_kimi import get_llm_function
 from ..core.logger import get_logger
+from ..core.metrics import record_cache
 from ..models import Audit, Report
 from .pagespeed_freshness import is_pagespeed_stale
+from .report_artifacts import ReportArtifacts
 
 logger = get_logger(__name__)
 
-# Importar create_comprehensive_pdf desde el mismo directorio de servicios
-try:
-    from .create_pdf import FPDF_AVAILABLE, create_comprehensive_pdf
+# create_pdf arrastra fpdf2/fontTools (~0.3s en frio): se importa al generar el
+# primer PDF y no al levantar la API o el worker.
+PDF_GENERATOR_AVAILABLE = importlib.util.find_spec("fpdf") is not None
+if not PDF_GENERATOR_AVAILABLE:
+    logger.warning("fpdf2 no esta instalado. PDFs no estaran disponibles.")
 
-    PDF_GENERATOR_AVAILABLE = FPDF_AVAILABLE
-except ImportError as e:
-    logger.warning(
-        f"No se pudo importar create_comprehensive_pdf: {e}. PDFs no estarÃ¡n disponibles."
-    )
-    PDF_GENERATOR_AVAILABLE = False
 
-    def create_comprehensive_pdf(report_folder_path, metadata=None):
-        logger.error("create_comprehensive_pdf no estÃ¡ disponible")
-        raise ImportError("create_pdf module not available")
+def create_comprehensive_pdf(report_folder_path, metadata=None):
+    try:
+        from .create_pdf import create_comprehensive_pdf as _create_comprehensive_pdf
+    except ImportError as e:
+        logger.error(f"No se pudo importar create_comprehensive_pdf: {e}")
+        raise ImportError("create_pdf module not available") from e
+    return _create_comprehensive_pdf(report_folder_path, metadata=metadata)
+
+
+def render_comprehensive_pdf(artifacts, output_path, metadata=None):
+    if settings.PDF_RENDER_POOL_ENABLED:
+        from .pdf_render_pool import get_render_pool
+
+        return get_render_pool().render(artifacts, output_path, metadata=metadata)
+    try:
+        from .create_pdf import render_comprehensive_pdf as _render_comprehensive_pdf
+    except ImportError as e:
+        logger.error(f"No se pudo importar render_comprehensive_pdf: {e}")
+        raise ImportError("create_pdf module not available") from e
+    return _render_comprehensive_pdf(artifacts, output_path, metadata=metadata)
 
 
 class PDFService:
@@ -45,6 +61,9 @@ class PDFService:
 
     REPORT_CONTEXT_PROMPT_VERSION = "report_generation_v2"
     REPORT_SIGNATURE_REPORT_TYPE = "REPORT_CONTEXT_SIGNATURE"
+    PDF_RENDER_KEY_REPORT_TYPE = "PDF_RENDER_KEY"
+    # Subir al cambiar la salida de create_pdf: invalida el cache de render.
+    PDF_RENDERER_VERSION = "create_pdf-2.21"
     PDF_KEYWORDS_CONTEXT_LIMIT = 30
     DETERMINISTIC_REPORT_MARKERS = (
         "full_deterministic_regenerated",
@@ -136,31 +155,6 @@ class PDFService:
             )
             return None
 
-    @staticmethod
-    def _clean_previous_pdf_artifacts(reports_dir: str) -> None:
-        """
-        Limpia artefactos previos para evitar mezcla entre corridas con mismo audit_id.
-        - pages/*.json
-        - competitors/*.json
-        - Reporte_Consolidado_*.pdf
-        """
-        import glob
-
-        patterns = [
-            os.path.join(reports_dir, "pages", "*.json"),
-            os.path.join(reports_dir, "competitors", "*.json"),
-            os.path.join(reports_dir, "Reporte_Consolidado_*.pdf"),
-        ]
-
-        for pattern in patterns:
-            for file_path in glob.glob(pattern):
-                try:
-                    os.remove(file_path)
-                except Exception as e:
-                    logger.warning(
-                        f"No se pudo limpiar artefacto previo {file_path}: {e}"
-                    )
-
     @staticmethod
     def _upload_pdf_to_supabase(audit_id: int, pdf_file_path: str) -> tuple[str, int]:
         if not settings.SUPABASE_URL or not settings.SUPABASE_SERVICE_ROLE_KEY:
@@ -172,18 +166,15 @@ class PDFService:
 
         from .supabase_service import SupabaseService
 
-        with open(pdf_file_path, "rb") as f:
-            file_content = f.read()
-
-        file_size = len(file_content)
         storage_path = f"audits/{audit_id}/report.pdf"
         logger.info(
             f"storage_provider=supabase audit_id={audit_id} action=upload_pdf storage_path={storage_path}"
         )
-        SupabaseService.upload_file(
+        # Upload en streaming desde disco (resumable para PDFs grandes)
+        file_size = SupabaseService.upload_path(
             bucket=settings.SUPABASE_STORAGE_BUCKET,
             path=storage_path,
-            file_content=file_content,
+            file_path=pdf_file_path,
             content_type="application/pdf",
         )
         return f"supabase://{storage_path}", file_size
@@ -210,6 +201,7 @@ class PDFService:
 
         repaired_path: Optional[str] = None
         repaired_size: Optional[int] = None
+        render_key_managed = False
 
         if existing_path and os.path.exists(existing_path):
             repaired_path, repaired_size = PDFService._upload_pdf_to_supabase(
@@ -234,6 +226,7 @@ class PDFService:
                 return_details=True,
             )
             repaired_path = generation_result.get("pdf_path")
+            render_key_managed = True
             file_size_raw = generation_result.get("file_size")
             try:
                 repaired_size = (
@@ -251,6 +244,11 @@ class PDFService:
             raise RuntimeError(
                 "PDF repair failed - expected Supabase storage path (supabase://...)."
             )
+        if not render_key_managed:
+            # El objeto en Storage se reemplazo fuera del render cache.
+            PDFService._save_report_marker(
+                audit.id, PDFService.PDF_RENDER_KEY_REPORT_TYPE, "", db=db
+            )
 
         if report is None:
             report = Report(
@@ -673,69 +671,144 @@ class PDFService:
                 except Exception as exc:
                     logger.warning(f"Could not read report signature cache: {exc}")
 
+        return PDFService._load_report_marker(
+            audit_id, PDFService.REPORT_SIGNATURE_REPORT_TYPE, db=db
+        )
+
+    @staticmethod
+    def _save_report_signature(audit_id: int, signature: str, db: Any = None) -> None:
+        if not signature:
+            return
+
+        if settings.AUDIT_LOCAL_ARTIFACTS_ENABLED:
+            signature_path = PDFService._report_context_signature_path(audit_id)
+            os.makedirs(os.path.dirname(signature_path), exist_ok=True)
+            try:
+                with open(signature_path, "w", encoding="utf-8") as f:
+                    f.write(signature)
+            except Exception as exc:
+                logger.warning(f"Could not persist report signature cache: {exc}")
+
+        PDFService._save_report_marker(
+            audit_id, PDFService.REPORT_SIGNATURE_REPORT_TYPE, signature, db=db
+        )
+
+    @staticmethod
+    def _load_report_marker(audit_id: int, report_type: str, db: Any = None) -> str:
+        """Lee un valor cacheado en una fila ``Report`` auxiliar (en ``file_path``)."""
         if db is None:
             return ""
 
         try:
             from ..models import Report
 
-            cached_signature = (
+            marker = (
                 db.query(Report)
                 .filter(
                     Report.audit_id == int(audit_id),
-                    Report.report_type == PDFService.REPORT_SIGNATURE_REPORT_TYPE,
+                    Report.report_type == report_type,
                 )
                 .order_by(Report.id.desc())
                 .first()
             )
-            if cached_signature and isinstance(cached_signature.file_path, str):
-                return cached_signature.file_path.strip()
+            if marker and isinstance(marker.file_path, str):
+                return marker.file_path.strip()
         except Exception as exc:
-            logger.warning(f"Could not read report signature cache from DB: {exc}")
+            logger.warning(f"Could not read {report_type} cache from DB: {exc}")
 
         return ""
 
     @staticmethod
-    def _save_report_signature(audit_id: int, signature: str, db: Any = None) -> None:
-        if not signature:
-            return
-
-        if settings.AUDIT_LOCAL_ARTIFACTS_ENABLED:
-            signature_path = PDFService._report_context_signature_path(audit_id)
-            os.makedirs(os.path.dirname(signature_path), exist_ok=True)
-            try:
-                with open(signature_path, "w", encoding="utf-8") as f:
-                    f.write(signature)
-            except Exception as exc:
-                logger.warning(f"Could not persist report signature cache: {exc}")
-
+    def _save_report_marker(
+        audit_id: int, report_type: str, value: str, db: Any = None
+    ) -> None:
         if db is None:
             return
 
         try:
             from ..models import Report
 
-            cached_signature = (
+            marker = (
                 db.query(Report)
                 .filter(
                     Report.audit_id == int(audit_id),
-                    Report.report_type == PDFService.REPORT_SIGNATURE_REPORT_TYPE,
+                    Report.report_type == report_type,
                 )
                 .order_by(Report.id.desc())
                 .first()
             )
-            if cached_signature is None:
-                cached_signature = Report(
+            if marker is None:
+                marker = Report(
                     audit_id=int(audit_id),
-                    report_type=PDFService.REPORT_SIGNATURE_REPORT_TYPE,
-                    file_path=signature,
+                    report_type=report_type,
+                    file_path=value,
                 )
-                db.add(cached_signature)
+                db.add(marker)
             else:
-                cached_signature.file_path = signature
+                marker.file_path = value
             db.flush()
         except Exception as exc:
-            logger.warning(f"Could not persist report signature cache in DB: {exc}")
+            logger.warning(f"Could not persist {report_type} cache in DB: {exc}")
+
+    @staticmethod
+    def _compute_pdf_render_key(
+        context_signature: str,
+        artifacts: ReportArtifacts,
+        metadata: Dict[str, str],
+    ) -> str:
+        """
+        Clave determinista del PDF: firma de contexto + hash del markdown +
+        version del renderer + hash de todos los artefactos y metadata.
+        """
+        if not context_signature:
+            return ""
+        markdown = str(artifacts.get("ag2_report.md") or "")
+        serialized = json.dumps(
+            {
+                "renderer_version": PDFService.PDF_RENDERER_VERSION,
+                "context_signature": context_signature,
+                "markdown_sha256": hashlib.sha256(markdown.encode("utf-8")).hexdigest(),
+                "artifacts_sha256": artifacts.digest(),
+                "metadata": metadata,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _find_cached_pdf_render(db: Any, audit_id: int, render_key: str):
+        """
+        Devuelve el ``Report`` PDF vigente si fue renderizado con ``render_key``
+        y el objeto sigue existiendo en Storage; si no, None.
+        """
+        if not render_key or db is None:
+            return None
+        saved_key = PDFService._load_report_marker(
+            audit_id, PDFService.PDF_RENDER_KEY_REPORT_TYPE, db=db
+        )
+        if saved_key != render_key:
+            return None
+
+        from .pdf_job_service import PDFJobService
+        from .supabase_service import SupabaseService
+
+        try:
+            report = PDFJobService.get_latest_pdf_report(db, int(audit_id))
+            file_path = str(getattr(report, "file_path", "") or "") if report else ""
+            if not file_path.startswith("supabase://"):
+                return None
+            if not SupabaseService.object_exists(
+                settings.SUPABASE_STORAGE_BUCKET,
+                file_path.replace("supabase://", "", 1),
+            ):
+                return None
+            return report
+        except Exception as exc:
+            logger.warning(
+                f"Could not validate cached PDF render for audit {audit_id}: {exc}"
+            )
+            return None
 
     @staticmethod
     def prewarm_report_signature(db: Any, audit_id: int) -> str:
@@ -2675,7 +2748,9 @@ class PDFService:
                 refreshed_pagespeed = await PDFService._run_stage_with_timeout(
                     stage_name="PageSpeed analysis",
                     coroutine_factory=lambda: PageSpeedService.analyze_both_strategies(
-                        url=str(audit.url), api_key=settings.GOOGLE_PAGESPEED_API_KEY
+                        url=str(audit.url),
+                        api_key=settings.GOOGLE_PAGESPEED_API_KEY,
+                        force_refresh=force_pagespeed_refresh,
                     ),
                     stage_timeout_seconds=pagespeed_timeout_seconds,
                     started_at=started_at,
@@ -3943,19 +4018,71 @@ class PDFService:
 
         logger.info(f"âœ“ Loaded {len(pages)} pages and {len(competitors)} competitors")
 
-        # 8. Generate PDF with complete context
-        pdf_path = await PDFService.generate_comprehensive_pdf(
-            audit=audit,
-            pages=pages,
-            competitors=competitors,
-            pagespeed_data=pagespeed_data,
-            keywords_data=keywords_data,
-            backlinks_data=backlinks_data,
-            rank_tracking_data=rank_tracking_data,
-            llm_visibility_data=llm_visibility_data,
-            report_markdown_override=report_markdown_for_pdf,
-        )
-        pdf_file_size = getattr(audit, "_generated_pdf_size_bytes", None)
+        # 8. Render cache: mismo contexto + markdown + renderer => mismo PDF.
+        # Solo para markdown cacheado o persistido (no fallbacks transitorios).
+        # Los artefactos de la clave se reutilizan para el render si no hay hit.
+        render_key = ""
+        cached_pdf_report = None
+        report_artifacts = None
+        if current_signature and (report_cache_hit or report_persisted):
+            try:
+                report_artifacts = PDFService._build_report_artifacts(
+                    audit=audit,
+                    pages=pages,
+                    competitors=competitors,
+                    pagespeed_data=pagespeed_data,
+                    keywords_data=keywords_data,
+                    backlinks_data=backlinks_data,
+                    rank_tracking_data=rank_tracking_data,
+                    llm_visibility_data=llm_visibility_data,
+                    report_markdown_override=report_markdown_for_pdf,
+                )
+                render_key = PDFService._compute_pdf_render_key(
+                    current_signature,
+                    report_artifacts,
+                    PDFService._build_pdf_metadata(audit),
+                )
+            except Exception as exc:
+                logger.warning(f"Could not compute PDF render cache key: {exc}")
+                render_key = ""
+            cached_pdf_report = PDFService._find_cached_pdf_render(
+                db, audit_id, render_key
+            )
+            if render_key:
+                record_cache("pdf_render", hit=cached_pdf_report is not None)
+
+        pdf_render_cache_hit = cached_pdf_report is not None
+        if pdf_render_cache_hit:
+            logger.info(
+                f"PDF render cache hit for audit {audit_id} (key={render_key[:12]}); "
+                "skipping render and upload."
+            )
+            pdf_path = str(cached_pdf_report.file_path)
+            pdf_file_size = cached_pdf_report.file_size
+        else:
+            # 8.1 Generate PDF with complete context
+            pdf_path = await PDFService.generate_comprehensive_pdf(
+                audit=audit,
+                pages=pages,
+                competitors=competitors,
+                pagespeed_data=pagespeed_data,
+                keywords_data=keywords_data,
+                backlinks_data=backlinks_data,
+                rank_tracking_data=rank_tracking_data,
+                llm_visibility_data=llm_visibility_data,
+                report_markdown_override=report_markdown_for_pdf,
+                artifacts=report_artifacts,
+            )
+            pdf_file_size = getattr(audit, "_generated_pdf_size_bytes", None)
+            # Todo render sobrescribe el mismo objeto: sin clave (fallback
+            # transitorio, clave no calculable) se limpia la del PDF anterior.
+            PDFService._save_report_marker(
+                audit_id,
+                PDFService.PDF_RENDER_KEY_REPORT_TYPE,
+                render_key if str(pdf_path).startswith("supabase://") else "",
+                db=db,
+            )
+            db.commit()
 
         total_elapsed = time.monotonic() - started_at
         logger.info(
@@ -3966,6 +4093,7 @@ class PDFService:
             return {
                 "pdf_path": pdf_path,
                 "report_cache_hit": report_cache_hit,
+                "pdf_render_cache_hit": pdf_render_cache_hit,
                 "report_regenerated": report_regenerated,
                 "report_persisted": report_persisted,
                 "generation_mode": generation_mode,
@@ -3977,6 +4105,148 @@ class PDFService:
             }
         return pdf_path
 
+    @staticmethod
+    def _build_report_artifacts(
+        audit: Audit,
+        pages: list,
+        competitors: list,
+        pagespeed_data: dict = None,
+        keywords_data: dict = None,
+        backlinks_data: dict = None,
+        rank_tracking_data: dict = None,
+        llm_visibility_data: list = None,
+        report_markdown_override: Optional[str] = None,
+    ) -> ReportArtifacts:
+        """Arma en memoria los artefactos que consume el renderer de PDF."""
+        artifacts = ReportArtifacts(str(audit.id))
+        report_markdown_value = (
+            report_markdown_override
+            if report_markdown_override is not None
+            else audit.report_markdown
+        )
+        report_markdown_value = PDFService._normalize_markdown_for_pdf_render(
+            report_markdown_value
+        )
+
+        # 1. Markdown report
+        if report_markdown_value:
+            artifacts.add("ag2_report.md", report_markdown_value)
+
+        # 2. fix_plan.json
+        if audit.fix_plan:
+            try:
+                artifacts.add(
+                    "fix_plan.json",
+                    (
+                        json.loads(audit.fix_plan)
+                        if isinstance(audit.fix_plan, str)
+                        else audit.fix_plan
+                    ),
+                )
+            except Exception as e:
+                logger.warning(f"No se pudo preparar fix_plan.json: {e}")
+
+        # 3. aggregated_summary.json (target audit)
+        if audit.target_audit:
+            try:
+                artifacts.add(
+                    "aggregated_summary.json",
+                    (
+                        json.loads(audit.target_audit)
+                        if isinstance(audit.target_audit, str)
+                        else audit.target_audit
+                    ),
+                )
+            except Exception as e:
+                logger.warning(f"No se pudo preparar aggregated_summary.json: {e}")
+
+        # 4. PageSpeed data
+        if pagespeed_data:
+            artifacts.add("pagespeed.json", pagespeed_data)
+
+        # 4.1 Keywords / 4.2 Backlinks / 4.3 Rankings: dict o lista
+        if keywords_data:
+            artifacts.add(
+                "keywords.json",
+                (
+                    keywords_data.get("keywords", keywords_data)
+                    if isinstance(keywords_data, dict)
+                    else keywords_data
+                ),
+            )
+        if backlinks_data:
+            artifacts.add(
+                "backlinks.json",
+                (
+                    backlinks_data.get("top_backlinks", backlinks_data)
+                    if isinstance(backlinks_data, dict)
+                    else backlinks_data
+                ),
+            )
+        if rank_tracking_data:
+            artifacts.add(
+                "rankings.json",
+                (
+                    rank_tracking_data.get("rankings", rank_tracking_data)
+                    if isinstance(rank_tracking_data, dict)
+                    else rank_tracking_data
+                ),
+            )
+
+        # 4.4 LLM Visibility data
+        if llm_visibility_data:
+            artifacts.add("llm_visibility.json", llm_visibility_data)
+
+        # 5. Páginas
+        for page in pages or []:
+            try:
+                artifacts.add(
+                    f"pages/page_{page.id}.json",
+                    {
+                        "url": page.url,
+                        "path": page.path,
+                        "overall_score": page.overall_score,
+                        "h1_score": page.h1_score,
+                        "structure_score": page.structure_score,
+                        "content_score": page.content_score,
+                        "eeat_score": page.eeat_score,
+                        "schema_score": page.schema_score,
+                        "critical_issues": page.critical_issues,
+                        "high_issues": page.high_issues,
+                        "medium_issues": page.medium_issues,
+                        "low_issues": page.low_issues,
+                        "audit_data": page.audit_data,
+                    },
+                )
+            except Exception as e:
+                logger.warning(f"No se pudo preparar datos de página {page.id}: {e}")
+
+        # 6. Competidores
+        for idx, comp in enumerate(competitors or []):
+            try:
+                comp_data = (
+                    dict(comp)
+                    if isinstance(comp, dict)
+                    else {
+                        "url": getattr(comp, "url", ""),
+                        "geo_score": getattr(comp, "geo_score", 0),
+                        "audit_data": getattr(comp, "audit_data", {}),
+                    }
+                )
+                # Extract domain from URL if not present
+                if "domain" not in comp_data:
+                    url = comp_data.get("url", "")
+                    if url:
+                        domain = urlparse(url).netloc.replace("www.", "")
+                    else:
+                        domain = f"competitor_{idx + 1}"
+                    comp_data["domain"] = domain
+                artifacts.add(f"competitors/competitor_{idx + 1}.json", comp_data)
+            except Exception as e:
+                logger.warning(f"No se pudo preparar datos de competidor {idx}: {e}")
+
+        return artifacts
+
     @staticmethod
     async def generate_comprehensive_pdf(
         audit: Audit,
@@ -3988,6 +4258,7 @@ class PDFService:
         rank_tracking_data: dict = None,
         llm_visibility_data: list = None,
         report_markdown_override: Optional[str] = None,
+        artifacts: Optional[ReportArtifacts] = None,
     ) -> str:
         """
         Genera un PDF completo con todos los datos de la auditorÃ­a:
@@ -4010,6 +4281,7 @@ class PDFService:
             rank_tracking_data: Datos de Rank Tracking (opcional)
             llm_visibility_data: Datos de LLM Visibility (opcional)
             report_markdown_override: Markdown report a renderizar sin persistirlo
+            artifacts: Artefactos ya construidos con estos mismos datos (opcional)
 
         Returns:
             La ruta completa al archivo PDF generado
@@ -4024,232 +4296,71 @@ class PDFService:
             f"Generando PDF completo para auditorÃ­a {audit.id} con todos los datos"
         )
 
-        reports_dir = tempfile.mkdtemp(prefix=f"audit_{audit.id}_")
-        try:
-            os.makedirs(reports_dir, exist_ok=True)
-            PDFService._clean_previous_pdf_artifacts(reports_dir)
-            report_markdown_value = (
-                report_markdown_override
-                if report_markdown_override is not None
-                else audit.report_markdown
-            )
-            report_markdown_value = PDFService._normalize_markdown_for_pdf_render(
-                report_markdown_value
+        # Los artefactos viajan en memoria hasta el renderer; el directorio
+        # temporal solo aloja el PDF resultante.
+        if artifacts is None:
+            artifacts = PDFService._build_report_artifacts(
+                audit=audit,
+                pages=pages,
+                competitors=competitors,
+                pagespeed_data=pagespeed_data,
+                keywords_data=keywords_data,
+                backlinks_data=backlinks_data,
+                rank_tracking_data=rank_tracking_data,
+                llm_visibility_data=llm_visibility_data,
+                report_markdown_override=report_markdown_override,
             )
 
-            # 1. Guardar markdown report
-            if report_markdown_value:
-                md_file_path = os.path.join(reports_dir, "ag2_report.md")
-                with open(md_file_path, "w", encoding="utf-8") as f:
-                    f.write(report_markdown_value)
-
-            # 2. Guardar fix_plan.json
-            if audit.fix_plan:
-                fix_plan_path = os.path.join(reports_dir, "fix_plan.json")
-                try:
-                    fix_plan_data = (
-                        json.loads(audit.fix_plan)
-                        if isinstance(audit.fix_plan, str)
-                        else audit.fix_plan
-                    )
-                    with open(fix_plan_path, "w", encoding="utf-8") as f:
-                        json.dump(fix_plan_data, f, indent=2, ensure_ascii=False)
-                except Exception as e:
-                    logger.warning(f"No se pudo guardar fix_plan.json: {e}")
-
-            # 3. Guardar aggregated_summary.json (target audit)
-            if audit.target_audit:
-                agg_summary_path = os.path.join(reports_dir, "aggregated_summary.json")
-                try:
-                    target_audit_data = (
-                        json.loads(audit.target_audit)
-                        if isinstance(audit.target_audit, str)
-                        else audit.target_audit
-                    )
-                    with open(agg_summary_path, "w", encoding="utf-8") as f:
-                        json.dump(target_audit_data, f, indent=2, ensure_ascii=False)
-                except Exception as e:
-                    logger.warning(f"No se pudo guardar aggregated_summary.json: {e}")
-
-            # 4. Guardar PageSpeed data
-            if pagespeed_data:
-                pagespeed_path = os.path.join(reports_dir, "pagespeed.json")
-                try:
-                    with open(pagespeed_path, "w", encoding="utf-8") as f:
-                        json.dump(pagespeed_data, f, indent=2, ensure_ascii=False)
-                except Exception as e:
-                    logger.warning(f"No se pudo guardar pagespeed.json: {e}")
+        debug_dir = (settings.PDF_DEBUG_ARTIFACTS_DIR or "").strip()
+        if debug_dir:
+            try:
+                artifacts.write_folder(os.path.join(debug_dir, f"audit_{audit.id}"))
+            except Exception as e:
+                logger.warning(f"No se pudo volcar artefactos de depuración: {e}")
 
-            # 4.1 Guardar Keywords data
-            if keywords_data:
-                keywords_path = os.path.join(reports_dir, "keywords.json")
-                try:
-                    # keywords_data can be a dict or a list
-                    data_to_save = (
-                        keywords_data.get("keywords", keywords_data)
-                        if isinstance(keywords_data, dict)
-                        else keywords_data
+        reports_dir = tempfile.mkdtemp(prefix=f"audit_{audit.id}_")
+        try:
+            # 7. Generar PDF directo desde memoria
+            pdf_file_path = os.path.join(
+                reports_dir, f"Reporte_Consolidado_{audit.id}.pdf"
+            )
+            try:
+                # Render fuera del event loop (en el pool de procesos si esta activo)
+                generated_pdf_path = await asyncio.to_thread(
+                    render_comprehensive_pdf,
+                    artifacts,
+                    pdf_file_path,
+                    metadata=PDFService._build_pdf_metadata(audit),
+                )
+                if not os.path.exists(pdf_file_path):
+                    logger.error(
+                        "No generated PDF found for audit %s. expected=%s returned_path=%s",
+                        audit.id,
+                        pdf_file_path,
+                        generated_pdf_path,
                     )
-                    with open(keywords_path, "w", encoding="utf-8") as f:
-                        json.dump(data_to_save, f, indent=2, ensure_ascii=False)
-                except Exception as e:
-                    logger.warning(f"No se pudo guardar keywords.json: {e}")
+                    raise FileNotFoundError("PDF file not generated")
 
-            # 4.2 Guardar Backlinks data
-            if backlinks_data:
-                backlinks_path = os.path.join(reports_dir, "backlinks.json")
+                logger.info(f"PDF completo generado en: {pdf_file_path}")
                 try:
-                    # backlinks_data can be a dict or a list
-                    data_to_save = (
-                        backlinks_data.get("top_backlinks", backlinks_data)
-                        if isinstance(backlinks_data, dict)
-                        else backlinks_data
+                    supabase_path, pdf_size = PDFService._upload_pdf_to_supabase(
+                        audit_id=audit.id, pdf_file_path=pdf_file_path
                     )
-                    with open(backlinks_path, "w", encoding="utf-8") as f:
-                        json.dump(data_to_save, f, indent=2, ensure_ascii=False)
-                except Exception as e:
-                    logger.warning(f"No se pudo guardar backlinks.json: {e}")
-
-            # 4.3 Guardar Rankings data
-            if rank_tracking_data:
-                rankings_path = os.path.join(reports_dir, "rankings.json")
-                try:
-                    # rank_tracking_data can be a dict or a list
-                    data_to_save = (
-                        rank_tracking_data.get("rankings", rank_tracking_data)
-                        if isinstance(rank_tracking_data, dict)
-                        else rank_tracking_data
+                    setattr(audit, "_generated_pdf_size_bytes", pdf_size)
+                    logger.info(
+                        f"storage_provider=supabase audit_id={audit.id} action=upload_pdf_ok size={pdf_size}"
                     )
-                    with open(rankings_path, "w", encoding="utf-8") as f:
-                        json.dump(data_to_save, f, indent=2, ensure_ascii=False)
-                except Exception as e:
-                    logger.warning(f"No se pudo guardar rankings.json: {e}")
-
-            # 4.4 Guardar LLM Visibility data
-            if llm_visibility_data:
-                visibility_path = os.path.join(reports_dir, "llm_visibility.json")
-                try:
-                    with open(visibility_path, "w", encoding="utf-8") as f:
-                        json.dump(llm_visibility_data, f, indent=2, ensure_ascii=False)
-                except Exception as e:
-                    logger.warning(f"No se pudo guardar llm_visibility.json: {e}")
-
-            # 5. Guardar datos de pÃ¡ginas
-            if pages:
-                pages_dir = os.path.join(reports_dir, "pages")
-                os.makedirs(pages_dir, exist_ok=True)
-                for page in pages:
-                    try:
-                        page_data = {
-                            "url": page.url,
-                            "path": page.path,
-                            "overall_score": page.overall_score,
-                            "h1_score": page.h1_score,
-                            "structure_score": page.structure_score,
-                            "content_score": page.content_score,
-                            "eeat_score": page.eeat_score,
-                            "schema_score": page.schema_score,
-                            "critical_issues": page.critical_issues,
-                            "high_issues": page.high_issues,
-                            "medium_issues": page.medium_issues,
-                            "low_issues": page.low_issues,
-                            "audit_data": page.audit_data,
-                        }
-                        page_filename = f"page_{page.id}.json"
-                        page_path = os.path.join(pages_dir, page_filename)
-                        with open(page_path, "w", encoding="utf-8") as f:
-                            json.dump(page_data, f, indent=2, ensure_ascii=False)
-                    except Exception as e:
-                        logger.warning(
-                            f"No se pudo guardar datos de pÃ¡gina {page.id}: {e}"
-                        )
-
-            # 6. Guardar datos de competidores
-            if competitors:
-                competitors_dir = os.path.join(reports_dir, "competitors")
-                os.makedirs(competitors_dir, exist_ok=True)
-                for idx, comp in enumerate(competitors):
-                    try:
-                        comp_data = (
-                            comp
-                            if isinstance(comp, dict)
-                            else {
-                                "url": getattr(comp, "url", ""),
-                                "geo_score": getattr(comp, "geo_score", 0),
-                                "audit_data": getattr(comp, "audit_data", {}),
-                            }
-                        )
-                        # Extract domain from URL if not present
-                        if "domain" not in comp_data:
-                            from urllib.parse import urlparse
-
-                            url = comp_data.get("url", "")
-                            if url:
-                                domain = urlparse(url).netloc.replace("www.", "")
-                            else:
-                                domain = f"competitor_{idx + 1}"
-                            comp_data["domain"] = domain
-                        comp_filename = f"competitor_{idx + 1}.json"
-                        comp_path = os.path.join(competitors_dir, comp_filename)
-                        with open(comp_path, "w", encoding="utf-8") as f:
-                            json.dump(comp_data, f, indent=2, ensure_ascii=False)
-                    except Exception as e:
-                        logger.warning(
-                            f"No se pudo guardar datos de competidor {idx}: {e}"
-                        )
-
-            # 7. Generar PDF con create_comprehensive_pdf
-            try:
-                generated_pdf_path = create_comprehensive_pdf(
-                    reports_dir, metadata=PDFService._build_pdf_metadata(audit)
-                )
-
-                pdf_file_path = None
-                if isinstance(generated_pdf_path, str) and generated_pdf_path.strip():
-                    candidate_path = generated_pdf_path.strip()
-                    if os.path.exists(candidate_path):
-                        pdf_file_path = candidate_path
-
-                if pdf_file_path is None:
-                    import glob
-
-                    pdf_files = glob.glob(
-                        os.path.join(reports_dir, "Reporte_Consolidado_*.pdf")
+                    return supabase_path
+                except Exception as upload_err:
+                    logger.error(
+                        f"storage_provider=supabase audit_id={audit.id} action=upload_pdf_failed error_code=supabase_upload_failed error={upload_err}"
                     )
-                    if pdf_files:
-                        pdf_file_path = pdf_files[0]
-
-                if pdf_file_path:
-                    logger.info(f"PDF completo generado en: {pdf_file_path}")
-                    try:
-                        supabase_path, pdf_size = PDFService._upload_pdf_to_supabase(
-                            audit_id=audit.id, pdf_file_path=pdf_file_path
-                        )
-                        setattr(audit, "_generated_pdf_size_bytes", pdf_size)
-                        logger.info(
-                            f"storage_provider=supabase audit_id={audit.id} action=upload_pdf_ok size={pdf_size}"
-                        )
-                        return supabase_path
-                    except Exception as upload_err:
-                        logger.error(
-                            f"storage_provider=supabase audit_id={audit.id} action=upload_pdf_failed error_code=supabase_upload_failed error={upload_err}"
-                        )
-                        raise RuntimeError(
-                            "Error subiendo PDF a Supabase Storage."
-                        ) from upload_err
-
-                temp_dir_listing = sorted(os.listdir(reports_dir))
-                logger.error(
-                    "No generated PDF found for audit %s in %s. returned_path=%s contents=%s",
-                    audit.id,
-                    reports_dir,
-                    generated_pdf_path,
-                    temp_dir_listing,
-                )
-                raise FileNotFoundError("PDF file not generated")
+                    raise RuntimeError(
+                        "Error subiendo PDF a Supabase Storage."
+                    ) from upload_err
             except Exception as e:
                 logger.error(
-                    f"Error generando PDF con create_comprehensive_pdf: {e}",
+                    f"Error generando PDF con render_comprehensive_pdf: {e}",
                     exc_info=True,
                 )
                 raise
@@ -23,7 +23,7 @@ import json
 import logging
 import math
 import re
-import unicodedata
+import time
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
@@ -32,9 +32,23 @@ import aiohttp
 
 from ..core.config import settings
 from ..core.external_resilience import run_external_call
+from ..core.metrics import record_crawl, stage_timer, with_llm_prompt
+from .competitor_lexicon import (
+    ALNUM_RE,
+    GENERIC_BUSINESS_TERMS,
+    TOKEN_RE,
+    WORD_RE,
+    CompetitorLexicon,
+    first_banned_term,
+    token_root,
+    transactional_intent_roots,
+    weak_support_roots,
+)
+from .llm_context_budget import ContextBudget, estimate_tokens
 
 # Importar PromptLoader
 from .prompt_loader import get_prompt_loader
+from .summary_aggregator import SummaryAggregator
 
 logger = logging.getLogger(__name__)
 
@@ -117,6 +131,7 @@ class PipelineService:
         )
 
     @classmethod
+    @with_llm_prompt("pagespeed_analysis")
     async def generate_pagespeed_analysis(
         cls, pagespeed_data: Dict[str, Any], llm_function: callable
     ) -> str:
@@ -352,6 +367,7 @@ class PipelineService:
         end = match.end() + next_match.start() if next_match else len(text)
         return text[start:end].strip()
 
+    @with_llm_prompt("report_section_expansion")
     async def _expand_report_sections(
         self,
         report_markdown: str,
@@ -519,6 +535,7 @@ class PipelineService:
 
         return self._merge_report_sections(preamble, sections)
 
+    @with_llm_prompt("report_generation")
     async def _generate_report_impl(
         self,
         target_audit: Dict[str, Any],
@@ -914,518 +931,23 @@ class PipelineService:
         if not summaries:
             return {"error": "No summaries provided"}
 
-        def get_path_from_url(url_str, base_url_str):
-            if not url_str:
-                return "/"
-
-            raw = str(url_str).strip()
-            if not raw:
-                return "/"
-
-            def _canonical_host(value: str) -> str:
-                if not value:
-                    return ""
-                try:
-                    parsed_value = urlparse(
-                        value if "://" in value else f"https://{value}"
-                    )
-                except Exception:
-                    return ""
-                host_value = (parsed_value.hostname or "").lower()
-                if host_value.startswith("www."):
-                    host_value = host_value[4:]
-                return host_value
-
-            base_host = _canonical_host(str(base_url_str or "").strip())
-            path = ""
-
-            if raw.startswith("/"):
-                path = raw
-            else:
-                try:
-                    parsed = urlparse(raw if "://" in raw else f"https://{raw}")
-                except Exception:
-                    parsed = None
-
-                parsed_host = ""
-                if parsed is not None:
-                    parsed_host = (parsed.hostname or "").lower()
-                    if parsed_host.startswith("www."):
-                        parsed_host = parsed_host[4:]
-                    path = parsed.path or ""
-
-                # Valores malformados como "root-house./services" deben conservar
-                # solo la parte de ruta, nunca el host residual.
-                if (
-                    base_host
-                    and parsed_host
-                    and parsed_host != base_host
-                    and "://" not in raw
-                    and "/" in raw
-                ):
-                    path = f"/{raw.split('/', 1)[1]}"
-
-            if not path:
-                if raw.startswith("/"):
-                    path = raw
-                elif "://" not in raw and "/" in raw:
-                    path = f"/{raw.split('/', 1)[1]}"
-                else:
-                    path = "/"
-
-            path = path.split("?", 1)[0].split("#", 1)[0].strip() or "/"
-            if not path.startswith("/"):
-                path = f"/{path}"
-            path = re.sub(r"/{2,}", "/", path)
-            return path or "/"
-
-        if len(summaries) == 1:
-            s = summaries[0]
-            s["audited_page_paths"] = [get_path_from_url(s["url"], base_url)]
-            return s
-
-        logger.info(f"Agregando {len(summaries)} resúmenes de auditoría...")
-
-        pages_with_h1_pass = [
-            get_path_from_url(s["url"], base_url)
-            for s in summaries
-            if s["structure"]["h1_check"]["status"] == "pass"
-        ]
-        pages_missing_h1 = [
-            get_path_from_url(s["url"], base_url)
-            for s in summaries
-            if s["structure"]["h1_check"]["status"] != "pass"
-        ]
-        pages_with_author = [
-            get_path_from_url(s["url"], base_url)
-            for s in summaries
-            if s["eeat"]["author_presence"]["status"] == "pass"
-        ]
-        pages_with_schema = [
-            get_path_from_url(s["url"], base_url)
-            for s in summaries
-            if s["schema"]["schema_presence"]["status"] == "present"
-        ]
-        pages_with_faqs = [
-            get_path_from_url(s["url"], base_url)
-            for s in summaries
-            if s["content"]["question_targeting"]["status"] == "pass"
-        ]
-
-        header_hierarchy_issues = []
-        long_paragraph_issues = [
-            get_path_from_url(s["url"], base_url)
-            for s in summaries
-            if "long_paragraphs=" in s["content"]["fragment_clarity"]["details"]
-            and int(s["content"]["fragment_clarity"]["details"].split("=")[-1]) > 0
-        ]
-        author_missing_issues = [
-            get_path_from_url(s["url"], base_url)
-            for s in summaries
-            if s["eeat"]["author_presence"]["status"] != "pass"
-        ]
-        freshness_missing_issues = [
-            get_path_from_url(s["url"], base_url)
-            for s in summaries
-            if not s["eeat"]["content_freshness"]["dates_found"]
-        ]
-        no_authoritative_links = [
-            get_path_from_url(s["url"], base_url)
-            for s in summaries
-            if s["eeat"]["citations_and_sources"]["authoritative_links"] == 0
-        ]
-
-        all_schema_types = set()
-        all_raw_jsonld = []
-        all_h1s = []
-        homepage_h1_status = None
-        homepage_h1_example = None
-        homepage_h1_count = None
-        all_meta_robots = set()
-        total_external = 0
-        total_authoritative = 0
-        total_lists = 0
-        total_tables = 0
-
-        for s in summaries:
-            path = get_path_from_url(s["url"], base_url)
-            all_schema_types.update(s["schema"]["schema_types"])
-            if s["schema"].get("raw_jsonld"):
-                all_raw_jsonld.append(
-                    {
-                        "page_path": path,
-                        "raw_json": (
-                            s["schema"]["raw_jsonld"][0]
-                            if s["schema"]["raw_jsonld"]
-                            else "{}"
-                        ),
-                    }
-                )
-
-            h1_details = s["structure"]["h1_check"].get("details", {})
-            if h1_details:
-                all_h1s.append(
-                    f"[{path}] -> H1: {h1_details.get('example', 'N/A')} (Count: {h1_details.get('count', 0)})"
-                )
-            if path == "/":
-                homepage_h1_status = s["structure"]["h1_check"].get("status")
-                homepage_h1_example = h1_details.get("example") if h1_details else None
-                homepage_h1_count = h1_details.get("count") if h1_details else None
-            if s.get("meta_robots"):
-                all_meta_robots.add(s["meta_robots"])
-
-            total_external += s["eeat"]["citations_and_sources"]["external_links"]
-            total_authoritative += s["eeat"]["citations_and_sources"][
-                "authoritative_links"
-            ]
-            total_lists += s["structure"]["list_usage"]["count"]
-            total_tables += s["structure"]["table_usage"]["count"]
-
-            if s["structure"]["header_hierarchy"]["issues"]:
-                first_issue = s["structure"]["header_hierarchy"]["issues"][0]
-                header_hierarchy_issues.append(
-                    {
-                        "page_path": path,
-                        "prev_tag_html": first_issue.get("prev_tag_html"),
-                        "current_tag_html": first_issue.get("current_tag_html"),
-                    }
-                )
-
-        avg_semantic_score = round(
-            sum(s["structure"]["semantic_html"]["score_percent"] for s in summaries)
-            / len(summaries),
-            1,
-        )
-        avg_conversational = round(
-            sum(s["content"]["conversational_tone"]["score"] for s in summaries)
-            / len(summaries),
-            1,
-        )
-
-        h1_status = "pass" if len(pages_with_h1_pass) == len(summaries) else "warn"
-        if homepage_h1_status and homepage_h1_status != "pass":
-            h1_status = "fail"
-
-        aggregated = {
-            "url": f"SITE-WIDE AGGREGATE: {base_url}",
-            "status": 200,
-            "content_type": "aggregate/json",
-            "generated_at": summaries[0]["generated_at"],
-            "audited_pages_count": len(summaries),
-            "audited_page_paths": [
-                get_path_from_url(s["url"], base_url) for s in summaries
-            ],
-            "structure": {
-                "h1_check": {
-                    "status": h1_status,
-                    "details": f"{len(pages_with_h1_pass)}/{len(summaries)} pages have a valid H1.",
-                    "pages_pass": pages_with_h1_pass,
-                    "pages_missing": pages_missing_h1,
-                    "homepage_status": homepage_h1_status,
-                    "homepage_example": homepage_h1_example,
-                    "homepage_count": homepage_h1_count,
-                    "examples": all_h1s,
-                },
-                "header_hierarchy": {
-                    "issues_found_on_pages": len(header_hierarchy_issues),
-                    "pages_with_issues": [
-                        issue["page_path"] for issue in header_hierarchy_issues
-                    ],
-                    "issue_examples": header_hierarchy_issues,
-                },
-                "semantic_html": {"score_percent": avg_semantic_score},
-                "list_usage": {"count": total_lists},
-                "table_usage": {"count": total_tables},
-            },
-            "content": {
-                "fragment_clarity": {
-                    "long_paragraphs_found_on_pages": len(long_paragraph_issues),
-                    "pages_with_issues": long_paragraph_issues,
-                },
-                "conversational_tone": {"score": avg_conversational},
-                "question_targeting": {
-                    "status": "pass" if pages_with_faqs else "warn",
-                    "details": f"FAQs detected on {len(pages_with_faqs)} pages.",
-                    "pages_with_faqs": pages_with_faqs,
-                },
-            },
-            "eeat": {
-                "author_presence": {
-                    "status": (
-                        "warn" if len(pages_with_author) < len(summaries) else "pass"
-                    ),
-                    "details": f"Author found on {len(pages_with_author)}/{len(summaries)} pages.",
-                    "pages_with_author": pages_with_author,
-                    "pages_missing_author": author_missing_issues,
-                },
-                "citations_and_sources": {
-                    "total_external_links": total_external,
-                    "total_authoritative_links": total_authoritative,
-                    "pages_missing_authoritative_links": no_authoritative_links,
-                },
-                "content_freshness": {
-                    "dates_found_on_pages": len(summaries)
-                    - len(freshness_missing_issues),
-                    "pages_missing_dates": freshness_missing_issues,
-                },
-            },
-            "schema": {
-                "schema_presence": {
-                    "status": (
-                        "warn" if len(pages_with_schema) < len(summaries) else "pass"
-                    ),
-                    "details": f"JSON-LD Schema found on {len(pages_with_schema)}/{len(summaries)} pages.",
-                    "pages_with_schema": pages_with_schema,
-                },
-                "schema_types": list(all_schema_types),
-                "raw_jsonld_found": all_raw_jsonld,
-            },
-            "meta_robots": list(all_meta_robots),
-        }
-        return aggregated
+        if len(summaries) > 1:
+            logger.info(f"Agregando {len(summaries)} resúmenes de auditoría...")
+        aggregator = SummaryAggregator(base_url, dedupe_pages=False)
+        for summary in summaries:
+            aggregator.add(summary)
+        return aggregator.aggregate()
 
     @staticmethod
     def _compute_site_metrics(page_summaries: List[Dict[str, Any]]) -> Dict[str, Any]:
         if not page_summaries:
             return {}
 
-        total_pages = len(page_summaries)
-        h1_missing = 0
-        schema_present = 0
-        faq_pages = 0
-        semantic_scores: List[float] = []
-        product_pages = 0
-        category_pages = 0
-        meta_desc_pages = 0
-        meta_kw_pages = 0
-        product_schema_pages = 0
-        faq_schema_pages = 0
-        offer_schema_pages = 0
-        review_schema_pages = 0
-        text_lengths: List[int] = []
-        price_samples: List[float] = []
-        price_currency = None
-        pages_with_price = 0
-        total_images = 0
-        missing_alt = 0
-        total_videos = 0
-        header_hierarchy_issue_pages = 0
-        homepage_h1_status = None
-
-        product_url_patterns = [
-            "/p/",
-            "/producto",
-            "/product/",
-            "/products/",
-            "/sku/",
-            "/item/",
-        ]
-        category_url_patterns = [
-            "/category/",
-            "/categories/",
-            "/collection/",
-            "/collections/",
-            "/c/",
-            "/shop/",
-            "/store/",
-            "/department/",
-        ]
-        product_schema_types = {"Product"}
-        offer_schema_types = {"Offer", "AggregateOffer"}
-        review_schema_types = {"Review", "AggregateRating"}
-        faq_schema_types = {"FAQPage"}
-
+        aggregator = SummaryAggregator("", dedupe_pages=False)
         for summary in page_summaries:
-            if not isinstance(summary, dict):
-                continue
-            structure = (
-                summary.get("structure", {})
-                if isinstance(summary.get("structure"), dict)
-                else {}
-            )
-            content = (
-                summary.get("content", {})
-                if isinstance(summary.get("content"), dict)
-                else {}
-            )
-            schema = (
-                summary.get("schema", {})
-                if isinstance(summary.get("schema"), dict)
-                else {}
-            )
-
-            h1_status = structure.get("h1_check", {}).get("status")
-            if h1_status != "pass":
-                h1_missing += 1
-
-            if schema.get("schema_presence", {}).get("status") == "present":
-                schema_present += 1
-
-            if content.get("question_targeting", {}).get("status") == "pass":
-                faq_pages += 1
-
-            if content.get("meta_description"):
-                meta_desc_pages += 1
-            if content.get("meta_keywords"):
-                meta_kw_pages += 1
-
-            semantic_score = structure.get("semantic_html", {}).get("score_percent")
-            if isinstance(semantic_score, (int, float)):
-                semantic_scores.append(float(semantic_score))
-
-            url_value = summary.get("url", "") or ""
-            url_path = urlparse(url_value).path.lower() if url_value else ""
-            if url_path in ("", "/") and homepage_h1_status is None:
-                homepage_h1_status = h1_status
-            schema_types = schema.get("schema_types") or []
-            if any(p in url_path for p in product_url_patterns) or any(
-                t in ["Product", "Offer", "AggregateOffer"] for t in schema_types
-            ):
-                product_pages += 1
-            if any(p in url_path for p in category_url_patterns):
-                category_pages += 1
-
-            for t in schema_types:
-                if t in product_schema_types:
-                    product_schema_pages += 1
-                if t in offer_schema_types:
-                    offer_schema_pages += 1
-                if t in review_schema_types:
-                    review_schema_pages += 1
-                if t in faq_schema_types:
-                    faq_schema_pages += 1
-
-            media = (
-                content.get("media", {})
-                if isinstance(content.get("media"), dict)
-                else {}
-            )
-            img_count = media.get("image_count")
-            if isinstance(img_count, int):
-                total_images += img_count
-            alt_missing = media.get("images_missing_alt")
-            if isinstance(alt_missing, int):
-                missing_alt += alt_missing
-            vid_count = media.get("video_count")
-            if isinstance(vid_count, int):
-                total_videos += vid_count
-
-            header_issues = structure.get("header_hierarchy", {}).get("issues") or []
-            if header_issues:
-                header_hierarchy_issue_pages += 1
-
-            raw_jsonld = schema.get("raw_jsonld") or []
-            page_has_price = False
-            for block in raw_jsonld[:5]:
-                try:
-                    parsed = json.loads(block)
-                except Exception:  # nosec B112
-                    continue
-
-                def _collect_from_obj(obj: Any):
-                    nonlocal price_currency, page_has_price
-                    if isinstance(obj, dict):
-                        offers = obj.get("offers")
-                        if offers:
-                            _collect_from_obj(offers)
-                        price_val = obj.get("price")
-                        currency_val = obj.get("priceCurrency") or obj.get(
-                            "pricecurrency"
-                        )
-                        if currency_val and not price_currency:
-                            price_currency = str(currency_val)
-                        if price_val is not None:
-                            if isinstance(price_val, (int, float)):
-                                price_samples.append(float(price_val))
-                                page_has_price = True
-                            elif isinstance(price_val, str):
-                                match = re.search(r"[0-9]+(?:[\\.,][0-9]+)?", price_val)
-                                if match:
-                                    try:
-                                        price_samples.append(
-                                            float(match.group(0).replace(",", "."))
-                                        )
-                                        page_has_price = True
-                                    except Exception:  # nosec B110
-                                        pass
-                        for v in obj.values():
-                            _collect_from_obj(v)
-                    elif isinstance(obj, list):
-                        for it in obj:
-                            _collect_from_obj(it)
-
-                _collect_from_obj(parsed)
-
-            if page_has_price:
-                pages_with_price += 1
-
-            text_sample = content.get("text_sample", "") or ""
-            text_lengths.append(len(text_sample))
-
-        avg_semantic = (
-            round(sum(semantic_scores) / len(semantic_scores), 1)
-            if semantic_scores
-            else 0.0
-        )
-        avg_text_len = (
-            round(sum(text_lengths) / len(text_lengths), 1) if text_lengths else 0.0
-        )
-        schema_coverage = round((schema_present / max(1, total_pages)) * 100, 1)
-        h1_coverage = round(((total_pages - h1_missing) / max(1, total_pages)) * 100, 1)
-        header_hierarchy_coverage = round(
-            ((total_pages - header_hierarchy_issue_pages) / max(1, total_pages)) * 100,
-            1,
-        )
-        structure_score = round(
-            (avg_semantic + h1_coverage + header_hierarchy_coverage) / 3, 1
-        )
-
-        price_samples = [p for p in price_samples if p > 0][:50]
-        avg_price = (
-            round(sum(price_samples) / len(price_samples), 2) if price_samples else None
-        )
-        min_price = round(min(price_samples), 2) if price_samples else None
-        max_price = round(max(price_samples), 2) if price_samples else None
-        avg_images = round(total_images / max(1, total_pages), 1)
-        image_alt_coverage = (
-            round((total_images - missing_alt) / max(1, total_images) * 100, 1)
-            if total_images
-            else None
-        )
-
-        return {
-            "pages_analyzed": total_pages,
-            "schema_coverage_percent": schema_coverage,
-            "h1_coverage_percent": h1_coverage,
-            "header_hierarchy_issue_pages": header_hierarchy_issue_pages,
-            "header_hierarchy_coverage_percent": header_hierarchy_coverage,
-            "structure_score_percent": structure_score,
-            "homepage_h1_status": homepage_h1_status,
-            "faq_page_count": faq_pages,
-            "product_page_count": product_pages,
-            "category_page_count": category_pages,
-            "avg_semantic_score_percent": avg_semantic,
-            "avg_text_sample_length": avg_text_len,
-            "meta_description_coverage_percent": round(
-                (meta_desc_pages / max(1, total_pages)) * 100, 1
-            ),
-            "meta_keywords_coverage_percent": round(
-                (meta_kw_pages / max(1, total_pages)) * 100, 1
-            ),
-            "product_schema_pages": product_schema_pages,
-            "offer_schema_pages": offer_schema_pages,
-            "review_schema_pages": review_schema_pages,
-            "faq_schema_pages": faq_schema_pages,
-            "price_samples_count": len(price_samples),
-            "avg_price": avg_price,
-            "min_price": min_price,
-            "max_price": max_price,
-            "price_currency": price_currency,
-            "pages_with_price": pages_with_price,
-            "avg_images_per_page": avg_images,
-            "image_alt_coverage_percent": image_alt_coverage,
-            "video_count_total": total_videos,
-        }
+            if isinstance(summary, dict):
+                aggregator.add(summary)
+        return aggregator.site_metrics(total_pages=len(page_summaries))
 
     @staticmethod
     def _build_score_definitions() -> Dict[str, Any]:
@@ -1696,11 +1218,9 @@ class PipelineService:
             if isinstance(t, str) and t.strip()
         ]
         if core_terms:
-            generic_terms = PipelineService._generic_business_terms()
-            core_terms = [t for t in core_terms if t not in generic_terms]
+            core_terms = [t for t in core_terms if t not in GENERIC_BUSINESS_TERMS]
         if anchor_terms:
-            generic_terms = PipelineService._generic_business_terms()
-            anchor_terms = [t for t in anchor_terms if t not in generic_terms]
+            anchor_terms = [t for t in anchor_terms if t not in GENERIC_BUSINESS_TERMS]
         if not core_terms:
             logger.info(
                 "PIPELINE: Sin core terms; no se intentará detectar competidores para evitar falsos."
@@ -1970,75 +1490,47 @@ class PipelineService:
             f"PIPELINE: Filtrando {len(search_items)} resultados de búsqueda para encontrar competidores."
         )
 
-        def _text_roots(text: str) -> set:
-            roots = set()
-            for token in re.findall(r"[a-z0-9áéíóúñ]{2,}", str(text or "").lower()):
-                root = PipelineService._normalize_token_root(token)
-                if root:
-                    roots.add(root)
-            return roots
-
-        def _roots_match(term_root: str, roots: set) -> bool:
-            if not term_root or not roots:
-                return False
-            if term_root in roots:
-                return True
-            if len(term_root) < 5:
-                return False
-            for root in roots:
-                if len(root) < 5:
-                    continue
-                prefix_len = min(7, len(term_root), len(root))
-                if prefix_len >= 5 and term_root[:prefix_len] == root[:prefix_len]:
-                    return True
-            return False
+        lexicon = CompetitorLexicon.for_terms(
+            core_terms=tuple(core_terms),
+            anchor_terms=tuple(anchor_terms),
+            vertical_hint=str(vertical_hint or "other").lower(),
+        )
 
         def _count_core_term_matches(text: str) -> int:
-            if not core_terms:
-                return 0
-            roots = _text_roots(text)
-            matches = 0
-            matched_roots = set()
-            for term in core_terms:
-                root = PipelineService._normalize_token_root(term)
-                if not root or root in matched_roots:
-                    continue
-                if _roots_match(root, roots):
-                    matches += 1
-                    matched_roots.add(root)
-            return matches
-
-        def matches_core_terms(text: str, minimum: int) -> bool:
-            return _count_core_term_matches(text) >= minimum
+            return lexicon.count_matches(lexicon.core_terms, text)
 
         def _count_anchor_term_matches(text: str) -> int:
-            if not anchor_terms:
-                return 0
-            roots = _text_roots(text)
-            matches = 0
-            matched_roots = set()
-            for term in anchor_terms:
-                root = PipelineService._normalize_token_root(term)
-                if not root or root in matched_roots:
-                    continue
-                if _roots_match(root, roots):
-                    matches += 1
-                    matched_roots.add(root)
-            return matches
-
-        def _contains_banned_term(text: str, term: str) -> bool:
-            hay = (text or "").lower()
-            needle = (term or "").strip().lower()
-            if not hay or not needle:
-                return False
-            if " " in needle:
-                return needle in hay
-            if re.fullmatch(r"[a-z0-9]+", needle):
-                return (
-                    re.search(rf"(?<![a-z0-9]){re.escape(needle)}(?![a-z0-9])", hay)
-                    is not None
-                )
-            return needle in hay
+            return lexicon.count_matches(lexicon.anchor_terms, text)
+
+        # Patrones de dominio indexados: "gob." bloquea el segmento "gob";
+        # el resto bloquea el host exacto y sus subdominios.
+        blocked_segments: Dict[str, int] = {}
+        blocked_suffixes: Dict[str, int] = {}
+        for index, pattern in enumerate(bad_patterns):
+            raw_pattern = str(pattern or "").lower().strip()
+            if raw_pattern.endswith("."):
+                segment_pattern = raw_pattern.strip(".")
+                if segment_pattern:
+                    blocked_segments.setdefault(segment_pattern, index)
+            elif raw_pattern.lstrip("."):
+                blocked_suffixes.setdefault(raw_pattern.lstrip("."), index)
+
+        def _blocked_domain_pattern(host: str) -> Optional[str]:
+            normalized_host = str(host or "").lower().strip(".")
+            if not normalized_host:
+                return None
+            parts = normalized_host.split(".")
+            hits = [
+                blocked_segments[part] for part in parts if part in blocked_segments
+            ]
+            for start in range(len(parts)):
+                suffix = ".".join(parts[start:])
+                if suffix in blocked_suffixes:
+                    hits.append(blocked_suffixes[suffix])
+            return bad_patterns[min(hits)] if hits else None
+
+        title_terms = tuple(bad_title_words)
+        snippet_terms = tuple(bad_snippet_words)
 
         def evaluate_item(item: Dict[str, Any], relaxed: bool) -> Optional[str]:
             url = item.get("link") if isinstance(item, dict) else None
@@ -2073,53 +1565,21 @@ class PipelineService:
                 logger.info(f"PIPELINE: Excluyendo {url} (ruta no competitiva: {path})")
                 return None
 
-            def _domain_matches(pattern: str, host: str) -> bool:
-                raw_pattern = str(pattern or "").lower().strip()
-                normalized_host = str(host or "").lower().strip(".")
-                if not raw_pattern or not normalized_host:
-                    return False
-
-                if raw_pattern.endswith("."):
-                    segment_pattern = raw_pattern.strip(".")
-                    return bool(segment_pattern) and (
-                        segment_pattern in normalized_host.split(".")
-                    )
-
-                normalized_pattern = raw_pattern.lstrip(".")
-                return bool(normalized_pattern) and (
-                    normalized_host == normalized_pattern
-                    or normalized_host.endswith(f".{normalized_pattern}")
+            blocked_pattern = _blocked_domain_pattern(domain_clean)
+            if blocked_pattern:
+                logger.info(
+                    f"PIPELINE: Excluyendo {url} (patrón prohibido: {blocked_pattern})"
                 )
+                return None
 
-            for pattern in bad_patterns:
-                if _domain_matches(pattern, domain_clean):
-                    logger.info(
-                        f"PIPELINE: Excluyendo {url} (patrón prohibido: {pattern})"
-                    )
-                    return None
-
-            bad_word = next(
-                (
-                    word
-                    for word in bad_title_words
-                    if _contains_banned_term(title, word)
-                ),
-                None,
-            )
+            bad_word = first_banned_term(title, title_terms)
             if bad_word:
                 logger.info(
                     f"PIPELINE: Excluyendo {url} (palabra prohibida en título: {bad_word})"
                 )
                 return None
 
-            bad_snippet = next(
-                (
-                    word
-                    for word in bad_snippet_words
-                    if _contains_banned_term(snippet, word)
-                ),
-                None,
-            )
+            bad_snippet = first_banned_term(snippet, snippet_terms)
             if bad_snippet:
                 logger.info(
                     f"PIPELINE: Excluyendo {url} (palabra prohibida en snippet: {bad_snippet})"
@@ -2948,6 +2408,7 @@ class PipelineService:
             return True
         return False
 
+    @with_llm_prompt("external_analysis")
     async def _retry_external_intelligence(
         self,
         target_audit: Dict[str, Any],
@@ -3108,6 +2569,7 @@ class PipelineService:
             vertical_hint in PipelineService._strict_competitor_verticals()
         )
         broad_vertical = vertical_hint in PipelineService._broad_competitor_verticals()
+        lexicon = CompetitorLexicon.for_profile(effective_core_profile)
 
         market_tokens: List[str] = []
         if market_hint:
@@ -3157,7 +2619,7 @@ class PipelineService:
         if llm_category:
             cat_lower = llm_category.lower()
             # Limpiar y separar por espacios y símbolos
-            words = re.findall(r"\b\w+\b", cat_lower)
+            words = WORD_RE.findall(cat_lower)
             for word in words:
                 if len(word) > 2:
                     llm_category_tokens.add(word)
@@ -3171,7 +2633,7 @@ class PipelineService:
                 llm_category_tokens.add(trigram)
 
         if llm_subcategory:
-            sub_words = re.findall(r"\b\w+\b", llm_subcategory.lower())
+            sub_words = WORD_RE.findall(llm_subcategory.lower())
             for word in sub_words:
                 if len(word) > 2:
                     llm_category_tokens.add(word)
@@ -3179,58 +2641,29 @@ class PipelineService:
         # Combinar todos los tokens
         all_valid_tokens = industry_tokens.union(llm_category_tokens)
 
+        # Partes de cada token de categoría, tokenizadas una sola vez.
+        category_part_roots = {
+            cand_part.rstrip("s")
+            for candidate in all_valid_tokens
+            for cand_part in WORD_RE.findall(str(candidate).lower().strip())
+        }
+        category_part_roots.discard("")
+
         def _token_looks_like_category(token: str) -> bool:
             token_root = token.lower().rstrip("s")
-            for candidate in all_valid_tokens:
-                cand = str(candidate).lower().strip()
-                if not cand:
-                    continue
-                for cand_part in re.findall(r"\b\w+\b", cand):
-                    cand_root = cand_part.rstrip("s")
-                    if not cand_root:
-                        continue
-                    if token_root == cand_root:
-                        return True
-                    if token_root in cand_root or cand_root in token_root:
-                        return True
+            for cand_root in category_part_roots:
+                if token_root == cand_root:
+                    return True
+                if token_root in cand_root or cand_root in token_root:
+                    return True
             return False
 
         brand_tokens = {
             token
-            for token in re.findall(r"\b\w+\b", (brand_hint or "").lower())
+            for token in WORD_RE.findall((brand_hint or "").lower())
             if len(token) > 2
         }
-        profile_core_terms = {
-            PipelineService._normalize_token_root(term)
-            for term in (effective_core_profile or {}).get("core_terms", [])
-            if term
-        }
-        profile_strong_terms = {
-            PipelineService._normalize_token_root(term)
-            for term in (effective_core_profile or {}).get("strong_core_terms", [])
-            if term
-        }
-        profile_weak_terms = {
-            PipelineService._normalize_token_root(term)
-            for term in (effective_core_profile or {}).get("weak_core_terms", [])
-            if term
-        }
-        profile_outlier_terms = {
-            PipelineService._normalize_token_root(term)
-            for term in (effective_core_profile or {}).get("outlier_terms", [])
-            if term
-        }
-        profile_core_terms = {term for term in profile_core_terms if term}
-        profile_strong_terms = {term for term in profile_strong_terms if term}
-        profile_weak_terms = {term for term in profile_weak_terms if term}
-        profile_outlier_terms = {term for term in profile_outlier_terms if term}
-
-        def _query_token_roots(text: str) -> set:
-            return {
-                PipelineService._normalize_token_root(token)
-                for token in re.findall(r"[a-z0-9áéíóúñ]{2,}", str(text or "").lower())
-                if token
-            }
+        profile_outlier_terms = frozenset(lexicon.outlier_terms)
 
         # Avoid rejecting generic category words that happen to match the domain token
         # (e.g., robot.com -> "robot" is both brand token and industry term).
@@ -3360,6 +2793,11 @@ class PipelineService:
         # Strict by default to preserve category/subcategory relevance in competitor discovery.
         # Can be relaxed via AGENT1_RELAXED_QUERY_FILTER=true for debugging.
         relaxed_mode = bool(settings.AGENT1_RELAXED_QUERY_FILTER)
+        llm_category_words = {
+            word
+            for word in WORD_RE.findall((llm_category or "").lower())
+            if len(word) >= 3
+        }
 
         filtered: List[Dict[str, str]] = []
         rejected_reasons = []
@@ -3370,8 +2808,8 @@ class PipelineService:
                 rejected_reasons.append(f"Query {idx}: vacía")
                 continue
             ql = qtext.lower()
-            query_tokens = set(re.findall(r"\b\w+\b", ql))
-            query_token_roots = _query_token_roots(ql)
+            query_tokens = set(WORD_RE.findall(ql))
+            query_token_roots = lexicon.roots(ql)
 
             has_blocking_brand = bool(
                 brand_tokens_for_block
@@ -3417,7 +2855,7 @@ class PipelineService:
             has_llm_category_term = any(tok in ql for tok in llm_category_tokens)
             has_category_term = has_industry_term or has_llm_category_term
             match_details = PipelineService._query_core_match_details(
-                qtext, effective_core_profile
+                qtext, effective_core_profile, lexicon=lexicon
             )
             has_profile_core_term = bool(match_details["core_matches"])
             has_profile_strong_term = bool(match_details["strong_matches"])
@@ -3430,7 +2868,7 @@ class PipelineService:
                 has_profile_outlier_term and not has_profile_core_term
             )
             uses_only_weak_core = PipelineService._query_uses_only_weak_core_terms(
-                qtext, effective_core_profile
+                qtext, effective_core_profile, lexicon=lexicon
             )
             allows_broad_transactional_outlier = bool(
                 broad_vertical
@@ -3458,9 +2896,8 @@ class PipelineService:
             # Busca coincidencias parciales entre palabras de la query y la categoría
             has_flexible_category_match = False
             if llm_category and not has_llm_category_term:
-                cat_words = set(re.findall(r"\b\w{3,}\b", llm_category.lower()))
-                query_words = set(re.findall(r"\b\w{3,}\b", ql))
-                matching_words = cat_words.intersection(query_words)
+                query_words = {word for word in query_tokens if len(word) >= 3}
+                matching_words = llm_category_words.intersection(query_words)
                 if len(matching_words) >= 1:  # Al menos 1 palabra en común
                     has_flexible_category_match = True
                     logger.debug(
@@ -3504,7 +2941,7 @@ class PipelineService:
                     and has_market_term
                     and (has_category_term or has_flexible_category_match)
                     and PipelineService._query_has_non_generic_business_signal(
-                        qtext, effective_core_profile
+                        qtext, effective_core_profile, lexicon=lexicon
                     )
                 ):
                     filtered.append(q)
@@ -4002,112 +3439,11 @@ class PipelineService:
 
     @staticmethod
     def _generic_business_terms() -> set:
-        return {
-            "digital",
-            "online",
-            "platform",
-            "service",
-            "services",
-            "solutions",
-            "company",
-            "companies",
-            "empresa",
-            "empresas",
-            "official",
-            "site",
-            "website",
-            "store",
-            "shop",
-            "product",
-            "products",
-            "business",
-            "producto",
-            "productos",
-            "mas",
-            "más",
-            "gratis",
-            "free",
-            "ars",
-            "usd",
-            "mxn",
-            "clp",
-            "brl",
-            "superando",
-            "supera",
-            "superar",
-            "insight",
-            "insights",
-            "webinar",
-            "webinars",
-            "newsroom",
-            "overview",
-            "blog",
-            "news",
-            "event",
-            "events",
-            "research",
-            "report",
-            "reports",
-            "que",
-            "no",
-            "servicio",
-            "servicios",
-            "consultora",
-            "consultoras",
-            "nuestra",
-            "nuestro",
-            "nuestras",
-            "nuestros",
-            "sobre",
-            "contacto",
-            "somos",
-            "somo",
-            "global",
-        }
+        return set(GENERIC_BUSINESS_TERMS)
 
     @staticmethod
     def _weak_competitor_support_terms(vertical_hint: Optional[str] = None) -> set:
-        weak_terms = {
-            "ai",
-            "artificial",
-            "intelligence",
-            "assistant",
-            "assistants",
-            "tool",
-            "tools",
-            "platform",
-            "platforms",
-            "app",
-            "apps",
-            "software",
-            "code",
-            "coding",
-            "developer",
-            "developers",
-            "productivity",
-            "workflow",
-            "automation",
-            "cloud",
-            "api",
-            "apis",
-            "system",
-            "systems",
-            "service",
-            "services",
-            "solution",
-            "solutions",
-            "digital",
-            "online",
-        }
-        vertical = str(vertical_hint or "").strip().lower()
-        if vertical == "software":
-            weak_terms.update({"workspace", "suite"})
-        normalized = set()
-        for term in weak_terms.union(PipelineService._generic_business_terms()):
-            root = PipelineService._normalize_token_root(term)
-            if root:
-                normalized.add(root)
-        return normalized
+        return set(weak_support_roots(str(vertical_hint or "").strip().lower()))
 
     @staticmethod
     def _strict_competitor_verticals() -> set:
@@ -4119,40 +3455,14 @@ class PipelineService:
 
     @staticmethod
     def _query_has_transactional_intent(query: str) -> bool:
-        intent_terms = {
-            "online",
-            "shop",
-            "store",
-            "tienda",
-            "buy",
-            "comprar",
-            "delivery",
-            "shipping",
-            "envio",
-            "envío",
-            "stock",
-            "precio",
-            "price",
-            "pharmacy",
-            "farmacia",
-            "retail",
-            "venta",
-            "order",
-            "pedido",
-        }
-        query_roots = {
-            PipelineService._normalize_token_root(token)
-            for token in re.findall(r"[a-z0-9áéíóúñ]{2,}", str(query or "").lower())
-            if token
-        }
-        intent_roots = {
-            PipelineService._normalize_token_root(term) for term in intent_terms if term
-        }
-        return bool(query_roots.intersection(intent_roots))
+        query_roots = CompetitorLexicon.for_terms().roots(query)
+        return bool(query_roots.intersection(transactional_intent_roots()))
 
     @staticmethod
     def _query_core_match_details(
-        query: str, core_profile: Optional[Dict[str, Any]]
+        query: str,
+        core_profile: Optional[Dict[str, Any]],
+        lexicon: Optional[CompetitorLexicon] = None,
     ) -> Dict[str, Any]:
         if not query or not isinstance(core_profile, dict):
             return {
@@ -4160,68 +3470,25 @@ class PipelineService:
                 "query_terms": set(),
                 "core_terms": set(),
                 "strong_terms": set(),
-                "weak_terms": set(),
-                "market_terms": set(),
-                "core_matches": set(),
-                "strong_matches": set(),
-                "effective_matches": set(),
-                "weak_matches": set(),
-            }
-
-        vertical_hint = str(core_profile.get("vertical_hint") or "other").lower()
-        query_terms = {
-            PipelineService._normalize_token_root(term)
-            for term in re.findall(r"[a-z0-9áéíóúñ]{2,}", str(query).lower())
-            if term
-        }
-        core_terms = {
-            PipelineService._normalize_token_root(term)
-            for term in (core_profile.get("core_terms") or [])
-            if term
-        }
-        strong_terms = {
-            PipelineService._normalize_token_root(term)
-            for term in (core_profile.get("strong_core_terms") or [])
-            if term
-        }
-        weak_terms = PipelineService._weak_competitor_support_terms(vertical_hint)
-        weak_terms.update(
-            {
-                PipelineService._normalize_token_root(term)
-                for term in (core_profile.get("weak_core_terms") or [])
-                if term
-            }
-        )
-
-        market_terms = {
-            PipelineService._normalize_token_root(term)
-            for term in (core_profile.get("market_terms") or [])
-            if term
-        }
-        core_matches = core_terms.intersection(query_terms)
-        strong_matches = strong_terms.intersection(query_terms)
-        effective_matches = {
-            match for match in core_matches if match and match not in weak_terms
-        }
-        weak_matches = query_terms.intersection(weak_terms)
-        return {
-            "vertical_hint": vertical_hint,
-            "query_terms": query_terms,
-            "core_terms": core_terms,
-            "strong_terms": strong_terms,
-            "weak_terms": weak_terms,
-            "market_terms": market_terms,
-            "core_matches": core_matches,
-            "strong_matches": strong_matches,
-            "effective_matches": effective_matches,
-            "weak_matches": weak_matches,
-        }
+                "weak_terms": set(),
+                "market_terms": set(),
+                "core_matches": set(),
+                "strong_matches": set(),
+                "effective_matches": set(),
+                "weak_matches": set(),
+            }
+        lexicon = lexicon or CompetitorLexicon.for_profile(core_profile)
+        return lexicon.match_details(query)
 
     @staticmethod
     def _query_has_non_generic_business_signal(
-        query: str, core_profile: Optional[Dict[str, Any]]
+        query: str,
+        core_profile: Optional[Dict[str, Any]],
+        lexicon: Optional[CompetitorLexicon] = None,
     ) -> bool:
-        details = PipelineService._query_core_match_details(query, core_profile)
+        details = PipelineService._query_core_match_details(
+            query, core_profile, lexicon=lexicon
+        )
         if details["strong_matches"] or details["effective_matches"]:
             return True
         candidate_terms = (
@@ -4231,16 +3498,7 @@ class PipelineService:
 
     @staticmethod
     def _normalize_token_root(token: str) -> str:
-        normalized = unicodedata.normalize("NFKD", str(token or "").lower())
-        ascii_folded = "".join(ch for ch in normalized if not unicodedata.combining(ch))
-        raw = re.sub(r"[^a-z0-9]+", "", ascii_folded)
-        if not raw:
-            return ""
-        if raw.endswith("es") and len(raw) > 5:
-            return raw[:-2]
-        if raw.endswith("s") and len(raw) > 4:
-            return raw[:-1]
-        return raw
+        return token_root(str(token or ""))
 
     @staticmethod
     def _pluralize_spanish(token: str) -> str:
@@ -4325,7 +3583,7 @@ class PipelineService:
         brand_tokens: set = set()
         if root:
             brand_tokens.add(root.lower())
-            root_tokens = [t for t in re.findall(r"[a-z0-9]+", root.lower()) if t]
+            root_tokens = [t for t in ALNUM_RE.findall(root.lower()) if t]
             if len(root_tokens) <= 1:
                 for token in root_tokens:
                     brand_tokens.add(token)
@@ -4339,7 +3597,7 @@ class PipelineService:
             PipelineService._extract_brand_from_domain(domain) if domain else ""
         )
         if brand_hint:
-            for token in re.findall(r"[a-z0-9]+", brand_hint.lower()):
+            for token in ALNUM_RE.findall(brand_hint.lower()):
                 if token and (len(token) <= 3 or any(ch.isdigit() for ch in token)):
                     brand_tokens.add(token)
 
@@ -4499,7 +3757,7 @@ class PipelineService:
         market_hint = PipelineService._normalize_market_value(
             target_audit.get("market")
         ) or PipelineService._infer_market_from_url(url)
-        market_terms = re.findall(r"[a-z0-9]+", (market_hint or "").lower())
+        market_terms = ALNUM_RE.findall((market_hint or "").lower())
 
         stopwords = {
             "de",
@@ -4582,8 +3840,8 @@ class PipelineService:
             if not text:
                 return []
             tokens: List[str] = []
-            for token in re.findall(r"[a-z0-9áéíóúñ]{2,}", str(text).lower()):
-                root_token = PipelineService._normalize_token_root(token)
+            for token in TOKEN_RE.findall(str(text).lower()):
+                root_token = token_root(token)
                 if not root_token or root_token in stopwords:
                     continue
                 if root_token.isdigit():
@@ -4863,23 +4121,12 @@ class PipelineService:
     ) -> bool:
         if not query or not isinstance(core_profile, dict):
             return False
-        outliers = {
-            PipelineService._normalize_token_root(term)
-            for term in (core_profile.get("outlier_terms") or [])
-            if term
-        }
+        lexicon = CompetitorLexicon.for_profile(core_profile)
+        outliers = lexicon.outlier_terms
         if not outliers:
             return False
-        core_terms = {
-            PipelineService._normalize_token_root(term)
-            for term in (core_profile.get("core_terms") or [])
-            if term
-        }
-        query_terms = {
-            PipelineService._normalize_token_root(term)
-            for term in re.findall(r"[a-z0-9áéíóúñ]{2,}", str(query).lower())
-            if term
-        }
+        core_terms = lexicon.core_terms
+        query_terms = lexicon.roots(query)
         if not query_terms:
             return False
         if not query_terms.intersection(outliers):
@@ -4888,9 +4135,13 @@ class PipelineService:
 
     @staticmethod
     def _query_uses_only_weak_core_terms(
-        query: str, core_profile: Optional[Dict[str, Any]]
+        query: str,
+        core_profile: Optional[Dict[str, Any]],
+        lexicon: Optional[CompetitorLexicon] = None,
     ) -> bool:
-        details = PipelineService._query_core_match_details(query, core_profile)
+        details = PipelineService._query_core_match_details(
+            query, core_profile, lexicon=lexicon
+        )
         if not details["query_terms"]:
             return False
         core_matches = details["core_matches"]
@@ -6293,6 +5544,7 @@ class PipelineService:
             num_results=num_results,
         )
 
+    @with_llm_prompt("external_analysis")
     async def analyze_external_intelligence(
         self,
         target_audit: Dict[str, Any],
@@ -7685,12 +6937,10 @@ class PipelineService:
 
     @staticmethod
     def _estimate_tokens(text: str) -> int:
-        if not text:
-            return 0
-        return max(1, len(text) // 4)
+        return estimate_tokens(text)
 
     @staticmethod
-    def _context_budget_chars(system_prompt: str) -> int:
+    def _context_budget_tokens(system_prompt: str) -> int:
         try:
             from app.core.config import settings
 
@@ -7703,7 +6953,7 @@ class PipelineService:
         budget_tokens = int(max_context_tokens * safety_ratio) - system_tokens
         if budget_tokens < 1000:
             budget_tokens = max(1000, max_context_tokens - system_tokens - 1000)
-        return max(4000, int(budget_tokens * 4))
+        return max(1000, budget_tokens)
 
     @staticmethod
     def _truncate_long_strings(data: Any, max_len: int) -> Any:
@@ -7750,41 +7000,20 @@ class PipelineService:
     def _shrink_context_to_budget(
         self, context: Dict[str, Any], system_prompt: str
     ) -> Tuple[Dict[str, Any], str]:
-        import copy
+        """
+        Recorta el contexto por prioridad hasta que entra en el presupuesto de tokens.
 
-        budget_chars = self._context_budget_chars(system_prompt)
+        Cada clave de primer nivel se serializa una vez; cada reductor declara las
+        claves que toca y solo esas se vuelven a medir.
+        """
+        budget_tokens = self._context_budget_tokens(system_prompt)
         minimized = self._minimize_context(context)
-
-        def _strip_cycles(obj: Any, seen: Optional[set] = None) -> Any:
-            if seen is None:
-                seen = set()
-            obj_id = id(obj)
-            if obj_id in seen:
-                return "<CYCLE_REF>"
-            if isinstance(obj, dict):
-                seen.add(obj_id)
-                return {k: _strip_cycles(v, seen) for k, v in obj.items()}
-            if isinstance(obj, list):
-                seen.add(obj_id)
-                return [_strip_cycles(v, seen) for v in obj]
-            if isinstance(obj, tuple):
-                seen.add(obj_id)
-                return [_strip_cycles(v, seen) for v in obj]
-            return obj
-
-        def serialize(ctx: Dict[str, Any]) -> str:
-            safe_ctx = _strip_cycles(ctx)
-            return json.dumps(safe_ctx, ensure_ascii=False, default=str)
-
-        def current_size(ctx: Dict[str, Any]) -> int:
-            return len(serialize(ctx))
-
-        prompt_text = serialize(minimized)
-        if len(prompt_text) <= budget_chars:
-            return minimized, prompt_text
+        budget = ContextBudget(minimized, budget_tokens)
+        if budget.fits():
+            return minimized, budget.render()
 
         logger.warning(
-            f"Context size {len(prompt_text)} chars exceeds budget {budget_chars}. Trimming."
+            f"Context size ~{budget.tokens} tokens exceeds budget {budget_tokens}. Trimming."
         )
 
         def reduce_search(ctx: Dict[str, Any], limit: int) -> None:
@@ -7800,57 +7029,84 @@ class PipelineService:
             if isinstance(comps, list):
                 ctx["competitor_audits"] = comps[:limit]
 
+        # (reductor, claves que modifica), en orden de prioridad.
         reducers = [
-            lambda ctx: reduce_search(ctx, 5),
-            lambda ctx: reduce_search(ctx, 3),
-            lambda ctx: reduce_search(ctx, 1),
-            lambda ctx: ctx.pop("search_results", None),
-            lambda ctx: reduce_competitors(ctx, 3),
-            lambda ctx: reduce_competitors(ctx, 1),
-            lambda ctx: ctx.__setitem__("competitor_audits", []),
-            lambda ctx: ctx.update(
-                {
-                    "llm_visibility": {},
-                    "ai_content_suggestions": {},
-                    "rank_tracking": {},
-                    "keywords": {},
-                    "backlinks": {},
-                }
+            (lambda ctx: reduce_search(ctx, 5), ("search_results",)),
+            (lambda ctx: reduce_search(ctx, 3), ("search_results",)),
+            (lambda ctx: reduce_search(ctx, 1), ("search_results",)),
+            (lambda ctx: ctx.pop("search_results", None), ("search_results",)),
+            (lambda ctx: reduce_competitors(ctx, 3), ("competitor_audits",)),
+            (lambda ctx: reduce_competitors(ctx, 1), ("competitor_audits",)),
+            (
+                lambda ctx: ctx.__setitem__("competitor_audits", []),
+                ("competitor_audits",),
             ),
-            lambda ctx: ctx.__setitem__(
-                "product_intelligence", ctx.get("product_intelligence") or {}
+            (
+                lambda ctx: ctx.update(
+                    {
+                        "llm_visibility": {},
+                        "ai_content_suggestions": {},
+                        "rank_tracking": {},
+                        "keywords": {},
+                        "backlinks": {},
+                    }
+                ),
+                (
+                    "llm_visibility",
+                    "ai_content_suggestions",
+                    "rank_tracking",
+                    "keywords",
+                    "backlinks",
+                ),
             ),
-            lambda ctx: ctx.__setitem__(
-                "target_audit", self._compact_audit_for_llm(ctx.get("target_audit", {}))
+            (
+                lambda ctx: ctx.__setitem__(
+                    "product_intelligence", ctx.get("product_intelligence") or {}
+                ),
+                ("product_intelligence",),
             ),
-            lambda ctx: ctx.update(
-                {
-                    "target_audit": self._truncate_long_strings(
-                        ctx.get("target_audit", {}), 800
-                    )
-                }
+            (
+                lambda ctx: ctx.__setitem__(
+                    "target_audit",
+                    self._compact_audit_for_llm(ctx.get("target_audit", {})),
+                ),
+                ("target_audit",),
             ),
-            lambda ctx: ctx.update(
-                {
-                    "target_audit": self._truncate_long_strings(
-                        ctx.get("target_audit", {}), 400
-                    ),
-                    "external_intelligence": self._truncate_long_strings(
-                        ctx.get("external_intelligence", {}), 400
-                    ),
-                }
+            (
+                lambda ctx: ctx.update(
+                    {
+                        "target_audit": self._truncate_long_strings(
+                            ctx.get("target_audit", {}), 800
+                        )
+                    }
+                ),
+                ("target_audit",),
+            ),
+            (
+                lambda ctx: ctx.update(
+                    {
+                        "target_audit": self._truncate_long_strings(
+                            ctx.get("target_audit", {}), 400
+                        ),
+                        "external_intelligence": self._truncate_long_strings(
+                            ctx.get("external_intelligence", {}), 400
+                        ),
+                    }
+                ),
+                ("target_audit", "external_intelligence"),
             ),
         ]
 
-        trimmed = copy.deepcopy(minimized)
-        for reducer in reducers:
+        # ContextBudget ya trabaja sobre una copia sin ciclos del contexto.
+        trimmed = budget.context
+        for reducer, touched_keys in reducers:
             reducer(trimmed)
-            prompt_text = serialize(trimmed)
-            if len(prompt_text) <= budget_chars:
+            budget.refresh(*touched_keys)
+            if budget.fits():
                 logger.warning(
-                    f"Context trimmed to {len(prompt_text)} chars (budget {budget_chars})."
+                    f"Context trimmed to ~{budget.tokens} tokens (budget {budget_tokens})."
                 )
-                return trimmed, prompt_text
+                return trimmed, budget.render()
 
         # Final fallback: minimal context
         minimal = {
@@ -7859,9 +7115,10 @@ class PipelineService:
             ),
             "external_intelligence": trimmed.get("external_intelligence", {}),
         }
-        prompt_text = serialize(minimal)
+        prompt_text = ContextBudget(minimal, budget_tokens).render()
         logger.warning(
-            f"Context reduced to minimal size {len(prompt_text)} chars (budget {budget_chars})."
+            f"Context reduced to minimal size ~{estimate_tokens(prompt_text)} tokens "
+            f"(budget {budget_tokens})."
         )
         return minimal, prompt_text
 
@@ -8052,6 +7309,7 @@ class PipelineService:
 
         return counts
 
+    @with_llm_prompt("report_generation")
     async def generate_full_report(
         self,
         target_audit: Dict[str, Any],
@@ -8257,6 +7515,215 @@ def get_pipeline_service() -> PipelineService:
     return pipeline_service
 
 
+def _safe_positive_int(value: Any, default: int) -> int:
+    try:
+        value_int = int(value)
+        return value_int if value_int > 0 else default
+    except Exception:
+        return default
+
+
+def _is_valid_page_summary(summary: Any) -> bool:
+    if not isinstance(summary, dict):
+        return False
+    status = summary.get("status")
+    try:
+        status_int = int(status) if status is not None else None
+    except Exception:
+        status_int = None
+    if status_int is not None and status_int >= 400:
+        return False
+    for key in ("structure", "content", "eeat", "schema"):
+        if key not in summary or not isinstance(summary.get(key), dict):
+            return False
+    return True
+
+
+def _resolve_audit_base(url: str, target_audit: Dict[str, Any]) -> Tuple[str, str]:
+    """URL base (con esquema) y host sin www. de la auditoría."""
+    base_url = (target_audit.get("url") or url or "").strip()
+    if base_url and not urlparse(base_url).scheme:
+        base_url = f"https://{base_url}"
+    base_host = ""
+    if base_url:
+        try:
+            base_host = (urlparse(base_url).hostname or "").lower()
+            if base_host.startswith("www."):
+                base_host = base_host[4:]
+        except Exception:
+            base_host = ""
+    return base_url, base_host
+
+
+async def discover_audit_urls(
+    service: PipelineService,
+    base_url: str,
+    base_host: str,
+    crawler_service: callable,
+    exclude_base_url: bool = False,
+) -> Tuple[List[str], List[str]]:
+    """
+    Crawl del sitio (con fallbacks de sitemap y búsqueda) y selección de las
+    páginas a auditar. Devuelve (crawled_urls, urls_a_auditar).
+    """
+    crawled_urls: List[str] = []
+    try:
+        from app.core.config import settings
+    except Exception:
+        settings = None
+
+    max_crawl = _safe_positive_int(getattr(settings, "MAX_CRAWL_PAGES", None), 50)
+    max_audit_default = _safe_positive_int(
+        getattr(settings, "MAX_AUDIT_DEFAULT", None), max_crawl
+    )
+    max_audit = _safe_positive_int(
+        getattr(settings, "MAX_AUDIT_PAGES", None), max_audit_default
+    )
+    if max_crawl < max_audit:
+        max_crawl = max_audit
+
+    crawl_started = time.perf_counter()
+    try:
+        with stage_timer("crawl"):
+            crawled_urls = await crawler_service(base_url, max_pages=max_crawl)
+        record_crawl(len(crawled_urls or []), time.perf_counter() - crawl_started)
+    except Exception as e:
+        logger.error(
+            f"run_initial_audit: crawl failed for {base_url}: {e}",
+            exc_info=True,
+        )
+        crawled_urls = []
+
+    # Fallback 1: si el crawler devolvió muy pocas URLs, intentar sitemap directo
+    if base_url and (not crawled_urls or len(crawled_urls) <= 1):
+        try:
+            from app.services.crawler_service import CrawlerService as _CrawlerFallback
+
+            sitemap_urls = await _CrawlerFallback.fetch_sitemap_urls(
+                base_url,
+                allow_subdomains=False,
+                max_urls=max_crawl,
+                mobile_first=True,
+            )
+            if sitemap_urls:
+                crawled_urls = sitemap_urls
+                logger.info(
+                    f"run_initial_audit: fallback sitemap encontró {len(crawled_urls)} URLs."
+                )
+        except Exception as e:
+            logger.warning(
+                f"run_initial_audit: sitemap fallback failed for {base_url}: {e}",
+            )
+
+    # Fallback 2: si sigue siendo muy bajo, intentar discovery vía Serper (site:domain)
+    serper_key_for_discovery = getattr(settings, "SERPER_API_KEY", None)
+    if base_url and (not crawled_urls or len(crawled_urls) <= 1):
+        try:
+            if not serper_key_for_discovery:
+                logger.info(
+                    "run_initial_audit: search fallback omitido (SERPER_API_KEY ausente)."
+                )
+            else:
+                target_domain = base_host or urlparse(base_url).netloc.replace(
+                    "www.", ""
+                )
+                site_query = f"site:{target_domain}"
+                search_data = await service.run_serper_search(
+                    site_query,
+                    serper_key_for_discovery,
+                    num_results=max(10, min(max_crawl, 100)),
+                )
+                items = (
+                    search_data.get("items", [])
+                    if isinstance(search_data, dict)
+                    else []
+                )
+                internal_urls = service._extract_internal_urls_from_search(
+                    items, target_domain, limit=max_crawl
+                )
+                if internal_urls:
+                    crawled_urls = internal_urls
+                    logger.info(
+                        f"run_initial_audit: search fallback encontró {len(crawled_urls)} URLs internas."
+                    )
+        except Exception as e:
+            logger.warning(
+                f"run_initial_audit: search fallback failed for {base_url}: {e}"
+            )
+
+    urls_to_audit = crawled_urls or [base_url]
+    if base_host:
+        filtered_urls: List[str] = []
+        skipped_by_host = 0
+        for candidate in urls_to_audit:
+            if not candidate:
+                continue
+            try:
+                parsed = urlparse(str(candidate))
+            except Exception:
+                skipped_by_host += 1
+                continue
+            candidate_host = (parsed.hostname or "").lower()
+            if candidate_host.startswith("www."):
+                candidate_host = candidate_host[4:]
+            if candidate_host != base_host:
+                skipped_by_host += 1
+                continue
+            filtered_urls.append(candidate)
+        if skipped_by_host:
+            logger.info(
+                f"run_initial_audit: filtered {skipped_by_host} URLs outside base host '{base_host}'."
+            )
+        urls_to_audit = filtered_urls or [base_url]
+    logger.info(
+        f"run_initial_audit: URLs crawleadas={len(crawled_urls)} | URLs a auditar={len(urls_to_audit)}"
+    )
+    if len(urls_to_audit) > max_audit:
+        urls_to_audit = service.select_important_urls(
+            urls_to_audit, base_url, max_sample=max_audit
+        )
+
+    def canonical(u: str) -> str:
+        return (u or "").rstrip("/").lower()
+
+    seen_urls = set()
+    deduped_urls = []
+    for u in urls_to_audit:
+        if not u:
+            continue
+        cu = canonical(u)
+        if cu in seen_urls:
+            continue
+        seen_urls.add(cu)
+        deduped_urls.append(u)
+
+    if exclude_base_url:
+        base_canon = canonical(base_url)
+        deduped_urls = [u for u in deduped_urls if canonical(u) != base_canon]
+
+    return crawled_urls, deduped_urls
+
+
+async def discover_audit_pages(
+    url: str,
+    target_audit: Dict[str, Any],
+    crawler_service: callable,
+) -> Tuple[List[str], List[str]]:
+    """``discover_audit_urls`` con la misma normalización que ``run_initial_audit``."""
+    service = get_pipeline_service()
+    normalized_target = service._ensure_dict(target_audit)
+    base_url, base_host = _resolve_audit_base(url, normalized_target)
+    if not base_url:
+        return [], []
+    return await discover_audit_urls(
+        service,
+        base_url,
+        base_host,
+        crawler_service,
+        exclude_base_url=_is_valid_page_summary(normalized_target),
+    )
+
+
 async def run_initial_audit(
     url: str,
     target_audit: Dict[str, Any],
@@ -8271,6 +7738,7 @@ async def run_initial_audit(
     enable_llm_external_intel: bool = True,
     external_intel_mode: str = "full",
     external_intel_timeout_seconds: Optional[float] = None,
+    prefetched_pages: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Ejecuta el pipeline inicial de auditoría:
@@ -8278,6 +7746,12 @@ async def run_initial_audit(
     - Ejecuta búsquedas y detecta competidores
     - Audita competidores (si hay)
     - Genera reporte y fix_plan
+
+    ``prefetched_pages`` ({"crawled_urls", "summaries", "shards"}) viene del
+    fan-out distribuido: el crawl y las auditorías por página ya se hicieron en
+    shards. Cada shard ya persistió sus páginas y aporta solo registros
+    compactos del agregado (``records``) y el resumen de su primera página
+    (``sample``); esas páginas no vuelven en ``page_audits``.
     """
     service = get_pipeline_service()
 
@@ -8294,199 +7768,71 @@ async def run_initial_audit(
             )
 
     normalized_target = service._ensure_dict(target_audit)
-    base_url = (normalized_target.get("url") or url or "").strip()
-    if base_url and not urlparse(base_url).scheme:
-        base_url = f"https://{base_url}"
-    base_host = ""
-    if base_url:
-        try:
-            base_host = (urlparse(base_url).hostname or "").lower()
-            if base_host.startswith("www."):
-                base_host = base_host[4:]
-        except Exception:
-            base_host = ""
+    base_url, base_host = _resolve_audit_base(url, normalized_target)
     if base_url:
         normalized_target.setdefault("url", base_url)
         normalized_target.setdefault(
             "domain", base_host or urlparse(base_url).netloc.replace("www.", "")
         )
 
-    def safe_int(value: Any, default: int) -> int:
-        try:
-            value_int = int(value)
-            return value_int if value_int > 0 else default
-        except Exception:
-            return default
-
-    def is_valid_summary(summary: Any) -> bool:
-        if not isinstance(summary, dict):
-            return False
-        status = summary.get("status")
-        try:
-            status_int = int(status) if status is not None else None
-        except Exception:
-            status_int = None
-        if status_int is not None and status_int >= 400:
-            return False
-        for key in ("structure", "content", "eeat", "schema"):
-            if key not in summary or not isinstance(summary.get(key), dict):
-                return False
-        return True
-
     crawled_urls: List[str] = []
-    audited_summaries: List[Dict[str, Any]] = []
-    if normalized_target:
-        audited_summaries.append(normalized_target)
-
-    if crawler_service and audit_local_service and base_url:
-        try:
-            from app.core.config import settings
-        except Exception:
-            settings = None
-
-        max_crawl = safe_int(getattr(settings, "MAX_CRAWL_PAGES", None), 50)
-        max_audit_default = safe_int(
-            getattr(settings, "MAX_AUDIT_DEFAULT", None), max_crawl
-        )
-        max_audit = safe_int(
-            getattr(settings, "MAX_AUDIT_PAGES", None), max_audit_default
-        )
-        if max_crawl < max_audit:
-            max_crawl = max_audit
-
-        try:
-            crawled_urls = await crawler_service(base_url, max_pages=max_crawl)
-        except Exception as e:
-            logger.error(
-                f"run_initial_audit: crawl failed for {base_url}: {e}",
-                exc_info=True,
-            )
-            crawled_urls = []
-
-        # Fallback 1: si el crawler devolvió muy pocas URLs, intentar sitemap directo
-        if base_url and (not crawled_urls or len(crawled_urls) <= 1):
-            try:
-                from app.services.crawler_service import (
-                    CrawlerService as _CrawlerFallback,
-                )
-
-                sitemap_urls = await _CrawlerFallback.fetch_sitemap_urls(
-                    base_url,
-                    allow_subdomains=False,
-                    max_urls=max_crawl,
-                    mobile_first=True,
-                )
-                if sitemap_urls:
-                    crawled_urls = sitemap_urls
-                    logger.info(
-                        f"run_initial_audit: fallback sitemap encontró {len(crawled_urls)} URLs."
-                    )
-            except Exception as e:
-                logger.warning(
-                    f"run_initial_audit: sitemap fallback failed for {base_url}: {e}",
-                )
+    # Cada página válida entra al agregado apenas se audita; la posición
+    # conserva el orden original (target primero) para el resultado final.
+    aggregator = SummaryAggregator(base_url or url)
+    audited_summaries: List[Tuple[int, Dict[str, Any]]] = []
 
-        # Fallback 2: si sigue siendo muy bajo, intentar discovery vía Serper (site:domain)
-        serper_key_for_discovery = getattr(settings, "SERPER_API_KEY", None)
-        if base_url and (not crawled_urls or len(crawled_urls) <= 1):
-            try:
-                if not serper_key_for_discovery:
-                    logger.info(
-                        "run_initial_audit: search fallback omitido (SERPER_API_KEY ausente)."
-                    )
-                else:
-                    target_domain = base_host or urlparse(base_url).netloc.replace(
-                        "www.", ""
-                    )
-                    site_query = f"site:{target_domain}"
-                    search_data = await service.run_serper_search(
-                        site_query,
-                        serper_key_for_discovery,
-                        num_results=max(10, min(max_crawl, 100)),
-                    )
-                    items = (
-                        search_data.get("items", [])
-                        if isinstance(search_data, dict)
-                        else []
-                    )
-                    internal_urls = service._extract_internal_urls_from_search(
-                        items, target_domain, limit=max_crawl
-                    )
-                    if internal_urls:
-                        crawled_urls = internal_urls
-                        logger.info(
-                            f"run_initial_audit: search fallback encontró {len(crawled_urls)} URLs internas."
-                        )
-            except Exception as e:
-                logger.warning(
-                    f"run_initial_audit: search fallback failed for {base_url}: {e}"
-                )
+    def collect_summary(position: int, summary: Any) -> None:
+        if not _is_valid_page_summary(summary):
+            return
+        audited_summaries.append((position, summary))
+        aggregator.add(summary, position=position)
 
-        urls_to_audit = crawled_urls or [base_url]
-        if base_host:
-            filtered_urls: List[str] = []
-            skipped_by_host = 0
-            for candidate in urls_to_audit:
-                if not candidate:
-                    continue
-                try:
-                    parsed = urlparse(str(candidate))
-                except Exception:
-                    skipped_by_host += 1
-                    continue
-                candidate_host = (parsed.hostname or "").lower()
-                if candidate_host.startswith("www."):
-                    candidate_host = candidate_host[4:]
-                if candidate_host != base_host:
-                    skipped_by_host += 1
-                    continue
-                filtered_urls.append(candidate)
-            if skipped_by_host:
-                logger.info(
-                    f"run_initial_audit: filtered {skipped_by_host} URLs outside base host '{base_host}'."
+    if normalized_target:
+        collect_summary(0, normalized_target)
+
+    # Páginas que los shards ya persistieron (solo registro en el agregado).
+    persisted_pages = 0
+    if prefetched_pages is not None:
+        crawled_urls = list(prefetched_pages.get("crawled_urls") or [])
+        for position, summary in enumerate(
+            prefetched_pages.get("summaries") or [], start=1
+        ):
+            collect_summary(position, summary)
+        for shard in prefetched_pages.get("shards") or []:
+            records = shard.get("records") or []
+            for index, record in enumerate(records):
+                aggregator.add_record(
+                    record, summary=shard.get("sample") if index == 0 else None
                 )
-            urls_to_audit = filtered_urls or [base_url]
-        logger.info(
-            f"run_initial_audit: URLs crawleadas={len(crawled_urls)} | URLs a auditar={len(urls_to_audit)}"
+            persisted_pages += len(records)
+        await emit_progress(30)
+    elif crawler_service and audit_local_service and base_url:
+        crawled_urls, deduped_urls = await discover_audit_urls(
+            service,
+            base_url,
+            base_host,
+            crawler_service,
+            exclude_base_url=_is_valid_page_summary(normalized_target),
         )
-        if len(urls_to_audit) > max_audit:
-            urls_to_audit = service.select_important_urls(
-                urls_to_audit, base_url, max_sample=max_audit
-            )
-
-        def canonical(u: str) -> str:
-            return (u or "").rstrip("/").lower()
-
-        seen_urls = set()
-        deduped_urls = []
-        for u in urls_to_audit:
-            if not u:
-                continue
-            cu = canonical(u)
-            if cu in seen_urls:
-                continue
-            seen_urls.add(cu)
-            deduped_urls.append(u)
-
-        has_valid_base = is_valid_summary(normalized_target)
-        if has_valid_base:
-            base_canon = canonical(base_url)
-            deduped_urls = [u for u in deduped_urls if canonical(u) != base_canon]
-
         if deduped_urls:
             logger.info(
                 f"run_initial_audit: auditando {len(deduped_urls)} páginas (excluyendo base_url)."
             )
             sem = asyncio.Semaphore(5)
 
-            async def audit_one(audit_url: str) -> Dict[str, Any]:
+            async def audit_one(position: int, audit_url: str) -> None:
                 async with sem:
-                    return await audit_local_service(audit_url)
-
-            results = await asyncio.gather(
-                *[audit_one(u) for u in deduped_urls],
-                return_exceptions=True,
-            )
+                    result = await audit_local_service(audit_url)
+                collect_summary(position, result)
+
+            with stage_timer("local_audits"):
+                results = await asyncio.gather(
+                    *[
+                        audit_one(position, u)
+                        for position, u in enumerate(deduped_urls, start=1)
+                    ],
+                    return_exceptions=True,
+                )
 
             for result in results:
                 if isinstance(result, Exception):
@@ -8494,15 +7840,14 @@ async def run_initial_audit(
                         f"run_initial_audit: audit_local_service failed: {result}",
                         exc_info=True,
                     )
-                    continue
-                if isinstance(result, dict):
-                    audited_summaries.append(result)
             await emit_progress(30)
 
-    valid_summaries = [s for s in audited_summaries if is_valid_summary(s)]
-    if valid_summaries:
-        if len(valid_summaries) > 1:
-            aggregated = service._aggregate_summaries(valid_summaries, base_url or url)
+    audited_summaries.sort(key=lambda entry: entry[0])
+    valid_summaries = [summary for _, summary in audited_summaries]
+    if len(aggregator):
+        if len(aggregator) > 1:
+            logger.info(f"Agregando {len(aggregator)} resúmenes de auditoría...")
+            aggregated = aggregator.aggregate()
             aggregated["aggregate_label"] = aggregated.get("url")
             if base_url:
                 aggregated["url"] = base_url
@@ -8515,10 +7860,10 @@ async def run_initial_audit(
                 aggregated["language"] = normalized_target.get("language")
             normalized_target = aggregated
         else:
-            normalized_target = valid_summaries[0]
+            normalized_target = aggregator.first_summary
 
     # Attach sample content fields for LLM context
-    sample_source = valid_summaries[0] if valid_summaries else normalized_target
+    sample_source = aggregator.first_summary or normalized_target
     if isinstance(sample_source, dict):
         sample_content = sample_source.get("content", {})
         if isinstance(sample_content, dict):
@@ -8534,12 +7879,11 @@ async def run_initial_audit(
         ):
             normalized_target["meta_robots"] = sample_source.get("meta_robots")
 
-    # Store per-page audits for UI/DB saving
+    # Per-page audits are returned next to target_audit (never inside it) so they
+    # are persisted only once, in AuditedPage.
     ordered_summaries = []
     seen_summary_urls = set()
-    for summary in audited_summaries:
-        if not is_valid_summary(summary):
-            continue
+    for summary in valid_summaries:
         url_value = summary.get("url")
         if not url_value:
             continue
@@ -8556,14 +7900,13 @@ async def run_initial_audit(
         cleaned = {k: v for k, v in summary.items() if k != "_individual_page_audits"}
         return cleaned
 
-    normalized_target["_individual_page_audits"] = [
+    page_audits = [
         {"index": idx, "url": s.get("url"), "data": _snapshot_summary(s)}
         for idx, s in enumerate(ordered_summaries)
     ]
-    if ordered_summaries:
-        normalized_target["site_metrics"] = service._compute_site_metrics(
-            ordered_summaries
-        )
+    normalized_target.pop("_individual_page_audits", None)
+    if ordered_summaries or persisted_pages:
+        normalized_target["site_metrics"] = aggregator.site_metrics()
         try:
             from app.services.audit_service import CompetitorService
 
@@ -8580,8 +7923,10 @@ async def run_initial_audit(
             )
         except Exception:  # nosec B110
             pass
-    if ordered_summaries and base_url:
-        normalized_target.setdefault("audited_pages_count", len(ordered_summaries))
+    if (ordered_summaries or persisted_pages) and base_url:
+        normalized_target.setdefault(
+            "audited_pages_count", len(ordered_summaries) + persisted_pages
+        )
         if "audited_page_paths" not in normalized_target:
 
             def _path_from_url(u: str) -> str:
@@ -8594,7 +7939,8 @@ async def run_initial_audit(
                 return path_value if path_value.startswith("/") else f"/{path_value}"
 
             normalized_target["audited_page_paths"] = [
-                _path_from_url(s.get("url", "")) for s in ordered_summaries
+                _path_from_url(s.get("url", ""))
+                for s in ordered_summaries or [aggregator.first_summary]
             ]
     if crawled_urls:
         normalized_target["crawled_pages_count"] = len(crawled_urls)
@@ -8611,15 +7957,16 @@ async def run_initial_audit(
                 if external_intel_timeout_seconds
                 else {"max_retries": 1}
             )
-            (
-                external_intelligence,
-                search_queries,
-            ) = await service.analyze_external_intelligence(
-                normalized_target,
-                llm_function=llm_function,
-                mode=external_intel_mode,
-                retry_policy=retry_policy,
-            )
+            with stage_timer("external_intel"):
+                (
+                    external_intelligence,
+                    search_queries,
+                ) = await service.analyze_external_intelligence(
+                    normalized_target,
+                    llm_function=llm_function,
+                    mode=external_intel_mode,
+                    retry_policy=retry_policy,
+                )
         except Exception as e:
             error_code, error_message = service._resolve_external_intel_error(e)
             external_intelligence = service._build_unavailable_external_intelligence(
@@ -8718,14 +8065,15 @@ async def run_initial_audit(
                     )
                 )
 
-            for query_text, task in tasks.items():
-                try:
-                    search_results[query_text] = await task
-                except Exception as e:
-                    logger.error(
-                        f"run_initial_audit: search failed for '{query_text}': {e}"
-                    )
-                    search_results[query_text] = {"error": str(e), "items": []}
+            with stage_timer("serp"):
+                for query_text, task in tasks.items():
+                    try:
+                        search_results[query_text] = await task
+                    except Exception as e:
+                        logger.error(
+                            f"run_initial_audit: search failed for '{query_text}': {e}"
+                        )
+                        search_results[query_text] = {"error": str(e), "items": []}
     await emit_progress(45)
 
     # 3) Identify competitors
@@ -8760,9 +8108,10 @@ async def run_initial_audit(
     competitor_audits: List[Dict[str, Any]] = []
     if competitor_urls and audit_local_service:
         try:
-            competitor_audits = await service.generate_competitor_audits(
-                competitor_urls, audit_local_function=audit_local_service
-            )
+            with stage_timer("competitor_audits"):
+                competitor_audits = await service.generate_competitor_audits(
+                    competitor_urls, audit_local_function=audit_local_service
+                )
         except Exception as e:
             logger.error(
                 f"run_initial_audit: competitor audits failed: {e}", exc_info=True
@@ -8774,13 +8123,14 @@ async def run_initial_audit(
     fix_plan: List[Dict[str, Any]] = []
     if generate_report:
         await emit_progress(80)
-        report_markdown, fix_plan = await service.generate_report(
-            target_audit=normalized_target,
-            external_intelligence=external_intelligence,
-            search_results=search_results,
-            competitor_audits=competitor_audits,
-            llm_function=llm_function,
-        )
+        with stage_timer("report"):
+            report_markdown, fix_plan = await service.generate_report(
+                target_audit=normalized_target,
+                external_intelligence=external_intelligence,
+                search_results=search_results,
+                competitor_audits=competitor_audits,
+                llm_function=llm_function,
+            )
         await emit_progress(95)
         if not report_markdown:
             report_markdown = service._build_initial_baseline_report(
@@ -8798,4 +8148,5 @@ async def run_initial_audit(
         "report_markdown": report_markdown,
         "fix_plan": fix_plan,
         "pagespeed": {},
+        "page_audits": page_audits,
     }
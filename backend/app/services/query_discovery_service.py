@@ -33,6 +33,7 @@ class QueryDiscoveryService:
         industry: str,
         keywords: List[str],
         llm_function: Optional[callable] = None,
+        audit_id: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         Descubre queries relevantes para el nicho.
@@ -43,6 +44,7 @@ class QueryDiscoveryService:
             industry: Industria/categoría
             keywords: Keywords principales
             llm_function: Función LLM para generar queries
+            audit_id: Audit asociado (comparte probes con otros servicios GEO)
 
         Returns:
             Lista de queries descubiertas con metadatos
@@ -56,7 +58,7 @@ class QueryDiscoveryService:
 
         # PASO 2: Validar queries
         validated_queries = await QueryDiscoveryService._validate_queries(
-            candidate_queries, brand_name, domain, llm_function
+            candidate_queries, brand_name, domain, llm_function, audit_id=audit_id
         )
 
         # PASO 3: Clasificar por intención
@@ -151,18 +153,23 @@ Cómo mejorar el ranking de mi sitio web
         brand_name: str,
         domain: str,
         llm_function: Optional[callable],
+        audit_id: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """Valida queries consultando a un LLM."""
+        from app.services.llm_probe_executor import get_probe_executor
 
         validated = []
 
-        for query in queries:
+        # Consultar LLM con todas las queries en paralelo
+        if llm_function:
+            responses = await get_probe_executor(audit_id, llm_function).run(queries)
+        else:
+            responses = [""] * len(queries)
+
+        for query, response in zip(queries, responses):
             try:
-                # Consultar LLM con la query
-                if llm_function:
-                    response = await llm_function(query)
-                else:
-                    response = ""
+                if isinstance(response, Exception):
+                    raise response
 
                 # Verificar si genera contenido relevante
                 is_relevant = len(response) > 50
@@ -0,0 +1,155 @@
+"""
+Modelo en memoria de los artefactos que consume el renderer de PDF.
+
+Las entradas usan los mismos nombres lógicos que la carpeta de reporte y el
+bundle (``"ag2_report.md"``, ``"fix_plan.json"``, ``"pages/page_1.json"``,
+``"competitors/competitor_1.json"``), de modo que el renderer lee igual desde
+memoria, desde JSONs sueltos o desde ``audit_artifacts.bundle``.
+
+``PDFService`` construye un ``ReportArtifacts`` y se lo pasa directo al
+renderer: sin serializar, escribir ni volver a parsear cada JSON. El modo
+carpeta (``from_folder`` / ``write_folder``) queda para depurar y para el CLI
+de ``create_pdf``.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from app.services.artifact_bundle import open_artifact_bundle
+
+_TEXT_SUFFIXES = (".md", ".txt")
+
+
+def _normalize_name(name: str) -> str:
+    normalized = str(name).replace("\\", "/").lstrip("/")
+    if not normalized:
+        raise ValueError("Artifact name is required")
+    return normalized
+
+
+class ReportArtifacts:
+    """Artefactos de un reporte indexados por nombre lógico."""
+
+    def __init__(
+        self,
+        report_name: str,
+        entries: Optional[Dict[str, Any]] = None,
+        *,
+        source=None,
+    ):
+        self.report_name = str(report_name)
+        self._entries: Dict[str, Any] = {}
+        # Fuente perezosa (carpeta / bundle) para el modo depuración.
+        self._source = source
+        for name, value in (entries or {}).items():
+            self.add(name, value)
+
+    def add(self, name: str, value: Any) -> None:
+        self._entries[_normalize_name(name)] = value
+
+    def __contains__(self, name: str) -> bool:
+        name = _normalize_name(name)
+        return name in self._entries or (
+            self._source is not None and self._source.exists(name)
+        )
+
+    def get(self, name: str, default: Any = None) -> Any:
+        name = _normalize_name(name)
+        if name in self._entries:
+            return self._entries[name]
+        if self._source is not None and self._source.exists(name):
+            return self._source.read(name)
+        return default
+
+    def read(self, name: str) -> Any:
+        """Como ``get`` pero falla si la entrada no existe."""
+        if name not in self:
+            raise FileNotFoundError(f"Artifact not found: {name}")
+        return self.get(name)
+
+    def names(self, pattern: str) -> List[str]:
+        """Nombres que matchean ``pattern`` (glob sobre el nombre lógico), ordenados."""
+        pattern = _normalize_name(pattern)
+        matches = {name for name in self._entries if fnmatch.fnmatch(name, pattern)}
+        if not matches and self._source is not None:
+            matches.update(self._source.names(pattern))
+        return sorted(matches)
+
+    def digest(self) -> str:
+        """sha256 estable de las entradas en memoria (clave de cache de render)."""
+        hasher = hashlib.sha256()
+        for name in sorted(self._entries):
+            value = self._entries[name]
+            payload = (
+                value
+                if isinstance(value, str)
+                else json.dumps(
+                    value,
+                    sort_keys=True,
+                    separators=(",", ":"),
+                    ensure_ascii=False,
+                    default=str,
+                )
+            )
+            hasher.update(name.encode("utf-8") + b"\0")
+            hasher.update(payload.encode("utf-8") + b"\0")
+        return hasher.hexdigest()
+
+    @classmethod
+    def from_folder(cls, report_folder_path: str) -> "ReportArtifacts":
+        """Artefactos de una carpeta de reporte (JSONs sueltos o bundle), leídos a demanda."""
+        return cls(
+            os.path.basename(os.path.normpath(report_folder_path)),
+            source=_FolderSource(report_folder_path),
+        )
+
+    def write_folder(self, report_folder_path: str) -> None:
+        """Vuelca las entradas en memoria como carpeta de reporte (depuración)."""
+        for name, value in self._entries.items():
+            path = os.path.join(report_folder_path, *name.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                if name.endswith(_TEXT_SUFFIXES):
+                    f.write(str(value or ""))
+                else:
+                    json.dump(value, f, indent=2, ensure_ascii=False, default=str)
+
+
+class _FolderSource:
+    """JSONs sueltos con prioridad; si no existen, el bundle comprimido."""
+
+    def __init__(self, report_folder_path: str):
+        self.root = report_folder_path
+        self.bundle = open_artifact_bundle(report_folder_path)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, *name.split("/"))
+
+    def exists(self, name: str) -> bool:
+        if os.path.exists(self._path(name)):
+            return True
+        return self.bundle is not None and name in self.bundle
+
+    def read(self, name: str) -> Any:
+        path = self._path(name)
+        if os.path.exists(path) or self.bundle is None:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read() if name.endswith(_TEXT_SUFFIXES) else json.load(f)
+        if name not in self.bundle:
+            raise FileNotFoundError(f"Artifact not found: {name}")
+        return self.bundle.get(name)
+
+    def names(self, pattern: str) -> List[str]:
+        loose_files = glob.glob(os.path.join(self.root, *pattern.split("/")))
+        if loose_files or self.bundle is None:
+            return [
+                os.path.relpath(path, self.root).replace(os.sep, "/")
+                for path in loose_files
+            ]
+        return self.bundle.names(pattern)
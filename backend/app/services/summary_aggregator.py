@@ -0,0 +1,590 @@
+"""
+Agregación incremental de auditorías por página.
+
+``SummaryAggregator`` consume los resúmenes de ``audit_local_service`` de a uno
+(a medida que terminan) y en una sola pasada calcula lo que antes hacían
+``PipelineService._aggregate_summaries`` y ``_compute_site_metrics`` con una
+pasada por señal. De cada página guarda solo un registro compacto (ruta, flags
+y contadores), nunca el dict completo; las listas dependientes del orden se
+resuelven por posición al final, así el resultado no depende del orden en que
+terminan las páginas. Los registros se serializan (``page_record`` /
+``add_record``): los shards del fan-out devuelven eso y no los resúmenes.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+_SLASHES_RE = re.compile(r"/{2,}")
+_PRICE_RE = re.compile(r"[0-9]+(?:[\\.,][0-9]+)?")
+
+PRICE_SAMPLE_LIMIT = 50
+JSONLD_BLOCKS_PER_PAGE = 5
+
+PRODUCT_URL_PATTERNS = (
+    "/p/",
+    "/producto",
+    "/product/",
+    "/products/",
+    "/sku/",
+    "/item/",
+)
+CATEGORY_URL_PATTERNS = (
+    "/category/",
+    "/categories/",
+    "/collection/",
+    "/collections/",
+    "/c/",
+    "/shop/",
+    "/store/",
+    "/department/",
+)
+PRODUCT_PAGE_SCHEMA_TYPES = ("Product", "Offer", "AggregateOffer")
+PRODUCT_SCHEMA_TYPES = frozenset({"Product"})
+OFFER_SCHEMA_TYPES = frozenset({"Offer", "AggregateOffer"})
+REVIEW_SCHEMA_TYPES = frozenset({"Review", "AggregateRating"})
+FAQ_SCHEMA_TYPES = frozenset({"FAQPage"})
+
+
+def canonical_host(value: str) -> str:
+    if not value:
+        return ""
+    try:
+        parsed_value = urlparse(value if "://" in value else f"https://{value}")
+    except Exception:
+        return ""
+    host_value = (parsed_value.hostname or "").lower()
+    if host_value.startswith("www."):
+        host_value = host_value[4:]
+    return host_value
+
+
+def path_from_url(url_str: Any, base_host: str) -> str:
+    """Ruta normalizada de una página (``base_host`` ya canonicalizado)."""
+    if not url_str:
+        return "/"
+
+    raw = str(url_str).strip()
+    if not raw:
+        return "/"
+
+    path = ""
+    if raw.startswith("/"):
+        path = raw
+    else:
+        try:
+            parsed = urlparse(raw if "://" in raw else f"https://{raw}")
+        except Exception:
+            parsed = None
+
+        parsed_host = ""
+        if parsed is not None:
+            parsed_host = (parsed.hostname or "").lower()
+            if parsed_host.startswith("www."):
+                parsed_host = parsed_host[4:]
+            path = parsed.path or ""
+
+        # Valores malformados como "root-house./services" deben conservar
+        # solo la parte de ruta, nunca el host residual.
+        if (
+            base_host
+            and parsed_host
+            and parsed_host != base_host
+            and "://" not in raw
+            and "/" in raw
+        ):
+            path = f"/{raw.split('/', 1)[1]}"
+
+    if not path:
+        if raw.startswith("/"):
+            path = raw
+        elif "://" not in raw and "/" in raw:
+            path = f"/{raw.split('/', 1)[1]}"
+        else:
+            path = "/"
+
+    path = path.split("?", 1)[0].split("#", 1)[0].strip() or "/"
+    if not path.startswith("/"):
+        path = f"/{path}"
+    path = _SLASHES_RE.sub("/", path)
+    return path or "/"
+
+
+def _dict(value: Any) -> Dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def _int(value: Any) -> int:
+    return value if isinstance(value, int) else 0
+
+
+def _collect_prices(obj: Any, prices: List[float], currency: List[str]) -> bool:
+    """Recorre un bloque JSON-LD; devuelve True si encontró algún precio."""
+    found = False
+    if isinstance(obj, dict):
+        offers = obj.get("offers")
+        if offers:
+            found = _collect_prices(offers, prices, currency) or found
+        price_val = obj.get("price")
+        currency_val = obj.get("priceCurrency") or obj.get("pricecurrency")
+        if currency_val and not currency:
+            currency.append(str(currency_val))
+        if price_val is not None:
+            if isinstance(price_val, (int, float)):
+                prices.append(float(price_val))
+                found = True
+            elif isinstance(price_val, str):
+                match = _PRICE_RE.search(price_val)
+                if match:
+                    try:
+                        prices.append(float(match.group(0).replace(",", ".")))
+                        found = True
+                    except Exception:  # nosec B110
+                        pass
+        for value in obj.values():
+            found = _collect_prices(value, prices, currency) or found
+    elif isinstance(obj, list):
+        for item in obj:
+            found = _collect_prices(item, prices, currency) or found
+    return found
+
+
+@dataclass
+class _PageRecord:
+    """Lo que la agregación necesita de una página, sin el resumen completo."""
+
+    position: int
+    path: str
+    url_key: str
+    has_url: bool = False
+    generated_at: Any = None
+    h1_status: Any = None
+    h1_example: Optional[str] = None
+    h1_homepage_example: Any = None
+    h1_homepage_count: Any = None
+    author_pass: bool = False
+    schema_present: bool = False
+    faq_pass: bool = False
+    long_paragraphs: bool = False
+    missing_dates: bool = False
+    missing_authoritative_links: bool = False
+    schema_types: List[str] = field(default_factory=list)
+    raw_jsonld: Optional[Dict[str, Any]] = None
+    header_issue: Optional[Dict[str, Any]] = None
+    meta_robots: Any = None
+    external_links: int = 0
+    authoritative_links: int = 0
+    list_count: int = 0
+    table_count: int = 0
+    semantic_score: Any = 0
+    conversational_score: Any = 0
+    # _compute_site_metrics
+    url_path: str = ""
+    has_meta_description: bool = False
+    has_meta_keywords: bool = False
+    product_page: bool = False
+    category_page: bool = False
+    images: int = 0
+    images_missing_alt: int = 0
+    videos: int = 0
+    prices: List[float] = field(default_factory=list)
+    price_currency: Optional[str] = None
+    has_price: bool = False
+    text_length: int = 0
+
+
+class SummaryAggregator:
+    """
+    Agregado site-wide que se alimenta página a página.
+
+    ``add`` puede llamarse en cualquier orden con la posición original de cada
+    página; ``aggregate`` y ``site_metrics`` producen lo mismo que
+    ``_aggregate_summaries`` / ``_compute_site_metrics`` sobre la lista ordenada.
+    Con ``dedupe_pages`` las métricas de sitio cuentan una vez cada URL (y
+    omiten resúmenes sin URL), igual que las páginas persistidas del pipeline.
+    """
+
+    def __init__(self, base_url: str, dedupe_pages: bool = True):
+        self.base_url = base_url
+        self.base_host = canonical_host(str(base_url or "").strip())
+        self.dedupe_pages = dedupe_pages
+        self._records: List[_PageRecord] = []
+        self._site_records: Dict[Any, _PageRecord] = {}
+        self._first_summary: Optional[Dict[str, Any]] = None
+        self._first_position: Optional[int] = None
+        self._next_position = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def first_summary(self) -> Optional[Dict[str, Any]]:
+        """Resumen de menor posición (el único que se conserva entero)."""
+        return self._first_summary
+
+    def add(self, summary: Dict[str, Any], position: Optional[int] = None) -> None:
+        if position is None:
+            position = self._next_position
+        self._add(self._build_record(summary, position), summary)
+
+    def page_record(self, summary: Dict[str, Any], position: int) -> Dict[str, Any]:
+        """Registro compacto (JSON) de una página, para agregarla en otro proceso."""
+        return asdict(self._build_record(summary, position))
+
+    def add_record(
+        self, record: Dict[str, Any], summary: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Suma un registro de ``page_record``. El resumen completo solo hace falta
+        para la página de menor posición (``first_summary``).
+        """
+        self._add(_PageRecord(**record), summary)
+
+    def _add(self, record: _PageRecord, summary: Optional[Dict[str, Any]]) -> None:
+        position = record.position
+        self._next_position = max(self._next_position, position + 1)
+        self._records.append(record)
+        if summary is not None and (
+            self._first_position is None or position < self._first_position
+        ):
+            self._first_position = position
+            self._first_summary = summary
+
+        if not self.dedupe_pages:
+            self._site_records[position] = record
+        elif record.has_url:
+            current = self._site_records.get(record.url_key)
+            if current is None or position < current.position:
+                self._site_records[record.url_key] = record
+
+    def _build_record(self, summary: Dict[str, Any], position: int) -> _PageRecord:
+        structure = _dict(summary.get("structure"))
+        content = _dict(summary.get("content"))
+        eeat = _dict(summary.get("eeat"))
+        schema = _dict(summary.get("schema"))
+        h1_check = _dict(structure.get("h1_check"))
+        citations = _dict(eeat.get("citations_and_sources"))
+        url_value = summary.get("url")
+        path = path_from_url(url_value, self.base_host)
+
+        record = _PageRecord(
+            position=position,
+            path=path,
+            url_key=str(url_value or "").rstrip("/").lower(),
+            has_url=bool(url_value),
+            generated_at=summary.get("generated_at"),
+            h1_status=h1_check.get("status"),
+            author_pass=_dict(eeat.get("author_presence")).get("status") == "pass",
+            schema_present=_dict(schema.get("schema_presence")).get("status")
+            == "present",
+            faq_pass=_dict(content.get("question_targeting")).get("status") == "pass",
+            missing_dates=not _dict(eeat.get("content_freshness")).get("dates_found"),
+            missing_authoritative_links=citations.get("authoritative_links") == 0,
+            schema_types=list(schema.get("schema_types") or []),
+            meta_robots=summary.get("meta_robots"),
+            external_links=citations.get("external_links") or 0,
+            authoritative_links=citations.get("authoritative_links") or 0,
+            list_count=_dict(structure.get("list_usage")).get("count") or 0,
+            table_count=_dict(structure.get("table_usage")).get("count") or 0,
+            semantic_score=_dict(structure.get("semantic_html")).get("score_percent"),
+            conversational_score=_dict(content.get("conversational_tone")).get("score")
+            or 0,
+            has_meta_description=bool(content.get("meta_description")),
+            has_meta_keywords=bool(content.get("meta_keywords")),
+            text_length=len(content.get("text_sample", "") or ""),
+        )
+
+        h1_details = h1_check.get("details", {})
+        if h1_details:
+            record.h1_example = (
+                f"[{path}] -> H1: {h1_details.get('example', 'N/A')} "
+                f"(Count: {h1_details.get('count', 0)})"
+            )
+            record.h1_homepage_example = h1_details.get("example")
+            record.h1_homepage_count = h1_details.get("count")
+
+        fragment_details = _dict(content.get("fragment_clarity")).get("details") or ""
+        if isinstance(fragment_details, str) and "long_paragraphs=" in fragment_details:
+            try:
+                record.long_paragraphs = int(fragment_details.split("=")[-1]) > 0
+            except ValueError:
+                record.long_paragraphs = False
+
+        raw_jsonld = schema.get("raw_jsonld") or []
+        if raw_jsonld:
+            record.raw_jsonld = {"page_path": path, "raw_json": raw_jsonld[0]}
+
+        header_issues = _dict(structure.get("header_hierarchy")).get("issues") or []
+        if header_issues:
+            first_issue = header_issues[0]
+            record.header_issue = {
+                "page_path": path,
+                "prev_tag_html": first_issue.get("prev_tag_html"),
+                "current_tag_html": first_issue.get("current_tag_html"),
+            }
+
+        url_path = urlparse(url_value).path.lower() if url_value else ""
+        record.url_path = url_path
+        record.product_page = any(p in url_path for p in PRODUCT_URL_PATTERNS) or any(
+            t in PRODUCT_PAGE_SCHEMA_TYPES for t in record.schema_types
+        )
+        record.category_page = any(p in url_path for p in CATEGORY_URL_PATTERNS)
+
+        media = _dict(content.get("media"))
+        record.images = _int(media.get("image_count"))
+        record.images_missing_alt = _int(media.get("images_missing_alt"))
+        record.videos = _int(media.get("video_count"))
+
+        currency: List[str] = []
+        for block in raw_jsonld[:JSONLD_BLOCKS_PER_PAGE]:
+            try:
+                parsed = json.loads(block)
+            except Exception:  # nosec B112
+                continue
+            record.has_price = (
+                _collect_prices(parsed, record.prices, currency) or record.has_price
+            )
+        record.prices = [price for price in record.prices if price > 0]
+        record.price_currency = currency[0] if currency else None
+        return record
+
+    def _ordered(self, records) -> List[_PageRecord]:
+        return sorted(records, key=lambda record: record.position)
+
+    def aggregate(self) -> Dict[str, Any]:
+        """Resumen consolidado (ver ``PipelineService._aggregate_summaries``)."""
+        if not self._records:
+            return {"error": "No summaries provided"}
+
+        records = self._ordered(self._records)
+        if len(records) == 1:
+            summary = self._first_summary
+            summary["audited_page_paths"] = [records[0].path]
+            return summary
+
+        total = len(records)
+        paths = [record.path for record in records]
+        pages_with_h1_pass = [r.path for r in records if r.h1_status == "pass"]
+        pages_missing_h1 = [r.path for r in records if r.h1_status != "pass"]
+        pages_with_author = [r.path for r in records if r.author_pass]
+        pages_with_schema = [r.path for r in records if r.schema_present]
+        pages_with_faqs = [r.path for r in records if r.faq_pass]
+        long_paragraph_issues = [r.path for r in records if r.long_paragraphs]
+        author_missing_issues = [r.path for r in records if not r.author_pass]
+        freshness_missing_issues = [r.path for r in records if r.missing_dates]
+        no_authoritative_links = [
+            r.path for r in records if r.missing_authoritative_links
+        ]
+        header_hierarchy_issues = [r.header_issue for r in records if r.header_issue]
+
+        all_schema_types = set()
+        all_meta_robots = set()
+        homepage_h1_status = None
+        homepage_h1_example = None
+        homepage_h1_count = None
+        for record in records:
+            all_schema_types.update(record.schema_types)
+            if record.meta_robots:
+                all_meta_robots.add(record.meta_robots)
+            if record.path == "/":
+                homepage_h1_status = record.h1_status
+                homepage_h1_example = record.h1_homepage_example
+                homepage_h1_count = record.h1_homepage_count
+
+        avg_semantic_score = round(
+            sum(
+                r.semantic_score
+                for r in records
+                if isinstance(r.semantic_score, (int, float))
+            )
+            / total,
+            1,
+        )
+        avg_conversational = round(
+            sum(r.conversational_score for r in records) / total,
+            1,
+        )
+
+        h1_status = "pass" if len(pages_with_h1_pass) == total else "warn"
+        if homepage_h1_status and homepage_h1_status != "pass":
+            h1_status = "fail"
+
+        return {
+            "url": f"SITE-WIDE AGGREGATE: {self.base_url}",
+            "status": 200,
+            "content_type": "aggregate/json",
+            "generated_at": records[0].generated_at,
+            "audited_pages_count": total,
+            "audited_page_paths": paths,
+            "structure": {
+                "h1_check": {
+                    "status": h1_status,
+                    "details": f"{len(pages_with_h1_pass)}/{total} pages have a valid H1.",
+                    "pages_pass": pages_with_h1_pass,
+                    "pages_missing": pages_missing_h1,
+                    "homepage_status": homepage_h1_status,
+                    "homepage_example": homepage_h1_example,
+                    "homepage_count": homepage_h1_count,
+                    "examples": [r.h1_example for r in records if r.h1_example],
+                },
+                "header_hierarchy": {
+                    "issues_found_on_pages": len(header_hierarchy_issues),
+                    "pages_with_issues": [
+                        issue["page_path"] for issue in header_hierarchy_issues
+                    ],
+                    "issue_examples": header_hierarchy_issues,
+                },
+                "semantic_html": {"score_percent": avg_semantic_score},
+                "list_usage": {"count": sum(r.list_count for r in records)},
+                "table_usage": {"count": sum(r.table_count for r in records)},
+            },
+            "content": {
+                "fragment_clarity": {
+                    "long_paragraphs_found_on_pages": len(long_paragraph_issues),
+                    "pages_with_issues": long_paragraph_issues,
+                },
+                "conversational_tone": {"score": avg_conversational},
+                "question_targeting": {
+                    "status": "pass" if pages_with_faqs else "warn",
+                    "details": f"FAQs detected on {len(pages_with_faqs)} pages.",
+                    "pages_with_faqs": pages_with_faqs,
+                },
+            },
+            "eeat": {
+                "author_presence": {
+                    "status": "warn" if len(pages_with_author) < total else "pass",
+                    "details": f"Author found on {len(pages_with_author)}/{total} pages.",
+                    "pages_with_author": pages_with_author,
+                    "pages_missing_author": author_missing_issues,
+                },
+                "citations_and_sources": {
+                    "total_external_links": sum(r.external_links for r in records),
+                    "total_authoritative_links": sum(
+                        r.authoritative_links for r in records
+                    ),
+                    "pages_missing_authoritative_links": no_authoritative_links,
+                },
+                "content_freshness": {
+                    "dates_found_on_pages": total - len(freshness_missing_issues),
+                    "pages_missing_dates": freshness_missing_issues,
+                },
+            },
+            "schema": {
+                "schema_presence": {
+                    "status": "warn" if len(pages_with_schema) < total else "pass",
+                    "details": f"JSON-LD Schema found on {len(pages_with_schema)}/{total} pages.",
+                    "pages_with_schema": pages_with_schema,
+                },
+                "schema_types": list(all_schema_types),
+                "raw_jsonld_found": [r.raw_jsonld for r in records if r.raw_jsonld],
+            },
+            "meta_robots": list(all_meta_robots),
+        }
+
+    def site_metrics(self, total_pages: Optional[int] = None) -> Dict[str, Any]:
+        """Métricas de sitio (ver ``PipelineService._compute_site_metrics``)."""
+        records = self._ordered(self._site_records.values())
+        total_pages = len(records) if total_pages is None else total_pages
+        if not total_pages:
+            return {}
+
+        h1_missing = sum(1 for r in records if r.h1_status != "pass")
+        header_hierarchy_issue_pages = sum(1 for r in records if r.header_issue)
+        semantic_scores = [
+            float(r.semantic_score)
+            for r in records
+            if isinstance(r.semantic_score, (int, float))
+        ]
+        homepage_h1_status = next(
+            (
+                r.h1_status
+                for r in records
+                if r.url_path in ("", "/") and r.h1_status is not None
+            ),
+            None,
+        )
+        price_samples: List[float] = []
+        price_currency = None
+        for record in records:
+            if price_currency is None and record.price_currency:
+                price_currency = record.price_currency
+            if len(price_samples) < PRICE_SAMPLE_LIMIT:
+                price_samples.extend(record.prices)
+        price_samples = price_samples[:PRICE_SAMPLE_LIMIT]
+        total_images = sum(r.images for r in records)
+        missing_alt = sum(r.images_missing_alt for r in records)
+
+        def _count_schema(types: frozenset) -> int:
+            return sum(1 for r in records for t in r.schema_types if t in types)
+
+        avg_semantic = (
+            round(sum(semantic_scores) / len(semantic_scores), 1)
+            if semantic_scores
+            else 0.0
+        )
+        avg_text_len = (
+            round(sum(r.text_length for r in records) / len(records), 1)
+            if records
+            else 0.0
+        )
+        pages = max(1, total_pages)
+        schema_coverage = round(
+            (sum(1 for r in records if r.schema_present) / pages) * 100, 1
+        )
+        h1_coverage = round(((total_pages - h1_missing) / pages) * 100, 1)
+        header_hierarchy_coverage = round(
+            ((total_pages - header_hierarchy_issue_pages) / pages) * 100,
+            1,
+        )
+        structure_score = round(
+            (avg_semantic + h1_coverage + header_hierarchy_coverage) / 3, 1
+        )
+
+        avg_price = (
+            round(sum(price_samples) / len(price_samples), 2) if price_samples else None
+        )
+        min_price = round(min(price_samples), 2) if price_samples else None
+        max_price = round(max(price_samples), 2) if price_samples else None
+        image_alt_coverage = (
+            round((total_images - missing_alt) / max(1, total_images) * 100, 1)
+            if total_images
+            else None
+        )
+
+        return {
+            "pages_analyzed": total_pages,
+            "schema_coverage_percent": schema_coverage,
+            "h1_coverage_percent": h1_coverage,
+            "header_hierarchy_issue_pages": header_hierarchy_issue_pages,
+            "header_hierarchy_coverage_percent": header_hierarchy_coverage,
+            "structure_score_percent": structure_score,
+            "homepage_h1_status": homepage_h1_status,
+            "faq_page_count": sum(1 for r in records if r.faq_pass),
+            "product_page_count": sum(1 for r in records if r.product_page),
+            "category_page_count": sum(1 for r in records if r.category_page),
+            "avg_semantic_score_percent": avg_semantic,
+            "avg_text_sample_length": avg_text_len,
+            "meta_description_coverage_percent": round(
+                (sum(1 for r in records if r.has_meta_description) / pages) * 100, 1
+            ),
+            "meta_keywords_coverage_percent": round(
+                (sum(1 for r in records if r.has_meta_keywords) / pages) * 100, 1
+            ),
+            "product_schema_pages": _count_schema(PRODUCT_SCHEMA_TYPES),
+            "offer_schema_pages": _count_schema(OFFER_SCHEMA_TYPES),
+            "review_schema_pages": _count_schema(REVIEW_SCHEMA_TYPES),
+            "faq_schema_pages": _count_schema(FAQ_SCHEMA_TYPES),
+            "price_samples_count": len(price_samples),
+            "avg_price": avg_price,
+            "min_price": min_price,
+            "max_price": max_price,
+            "price_currency": price_currency,
+            "pages_with_price": sum(1 for r in records if r.has_price),
+            "avg_images_per_page": round(total_images / pages, 1),
+            "image_alt_coverage_percent": image_alt_coverage,
+            "video_count_total": sum(r.videos for r in records),
+        }
@@ -2,7 +2,12 @@
 Servicio de integración con Supabase (Storage & Auth Admin)
 """
 
-from typing import Optional
+import base64
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 
 from app.core.config import settings
 from app.core.logger import get_logger
@@ -19,10 +24,21 @@ except ImportError:
     logger.warning("Supabase client library not found. Install 'supabase' package.")
 
 
+# Supabase exige chunks de exactamente 6 MB en uploads resumables (TUS),
+# salvo el último.
+RESUMABLE_CHUNK_SIZE = 6 * 1024 * 1024
+TUS_VERSION = "1.0.0"
+
+
 class SupabaseService:
     """Servicio wrapper para Supabase"""
 
     _client: Optional["Client"] = None
+    # LRU (bucket, path, expiry_seconds) -> (signed_url, cache_expires_at monotonic)
+    _signed_url_cache: "OrderedDict[Tuple[str, str, int], Tuple[str, float]]" = (
+        OrderedDict()
+    )
+    _signed_url_lock = threading.Lock()
 
     @classmethod
     def get_client(cls) -> "Client":
@@ -65,10 +81,197 @@ class SupabaseService:
         except Exception as e:
             logger.error(f"Error subiendo archivo a Supabase: {e}")
             raise e
+        finally:
+            cls.invalidate_signed_urls(bucket, path)
+
+    @classmethod
+    def upload_path(
+        cls,
+        bucket: str,
+        path: str,
+        file_path: str,
+        content_type: str = "application/pdf",
+    ) -> int:
+        """
+        Subir un archivo desde disco sin cargarlo entero en memoria.
+
+        Hasta ``SUPABASE_RESUMABLE_UPLOAD_THRESHOLD_MB`` se envía como stream en
+        un único request; por encima se usa el upload resumable (TUS) en chunks.
+        Retorna el tamaño subido en bytes.
+        """
+        file_size = os.path.getsize(file_path)
+        threshold = max(0, settings.SUPABASE_RESUMABLE_UPLOAD_THRESHOLD_MB) * (
+            1024 * 1024
+        )
+        try:
+            if threshold and file_size > threshold:
+                cls._upload_resumable(bucket, path, file_path, file_size, content_type)
+            else:
+                client = cls.get_client()
+                with open(file_path, "rb") as f:
+                    client.storage.from_(bucket).upload(
+                        path=path,
+                        file=f,
+                        file_options={"content-type": content_type, "upsert": "true"},
+                    )
+            logger.info(
+                f"Archivo subido a Supabase Storage: {bucket}/{path} size={file_size}"
+            )
+            return file_size
+        except Exception as e:
+            logger.error(f"Error subiendo archivo a Supabase: {e}")
+            raise e
+        finally:
+            cls.invalidate_signed_urls(bucket, path)
+
+    @staticmethod
+    def _storage_auth_headers() -> Dict[str, str]:
+        if not settings.SUPABASE_URL or not settings.SUPABASE_SERVICE_ROLE_KEY:
+            raise ValueError(
+                "SUPABASE_URL y SUPABASE_SERVICE_ROLE_KEY son requeridos para operaciones de backend."
+            )
+        return {
+            "Authorization": f"Bearer {settings.SUPABASE_SERVICE_ROLE_KEY}",
+            "apikey": settings.SUPABASE_SERVICE_ROLE_KEY,
+            "Tus-Resumable": TUS_VERSION,
+        }
+
+    @classmethod
+    def _upload_resumable(
+        cls,
+        bucket: str,
+        path: str,
+        file_path: str,
+        file_size: int,
+        content_type: str,
+    ) -> None:
+        """Upload resumable (TUS): un chunk en memoria a la vez, reanuda tras fallos."""
+        import httpx
+
+        def _b64(value: str) -> str:
+            return base64.b64encode(value.encode("utf-8")).decode("ascii")
+
+        headers = cls._storage_auth_headers()
+        endpoint = f"{settings.SUPABASE_URL.rstrip('/')}/storage/v1/upload/resumable"
+        max_retries = max(0, settings.SUPABASE_RESUMABLE_UPLOAD_MAX_RETRIES)
+
+        with httpx.Client(timeout=settings.SUPABASE_TIMEOUT_SECONDS) as http:
+            created = http.post(
+                endpoint,
+                headers={
+                    **headers,
+                    "Upload-Length": str(file_size),
+                    "Upload-Metadata": ",".join(
+                        [
+                            f"bucketName {_b64(bucket)}",
+                            f"objectName {_b64(path)}",
+                            f"contentType {_b64(content_type)}",
+                            f"cacheControl {_b64('3600')}",
+                        ]
+                    ),
+                    "x-upsert": "true",
+                },
+            )
+            created.raise_for_status()
+            upload_url = created.headers.get("Location")
+            if not upload_url:
+                raise ValueError("Supabase resumable upload sin header Location.")
+            if upload_url.startswith("/"):
+                upload_url = f"{settings.SUPABASE_URL.rstrip('/')}{upload_url}"
+
+            offset = 0
+            failures = 0
+            with open(file_path, "rb") as f:
+                while offset < file_size:
+                    f.seek(offset)
+                    chunk = f.read(RESUMABLE_CHUNK_SIZE)
+                    try:
+                        response = http.patch(
+                            upload_url,
+                            content=chunk,
+                            headers={
+                                **headers,
+                                "Upload-Offset": str(offset),
+                                "Content-Type": "application/offset+octet-stream",
+                            },
+                        )
+                        response.raise_for_status()
+                        offset = int(
+                            response.headers.get("Upload-Offset", offset + len(chunk))
+                        )
+                    except (httpx.HTTPError, ValueError) as e:
+                        failures += 1
+                        if failures > max_retries:
+                            raise
+                        logger.warning(
+                            f"Chunk resumable fallido {bucket}/{path} offset={offset} "
+                            f"intento={failures}: {e}"
+                        )
+                        time.sleep(min(2**failures, 10))
+                        # El servidor informa cuánto recibió realmente.
+                        head = http.head(upload_url, headers=headers)
+                        head.raise_for_status()
+                        offset = int(head.headers.get("Upload-Offset", offset))
+
+    @classmethod
+    def invalidate_signed_urls(cls, bucket: str, path: str) -> None:
+        """Descarta las signed URLs cacheadas de un objeto."""
+        with cls._signed_url_lock:
+            for key in [
+                k for k in cls._signed_url_cache if k[0] == bucket and k[1] == path
+            ]:
+                cls._signed_url_cache.pop(key, None)
+
+    @classmethod
+    def clear_signed_url_cache(cls) -> None:
+        with cls._signed_url_lock:
+            cls._signed_url_cache.clear()
 
     @classmethod
     def get_signed_url(cls, bucket: str, path: str, expiry_seconds: int = 3600) -> str:
-        """Generar URL firmada para descarga segura"""
+        """
+        Generar URL firmada para descarga segura.
+
+        La URL se cachea por objeto durante ``SUPABASE_SIGNED_URL_CACHE_SECONDS``
+        y se firma con ese margen extra, de modo que una URL servida desde cache
+        siempre sigue válida al menos ``expiry_seconds``.
+        """
+        from app.core.metrics import record_cache
+
+        cache_seconds = max(0, settings.SUPABASE_SIGNED_URL_CACHE_SECONDS)
+        cache_key = (bucket, path, int(expiry_seconds))
+        if cache_seconds:
+            with cls._signed_url_lock:
+                cached = cls._signed_url_cache.get(cache_key)
+                if cached:
+                    cls._signed_url_cache.move_to_end(cache_key)
+            if cached and time.monotonic() < cached[1]:
+                record_cache("supabase_signed_url", hit=True)
+                return cached[0]
+            record_cache("supabase_signed_url", hit=False)
+
+        signed_url = cls._create_signed_url(
+            bucket, path, int(expiry_seconds) + cache_seconds
+        )
+        if cache_seconds:
+            now = time.monotonic()
+            max_entries = max(1, settings.SUPABASE_SIGNED_URL_CACHE_MAX_ENTRIES)
+            with cls._signed_url_lock:
+                # Purga las vencidas y, si sigue lleno, desaloja las menos usadas.
+                for key in [
+                    k
+                    for k, (_, expires_at) in cls._signed_url_cache.items()
+                    if expires_at <= now
+                ]:
+                    del cls._signed_url_cache[key]
+                cls._signed_url_cache[cache_key] = (signed_url, now + cache_seconds)
+                cls._signed_url_cache.move_to_end(cache_key)
+                while len(cls._signed_url_cache) > max_entries:
+                    cls._signed_url_cache.popitem(last=False)
+        return signed_url
+
+    @classmethod
+    def _create_signed_url(cls, bucket: str, path: str, expiry_seconds: int) -> str:
         client = cls.get_client()
         try:
             res = client.storage.from_(bucket).create_signed_url(path, expiry_seconds)
@@ -104,10 +307,23 @@ class SupabaseService:
             logger.error(f"Error generando signed URL: {e}")
             raise e
 
+    @classmethod
+    def object_exists(cls, bucket: str, path: str) -> bool:
+        """True si el objeto existe en Storage (HEAD; list como fallback)."""
+        bucket_client = cls.get_client().storage.from_(bucket)
+        if hasattr(bucket_client, "exists"):
+            return bool(bucket_client.exists(path))
+        folder, _, name = path.rpartition("/")
+        entries = bucket_client.list(folder, {"search": name}) or []
+        return any(
+            isinstance(entry, dict) and entry.get("name") == name for entry in entries
+        )
+
     @classmethod
     def delete_file(cls, bucket: str, path: str):
         """Eliminar archivo"""
         client = cls.get_client()
+        cls.invalidate_signed_urls(bucket, path)
         try:
             client.storage.from_(bucket).remove([path])
         except Exception as e:
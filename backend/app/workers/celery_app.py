@@ -1,5 +1,16 @@
+import time
+
 from app.core.config import settings
+from app.core.metrics import CELERY_TASK_SECONDS, metrics_enabled, push_to_gateway
+from app.workers.queues import apply_worker_lane, queue_settings
 from celery import Celery
+from celery.signals import (
+    celeryd_init,
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+    worker_process_shutdown,
+)
 
 
 def _pick_first(*values):
@@ -55,3 +66,60 @@ celery_app.conf.update(
     # Avoid Celery 6 deprecation warning
     broker_connection_retry_on_startup=True,
 )
+# Colas por carril (audits / reports / content / webhooks) y prioridades.
+celery_app.conf.update(**queue_settings(broker_url))
+
+
+@celeryd_init.connect
+def _configure_worker_lane(conf=None, instance=None, options=None, **_kwargs):
+    # Corre antes de que el worker lea concurrency/prefetch/colas.
+    apply_worker_lane(
+        conf,
+        getattr(instance, "app", None) or celery_app,
+        settings.CELERY_WORKER_LANE,
+        queues_from_cli=(options or {}).get("queues"),
+    )
+
+
+# ===== MÉTRICAS =====
+# Cada proceso del pool tiene su propio registro: se empuja al Pushgateway
+# (si METRICS_PUSHGATEWAY_URL está configurado) tras cada tarea, con throttle.
+_task_started_at: dict = {}
+
+
+@task_prerun.connect
+def _record_task_start(task_id=None, **_kwargs):
+    if task_id:
+        _task_started_at[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _record_task_end(task_id=None, task=None, state=None, **_kwargs):
+    started = _task_started_at.pop(task_id, None)
+    if started is not None and metrics_enabled():
+        CELERY_TASK_SECONDS.observe(
+            time.perf_counter() - started,
+            task=getattr(task, "name", None) or "unknown",
+            state=state or "UNKNOWN",
+        )
+    push_to_gateway()
+
+
+@worker_process_shutdown.connect
+def _flush_metrics_on_shutdown(**_kwargs):
+    push_to_gateway(force=True)
+
+
+@worker_process_init.connect
+def _size_pdf_render_pool(**_kwargs):
+    # Un hijo prefork renderiza un PDF a la vez: más workers solo ocupan memoria.
+    from app.services.pdf_render_pool import set_render_pool_workers
+
+    set_render_pool_workers(1)
+
+
+@worker_process_shutdown.connect
+def _shutdown_pdf_render_pool(**_kwargs):
+    from app.services.pdf_render_pool import shutdown_render_pool
+
+    shutdown_render_pool(wait=False)
@@ -0,0 +1,190 @@
+"""
+Colas de Celery por clase de carga (carriles) y prioridades.
+
+Todas las tareas compartían la cola ``celery``: una ráfaga de auditorías de una
+hora dejaba sin worker a webhooks de dos segundos y a los PDFs que el usuario
+está esperando. Cada familia de tareas tiene ahora su cola y cada carril su
+perfil de worker (concurrencia / prefetch):
+
+- ``audits``: pipeline de auditoría y shards del fan-out por página, prefetch 1.
+- ``reports``: PDFs y PageSpeed. Los jobs pedidos desde la UI entran con
+  prioridad interactiva y pasan delante de los renders disparados por el pipeline.
+- ``content``: lotes de artículos.
+- ``webhooks``: entregas cortas, más concurrencia y prefetch.
+
+Un worker toma su carril de ``CELERY_WORKER_LANE`` (o ``-Q`` explícito); sin
+carril consume todas las colas como antes.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from app.core.logger import get_logger
+from kombu import Queue
+
+logger = get_logger(__name__)
+
+# Se conserva el nombre por defecto de Celery para no huerfanar mensajes encolados.
+QUEUE_DEFAULT = "celery"
+QUEUE_AUDITS = "audits"
+QUEUE_REPORTS = "reports"
+QUEUE_CONTENT = "content"
+QUEUE_WEBHOOKS = "webhooks"
+
+ALL_QUEUES = (QUEUE_DEFAULT, QUEUE_AUDITS, QUEUE_REPORTS, QUEUE_CONTENT, QUEUE_WEBHOOKS)
+
+# Prioridades en semántica AMQP (mayor = antes). ``task_priority`` las invierte
+# para brokers tipo Redis, donde 0 es la más alta.
+MAX_PRIORITY = 9
+PRIORITY_INTERACTIVE = 9
+PRIORITY_NORMAL = 5
+PRIORITY_BATCH = 1
+
+_INVERTED_PRIORITY_SCHEMES = frozenset({"redis", "rediss", "sentinel"})
+
+# task name -> (cola, prioridad)
+TASK_LANES: Dict[str, tuple[str, int]] = {
+    "run_audit_task": (QUEUE_AUDITS, PRIORITY_NORMAL),
+    "run_geo_analysis_task": (QUEUE_AUDITS, PRIORITY_BATCH),
+    "generate_full_report_task": (QUEUE_AUDITS, PRIORITY_BATCH),
+    "audit_page_shard_task": (QUEUE_AUDITS, PRIORITY_NORMAL),
+    # El callback completa una auditoría ya en curso: no espera detrás de shards.
+    "finalize_page_audit_fanout_task": (QUEUE_AUDITS, PRIORITY_INTERACTIVE),
+    "page_audit_fanout_failed_task": (QUEUE_AUDITS, PRIORITY_INTERACTIVE),
+    "run_pdf_generation_job_task": (QUEUE_REPORTS, PRIORITY_INTERACTIVE),
+    "run_pagespeed_generation_job_task": (QUEUE_REPORTS, PRIORITY_INTERACTIVE),
+    "generate_pdf_task": (QUEUE_REPORTS, PRIORITY_BATCH),
+    "run_pagespeed_task": (QUEUE_REPORTS, PRIORITY_BATCH),
+    "generate_article_batch_task": (QUEUE_CONTENT, PRIORITY_NORMAL),
+    "send_webhook_async": (QUEUE_WEBHOOKS, PRIORITY_NORMAL),
+}
+
+# Perfil de worker por carril. ``all`` es el worker único de siempre.
+WORKER_LANES: Dict[str, Dict[str, Any]] = {
+    "audits": {"queues": (QUEUE_AUDITS,), "concurrency": 2, "prefetch_multiplier": 1},
+    "reports": {
+        "queues": (QUEUE_REPORTS,),
+        "concurrency": 2,
+        "prefetch_multiplier": 1,
+    },
+    "content": {
+        "queues": (QUEUE_CONTENT,),
+        "concurrency": 2,
+        "prefetch_multiplier": 1,
+    },
+    "webhooks": {
+        "queues": (QUEUE_WEBHOOKS, QUEUE_DEFAULT),
+        "concurrency": 8,
+        "prefetch_multiplier": 4,
+    },
+    "all": {"queues": ALL_QUEUES, "concurrency": None, "prefetch_multiplier": None},
+}
+
+
+def broker_inverts_priority(broker_url: Optional[str]) -> bool:
+    scheme = urlparse(str(broker_url or "")).scheme.split("+")[0].lower()
+    return scheme in _INVERTED_PRIORITY_SCHEMES
+
+
+def task_priority(level: int, broker_url: Optional[str]) -> int:
+    """Traduce una prioridad AMQP (0-9, mayor = antes) a la del broker."""
+    level = max(0, min(MAX_PRIORITY, int(level)))
+    return MAX_PRIORITY - level if broker_inverts_priority(broker_url) else level
+
+
+def build_task_routes(broker_url: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    return {
+        name: {"queue": queue, "priority": task_priority(level, broker_url)}
+        for name, (queue, level) in TASK_LANES.items()
+    }
+
+
+def queue_settings(broker_url: Optional[str]) -> Dict[str, Any]:
+    """Config de Celery para colas, rutas y prioridades."""
+    config: Dict[str, Any] = {
+        "task_default_queue": QUEUE_DEFAULT,
+        # Declaradas explícitamente: un worker sin carril ni -Q consume todas.
+        "task_queues": tuple(Queue(name, routing_key=name) for name in ALL_QUEUES),
+        "task_routes": build_task_routes(broker_url),
+        "task_queue_max_priority": MAX_PRIORITY + 1,
+        "task_default_priority": task_priority(PRIORITY_NORMAL, broker_url),
+    }
+    if broker_inverts_priority(broker_url):
+        # Un paso por nivel: por defecto Redis agrupa en [0, 3, 6, 9].
+        config["broker_transport_options"] = {
+            "priority_steps": list(range(MAX_PRIORITY + 1))
+        }
+    return config
+
+
+def get_worker_lane(name: Optional[str]) -> Optional[Dict[str, Any]]:
+    lane = (name or "").strip().lower()
+    if not lane:
+        return None
+    if lane not in WORKER_LANES:
+        raise ValueError(
+            f"Unknown CELERY_WORKER_LANE '{name}'. "
+            f"Expected one of: {', '.join(sorted(WORKER_LANES))}"
+        )
+    return WORKER_LANES[lane]
+
+
+def apply_worker_lane(conf, app, lane_name: Optional[str], queues_from_cli=None):
+    """
+    Aplica el perfil del carril al worker antes de que lea su configuración.
+
+    Los flags de la línea de comandos (``--concurrency``, ``-Q``...) siguen
+    teniendo prioridad sobre el perfil.
+    """
+    lane = get_worker_lane(lane_name)
+    if lane is None:
+        return None
+    if lane["concurrency"]:
+        conf.worker_concurrency = lane["concurrency"]
+    if lane["prefetch_multiplier"]:
+        conf.worker_prefetch_multiplier = lane["prefetch_multiplier"]
+    if not queues_from_cli:
+        app.amqp.queues.select(list(lane["queues"]))
+    logger.info(
+        "Celery worker lane '%s' consuming %s",
+        lane_name,
+        ", ".join(lane["queues"]),
+    )
+    return lane
+
+
+def lane_for_queue(queue: str) -> Optional[str]:
+    for lane_name, lane in WORKER_LANES.items():
+        if lane_name != "all" and queue in lane["queues"]:
+            return lane_name
+    return None
+
+
+def get_queue_depths(app, timeout: float = 2.0) -> Dict[str, Optional[int]]:
+    """
+    Mensajes pendientes por cola (incluye las subcolas de prioridad en Redis).
+
+    ``None`` si el broker no respondió para esa cola.
+    """
+    depths: Dict[str, Optional[int]] = {}
+    with app.connection_for_read() as conn:
+        conn.ensure_connection(max_retries=1, timeout=timeout)
+        for queue in ALL_QUEUES:
+            # Canal nuevo por cola: un declare pasivo fallido cierra el canal en AMQP.
+            with conn.channel() as channel:
+                try:
+                    depths[queue] = int(
+                        channel.queue_declare(queue=queue, passive=True).message_count
+                    )
+                except Exception as exc:
+                    if "NOT_FOUND" in str(exc) or "404" in str(exc):
+                        # Cola nunca declarada (o vacía en Redis): sin mensajes.
+                        depths[queue] = 0
+                        continue
+                    logger.warning(
+                        f"Could not read depth of Celery queue {queue}: {exc}"
+                    )
+                    depths[queue] = None
+    return depths
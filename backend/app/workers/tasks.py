@@ -2,6 +2,8 @@
 Celery Tasks for background processing.
 """
 
+import asyncio
+import time
 from contextlib import contextmanager
 from datetime import datetime, timezone
 
@@ -12,13 +14,12 @@ from app.core.database import SessionLocal, ensure_database_revision
 # Esto puede ser refactorizado a un módulo de utilidades común en el futuro
 from app.core.llm_kimi import get_llm_function
 from app.core.logger import get_logger
+from app.core.metrics import stage_timer
 from app.models import Audit, AuditStatus, GeoArticleBatch
 from app.services.audit_local_service import AuditLocalService
 from app.services.audit_service import AuditService, ReportService
 from app.services.pagespeed_job_service import PageSpeedJobService
 from app.services.pdf_job_service import PDFJobService
-from app.services.pdf_service import PDFService
-from app.services.pipeline_service import PipelineService
 from app.workers.async_runtime import run_worker_coroutine
 from app.workers.celery_app import celery_app
 from sqlalchemy.orm import Session
@@ -76,6 +77,317 @@ def run_pagespeed_generation_job_task(job_id: int):
         }
 
 
+async def _audit_local_page(url: str):
+    """
+    Wrapper alrededor de AuditLocalService.run_local_audit que normaliza el retorno.
+    Acepta que run_local_audit devuelva (summary, meta) o solo summary, y retorna siempre summary (dict).
+    """
+    try:
+        result = await AuditLocalService.run_local_audit(url)
+
+        # Si la función retorna (summary, meta) -> extraer summary
+        if isinstance(result, (tuple, list)) and len(result) > 0:
+            summary = result[0]
+        else:
+            summary = result
+
+        # Si por alguna razón summary no es dict, retornar un dict vacío con status 500
+        if not isinstance(summary, dict):
+            logger.error(
+                f"AuditLocalService.run_local_audit returned non-dict for {url}: {type(summary)}"
+            )
+            return {
+                "status": 500,
+                "url": url,
+                "error": "Invalid audit result type",
+            }
+
+        return summary
+    except Exception as audit_error:
+        logger.error(
+            f"Error in audit_local_service_func for {url}: {audit_error}",
+            exc_info=True,
+        )
+        return {"status": 500, "url": url, "error": str(audit_error)}
+
+
+def _update_audit_progress(audit_id: int, value: float):
+    try:
+        with get_db_session() as db:
+            audit = AuditService.get_audit(db, audit_id)
+            if not audit:
+                return
+            current = audit.progress or 0
+            if value <= current:
+                return
+            AuditService.update_audit_progress(
+                db=db,
+                audit_id=audit_id,
+                progress=value,
+                status=AuditStatus.RUNNING,
+            )
+    except Exception as progress_err:
+        logger.warning(
+            f"Could not update progress for audit {audit_id}: {progress_err}"
+        )
+
+
+async def _run_initial_pipeline(
+    audit_id: int,
+    audit_url: str,
+    target_audit: dict,
+    llm_function,
+    prefetched_pages: dict | None = None,
+) -> dict:
+    # Ejecutar pipeline principal de auditoría INICIAL (sin GEO tools, sin reporte pesado)
+    # Este nuevo flujo es exclusivamente para errores (fix plan) y competidores.
+    from app.services.crawler_service import CrawlerService
+    from app.services.pipeline_service import run_initial_audit
+
+    return await run_initial_audit(
+        url=audit_url,
+        target_audit=target_audit,
+        audit_id=audit_id,
+        llm_function=llm_function,
+        google_api_key=None,
+        google_cx_id=None,
+        crawler_service=CrawlerService.crawl_site,
+        audit_local_service=_audit_local_page,
+        progress_callback=lambda value: _update_audit_progress(audit_id, value),
+        generate_report=False,
+        enable_llm_external_intel=True,
+        external_intel_mode="full",
+        external_intel_timeout_seconds=(
+            settings.AGENT1_LLM_TIMEOUT_SECONDS
+            if settings.AGENT1_LLM_TIMEOUT_SECONDS
+            and settings.AGENT1_LLM_TIMEOUT_SECONDS > 0
+            else None
+        ),
+        prefetched_pages=prefetched_pages,
+    )
+
+
+async def _audit_page_shard(
+    audit_id: int, shard_index: int, urls: list, track_progress: bool = True
+) -> list:
+    """
+    Audita un shard de URLs con concurrencia acotada y reporta su progreso.
+    Devuelve los resúmenes válidos en el orden de ``urls``.
+    """
+    from app.services.audit_fanout_service import AuditFanoutService
+
+    def record(**kwargs):
+        if track_progress:
+            AuditFanoutService.record_shard_progress(audit_id, shard_index, **kwargs)
+
+    total = len(urls)
+    sem = asyncio.Semaphore(max(1, int(settings.AUDIT_FANOUT_SHARD_CONCURRENCY)))
+    # Throttle: ~20 actualizaciones por shard como mucho.
+    report_every = max(1, total // 20)
+    summaries: list = []
+    failed = 0
+
+    async def audit_one(index: int, page_url: str) -> tuple:
+        async with sem:
+            return index, await _audit_local_page(page_url)
+
+    record(done=0, total=total)
+    for future in asyncio.as_completed([audit_one(i, u) for i, u in enumerate(urls)]):
+        index, summary = await future
+        if isinstance(summary, dict) and summary.get("status") != 500:
+            summaries.append((index, summary))
+        else:
+            failed += 1
+        done = len(summaries) + failed
+        if done % report_every == 0 and done < total:
+            record(done=done, total=total, failed=failed)
+    record(done=total, total=total, status="completed", failed=failed)
+    summaries.sort(key=lambda entry: entry[0])
+    return [summary for _, summary in summaries]
+
+
+def _dispatch_page_audit_fanout(
+    audit_id: int,
+    audit_url: str,
+    target_audit: dict,
+    crawled_urls: list,
+    page_urls: list,
+) -> dict:
+    """Lanza un chord: un ``audit_page_shard_task`` por shard + callback de agregado."""
+    from app.services.audit_fanout_service import AuditFanoutService
+    from app.services.pipeline_service import _resolve_audit_base
+    from celery import chord
+
+    shards = AuditFanoutService.shard_urls(page_urls)
+    AuditFanoutService.start(audit_id, [len(shard) for shard in shards])
+    # Misma base que usa run_initial_audit para las rutas del agregado; las
+    # posiciones siguen el orden de page_urls (la 0 es la página objetivo).
+    base_url = _resolve_audit_base(audit_url, target_audit or {})[0] or audit_url
+    header = []
+    first_position = 1
+    for index, shard in enumerate(shards):
+        header.append(
+            audit_page_shard_task.s(audit_id, index, shard, base_url, first_position)
+        )
+        first_position += len(shard)
+    callback = finalize_page_audit_fanout_task.s(
+        audit_id, audit_url, target_audit, crawled_urls
+    ).on_error(page_audit_fanout_failed_task.s(audit_id))
+    chord(header)(callback)
+    logger.info(
+        f"Audit {audit_id}: {len(page_urls)} pages fanned out in {len(shards)} shards"
+    )
+    return {
+        "audit_id": audit_id,
+        "mode": "fanout",
+        "shards": len(shards),
+        "pages": len(page_urls),
+    }
+
+
+def _complete_audit(audit_id: int, result: dict, llm_function) -> None:
+    """Persiste el resultado del pipeline inicial y marca la auditoría COMPLETED."""
+    from app.services.pipeline_service import PipelineService
+
+    # Guardar páginas auditadas individuales
+    with stage_timer("persist_pages"), get_db_session() as db:
+        _save_individual_pages(db, audit_id, result)
+
+    with get_db_session() as db:
+        # 3. Guardar resultados y marcar como COMPLETED
+        report_markdown = result.get("report_markdown", "")
+
+        # Ensure target_audit is a dictionary.
+        raw_target_audit = result.get("target_audit", {})
+        if not isinstance(raw_target_audit, dict):
+            logger.warning(
+                f"PipelineService returned non-dict target_audit for audit {audit_id}: {type(raw_target_audit)}"
+            )
+            target_audit = (
+                raw_target_audit[0]
+                if isinstance(raw_target_audit, (tuple, list))
+                and len(raw_target_audit) > 0
+                and isinstance(raw_target_audit[0], dict)
+                else {}
+            )
+        else:
+            target_audit = raw_target_audit
+
+        fix_plan = result.get("fix_plan", [])
+        external_intelligence = result.get("external_intelligence", {})
+        search_results = result.get("search_results", {})
+        competitor_audits = result.get("competitor_audits", [])
+        pagespeed_data = result.get("pagespeed", {})
+
+        # Guardar PageSpeed en JSON y BD
+        if pagespeed_data:
+            _save_pagespeed_data(audit_id, pagespeed_data)
+            logger.info(f"PageSpeed data: {list(pagespeed_data.keys())}")
+
+            # Generar y guardar análisis ejecutivo de PageSpeed
+            try:
+                # Como estamos en un contexto síncrono, usamos asyncio.run
+                ps_analysis = run_worker_coroutine(
+                    PipelineService.generate_pagespeed_analysis(
+                        pagespeed_data, llm_function
+                    )
+                )
+                if ps_analysis:
+                    _save_pagespeed_analysis(audit_id, ps_analysis)
+            except Exception as e:
+                logger.error(f"Error generating PageSpeed analysis: {e}")
+
+        # Guardar resultados y marcar como COMPLETED
+        with stage_timer("persist_results"):
+            run_worker_coroutine(
+                AuditService.set_audit_results(
+                    db=db,
+                    audit_id=audit_id,
+                    target_audit=target_audit,
+                    external_intelligence=external_intelligence,
+                    search_results=search_results,
+                    competitor_audits=competitor_audits,
+                    report_markdown=report_markdown,
+                    fix_plan=fix_plan,
+                    pagespeed_data=pagespeed_data,
+                )
+            )
+
+        AuditService.update_audit_progress(
+            db=db, audit_id=audit_id, progress=100, status=AuditStatus.COMPLETED
+        )
+        logger.info(f"Audit {audit_id} completed successfully.")
+        logger.info(
+            "Dashboard ready! PDF can be generated manually from the dashboard."
+        )
+
+        if settings.ENABLE_PAGESPEED and settings.GOOGLE_PAGESPEED_API_KEY:
+            try:
+                db.expire_all()
+                persistent_audit = db.query(Audit).filter(Audit.id == audit_id).first()
+                if persistent_audit is None:
+                    raise ValueError(
+                        f"Audit {audit_id} not found after completion for automatic PageSpeed queue"
+                    )
+                queued_pagespeed_job = PageSpeedJobService.queue_if_needed(
+                    db,
+                    audit=persistent_audit,
+                    requested_by_user_id=getattr(persistent_audit, "user_id", None),
+                    strategy="both",
+                    force_refresh=False,
+                )
+                if queued_pagespeed_job is not None:
+                    logger.info(
+                        "Queued automatic PageSpeed job for audit %s (job_id=%s)",
+                        audit_id,
+                        queued_pagespeed_job.id,
+                    )
+            except Exception as pagespeed_queue_error:
+                logger.warning(
+                    "Automatic PageSpeed queue failed for audit %s: %s",
+                    audit_id,
+                    pagespeed_queue_error,
+                )
+                try:
+                    AuditService.append_runtime_diagnostic(
+                        db,
+                        audit_id,
+                        source="pagespeed",
+                        stage="auto-queue",
+                        severity="warning",
+                        code="pagespeed_auto_queue_failed",
+                        message="Automatic PageSpeed queue failed after audit completion.",
+                        technical_detail=type(pagespeed_queue_error).__name__,
+                    )
+                except Exception:
+                    logger.warning(
+                        "Could not persist automatic PageSpeed queue diagnostic for audit %s",
+                        audit_id,
+                    )
+
+
+def _mark_audit_failed(audit_id: int, error: BaseException) -> None:
+    try:
+        with get_db_session() as db:
+            # 5. Marcar como FAILED en caso de error
+            audit = AuditService.get_audit(db, audit_id)
+            last_progress = getattr(audit, "progress", 0) if audit else 0
+
+            AuditService.update_audit_progress(
+                db=db,
+                audit_id=audit_id,
+                progress=last_progress,
+                status=AuditStatus.FAILED,
+                error_message=str(error),
+            )
+        logger.error(f"Audit {audit_id} marked as FAILED.")
+    except Exception as db_error:
+        logger.critical(
+            f"Failed to update audit {audit_id} status to FAILED: {db_error}",
+            exc_info=True,
+        )
+
+
 @celery_app.task(
     name="run_audit_task",
     bind=True,
@@ -88,6 +400,10 @@ def run_audit_task(self, audit_id: int):
     """
     Tarea de Celery para ejecutar el pipeline completo.
     Mejorada con reintentos inteligentes para evitar condiciones de carrera.
+
+    Con ``AUDIT_FANOUT_ENABLED`` y un sitio grande, las auditorías por página
+    se reparten en shards y la tarea termina tras despacharlos; el callback del
+    chord completa el pipeline.
     """
     logger.info(
         f"Celery task '{self.name}' [ID: {self.request.id}] started for audit_id: {audit_id}"
@@ -124,42 +440,6 @@ def run_audit_task(self, audit_id: int):
         # 2. Ejecutar el pipeline (fuera de la transacción de DB para no bloquearla)
         llm_function = get_llm_function()
 
-        async def audit_local_service_func(url: str):
-            """
-            Wrapper alrededor de AuditLocalService.run_local_audit que normaliza el retorno.
-            Acepta que run_local_audit devuelva (summary, meta) o solo summary, y retorna siempre summary (dict).
-            """
-            try:
-                result = await AuditLocalService.run_local_audit(url)
-
-                # Si la función retorna (summary, meta) -> extraer summary
-                if isinstance(result, (tuple, list)) and len(result) > 0:
-                    summary = result[0]
-                else:
-                    summary = result
-
-                # Si por alguna razón summary no es dict, retornar un dict vacío con status 500
-                if not isinstance(summary, dict):
-                    logger.error(
-                        f"AuditLocalService.run_local_audit returned non-dict for {url}: {type(summary)}"
-                    )
-                    return {
-                        "status": 500,
-                        "url": url,
-                        "error": "Invalid audit result type",
-                    }
-
-                return summary
-            except Exception as audit_error:
-                logger.error(
-                    f"Error in audit_local_service_func for {url}: {audit_error}",
-                    exc_info=True,
-                )
-                return {"status": 500, "url": url, "error": str(audit_error)}
-
-        # Importar crawler (PageSpeed y GEO tools se ejecutan solo al generar PDF)
-        from app.services.crawler_service import CrawlerService
-
         # NOTE: PageSpeed and GEO Tools (Keywords, Rankings, Backlinks, Visibility)
         # are NOT run automatically here. They are executed when the user requests
         # the full PDF report via generate_full_report_task.
@@ -167,7 +447,8 @@ def run_audit_task(self, audit_id: int):
         # CRITICAL FIX: Run local audit on target URL FIRST to get actual site data
         # Without this, the LLM cannot detect the correct category and search queries
         logger.info(f"Running local audit on target URL: {audit_url}")
-        target_audit_result = run_worker_coroutine(audit_local_service_func(audit_url))
+        with stage_timer("target_local_audit"):
+            target_audit_result = run_worker_coroutine(_audit_local_page(audit_url))
 
         if not target_audit_result or target_audit_result.get("status") == 500:
             logger.error(f"Failed to run local audit on target URL: {audit_url}")
@@ -191,195 +472,304 @@ def run_audit_task(self, audit_id: int):
             if audit_competitors and not target_audit_result.get("competitors"):
                 target_audit_result["competitors"] = audit_competitors
 
-        def update_progress(value: float):
-            try:
-                with get_db_session() as db:
-                    audit = AuditService.get_audit(db, audit_id)
-                    if not audit:
-                        return
-                    current = audit.progress or 0
-                    if value <= current:
-                        return
-                    AuditService.update_audit_progress(
-                        db=db,
-                        audit_id=audit_id,
-                        progress=value,
-                        status=AuditStatus.RUNNING,
-                    )
-            except Exception as progress_err:
-                logger.warning(
-                    f"Could not update progress for audit {audit_id}: {progress_err}"
-                )
+        prefetched_pages = None
+        if settings.AUDIT_FANOUT_ENABLED:
+            from app.services.audit_fanout_service import AuditFanoutService
+            from app.services.crawler_service import CrawlerService
+            from app.services.pipeline_service import discover_audit_pages
 
-        # Ejecutar pipeline principal de auditoría INICIAL (sin GEO tools, sin reporte pesado)
-        # Este nuevo flujo es exclusivamente para errores (fix plan) y competidores.
-        from app.services.pipeline_service import run_initial_audit
+            crawled_urls, page_urls = run_worker_coroutine(
+                discover_audit_pages(
+                    audit_url, target_audit_result, CrawlerService.crawl_site
+                )
+            )
+            if AuditFanoutService.should_fan_out(len(page_urls)):
+                _update_audit_progress(audit_id, 10)
+                return _dispatch_page_audit_fanout(
+                    audit_id, audit_url, target_audit_result, crawled_urls, page_urls
+                )
+            # Sitio chico: se audita aquí sin volver a crawlear.
+            with stage_timer("local_audits"):
+                summaries = run_worker_coroutine(
+                    _audit_page_shard(audit_id, 0, page_urls, track_progress=False)
+                )
+            prefetched_pages = {"crawled_urls": crawled_urls, "summaries": summaries}
 
         result = run_worker_coroutine(
-            run_initial_audit(
-                url=audit_url,
-                target_audit=target_audit_result,
-                audit_id=audit_id,
-                llm_function=llm_function,
-                google_api_key=None,
-                google_cx_id=None,
-                crawler_service=CrawlerService.crawl_site,
-                audit_local_service=audit_local_service_func,
-                progress_callback=update_progress,
-                generate_report=False,
-                enable_llm_external_intel=True,
-                external_intel_mode="full",
-                external_intel_timeout_seconds=(
-                    settings.AGENT1_LLM_TIMEOUT_SECONDS
-                    if settings.AGENT1_LLM_TIMEOUT_SECONDS
-                    and settings.AGENT1_LLM_TIMEOUT_SECONDS > 0
-                    else None
-                ),
+            _run_initial_pipeline(
+                audit_id,
+                audit_url,
+                target_audit_result,
+                llm_function,
+                prefetched_pages=prefetched_pages,
             )
         )
 
         # GEO Tools (Keywords, Backlinks, Rankings) will be generated on-demand when PDF is requested
         # This avoids generating data that may not be used and keeps the audit pipeline fast
+        _complete_audit(audit_id, result, llm_function)
 
-        # Guardar páginas auditadas individuales
-        with get_db_session() as db:
-            _save_individual_pages(db, audit_id, result)
+    except Exception as e:
+        logger.error(f"Error running pipeline for audit {audit_id}: {e}", exc_info=True)
+        _mark_audit_failed(audit_id, e)
+        raise
 
-        with get_db_session() as db:
-            # 3. Guardar resultados y marcar como COMPLETED
-            report_markdown = result.get("report_markdown", "")
 
-            # Ensure target_audit is a dictionary.
-            raw_target_audit = result.get("target_audit", {})
-            if not isinstance(raw_target_audit, dict):
-                logger.warning(
-                    f"PipelineService returned non-dict target_audit for audit {audit_id}: {type(raw_target_audit)}"
-                )
-                target_audit = (
-                    raw_target_audit[0]
-                    if isinstance(raw_target_audit, (tuple, list))
-                    and len(raw_target_audit) > 0
-                    and isinstance(raw_target_audit[0], dict)
-                    else {}
-                )
-            else:
-                target_audit = raw_target_audit
+@celery_app.task(
+    name="audit_page_shard_task",
+    bind=True,
+    soft_time_limit=1800,
+    time_limit=2000,
+)
+def audit_page_shard_task(
+    self,
+    audit_id: int,
+    shard_index: int,
+    urls: list,
+    base_url: str = "",
+    first_position: int = 1,
+):
+    """
+    Audita un shard de páginas de una auditoría con fan-out.
 
-            fix_plan = result.get("fix_plan", [])
-            external_intelligence = result.get("external_intelligence", {})
-            search_results = result.get("search_results", {})
-            competitor_audits = result.get("competitor_audits", [])
-            pagespeed_data = result.get("pagespeed", {})
+    Las páginas se persisten aquí (AuditedPage); al callback del chord solo
+    viaja lo que necesita el agregado: un registro compacto por página y el
+    resumen completo de la primera.
+    """
+    from app.services.audit_fanout_service import AuditFanoutService
+    from app.services.pipeline_service import _is_valid_page_summary
+    from app.services.summary_aggregator import SummaryAggregator
+
+    with stage_timer("local_audits_shard"):
+        summaries = run_worker_coroutine(_audit_page_shard(audit_id, shard_index, urls))
+    summaries = [summary for summary in summaries if _is_valid_page_summary(summary)]
+
+    aggregator = SummaryAggregator(base_url or (urls[0] if urls else ""))
+    records = [
+        aggregator.page_record(summary, first_position + offset)
+        for offset, summary in enumerate(summaries)
+    ]
+    page_audits = [
+        {"index": record["position"], "url": summary.get("url"), "data": summary}
+        for record, summary in zip(records, summaries)
+    ]
+    with stage_timer("persist_pages_shard"), get_db_session() as db:
+        saved = AuditService.save_page_audits(db, audit_id, page_audits, replace=True)
+    if page_audits and not saved:
+        raise RuntimeError(
+            f"Audit {audit_id}: shard {shard_index} could not persist its pages"
+        )
 
-            # Guardar PageSpeed en JSON y BD
-            if pagespeed_data:
-                _save_pagespeed_data(audit_id, pagespeed_data)
-                logger.info(f"PageSpeed data: {list(pagespeed_data.keys())}")
+    overall = AuditFanoutService.overall_progress(audit_id)
+    if overall is not None:
+        _update_audit_progress(audit_id, overall)
+    return {
+        "shard": shard_index,
+        "pages": saved,
+        "records": records,
+        "sample": summaries[0] if summaries else None,
+    }
 
-                # Generar y guardar análisis ejecutivo de PageSpeed
-                try:
-                    # Como estamos en un contexto síncrono, usamos asyncio.run
-                    ps_analysis = run_worker_coroutine(
-                        PipelineService.generate_pagespeed_analysis(
-                            pagespeed_data, llm_function
-                        )
-                    )
-                    if ps_analysis:
-                        _save_pagespeed_analysis(audit_id, ps_analysis)
-                except Exception as e:
-                    logger.error(f"Error generating PageSpeed analysis: {e}")
 
-            # Guardar resultados y marcar como COMPLETED
-            run_worker_coroutine(
-                AuditService.set_audit_results(
-                    db=db,
-                    audit_id=audit_id,
-                    target_audit=target_audit,
-                    external_intelligence=external_intelligence,
-                    search_results=search_results,
-                    competitor_audits=competitor_audits,
-                    report_markdown=report_markdown,
-                    fix_plan=fix_plan,
-                    pagespeed_data=pagespeed_data,
-                )
-            )
+@celery_app.task(
+    name="finalize_page_audit_fanout_task",
+    bind=True,
+    soft_time_limit=3600,
+    time_limit=4000,
+)
+def finalize_page_audit_fanout_task(
+    self,
+    shard_results: list,
+    audit_id: int,
+    audit_url: str,
+    target_audit: dict,
+    crawled_urls: list,
+):
+    """
+    Callback del chord: agrega los shards y completa el pipeline de la auditoría.
 
-            AuditService.update_audit_progress(
-                db=db, audit_id=audit_id, progress=100, status=AuditStatus.COMPLETED
-            )
-            logger.info(f"Audit {audit_id} completed successfully.")
-            logger.info(
-                "Dashboard ready! PDF can be generated manually from the dashboard."
+    Los shards ya persistieron sus páginas y devuelven registros compactos; una
+    lista de resúmenes es el formato previo (mensajes encolados antes del deploy).
+    """
+    try:
+        shards = []
+        summaries = []
+        for shard in shard_results or []:
+            if isinstance(shard, dict):
+                shards.append(shard)
+            else:
+                summaries.extend(s for s in (shard or []) if isinstance(s, dict))
+        persisted = sum(len(shard.get("records") or []) for shard in shards)
+        logger.info(
+            f"Audit {audit_id}: aggregating {persisted + len(summaries)} page audits "
+            f"from {len(shard_results or [])} shards"
+        )
+        llm_function = get_llm_function()
+        result = run_worker_coroutine(
+            _run_initial_pipeline(
+                audit_id,
+                audit_url,
+                target_audit,
+                llm_function,
+                prefetched_pages={
+                    "crawled_urls": crawled_urls,
+                    "summaries": summaries,
+                    "shards": shards,
+                },
             )
+        )
+        result["persisted_pages_count"] = persisted
+        _complete_audit(audit_id, result, llm_function)
+        return {
+            "audit_id": audit_id,
+            "mode": "fanout",
+            "pages": persisted + len(summaries),
+        }
+    except Exception as e:
+        logger.error(
+            f"Error finalizing fanned-out audit {audit_id}: {e}", exc_info=True
+        )
+        _mark_audit_failed(audit_id, e)
+        raise
 
-            if settings.ENABLE_PAGESPEED and settings.GOOGLE_PAGESPEED_API_KEY:
-                try:
-                    db.expire_all()
-                    persistent_audit = (
-                        db.query(Audit).filter(Audit.id == audit_id).first()
-                    )
-                    if persistent_audit is None:
-                        raise ValueError(
-                            f"Audit {audit_id} not found after completion for automatic PageSpeed queue"
-                        )
-                    queued_pagespeed_job = PageSpeedJobService.queue_if_needed(
-                        db,
-                        audit=persistent_audit,
-                        requested_by_user_id=getattr(persistent_audit, "user_id", None),
-                        strategy="both",
-                        force_refresh=False,
-                    )
-                    if queued_pagespeed_job is not None:
-                        logger.info(
-                            "Queued automatic PageSpeed job for audit %s (job_id=%s)",
-                            audit_id,
-                            queued_pagespeed_job.id,
-                        )
-                except Exception as pagespeed_queue_error:
-                    logger.warning(
-                        "Automatic PageSpeed queue failed for audit %s: %s",
-                        audit_id,
-                        pagespeed_queue_error,
-                    )
-                    try:
-                        AuditService.append_runtime_diagnostic(
-                            db,
-                            audit_id,
-                            source="pagespeed",
-                            stage="auto-queue",
-                            severity="warning",
-                            code="pagespeed_auto_queue_failed",
-                            message="Automatic PageSpeed queue failed after audit completion.",
-                            technical_detail=type(pagespeed_queue_error).__name__,
-                        )
-                    except Exception:
-                        logger.warning(
-                            "Could not persist automatic PageSpeed queue diagnostic for audit %s",
-                            audit_id,
-                        )
 
+@celery_app.task(name="page_audit_fanout_failed_task")
+def page_audit_fanout_failed_task(request, exc, traceback, audit_id: int):
+    """Errback del chord: un shard falló y el callback no va a correr."""
+    logger.error(f"Fanned-out audit {audit_id} failed in task {request.id}: {exc}")
+    _mark_audit_failed(audit_id, exc)
+
+
+async def _run_geo_tool(name: str, timeout_seconds: float, tool):
+    """
+    Corre una herramienta GEO con su propia sesión de DB y presupuesto de tiempo.
+    Devuelve None si falla o se agota el tiempo: el reporte usa los parciales.
+    """
+
+    async def _with_session():
+        with get_db_session() as db:
+            return await tool(db)
+
+    started = time.perf_counter()
+    try:
+        with stage_timer(f"geo_{name}"):
+            result = await asyncio.wait_for(
+                _with_session(),
+                timeout=timeout_seconds if timeout_seconds > 0 else None,
+            )
+        logger.info(f"GEO tool {name} finished in {time.perf_counter() - started:.1f}s")
+        return result
+    except asyncio.TimeoutError:
+        logger.warning(f"GEO tool {name} exceeded its {timeout_seconds}s budget")
     except Exception as e:
-        logger.error(f"Error running pipeline for audit {audit_id}: {e}", exc_info=True)
-        try:
-            with get_db_session() as db:
-                # 5. Marcar como FAILED en caso de error
-                audit = AuditService.get_audit(db, audit_id)
-                last_progress = getattr(audit, "progress", 0) if audit else 0
+        logger.error(f"GEO tool {name} failed: {e}", exc_info=True)
+    return None
 
-                AuditService.update_audit_progress(
-                    db=db,
-                    audit_id=audit_id,
-                    progress=last_progress,
-                    status=AuditStatus.FAILED,
-                    error_message=str(e),
+
+async def _run_geo_tools(audit_id: int, domain: str, brand_name: str, keywords: list):
+    """Rank tracking, backlinks y visibilidad LLM en paralelo (son independientes)."""
+    from app.services.backlink_service import BacklinkService
+    from app.services.llm_visibility_service import LLMVisibilityService
+    from app.services.rank_tracker_service import RankTrackerService
+
+    # Cada herramienta devuelve datos planos: sus filas ORM no sobreviven a su sesión.
+    async def rankings_tool(db):
+        logger.info(f"Running Rank Tracking for {domain}")
+        rankings = await RankTrackerService(db).track_rankings(
+            audit_id, domain, keywords
+        )
+        return [
+            {
+                "keyword": r.keyword,
+                "position": r.position,
+                "top_competitor": (
+                    r.top_results[0]["domain"] if r.top_results else "N/A"
+                ),
+            }
+            for r in rankings
+        ]
+
+    async def backlinks_tool(db):
+        logger.info(f"Running Backlink Analysis for {domain}")
+        backlinks = await BacklinkService(db).analyze_backlinks(audit_id, domain)
+        return {
+            "total": len(backlinks),
+            "dofollow": len([b for b in backlinks if b.is_dofollow]),
+        }
+
+    async def visibility_tool(db):
+        logger.info(f"Running LLM Visibility for {domain}")
+        # Use instance method check_visibility to ensure results are saved to DB
+        return await LLMVisibilityService(db).check_visibility(
+            audit_id, brand_name, keywords
+        )
+
+    return await asyncio.gather(
+        _run_geo_tool("rankings", settings.GEO_RANKINGS_TIMEOUT_SECONDS, rankings_tool),
+        _run_geo_tool(
+            "backlinks", settings.GEO_BACKLINKS_TIMEOUT_SECONDS, backlinks_tool
+        ),
+        _run_geo_tool(
+            "visibility", settings.GEO_VISIBILITY_TIMEOUT_SECONDS, visibility_tool
+        ),
+    )
+
+
+def _build_geo_section(rankings, backlinks, visibility) -> str:
+    """Sección 10 del reporte; ``None`` marca una herramienta que no terminó."""
+    geo_section = "\n\n# 10. Análisis GEO Automático (Anexos)\n\n"
+
+    # Rank Tracking
+    geo_section += "## 10.1 Rank Tracking Inicial\n"
+    if rankings is None:
+        geo_section += "*Rank tracking no disponible.*\n"
+    elif rankings:
+        geo_section += "| Keyword | Posición | Top Competidor |\n|---|---|---|\n"
+        for r in rankings:
+            pos = f"#{r['position']}" if r["position"] > 0 else ">10"
+            geo_section += f"| {r['keyword']} | {pos} | {r['top_competitor']} |\n"
+    else:
+        geo_section += "*No se encontraron rankings.*\n"
+
+    # Backlinks
+    geo_section += "\n## 10.2 Análisis de Enlaces\n"
+    if backlinks is None:
+        geo_section += "*Análisis de enlaces no disponible.*\n"
+    else:
+        geo_section += f"* **Total de Backlinks Encontrados**: {backlinks['total']}\n"
+        geo_section += f"* **Enlaces DoFollow**: {backlinks['dofollow']}\n"
+        geo_section += (
+            f"* **Enlaces NoFollow**: {backlinks['total'] - backlinks['dofollow']}\n"
+        )
+
+    # LLM Visibility
+    geo_section += "\n## 10.3 Visibilidad en IA (LLMs)\n"
+    if visibility and len(visibility) > 0:
+        visible_count = sum(1 for v in visibility if v.get("is_visible", False))
+        total_queries = len(visibility)
+        visibility_rate = (
+            (visible_count / total_queries * 100) if total_queries > 0 else 0
+        )
+
+        geo_section += f"* **Consultas Analizadas**: {total_queries}\n"
+        geo_section += f"* **Visibilidad**: {visible_count}/{total_queries} ({visibility_rate:.1f}%)\n"
+        geo_section += f"* **LLM**: {visibility[0].get('llm_name', 'KIMI')}\n"
+
+        visible_queries = [v for v in visibility if v.get("is_visible", False)]
+        if visible_queries:
+            geo_section += "\n**Queries donde la marca es visible:**\n"
+            for v in visible_queries[:3]:
+                query = v.get("query", "N/A")
+                citation = (
+                    v.get("citation_text", "")[:100] + "..."
+                    if len(v.get("citation_text", "")) > 100
+                    else v.get("citation_text", "")
                 )
-            logger.error(f"Audit {audit_id} marked as FAILED.")
-        except Exception as db_error:
-            logger.critical(
-                f"Failed to update audit {audit_id} status to FAILED: {db_error}",
-                exc_info=True,
-            )
-        raise
+                geo_section += f"- *{query}*: {citation}\n"
+    else:
+        geo_section += "*Análisis de visibilidad no disponible.*\n"
+
+    return geo_section
 
 
 @celery_app.task(
@@ -395,6 +785,8 @@ def run_geo_analysis_task(self, audit_id: int):
     Tarea separada para ejecutar herramientas GEO (Rank, Backlinks, Visibility)
     y actualizar el reporte existente.
     """
+    from app.services.pdf_service import PDFService
+
     logger.info(f"Starting GEO Analysis task for audit {audit_id}")
 
     try:
@@ -402,16 +794,14 @@ def run_geo_analysis_task(self, audit_id: int):
             audit = AuditService.get_audit(db, audit_id)
             if not audit:
                 raise ValueError(f"Audit {audit_id} not found")
+            if "# 10. Análisis GEO Automático" in (audit.report_markdown or ""):
+                logger.info("GEO section already present in report.")
+                return
 
             audit_url = str(audit.url)
 
-            # Import services
             from urllib.parse import urlparse
 
-            from app.services.backlink_service import BacklinkService
-            from app.services.llm_visibility_service import LLMVisibilityService
-            from app.services.rank_tracker_service import RankTrackerService
-
             domain = urlparse(audit_url).netloc.replace("www.", "")
             brand_name = domain.split(".")[0]
 
@@ -422,123 +812,50 @@ def run_geo_analysis_task(self, audit_id: int):
             ):
                 category = audit.external_intelligence.get("category")
 
-            # 1. Prepare Keywords
-            keywords = [brand_name]
-            if category:
-                keywords.append(category)
-
-            # 2. Define Async Wrapper
-            async def run_geo_tools():
-                rank_service = RankTrackerService(db)
-                backlink_service = BacklinkService(db)
-                visibility_service = LLMVisibilityService(db)
-
-                logger.info(f"Running Rank Tracking for {domain}")
-                rankings = await rank_service.track_rankings(audit_id, domain, keywords)
-
-                logger.info(f"Running Backlink Analysis for {domain}")
-                backlinks = await backlink_service.analyze_backlinks(audit_id, domain)
+        # 1. Prepare Keywords
+        keywords = [brand_name]
+        if category:
+            keywords.append(category)
 
-                logger.info(f"Running LLM Visibility for {domain}")
-
-                # Use instance method check_visibility to ensure results are saved to DB
-                visibility = await visibility_service.check_visibility(
-                    audit_id, brand_name, keywords
-                )
-
-                return rankings, backlinks, visibility
-
-            # 3. Execute Tools
-            rankings, backlinks, visibility = run_worker_coroutine(run_geo_tools())
+        # 2. Execute Tools (en paralelo, cada una con su sesión y su presupuesto)
+        rankings, backlinks, visibility = run_worker_coroutine(
+            _run_geo_tools(audit_id, domain, brand_name, keywords)
+        )
+        if rankings is None and backlinks is None and visibility is None:
+            raise RuntimeError(f"All GEO tools failed for audit {audit_id}")
 
-            # 4. Append/Update Report
+        # 3. Append/Update Report
+        with get_db_session() as db:
+            audit = AuditService.get_audit(db, audit_id)
+            if not audit:
+                raise ValueError(f"Audit {audit_id} not found")
             current_report = audit.report_markdown or ""
 
             # Check if GEO section already exists to avoid duplication (simple check)
-            if "# 10. Análisis GEO Automático" not in current_report:
-                geo_section = "\n\n# 10. Análisis GEO Automático (Anexos)\n\n"
-
-                # Rank Tracking
-                geo_section += "## 10.1 Rank Tracking Inicial\n"
-                if rankings:
-                    geo_section += (
-                        "| Keyword | Posición | Top Competidor |\n|---|---|---|\n"
-                    )
-                    for r in rankings:
-                        top_competitor = (
-                            r.top_results[0]["domain"] if r.top_results else "N/A"
-                        )
-                        pos = f"#{r.position}" if r.position > 0 else ">10"
-                        geo_section += f"| {r.keyword} | {pos} | {top_competitor} |\n"
-                else:
-                    geo_section += "*No se encontraron rankings.*\n"
-
-                # Backlinks
-                geo_section += "\n## 10.2 Análisis de Enlaces\n"
-                geo_section += (
-                    f"* **Total de Backlinks Encontrados**: {len(backlinks)}\n"
-                )
-                dofollow_count = len([b for b in backlinks if b.is_dofollow])
-                geo_section += f"* **Enlaces DoFollow**: {dofollow_count}\n"
-                geo_section += (
-                    f"* **Enlaces NoFollow**: {len(backlinks) - dofollow_count}\n"
-                )
-
-                # LLM Visibility
-                geo_section += "\n## 10.3 Visibilidad en IA (LLMs)\n"
-                if visibility and len(visibility) > 0:
-                    visible_count = sum(
-                        1 for v in visibility if v.get("is_visible", False)
-                    )
-                    total_queries = len(visibility)
-                    visibility_rate = (
-                        (visible_count / total_queries * 100)
-                        if total_queries > 0
-                        else 0
-                    )
+            if "# 10. Análisis GEO Automático" in current_report:
+                logger.info("GEO section already present in report.")
+                return
 
-                    geo_section += f"* **Consultas Analizadas**: {total_queries}\n"
-                    geo_section += f"* **Visibilidad**: {visible_count}/{total_queries} ({visibility_rate:.1f}%)\n"
-                    geo_section += (
-                        f"* **LLM**: {visibility[0].get('llm_name', 'KIMI')}\n"
-                    )
+            # Update Audit
+            audit.report_markdown = current_report + _build_geo_section(
+                rankings, backlinks, visibility
+            )
+            db.commit()
+            logger.info("GEO Tools results appended to report.")
 
-                    visible_queries = [
-                        v for v in visibility if v.get("is_visible", False)
-                    ]
-                    if visible_queries:
-                        geo_section += "\n**Queries donde la marca es visible:**\n"
-                        for v in visible_queries[:3]:
-                            query = v.get("query", "N/A")
-                            citation = (
-                                v.get("citation_text", "")[:100] + "..."
-                                if len(v.get("citation_text", "")) > 100
-                                else v.get("citation_text", "")
-                            )
-                            geo_section += f"- *{query}*: {citation}\n"
-                else:
-                    geo_section += "*Análisis de visibilidad no disponible.*\n"
-
-                # Update Audit
-                audit.report_markdown = current_report + geo_section
-                db.commit()
-                logger.info("GEO Tools results appended to report.")
-
-                # Regenerate PDF
-                logger.info(f"Regenerating PDF for audit {audit_id}")
-                pdf_file_path = PDFService.create_from_audit(
-                    audit=audit, markdown_content=audit.report_markdown
-                )
-                pdf_file_size = getattr(audit, "_generated_pdf_size_bytes", None)
-                ReportService.create_report(
-                    db=db,
-                    audit_id=audit_id,
-                    report_type="PDF",
-                    file_path=pdf_file_path,
-                    file_size=pdf_file_size,
-                )
-            else:
-                logger.info("GEO section already present in report.")
+            # Regenerate PDF (una sola vez, con los resultados de las tres herramientas)
+            logger.info(f"Regenerating PDF for audit {audit_id}")
+            pdf_file_path = PDFService.create_from_audit(
+                audit=audit, markdown_content=audit.report_markdown
+            )
+            pdf_file_size = getattr(audit, "_generated_pdf_size_bytes", None)
+            ReportService.create_report(
+                db=db,
+                audit_id=audit_id,
+                report_type="PDF",
+                file_path=pdf_file_path,
+                file_size=pdf_file_size,
+            )
 
     except Exception as e:
         logger.error(
@@ -603,35 +920,20 @@ def _save_individual_pages(db: Session, audit_id: int, pipeline_result: dict):
         audited_page_paths = target_audit.get("audited_page_paths", [])
         audited_pages_count = target_audit.get("audited_pages_count", 0)
 
-        # NUEVO: Verificar si hay datos individuales de páginas
-        individual_page_audits = target_audit.get("_individual_page_audits", [])
+        # Datos individuales de páginas (clave legacy dentro de target_audit como fallback)
+        individual_page_audits = pipeline_result.get("page_audits") or target_audit.get(
+            "_individual_page_audits", []
+        )
 
         if individual_page_audits:
             # Usar datos individuales reales de cada página
             logger.info(
                 f"Encontrados {len(individual_page_audits)} reportes individuales de páginas"
             )
-
-            for page_audit in individual_page_audits:
-                page_index = page_audit.get("index", 0)
-                page_url = page_audit.get("url")
-                page_data = page_audit.get("data", {})
-
-                if page_url and page_data:
-                    try:
-                        AuditService.save_page_audit(
-                            db=db,
-                            audit_id=audit_id,
-                            page_url=page_url,
-                            audit_data=page_data,
-                            page_index=page_index,
-                        )
-                    except Exception as e:
-                        logger.error(f"Error guardando página {page_url}: {e}")
-
-            logger.info(
-                f"Guardadas {len(individual_page_audits)} páginas auditadas para audit {audit_id}"
-            )
+            AuditService.save_page_audits(db, audit_id, individual_page_audits)
+            return
+        if pipeline_result.get("persisted_pages_count"):
+            # Fan-out: los shards ya guardaron las páginas reales.
             return
 
         # FALLBACK: Si no hay datos individuales, usar el método anterior
@@ -658,6 +960,7 @@ def _save_individual_pages(db: Session, audit_id: int, pipeline_result: dict):
 
         base_url = str(audit.url).rstrip("/")
 
+        page_audits = []
         for i, page_path in enumerate(audited_page_paths):
             # Reconstruir URL completa
             if page_path.startswith("http"):
@@ -679,18 +982,10 @@ def _save_individual_pages(db: Session, audit_id: int, pipeline_result: dict):
                 "schema": target_audit.get("schema", {}),
             }
 
-            # Guardar página auditada
-            AuditService.save_page_audit(
-                db=db,
-                audit_id=audit_id,
-                page_url=page_url,
-                audit_data=page_audit_data,
-                page_index=i,
-            )
+            page_audits.append({"index": i, "url": page_url, "data": page_audit_data})
 
-        logger.info(
-            f"Guardadas {len(audited_page_paths)} páginas auditadas para audit {audit_id}"
-        )
+        # Guardar páginas auditadas en un único INSERT
+        AuditService.save_page_audits(db, audit_id, page_audits)
     except Exception as e:
         logger.error(
             f"Error guardando páginas individuales para audit {audit_id}: {e}",
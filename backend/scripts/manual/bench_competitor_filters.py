@@ -0,0 +1,135 @@
+"""
+Micro-benchmark of the competitor/query filters of the external intel stage.
+
+Replays the SERP sample in ``fixtures/serp_competitors.json`` through
+``PipelineService.filter_competitor_urls`` and ``_prune_competitor_queries``
+(no network, no LLM) and reports ms per call. ``--scale`` multiplies the search
+items (with distinct hosts) to mimic audits with hundreds of results. Outside
+pytest discovery.
+
+Compare two revisions by saving each run and diffing them:
+
+    git checkout <before> && python scripts/manual/bench_competitor_filters.py --out before.json
+    git checkout <after>  && python scripts/manual/bench_competitor_filters.py --out after.json
+    python scripts/manual/bench_competitor_filters.py --compare before.json after.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ.setdefault("ENVIRONMENT", "testing")
+
+FIXTURE_PATH = os.path.join(
+    os.path.dirname(__file__), "fixtures", "serp_competitors.json"
+)
+
+
+def _load_fixture(scale: int) -> Dict[str, Any]:
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        fixture = json.load(f)
+    items: List[Dict[str, Any]] = []
+    for copy in range(max(1, scale)):
+        for item in fixture["search_items"]:
+            link = item["link"]
+            if copy:
+                # Hosts distintos por copia: el filtro descarta dominios repetidos.
+                link = link.replace("https://www.", f"https://www.c{copy}")
+            items.append({**item, "link": link})
+    fixture["search_items"] = items
+    return fixture
+
+
+def _time_call(fn: Callable[[], Any], iterations: int) -> List[float]:
+    fn()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _run(iterations: int, scale: int) -> Dict[str, Any]:
+    from app.services.pipeline_service import PipelineService
+
+    logging.disable(logging.CRITICAL)
+    fixture = _load_fixture(scale)
+    items = fixture["search_items"]
+    profile = PipelineService._build_core_business_profile(fixture["target_audit"])
+
+    def _filter() -> Any:
+        return PipelineService.filter_competitor_urls(
+            items,
+            fixture["target_domain"],
+            limit=len(items),
+            core_terms=fixture["core_terms"],
+            anchor_terms=fixture["anchor_terms"],
+            vertical_hint=fixture["vertical_hint"],
+        )
+
+    def _prune() -> Any:
+        return PipelineService._prune_competitor_queries(
+            fixture["queries"],
+            fixture["target_audit"],
+            llm_category=fixture["llm_category"],
+            llm_subcategory=fixture["llm_subcategory"],
+            market_hint=fixture["market"],
+            core_profile=profile,
+        )
+
+    result: Dict[str, Any] = {
+        "iterations": iterations,
+        "search_items": len(items),
+        "queries": len(fixture["queries"]),
+        "competitors": len(_filter()),
+        "accepted_queries": len(_prune()),
+    }
+    for name, fn in (("filter_urls", _filter), ("prune_queries", _prune)):
+        samples = _time_call(fn, iterations)
+        result[f"{name}_ms"] = round(statistics.median(samples), 3)
+    return result
+
+
+def _compare(before_path: str, after_path: str) -> None:
+    with open(before_path, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(after_path, encoding="utf-8") as f:
+        after = json.load(f)
+    print(f"{'metric':<18} {'before':>10} {'after':>10} {'change':>9}")
+    for key in ("filter_urls_ms", "prune_queries_ms"):
+        delta = (after[key] - before[key]) / before[key] * 100 if before[key] else 0
+        print(f"{key:<18} {before[key]:>10} {after[key]:>10} {delta:>+8.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--scale", type=int, default=4)
+    parser.add_argument("--out", help="Guardar el resultado como JSON")
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Comparar dos runs"
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        _compare(*args.compare)
+        return
+
+    result = _run(args.iterations, args.scale)
+    print(json.dumps(result, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Micro-benchmark of brand mention detection in LLM responses.
+
+Times ``MentionMatcher.first_mentions`` against the per-brand substring checks
+it replaced (``brand in text.lower()`` plus a ``split(".")`` scan for the
+sentence) on a synthetic ~4 KB response, for several competitor counts. No
+network, no LLM. Outside pytest discovery.
+
+``--min-speedup`` makes the run exit non-zero when the matcher is not at least
+that many times faster than the reference for every competitor count:
+
+    python scripts/manual/bench_mention_matcher.py --min-speedup 1.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ.setdefault("ENVIRONMENT", "testing")
+
+
+def _response(competitors: List[str]) -> str:
+    sentences = [
+        "Para comprar guitarras en Argentina hay varias opciones confiables",
+        f"Entre ellas se destacan {competitors[0].split('.')[0].title()} y Acme",
+        "Los precios varian segun la marca, el modelo y la disponibilidad",
+        f"Tambien conviene revisar {competitors[-1].split('.')[0]} para envios",
+    ]
+    text = ". ".join(sentences) + ". "
+    return (text * (4096 // len(text) + 1))[:4096]
+
+
+def _reference(text: str, brand: str, domain: str, competitors: List[str]) -> Any:
+    """Detección previa: substring por marca y ``split('.')`` para la oración."""
+
+    def clean(value: str) -> str:
+        return value.replace("www.", "").replace(".com", "").replace(".io", "").lower()
+
+    def position(name: str) -> int:
+        for i, sentence in enumerate(text.split(".")):
+            if name in sentence.lower():
+                return i + 1
+        return 999
+
+    found = {}
+    for key, name, variant in [("__brand__", brand.lower(), clean(domain))] + [
+        (comp, clean(comp), clean(comp)) for comp in competitors
+    ]:
+        lowered = text.lower()
+        if name in lowered or variant in lowered:
+            found[key] = position(name)
+    return found
+
+
+def _time_call(fn: Callable[[], Any], iterations: int) -> float:
+    fn()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 4)
+
+
+def _run(iterations: int, counts: List[int]) -> Dict[str, Any]:
+    from app.services.mention_matcher import MentionMatcher
+
+    result: Dict[str, Any] = {"iterations": iterations, "runs": []}
+    for count in counts:
+        competitors = [f"rival{i}store.com" for i in range(count)]
+        text = _response(competitors)
+        matcher = MentionMatcher.for_brands("Acme", "acme.com", competitors)
+        matcher_ms = _time_call(lambda: matcher.first_mentions(text), iterations)
+        reference_ms = _time_call(
+            lambda: _reference(text, "Acme", "acme.com", competitors), iterations
+        )
+        result["runs"].append(
+            {
+                "competitors": count,
+                "matcher_ms": matcher_ms,
+                "reference_ms": reference_ms,
+                "speedup": round(reference_ms / matcher_ms, 2) if matcher_ms else 0,
+            }
+        )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--competitors", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--min-speedup", type=float, default=None)
+    parser.add_argument("--out", help="Guardar el resultado como JSON")
+    args = parser.parse_args()
+
+    result = _run(args.iterations, args.competitors)
+    print(json.dumps(result, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if args.min_speedup is not None:
+        slow = [r for r in result["runs"] if r["speedup"] < args.min_speedup]
+        if slow:
+            sys.exit(f"Speed-up below {args.min_speedup}x: {slow}")
+
+
+if __name__ == "__main__":
+    main()
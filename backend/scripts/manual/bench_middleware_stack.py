@@ -0,0 +1,153 @@
+"""
+Micro-benchmark of the HTTP middleware stack on the audit status polling endpoint.
+
+Runs ``create_app()`` in-process (httpx ASGITransport, no network, no DB: the
+audit lookup is stubbed) and reports p50/p99 latency and req/s for
+``GET /api/v1/audits/{id}/status``. Outside pytest discovery.
+
+Compare two revisions by saving each run and diffing them:
+
+    git checkout <before> && python scripts/manual/bench_middleware_stack.py --out before.json
+    git checkout <after>  && python scripts/manual/bench_middleware_stack.py --out after.json
+    python scripts/manual/bench_middleware_stack.py --compare before.json after.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ.setdefault("ENVIRONMENT", "testing")
+os.environ.setdefault("CELERY_BROKER_URL", "memory://")
+os.environ.setdefault("CELERY_RESULT_BACKEND", "cache+memory://")
+
+STATUS_PATH = "/api/v1/audits/1/status"
+
+
+def _build_app():
+    import logging
+
+    from app.api.routes import audits as audits_routes
+    from app.core.auth import AuthUser, get_current_user
+    from app.core.config import settings
+    from app.core.database import get_db
+
+    # Stack de producción (rate limit activo) sin límites que corten el bench.
+    settings.DEBUG = False
+    settings.RATE_LIMIT_DEFAULT = 10**9
+    settings.REDIS_URL = ""
+    logging.disable(logging.INFO)
+
+    audit = SimpleNamespace(
+        id=1,
+        url="https://example.com",
+        domain="example.com",
+        status="running",
+        progress=42,
+        created_at=datetime.now(timezone.utc),
+        geo_score=0.0,
+        total_pages=10,
+        pagespeed_status=None,
+        pdf_status=None,
+    )
+    audits_routes._get_owned_projected_audit = lambda *args, **kwargs: audit
+
+    from app.main import create_app
+
+    app = create_app()
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_current_user] = lambda: AuthUser(
+        user_id="bench-user", email="bench@example.com"
+    )
+    return app
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _run(requests: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+    import httpx
+
+    app = _build_app()
+    transport = httpx.ASGITransport(app=app, client=("10.0.0.1", 40000))
+    latencies: List[float] = []
+    errors = 0
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://localhost"
+    ) as client:
+        for _ in range(warmup):
+            await client.get(STATUS_PATH)
+
+        remaining = iter(range(requests))
+
+        async def _worker() -> None:
+            nonlocal errors
+            for _ in remaining:
+                started = time.perf_counter()
+                response = await client.get(STATUS_PATH)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "req_per_s": round(requests / elapsed, 1),
+    }
+
+
+def _compare(before_path: str, after_path: str) -> None:
+    with open(before_path, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(after_path, encoding="utf-8") as f:
+        after = json.load(f)
+    print(f"{'metric':<10} {'before':>10} {'after':>10} {'change':>9}")
+    for key in ("p50_ms", "p99_ms", "req_per_s"):
+        delta = (after[key] - before[key]) / before[key] * 100 if before[key] else 0
+        print(f"{key:<10} {before[key]:>10} {after[key]:>10} {delta:>+8.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--out", help="Guardar el resultado como JSON")
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Comparar dos runs"
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        _compare(*args.compare)
+        return
+
+    result = asyncio.run(_run(args.requests, args.concurrency, args.warmup))
+    print(json.dumps(result, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -103,6 +103,19 @@ def relax_report_length_settings(monkeypatch):
     yield
 
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_signed_url_cache():
+    """
+    Signed URLs are cached per storage path; tests reuse the same paths with
+    different fake clients.
+    """
+    from app.services.supabase_service import SupabaseService
+
+    SupabaseService.clear_signed_url_cache()
+    yield
+    SupabaseService.clear_signed_url_cache()
+
+
 @pytest.fixture(scope="function", autouse=True)
 def setup_test_db():
     """
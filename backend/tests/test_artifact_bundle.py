@@ -0,0 +1,117 @@
+import json
+
+import pytest
+from app.services import create_pdf as create_pdf_module
+from app.services.artifact_bundle import (
+    ArtifactBundleError,
+    ArtifactBundleReader,
+    ArtifactBundleWriter,
+    bundle_path_for,
+)
+
+
+def _large_target_audit():
+    return {
+        "url": "https://example.com",
+        "structure": {"notes": ["heading check " * 40 for _ in range(20)]},
+        "content": {"paragraphs": [f"paragraph {i} " * 30 for i in range(20)]},
+        "site_metrics": {"structure_score_percent": 40},
+    }
+
+
+def test_bundle_round_trip_preserves_documents(tmp_path):
+    target = _large_target_audit()
+    writer = ArtifactBundleWriter()
+    writer.add("aggregated_summary.json", target)
+    writer.add("fix_plan.json", [{"priority": "HIGH", "issue": "Missing H1"}])
+    writer.add("ag2_report.md", "# Report\n\nContenido")
+    writer.write(tmp_path / "bundle")
+
+    reader = ArtifactBundleReader(tmp_path / "bundle")
+
+    assert reader.names() == [
+        "ag2_report.md",
+        "aggregated_summary.json",
+        "fix_plan.json",
+    ]
+    assert reader.get("aggregated_summary.json") == target
+    assert list(reader.get("aggregated_summary.json")) == list(target)
+    assert reader.get("fix_plan.json") == [{"priority": "HIGH", "issue": "Missing H1"}]
+    assert reader.get("ag2_report.md") == "# Report\n\nContenido"
+    assert reader.get("missing.json", default=[]) == []
+
+
+def test_bundle_dedups_repeated_sub_documents(tmp_path):
+    target = _large_target_audit()
+    competitors = [{"domain": f"c{i}.com", "text": "x " * 3000} for i in range(3)]
+
+    writer = ArtifactBundleWriter()
+    writer.add("aggregated_summary.json", target)
+    for comp in competitors:
+        writer.add(f"competitors/competitor_{comp['domain']}.json", comp)
+    writer.add(
+        "final_llm_context.json",
+        {"target_audit": target, "competitor_audits": competitors},
+    )
+    stats = writer.write(tmp_path / "bundle")
+
+    assert stats["dedup_hits"] > 0
+    standalone_size = len(json.dumps(target)) + sum(
+        len(json.dumps(c)) for c in competitors
+    )
+    assert stats["stored_bytes"] < standalone_size
+
+    reader = ArtifactBundleReader(tmp_path / "bundle")
+    context = reader.get("final_llm_context.json")
+    assert context["target_audit"] == target
+    assert context["competitor_audits"] == competitors
+    assert reader.names("competitors/*.json") == [
+        "competitors/competitor_c0.com.json",
+        "competitors/competitor_c1.com.json",
+        "competitors/competitor_c2.com.json",
+    ]
+
+
+def test_bundle_reader_rejects_truncated_file(tmp_path):
+    writer = ArtifactBundleWriter()
+    writer.add("fix_plan.json", [])
+    path = tmp_path / "bundle"
+    writer.write(path)
+    path.write_bytes(path.read_bytes()[:-6])
+
+    with pytest.raises(ArtifactBundleError):
+        ArtifactBundleReader(path)
+
+
+def test_create_comprehensive_pdf_reads_pages_and_competitors_from_bundle(
+    tmp_path, monkeypatch
+):
+    report_dir = tmp_path / "audit_7"
+    writer = ArtifactBundleWriter()
+    writer.add("ag2_report.md", "# Report\n\nContenido")
+    writer.add("fix_plan.json", [])
+    writer.add(
+        "aggregated_summary.json",
+        {"url": "https://example.com", "audited_pages_count": 1},
+    )
+    writer.add("pages/page_1.json", {"url": "https://example.com", "ok": True})
+    writer.add(
+        "competitors/competitor_rival.com.json",
+        {"domain": "rival.com", "url": "https://rival.com", "geo_score": 55.0},
+    )
+    writer.write(bundle_path_for(report_dir))
+
+    hints = []
+    original = create_pdf_module.PDFReport.write_json_summary_box
+
+    def _spy(self, data, top_n=3, filename_hint=None):
+        hints.append((str(filename_hint), data))
+        return original(self, data, top_n=top_n, filename_hint=filename_hint)
+
+    monkeypatch.setattr(create_pdf_module.PDFReport, "write_json_summary_box", _spy)
+
+    pdf_path = create_pdf_module.create_comprehensive_pdf(str(report_dir))
+
+    assert pdf_path.endswith("Reporte_Consolidado_audit_7.pdf")
+    page_hints = [data for hint, data in hints if hint.startswith("pages")]
+    assert page_hints == [{"url": "https://example.com", "ok": True}]
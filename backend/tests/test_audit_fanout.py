@@ -0,0 +1,235 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from app.core.config import settings
+from app.models import Audit, AuditStatus
+from app.services import audit_fanout_service
+from app.services.audit_fanout_service import AuditFanoutService
+from app.services.audit_service import AuditService
+from app.services.pipeline_service import discover_audit_pages
+from app.services.summary_aggregator import SummaryAggregator
+from app.workers.tasks import (
+    audit_page_shard_task,
+    finalize_page_audit_fanout_task,
+    run_audit_task,
+)
+
+
+class _DictCache:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ttl=300):
+        self.values[key] = value
+
+
+@pytest.fixture
+def shard_cache(monkeypatch):
+    fake = _DictCache()
+    monkeypatch.setattr(audit_fanout_service, "cache", fake)
+    return fake
+
+
+@pytest.fixture
+def fanout_settings(monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_FANOUT_ENABLED", True)
+    monkeypatch.setattr(settings, "AUDIT_FANOUT_MIN_PAGES", 5)
+    monkeypatch.setattr(settings, "AUDIT_FANOUT_SHARD_SIZE", 4)
+    monkeypatch.setattr(settings, "AUDIT_FANOUT_SHARD_CONCURRENCY", 2)
+
+
+def _page_summary(url):
+    return {
+        "url": url,
+        "status": 200,
+        "structure": {},
+        "content": {},
+        "eeat": {},
+        "schema": {},
+    }
+
+
+def test_shards_and_threshold(fanout_settings):
+    urls = [f"https://big.example/p{i}" for i in range(10)]
+
+    assert AuditFanoutService.shard_urls(urls) == [urls[0:4], urls[4:8], urls[8:10]]
+    assert AuditFanoutService.should_fan_out(5)
+    assert not AuditFanoutService.should_fan_out(4)
+
+
+def test_shard_progress_is_tracked_per_shard(shard_cache):
+    AuditFanoutService.start(7, [4, 4, 2])
+    AuditFanoutService.record_shard_progress(
+        7, 0, done=4, total=4, status="completed", failed=1
+    )
+    AuditFanoutService.record_shard_progress(7, 2, done=1, total=2)
+
+    progress = AuditFanoutService.get_shard_progress(7)
+
+    assert progress["shards_total"] == 3
+    assert progress["shards_completed"] == 1
+    assert progress["pages_total"] == 10
+    assert progress["pages_done"] == 5
+    assert progress["shards"][0]["failed"] == 1
+    assert progress["shards"][1]["status"] == "pending"
+    assert AuditFanoutService.overall_progress(7) == 20.0
+    assert AuditFanoutService.get_shard_progress(8) == {}
+
+
+def test_discover_audit_pages_filters_host_and_excludes_valid_base(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_CRAWL_PAGES", 50)
+    monkeypatch.setattr(settings, "MAX_AUDIT_PAGES", 50)
+
+    async def crawler(base_url, max_pages):
+        return [
+            "https://big.example/",
+            "https://big.example/a",
+            "https://big.example/a/",
+            "https://other.example/b",
+            "https://www.big.example/c",
+        ]
+
+    crawled, pages = asyncio.run(
+        discover_audit_pages(
+            "https://big.example/", _page_summary("https://big.example/"), crawler
+        )
+    )
+
+    assert len(crawled) == 5
+    assert pages == ["https://big.example/a", "https://www.big.example/c"]
+
+
+@patch("app.workers.tasks.AuditLocalService.run_local_audit", new_callable=AsyncMock)
+@patch("app.services.pipeline_service.discover_audit_pages", new_callable=AsyncMock)
+@patch("app.services.pipeline_service.run_initial_audit", new_callable=AsyncMock)
+def test_large_site_is_dispatched_as_chord(
+    mock_run_initial,
+    mock_discover,
+    mock_local_audit,
+    db_session,
+    fanout_settings,
+    shard_cache,
+):
+    audit = Audit(url="https://big.example", domain="big.example")
+    db_session.add(audit)
+    db_session.commit()
+    page_urls = [f"https://big.example/p{i}" for i in range(10)]
+    mock_discover.return_value = (page_urls, page_urls)
+    mock_local_audit.return_value = _page_summary("https://big.example")
+
+    with patch("app.workers.tasks.get_db_session") as mock_get_db, patch(
+        "celery.chord"
+    ) as mock_chord:
+        mock_get_db.return_value.__enter__.return_value = db_session
+        outcome = run_audit_task.run(audit.id)
+
+    assert outcome == {
+        "audit_id": audit.id,
+        "mode": "fanout",
+        "shards": 3,
+        "pages": 10,
+    }
+    header = mock_chord.call_args.args[0]
+    assert [sig.args[1:] for sig in header] == [
+        (0, page_urls[0:4], "https://big.example", 1),
+        (1, page_urls[4:8], "https://big.example", 5),
+        (2, page_urls[8:10], "https://big.example", 9),
+    ]
+    callback = mock_chord.return_value.call_args.args[0]
+    assert callback.task == "finalize_page_audit_fanout_task"
+    mock_run_initial.assert_not_called()
+    assert AuditFanoutService.get_shard_progress(audit.id)["shards_total"] == 3
+    db_session.refresh(audit)
+    assert audit.status == AuditStatus.RUNNING
+
+
+@patch("app.workers.tasks.AuditLocalService.run_local_audit", new_callable=AsyncMock)
+def test_shard_persists_pages_and_returns_compact_records(
+    mock_local_audit, db_session, fanout_settings, shard_cache
+):
+    audit = Audit(url="https://big.example", domain="big.example")
+    db_session.add(audit)
+    db_session.commit()
+    urls = [f"https://big.example/p{i}" for i in range(3)]
+
+    async def _audit(url):
+        return _page_summary(url) if not url.endswith("p1") else {"status": 500}
+
+    mock_local_audit.side_effect = _audit
+
+    with patch("app.workers.tasks.get_db_session") as mock_get_db:
+        mock_get_db.return_value.__enter__.return_value = db_session
+        outcome = audit_page_shard_task.run(audit.id, 1, urls, "https://big.example", 5)
+        # Una re-entrega del shard reemplaza sus filas en vez de duplicarlas.
+        audit_page_shard_task.run(audit.id, 1, urls, "https://big.example", 5)
+
+    assert outcome["pages"] == 2
+    assert [r["position"] for r in outcome["records"]] == [5, 6]
+    assert [r["path"] for r in outcome["records"]] == ["/p0", "/p2"]
+    assert outcome["sample"]["url"] == "https://big.example/p0"
+    # Solo el resumen de la primera página viaja completo al callback.
+    assert "structure" not in outcome["records"][0]
+    json.dumps(outcome)
+    saved = AuditService.get_audited_pages(db_session, audit.id)
+    assert sorted(page.url for page in saved) == [urls[0], urls[2]]
+
+
+@patch("app.workers.tasks.PageSpeedJobService.queue_if_needed")
+@patch("app.services.pipeline_service.run_initial_audit", new_callable=AsyncMock)
+def test_chord_callback_aggregates_shards_and_completes_audit(
+    mock_run_initial, _mock_queue_pagespeed, db_session, monkeypatch
+):
+    monkeypatch.setattr(settings, "ENABLE_PAGESPEED", False)
+    audit = Audit(
+        url="https://big.example", domain="big.example", status=AuditStatus.RUNNING
+    )
+    db_session.add(audit)
+    db_session.commit()
+    mock_run_initial.return_value = {
+        "report_markdown": "",
+        "fix_plan": [],
+        "target_audit": {"audited_pages_count": 3},
+        "external_intelligence": {},
+        "search_results": {},
+        "competitor_audits": [],
+    }
+    aggregator = SummaryAggregator("https://big.example")
+    pages = [_page_summary(f"https://big.example/{name}") for name in ("a", "b", "c")]
+    shard_results = [
+        {
+            "shard": 0,
+            "pages": 2,
+            "records": [aggregator.page_record(pages[i], i + 1) for i in (0, 1)],
+            "sample": pages[0],
+        },
+        {"shard": 1, "pages": 0, "records": [], "sample": None},
+        {
+            "shard": 2,
+            "pages": 1,
+            "records": [aggregator.page_record(pages[2], 3)],
+            "sample": pages[2],
+        },
+    ]
+
+    with patch("app.workers.tasks.get_db_session") as mock_get_db:
+        mock_get_db.return_value.__enter__.return_value = db_session
+        outcome = finalize_page_audit_fanout_task.run(
+            shard_results,
+            audit.id,
+            "https://big.example",
+            _page_summary("https://big.example"),
+            ["https://big.example/a"],
+        )
+
+    assert outcome["pages"] == 3
+    prefetched = mock_run_initial.call_args.kwargs["prefetched_pages"]
+    assert prefetched["summaries"] == []
+    assert prefetched["shards"] == shard_results
+    db_session.refresh(audit)
+    assert audit.status == AuditStatus.COMPLETED
+    assert audit.target_audit["audited_pages_count"] == 3
@@ -5,6 +5,7 @@ import re
 import pytest
 from app.core.config import settings
 from app.models import Audit, AuditStatus, Competitor
+from app.services.artifact_bundle import ArtifactBundleReader, bundle_path_for
 from app.services.audit_service import AuditService
 
 
@@ -33,14 +34,43 @@ async def test_save_audit_files_persists_sanitized_fix_plan_once(
         llm_visibility=[],
     )
 
-    fix_plan_path = tmp_path / "audit_77" / "fix_plan.json"
-    assert fix_plan_path.exists()
-    data = json.loads(fix_plan_path.read_text(encoding="utf-8"))
+    report_dir = tmp_path / "audit_77"
+    assert not (report_dir / "fix_plan.json").exists()
+    data = ArtifactBundleReader(bundle_path_for(report_dir)).get("fix_plan.json")
     assert isinstance(data, list)
     assert isinstance(data[0]["payload"], str)
     assert not any("Error guardando archivos JSON" in r.message for r in caplog.records)
 
 
+@pytest.mark.asyncio
+async def test_fix_plan_update_goes_into_existing_bundle(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "REPORTS_DIR", str(tmp_path), raising=False)
+    monkeypatch.setattr(settings, "AUDIT_LOCAL_ARTIFACTS_ENABLED", True, raising=False)
+    target = {"url": "https://example.com", "notes": ["texto largo " * 50] * 20}
+
+    await AuditService._save_audit_files(
+        audit_id=78,
+        target_audit=target,
+        external_intelligence={},
+        search_results={},
+        competitor_audits=[],
+        fix_plan=[{"priority": "LOW"}],
+        pagespeed_data={},
+        keywords=[],
+        backlinks=[],
+        rankings=[],
+        llm_visibility=[],
+    )
+    AuditService._write_audit_artifacts(78, {"fix_plan.json": [{"priority": "HIGH"}]})
+
+    report_dir = tmp_path / "audit_78"
+    reader = ArtifactBundleReader(bundle_path_for(report_dir))
+    assert not (report_dir / "fix_plan.json").exists()
+    assert reader.get("fix_plan.json") == [{"priority": "HIGH"}]
+    assert reader.get("aggregated_summary.json") == target
+    assert reader.metadata == {"audit_id": 78}
+
+
 def test_safe_fs_name_removes_windows_invalid_chars():
     raw = 'https://a.com/p?x=1&y=2<>:"/\\|?*'
     safe = AuditService._safe_fs_name(raw)
@@ -50,6 +80,7 @@ def test_safe_fs_name_removes_windows_invalid_chars():
 
 def test_save_page_audit_creates_windows_safe_file(db_session, tmp_path, monkeypatch):
     monkeypatch.setattr(settings, "REPORTS_DIR", str(tmp_path), raising=False)
+    monkeypatch.setattr(settings, "REPORTS_BASE_DIR", str(tmp_path), raising=False)
     monkeypatch.setattr(settings, "AUDIT_LOCAL_ARTIFACTS_ENABLED", True, raising=False)
 
     audit = Audit(
@@ -109,6 +140,7 @@ async def test_set_audit_results_skips_failed_competitors_from_benchmark_and_per
     db_session, monkeypatch, tmp_path
 ):
     monkeypatch.setattr(settings, "REPORTS_DIR", str(tmp_path), raising=False)
+    monkeypatch.setattr(settings, "REPORTS_BASE_DIR", str(tmp_path), raising=False)
     monkeypatch.setattr(settings, "AUDIT_LOCAL_ARTIFACTS_ENABLED", True, raising=False)
 
     audit = Audit(
@@ -174,14 +206,13 @@ async def test_set_audit_results_skips_failed_competitors_from_benchmark_and_per
     assert diagnostics[-1]["source"] == "competitor"
     assert "HTTP 403" in diagnostics[-1]["message"]
 
-    competitor_files = list(
-        (tmp_path / f"audit_{audit.id}" / "competitors").glob("*.json")
-    )
-    assert len(competitor_files) == 1
+    bundle = ArtifactBundleReader(bundle_path_for(tmp_path / f"audit_{audit.id}"))
+    competitor_entries = bundle.names("competitors/*.json")
+    assert len(competitor_entries) == 1
     expected_filename = (
         f"competitor_{AuditService._safe_fs_name('good.example.com')}.json"
     )
-    assert competitor_files[0].name == expected_filename
+    assert competitor_entries[0] == f"competitors/{expected_filename}"
 
 
 def test_sanitize_json_value_strips_null_bytes():
@@ -212,6 +243,7 @@ async def test_set_audit_results_with_null_bytes_succeeds(
 ):
     """set_audit_results must not crash when scraped data contains \\x00."""
     monkeypatch.setattr(settings, "REPORTS_DIR", str(tmp_path), raising=False)
+    monkeypatch.setattr(settings, "REPORTS_BASE_DIR", str(tmp_path), raising=False)
     monkeypatch.setattr(settings, "AUDIT_LOCAL_ARTIFACTS_ENABLED", True, raising=False)
 
     audit = Audit(
@@ -257,3 +289,117 @@ async def test_set_audit_results_with_null_bytes_succeeds(
     assert "\x00" not in json.dumps(audit.competitor_audits)
     assert "\x00" not in (audit.report_markdown or "")
 
+
+@pytest.mark.asyncio
+async def test_set_audit_results_keeps_page_audits_only_in_audited_pages(
+    db_session, monkeypatch
+):
+    monkeypatch.setattr(settings, "AUDIT_LOCAL_ARTIFACTS_ENABLED", False, raising=False)
+
+    audit = Audit(
+        url="https://example.com",
+        domain="example.com",
+        status=AuditStatus.PENDING,
+        user_id="test-user",
+        user_email="test@example.com",
+    )
+    db_session.add(audit)
+    db_session.commit()
+    db_session.refresh(audit)
+
+    page_audits = [
+        {
+            "index": 0,
+            "url": "https://example.com/",
+            "data": {"structure": {"h1_check": {"status": "pass"}}},
+        },
+        {"index": 1, "url": "https://example.com/empty", "data": {}},
+    ]
+    assert AuditService.save_page_audits(db_session, audit.id, page_audits) == 1
+
+    await AuditService.set_audit_results(
+        db=db_session,
+        audit_id=audit.id,
+        target_audit={
+            "url": "https://example.com",
+            "_individual_page_audits": page_audits,
+        },
+        external_intelligence={},
+        search_results={},
+        competitor_audits=[],
+        report_markdown="# Report",
+        fix_plan=[],
+        pagespeed_data={},
+    )
+
+    db_session.refresh(audit)
+    assert "_individual_page_audits" not in audit.target_audit
+    pages = AuditService.get_audited_pages(db_session, audit.id)
+    assert [page.url for page in pages] == ["https://example.com/"]
+    assert audit.total_pages == 1
+
+
+def test_save_page_audits_bulk_matches_single_page_scores(db_session):
+    audit = Audit(
+        url="https://example.com",
+        domain="example.com",
+        status=AuditStatus.PENDING,
+        user_id="test-user",
+        user_email="test@example.com",
+    )
+    db_session.add(audit)
+    db_session.commit()
+    db_session.refresh(audit)
+
+    page_data = {
+        "structure": {
+            "h1_check": {"status": "pass"},
+            "semantic_html": {"score_percent": 70},
+            "title_check": {"status": "too_long"},
+        },
+        "content": {"conversational_tone": {"score": 6}},
+        "eeat": {
+            "author_presence": {"status": "pass"},
+            "citations_and_sources": {"external_links": 2},
+            "transparency_signals": {"about": True, "contact": False},
+        },
+        "schema": {
+            "schema_presence": {"status": "present"},
+            "schema_types": ["Organization", "WebSite"],
+        },
+    }
+    single = AuditService.save_page_audit(
+        db=db_session,
+        audit_id=audit.id,
+        page_url="https://example.com/single",
+        audit_data=page_data,
+    )
+
+    saved = AuditService.save_page_audits(
+        db_session,
+        audit.id,
+        [
+            {"index": i, "url": f"https://example.com/p{i}", "data": page_data}
+            for i in range(25)
+        ],
+    )
+
+    assert saved == 25
+    pages = AuditService.get_audited_pages(db_session, audit.id)
+    assert len(pages) == 26
+    columns = (
+        "h1_score",
+        "structure_score",
+        "content_score",
+        "eeat_score",
+        "schema_score",
+        "overall_score",
+        "critical_issues",
+        "high_issues",
+        "medium_issues",
+        "low_issues",
+    )
+    for page in pages[1:]:
+        assert page.path.startswith("/p")
+        for column in columns:
+            assert getattr(page, column) == getattr(single, column)
@@ -0,0 +1,150 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+from app.core import auth as auth_module
+from app.core.auth import get_user_from_bearer_token
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+ISSUER = "https://tenant.auth0.com/"
+AUDIENCE = "https://api.example.com"
+
+
+@pytest.fixture(autouse=True)
+def _clean_auth_caches():
+    auth_module.clear_auth_caches()
+    yield
+    auth_module.clear_auth_caches()
+
+
+class _FakeJWKS:
+    def __init__(self, keys, delay=0.0, gate=None):
+        self.keys = keys
+        self.delay = delay
+        self.gate = gate
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, issuer):
+        with self.lock:
+            self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        time.sleep(self.delay)
+        return dict(self.keys)
+
+
+def _seed_cache(keys, *, expires_in, fetched_ago=3600):
+    now = time.time()
+    auth_module._jwks_cache.update(
+        {
+            "issuer": ISSUER,
+            "keys_by_kid": dict(keys),
+            "expires_at": now + expires_in,
+            "fetched_at": now - fetched_ago,
+        }
+    )
+
+
+def test_concurrent_cold_lookups_share_one_jwks_fetch(monkeypatch):
+    fetch = _FakeJWKS({"k1": {"kid": "k1"}}, delay=0.1)
+    monkeypatch.setattr(auth_module, "_fetch_jwks", fetch)
+    results = []
+
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(auth_module._get_jwk_for_kid("k1", ISSUER))
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetch.calls == 1
+    assert results == [{"kid": "k1"}] * 8
+
+
+def test_expired_keys_are_served_stale_while_revalidating(monkeypatch):
+    gate = threading.Event()
+    fetch = _FakeJWKS({"k1": {"kid": "k1", "v": 2}}, gate=gate)
+    monkeypatch.setattr(auth_module, "_fetch_jwks", fetch)
+    _seed_cache({"k1": {"kid": "k1", "v": 1}}, expires_in=-10)
+
+    started = time.perf_counter()
+    jwk = auth_module._get_jwk_for_kid("k1", ISSUER)
+    again = auth_module._get_jwk_for_kid("k1", ISSUER)
+
+    assert time.perf_counter() - started < 0.5
+    assert jwk == again == {"kid": "k1", "v": 1}
+
+    gate.set()
+    deadline = time.time() + 5
+    while (
+        auth_module._jwks_cache["expires_at"] < time.time() and time.time() < deadline
+    ):
+        time.sleep(0.01)
+
+    assert fetch.calls == 1
+    assert auth_module._get_jwk_for_kid("k1", ISSUER) == {"kid": "k1", "v": 2}
+
+
+def test_unknown_kids_are_negative_cached(monkeypatch):
+    fetch = _FakeJWKS({"k1": {"kid": "k1"}})
+    monkeypatch.setattr(auth_module, "_fetch_jwks", fetch)
+    _seed_cache({"k1": {"kid": "k1"}}, expires_in=600)
+
+    assert auth_module._get_jwk_for_kid("rotated", ISSUER) is None
+    assert auth_module._get_jwk_for_kid("rotated", ISSUER) is None
+    assert fetch.calls == 1
+
+    # Un set recién obtenido no se vuelve a pedir por otro kid desconocido.
+    assert auth_module._get_jwk_for_kid("other", ISSUER) is None
+    assert fetch.calls == 1
+
+
+def test_verified_claims_are_cached_until_exp(monkeypatch):
+    monkeypatch.setattr(auth_module.settings, "AUTH0_ISSUER_BASE_URL", ISSUER)
+    monkeypatch.setattr(auth_module.settings, "AUTH0_API_AUDIENCE", AUDIENCE)
+    monkeypatch.setattr(auth_module.settings, "AUTH0_EXPECTED_CLIENT_ID", None)
+    monkeypatch.setattr(auth_module.settings, "ENVIRONMENT", "development")
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_jwk = json.loads(
+        jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key())
+    )
+    public_jwk["kid"] = "test-kid"
+    lookups = []
+    monkeypatch.setattr(
+        auth_module,
+        "_get_jwk_for_kid",
+        lambda *args: lookups.append(args) or public_jwk,
+    )
+    now = datetime.now(timezone.utc)
+    token = jwt.encode(
+        {
+            "sub": "auth0|user-1",
+            "aud": AUDIENCE,
+            "iss": ISSUER,
+            "iat": int(now.timestamp()),
+            "exp": int((now + timedelta(minutes=10)).timestamp()),
+        },
+        private_key,
+        algorithm="RS256",
+        headers={"kid": "test-kid"},
+    )
+
+    first = get_user_from_bearer_token(token)
+    second = get_user_from_bearer_token(token)
+
+    assert first == second
+    assert len(lookups) == 1
+
+    cache_key = auth_module._claims_cache_key(token)
+    claims, _exp = auth_module._claims_cache[cache_key]
+    auth_module._claims_cache[cache_key] = (claims, time.time() - 1)
+    get_user_from_bearer_token(token)
+    assert len(lookups) == 2
@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+
+import pytest
+from app.core.auth import AuthUser, get_current_user
+from app.main import app
+from app.workers import queues
+from app.workers.celery_app import celery_app
+
+
+def test_tasks_are_routed_to_their_lane_with_priority():
+    router = celery_app.amqp.router
+
+    pdf_route = router.route({}, "run_pdf_generation_job_task", (1,), {})
+    legacy_pdf_route = router.route({}, "generate_pdf_task", (1, "md"), {})
+    webhook_route = router.route({}, "send_webhook_async", (), {})
+    audit_route = router.route({}, "run_audit_task", (1,), {})
+
+    assert pdf_route["queue"].name == queues.QUEUE_REPORTS
+    assert legacy_pdf_route["queue"].name == queues.QUEUE_REPORTS
+    assert webhook_route["queue"].name == queues.QUEUE_WEBHOOKS
+    assert audit_route["queue"].name == queues.QUEUE_AUDITS
+    assert set(queues.ALL_QUEUES) <= set(celery_app.amqp.queues)
+
+
+def test_interactive_priority_wins_on_amqp_and_redis():
+    redis_routes = queues.build_task_routes("redis://localhost:6379/0")
+    amqp_routes = queues.build_task_routes("amqp://guest@localhost//")
+
+    # Redis atiende primero el número más bajo; AMQP el más alto.
+    assert (
+        redis_routes["run_pdf_generation_job_task"]["priority"]
+        < redis_routes["generate_pdf_task"]["priority"]
+    )
+    assert (
+        amqp_routes["run_pdf_generation_job_task"]["priority"]
+        > amqp_routes["generate_pdf_task"]["priority"]
+    )
+    assert queues.queue_settings("redis://localhost")["broker_transport_options"] == {
+        "priority_steps": list(range(10))
+    }
+
+
+def test_worker_lane_applies_profile_and_queue_selection():
+    selected = []
+    conf = SimpleNamespace(worker_concurrency=None, worker_prefetch_multiplier=4)
+    fake_app = SimpleNamespace(
+        amqp=SimpleNamespace(queues=SimpleNamespace(select=selected.append))
+    )
+
+    lane = queues.apply_worker_lane(conf, fake_app, "audits")
+
+    assert lane is queues.WORKER_LANES["audits"]
+    assert conf.worker_prefetch_multiplier == 1
+    assert conf.worker_concurrency == 2
+    assert selected == [[queues.QUEUE_AUDITS]]
+
+    # -Q en la línea de comandos manda sobre el carril.
+    selected.clear()
+    queues.apply_worker_lane(conf, fake_app, "webhooks", queues_from_cli=["audits"])
+    assert selected == []
+    assert conf.worker_prefetch_multiplier == 4
+
+    assert queues.apply_worker_lane(conf, fake_app, "") is None
+    with pytest.raises(ValueError):
+        queues.apply_worker_lane(conf, fake_app, "gpu")
+
+
+def test_admin_queue_depth_view(client, monkeypatch):
+    monkeypatch.setattr(
+        "app.api.routes.admin.get_queue_depths",
+        lambda _app, _timeout: {
+            "celery": 0,
+            "audits": 7,
+            "reports": 2,
+            "content": None,
+            "webhooks": 1,
+        },
+    )
+
+    assert client.get("/api/v1/admin/queues").status_code == 403
+
+    app.dependency_overrides[get_current_user] = lambda: AuthUser(
+        user_id="ops", email="ops@example.com", roles=("admin",)
+    )
+    response = client.get("/api/v1/admin/queues")
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["total_pending"] == 10
+    by_queue = {item["queue"]: item for item in payload["queues"]}
+    assert by_queue["audits"]["depth"] == 7
+    assert by_queue["audits"]["lane"] == "audits"
+    assert by_queue["audits"]["prefetch_multiplier"] == 1
+    assert "run_pdf_generation_job_task" in by_queue["reports"]["tasks"]
+    assert by_queue["content"]["depth"] is None
@@ -0,0 +1,59 @@
+from app.services.competitor_lexicon import (
+    CompetitorLexicon,
+    first_banned_term,
+    token_root,
+    weak_support_roots,
+)
+from app.services.pipeline_service import PipelineService
+
+
+def _profile():
+    return {
+        "core_terms": ["guitarras", "amplificador", "platform"],
+        "strong_core_terms": ["guitarras"],
+        "weak_core_terms": ["platform"],
+        "outlier_terms": ["premium"],
+        "market_terms": ["argentina"],
+        "vertical_hint": "ecommerce",
+    }
+
+
+def test_lexicon_is_shared_for_equal_profiles():
+    lexicon = CompetitorLexicon.for_profile(_profile())
+
+    assert CompetitorLexicon.for_profile(_profile()) is lexicon
+    assert lexicon.core_terms == ("guitarra", "amplificador", "platform")
+    assert lexicon.weak_terms >= weak_support_roots("ecommerce")
+    # Mismo texto => mismas raíces, sin re-tokenizar.
+    assert lexicon.roots("Guitarras Online") is lexicon.roots("guitarras online")
+
+
+def test_match_details_uses_profile_roots():
+    details = PipelineService._query_core_match_details(
+        "tienda de guitarras platform argentina", _profile()
+    )
+
+    assert details["core_matches"] == {"guitarra", "platform"}
+    assert details["strong_matches"] == {"guitarra"}
+    assert details["effective_matches"] == {"guitarra"}
+    assert "platform" in details["weak_matches"]
+    assert PipelineService._query_uses_only_outlier_terms("premium sound", _profile())
+    assert PipelineService._query_core_match_details("", _profile())["core_terms"] == (
+        set()
+    )
+
+
+def test_first_banned_term_keeps_word_boundaries_and_list_order():
+    terms = ("review", " vs ", "dea", "press release")
+
+    assert first_banned_term("guitar dealer in town", terms) is None
+    assert first_banned_term("Fender vs Gibson review", terms) == "review"
+    assert first_banned_term("fender vs gibson", terms) == " vs "
+    assert first_banned_term("official press release", terms) == "press release"
+    assert first_banned_term("", terms) is None
+
+
+def test_token_root_matches_pipeline_normalization():
+    assert token_root("Consultorías") == "consultoria"
+    assert PipelineService._normalize_token_root("Guitarras") == token_root("guitarras")
+    assert PipelineService._normalize_token_root(None) == ""
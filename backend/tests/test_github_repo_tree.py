@@ -0,0 +1,141 @@
+import base64
+import json
+from types import SimpleNamespace
+
+import pytest
+from app.integrations.github.blog_auditor import BlogAuditorService
+from app.integrations.github.client import GitHubClient
+from app.integrations.github.repo_tree import clear_repo_tree_cache
+
+COMMIT_SHA = "a" * 40
+
+
+class FakeRepo:
+    """Repo falso que solo expone la Git Trees API y cuenta las llamadas."""
+
+    full_name = "owner/site"
+    default_branch = "main"
+
+    def __init__(self, paths, package_json=None):
+        self.calls = []
+        self._package_json = package_json
+        entries = []
+        seen_dirs = set()
+        for path in paths:
+            parts = path.split("/")
+            for i in range(1, len(parts)):
+                directory = "/".join(parts[:i])
+                if directory not in seen_dirs:
+                    seen_dirs.add(directory)
+                    entries.append(
+                        SimpleNamespace(path=directory, type="tree", sha=None)
+                    )
+            entries.append(SimpleNamespace(path=path, type="blob", sha=f"blob:{path}"))
+        self._tree = SimpleNamespace(tree=entries, raw_data={"truncated": False})
+
+    def get_branch(self, name):
+        self.calls.append(("get_branch", name))
+        return SimpleNamespace(commit=SimpleNamespace(sha=COMMIT_SHA))
+
+    def get_git_tree(self, sha, recursive=False):
+        self.calls.append(("get_git_tree", sha, recursive))
+        return self._tree
+
+    def get_git_blob(self, sha):
+        self.calls.append(("get_git_blob", sha))
+        content = base64.b64encode(json.dumps(self._package_json).encode("utf-8"))
+        return SimpleNamespace(content=content.decode("ascii"))
+
+    def get_contents(self, path, ref=None):
+        raise AssertionError("scanners must not walk the repo with get_contents")
+
+
+@pytest.fixture(autouse=True)
+def _clean_tree_cache():
+    clear_repo_tree_cache()
+    yield
+    clear_repo_tree_cache()
+
+
+def _nextjs_repo():
+    return FakeRepo(
+        [
+            "package.json",
+            "app/page.tsx",
+            "app/layout.tsx",
+            "app/blog/page.tsx",
+            "app/blog/[slug]/page.tsx",
+            "pages/about.tsx",
+            "pages/_app.tsx",
+            "pages/api/hello.ts",
+        ],
+        package_json={"dependencies": {"next": "14.0.0"}},
+    )
+
+
+def test_detect_site_type_and_find_page_files_share_one_tree_fetch():
+    repo = _nextjs_repo()
+    client = GitHubClient("token")
+
+    config = client.detect_site_type(repo)
+    files = client.find_page_files(repo, config["site_type"])
+
+    assert config["site_type"] == "nextjs"
+    assert config["router_type"] == "app"
+    assert files == [
+        "app/page.tsx",
+        "app/blog/page.tsx",
+        "app/blog/[slug]/page.tsx",
+        "pages/about.tsx",
+        "pages/_app.tsx",
+    ]
+    assert [call[0] for call in repo.calls] == [
+        "get_branch",
+        "get_git_tree",
+        "get_git_blob",
+    ]
+
+
+def test_tree_is_cached_per_commit_sha_across_clients():
+    repo = _nextjs_repo()
+
+    GitHubClient("token").find_page_files(repo, "nextjs")
+    blog_files = BlogAuditorService(GitHubClient("other"))._find_blog_files(
+        repo, "nextjs"
+    )
+
+    assert blog_files == [
+        "app/page.tsx",
+        "app/blog/page.tsx",
+        "app/blog/[slug]/page.tsx",
+        "pages/about.tsx",
+    ]
+    tree_fetches = [call for call in repo.calls if call[0] == "get_git_tree"]
+    assert tree_fetches == [("get_git_tree", COMMIT_SHA, True)]
+
+
+def test_html_scan_skips_hidden_directories_and_spa_root_index():
+    repo = FakeRepo(
+        [
+            ".github/template.html",
+            "index.html",
+            "App.tsx",
+            "vite.config.tsx",
+            "docs/guide.html",
+            "src/main.jsx",
+        ]
+    )
+    client = GitHubClient("token")
+
+    assert client._scan_for_html_files(repo, "") == ["index.html", "docs/guide.html"]
+    assert client.find_page_files(repo, "vite") == [
+        "index.html",
+        "App.tsx",
+        "vite.config.tsx",
+        "src/main.jsx",
+        "src/main.jsx",
+    ]
+    assert BlogAuditorService(client)._find_blog_files(repo, "vite") == [
+        "App.tsx",
+        "src/main.jsx",
+    ]
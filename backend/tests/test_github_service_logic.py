@@ -55,7 +55,8 @@ async def test_create_pr_with_fixes_resets_branch():
     mock_gh_repo = MagicMock()
     mock_client.get_repo.return_value = mock_gh_repo
     mock_client.find_page_files.return_value = ["pages/index.tsx"]
-    mock_client.get_file_content.return_value = "original content"
+    mock_client.create_branch.return_value = "base_sha"
+    mock_client.get_files_content.return_value = {"pages/index.tsx": "original content"}
     mock_client.create_pull_request.return_value = {
         "github_pr_id": "pr_123",
         "pr_number": 1,
@@ -83,8 +84,71 @@ async def test_create_pr_with_fixes_resets_branch():
             mock_gh_repo, "seo-fix-1", "main"
         )
 
-        # Verify file update was called
-        mock_client.update_file.assert_called_once()
+        # Verify all files went into a single commit
+        mock_client.commit_files.assert_called_once()
+        mock_client.update_file.assert_not_called()
 
         # Verify PR creation was called
         mock_client.create_pull_request.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_create_pr_with_fixes_commits_all_files_in_one_commit():
+    mock_db = MagicMock()
+    service = GitHubService(mock_db)
+
+    mock_repo = MagicMock(spec=GitHubRepository)
+    mock_repo.id = "repo_123"
+    mock_repo.full_name = "owner/repo"
+    mock_repo.default_branch = "main"
+    mock_repo.site_type = "nextjs"
+
+    mock_audit = MagicMock(spec=Audit)
+    mock_audit.id = 1
+    mock_audit.keywords = []
+    mock_audit.pagespeed_data = None
+    mock_audit.target_audit = None
+    mock_audit.ai_content_suggestions = []
+    mock_audit.total_pages = 12
+    mock_audit.critical_issues = 0
+    mock_audit.high_issues = 0
+    mock_audit.medium_issues = 0
+
+    mock_db.query.return_value.filter.return_value.first.side_effect = [
+        mock_repo,
+        mock_audit,
+    ]
+
+    page_files = [f"app/page_{i}/page.tsx" for i in range(12)]
+    mock_client = MagicMock()
+    mock_client.create_branch.return_value = "base_sha"
+    mock_client.find_page_files.return_value = page_files
+    mock_client.get_files_content.return_value = {
+        path: f"content {path}" for path in page_files
+    }
+    mock_client.create_pull_request.return_value = {
+        "github_pr_id": "pr_123",
+        "pr_number": 1,
+        "html_url": "https://github.com/owner/repo/pull/1",
+    }
+
+    with patch.object(service, "get_valid_client", return_value=mock_client), patch(
+        "app.integrations.github.service.CodeModifierService.apply_fixes",
+        side_effect=lambda content, *args, **kwargs: content + " fixed",
+    ):
+        pr = await service.create_pr_with_fixes(
+            "conn_123", "repo_123", 1, [{"type": "title", "value": "New"}]
+        )
+
+    mock_client.get_files_content.assert_called_once_with(
+        mock_client.get_repo.return_value, page_files, "base_sha"
+    )
+    mock_client.commit_files.assert_called_once()
+    gh_repo, branch, files, message, parent_sha = (
+        mock_client.commit_files.call_args.args
+    )
+    assert sorted(files) == sorted(page_files)
+    assert all(content.endswith(" fixed") for content in files.values())
+    assert parent_sha == "base_sha"
+    assert message.startswith("chore(seo): Optimize title tag in 12 files")
+    assert pr.files_changed == 12
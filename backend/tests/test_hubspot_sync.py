@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.integrations.hubspot.service import HubSpotService
+from app.models.hubspot import HubSpotConnection, HubSpotPage
+
+
+class _FakeHubSpotClient:
+    def __init__(self, batches):
+        self.batches = batches
+        self.closed = False
+
+    async def iter_page_batches(self, limit: int = 100):
+        for batch in self.batches:
+            yield [dict(page) for page in batch]
+
+    async def close(self):
+        self.closed = True
+
+
+def _page(hubspot_id, updated, title="Title"):
+    return {
+        "id": hubspot_id,
+        "url": f"https://portal.example.com/{hubspot_id}",
+        "name": f"Page {hubspot_id}",
+        "htmlTitle": title,
+        "metaDescription": "Description",
+        "updated": updated,
+    }
+
+
+def _service(db_session, monkeypatch, client):
+    connection = HubSpotConnection(
+        owner_user_id="test-user",
+        portal_id="123",
+        access_token="encrypted",
+        refresh_token="encrypted",
+        expires_at=datetime.utcnow() + timedelta(hours=1),
+        scopes="content",
+    )
+    db_session.add(connection)
+    db_session.commit()
+    service = HubSpotService(db_session)
+
+    async def _fake_get_valid_client(_connection_id):
+        return client
+
+    monkeypatch.setattr(service, "get_valid_client", _fake_get_valid_client)
+    return service, connection
+
+
+def test_sync_pages_streams_batches_and_skips_unchanged_rows(db_session, monkeypatch):
+    client = _FakeHubSpotClient(
+        [
+            [_page("1", "2026-01-01T10:00:00Z"), _page("2", "2026-01-01T10:00:00Z")],
+            [_page("3", 1767261600000)],
+        ]
+    )
+    service, connection = _service(db_session, monkeypatch, client)
+
+    pages = asyncio.run(service.sync_pages(connection.id))
+
+    assert [page.hubspot_id for page in pages] == ["1", "2", "3"]
+    assert client.closed
+    assert pages[2].hubspot_updated_at == datetime(2026, 1, 1, 10, 0, 0)
+    first_synced = {page.hubspot_id: page.last_synced_at for page in pages}
+
+    client.batches = [
+        [
+            _page("1", "2026-01-01T10:00:00Z", title="Ignored: same updated"),
+            _page("2", "2026-02-01T10:00:00Z", title="New title"),
+            _page("3", 1767261600000),
+        ]
+    ]
+    pages = asyncio.run(service.sync_pages(connection.id))
+
+    by_id = {page.hubspot_id: page for page in pages}
+    assert by_id["1"].html_title == "Title"
+    assert by_id["1"].last_synced_at == first_synced["1"]
+    assert by_id["2"].html_title == "New title"
+    assert by_id["2"].hubspot_updated_at == datetime(2026, 2, 1, 10, 0, 0)
+    assert by_id["3"].last_synced_at == first_synced["3"]
+    assert (
+        db_session.query(HubSpotPage)
+        .filter(HubSpotPage.connection_id == connection.id)
+        .count()
+        == 3
+    )
@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.scripts.profile_imports import parse_importtime
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = (
+    "openai",
+    "fpdf",
+    "github",
+    "app.services.create_pdf",
+    "app.services.pipeline_service",
+    "app.services.geo_article_engine_service",
+)
+
+
+def _loaded_heavy_modules(entrypoint: str) -> list:
+    code = (
+        f"import sys, {entrypoint}\n"
+        f"print('LOADED=' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    env = dict(os.environ)
+    env.setdefault("ENVIRONMENT", "testing")
+    env.setdefault("CELERY_BROKER_URL", "memory://")
+    env.setdefault("CELERY_RESULT_BACKEND", "cache+memory://")
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    loaded = next(
+        line[len("LOADED=") :]
+        for line in proc.stdout.splitlines()
+        if line.startswith("LOADED=")
+    )
+    return [name for name in loaded.split(",") if name]
+
+
+def test_api_and_worker_entrypoints_defer_heavy_dependencies():
+    assert _loaded_heavy_modules("app.main") == []
+    assert _loaded_heavy_modules("app.workers.tasks") == []
+
+
+def test_github_package_exports_resolve_on_first_access():
+    import app.integrations.github as github_pkg
+    from app.integrations.github.client import GitHubClient
+
+    assert github_pkg.GitHubClient is GitHubClient
+
+
+def test_parse_importtime_reads_self_cumulative_and_depth():
+    output = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     json.decoder",
+            "import time:       300 |        420 |   json",
+            "import time:      1000 |       1420 | app.main",
+        ]
+    )
+
+    timings = parse_importtime(output)
+
+    assert [(t.module, t.self_us, t.cumulative_us, t.depth) for t in timings] == [
+        ("json.decoder", 120, 120, 2),
+        ("json", 300, 420, 1),
+        ("app.main", 1000, 1420, 0),
+    ]
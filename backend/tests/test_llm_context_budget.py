@@ -0,0 +1,96 @@
+import json
+
+from app.core.config import settings
+from app.services.llm_context_budget import ContextBudget, estimate_tokens
+from app.services.pipeline_service import PipelineService
+
+
+def _context(search_items=40, competitors=5):
+    return {
+        "target_audit": {
+            "url": "https://shop.example/",
+            "content": {"title": "Tienda"},
+        },
+        "external_intelligence": {"category": "Retail", "market": "AR"},
+        "search_results": {
+            "q1": {
+                "items": [
+                    {
+                        "link": f"https://site{i}.example/page",
+                        "snippet": "guitarras eléctricas y amplificadores " * 20,
+                    }
+                    for i in range(search_items)
+                ]
+            }
+        },
+        "competitor_audits": [
+            {"url": f"https://rival{i}.example/", "text": "x" * 2000}
+            for i in range(competitors)
+        ],
+        "keywords": {"items": ["guitarra", "amplificador"]},
+    }
+
+
+def test_render_matches_full_dump_after_refresh():
+    context = _context()
+    shared = {"a": 1}
+    context["product_intelligence"] = {"first": shared, "second": shared}
+    budget = ContextBudget(context, budget_tokens=10)
+
+    assert budget.render() == json.dumps(
+        budget.context, ensure_ascii=False, default=str
+    )
+    assert budget.context["product_intelligence"]["second"] == "<CYCLE_REF>"
+
+    budget.context.pop("search_results")
+    budget.context["keywords"] = {}
+    budget.refresh("search_results", "keywords")
+
+    assert budget.render() == json.dumps(
+        budget.context, ensure_ascii=False, default=str
+    )
+    assert (
+        budget.tokens
+        == sum(
+            estimate_tokens(json.dumps({k: v}, ensure_ascii=False)[1:-1])
+            for k, v in budget.context.items()
+        )
+        + len(budget.context)
+        + 1
+    )
+
+
+def test_shrink_drops_search_results_before_competitors(monkeypatch):
+    service = PipelineService()
+    context = _context()
+    full_tokens = ContextBudget(context, 0).tokens
+    search_tokens = estimate_tokens(
+        json.dumps({"search_results": context["search_results"]}, ensure_ascii=False)
+    )
+    monkeypatch.setattr(settings, "NV_CONTEXT_SAFETY_RATIO", 1.0)
+    # Sin search_results entra; con un solo resultado todavía no.
+    monkeypatch.setattr(
+        settings, "NV_MAX_CONTEXT_TOKENS", full_tokens - search_tokens + 50
+    )
+    monkeypatch.setattr(PipelineService, "_minimize_context", staticmethod(dict))
+
+    trimmed, prompt = service._shrink_context_to_budget(context, "")
+
+    assert "search_results" not in trimmed
+    assert len(trimmed["competitor_audits"]) == 5
+    assert trimmed["keywords"] == context["keywords"]
+    assert json.loads(prompt) == trimmed
+    # El contexto original no se modifica.
+    assert len(context["search_results"]["q1"]["items"]) == 40
+
+
+def test_estimate_tokens_weighs_json_structure_and_accents():
+    prose = "las guitarras electricas se venden en todo el pais " * 10
+    payload = json.dumps([{"id": i, "p": 1234.5} for i in range(50)])
+
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a") == 1
+    # JSON denso cuenta más tokens por carácter que prosa.
+    assert estimate_tokens(payload) / len(payload) > estimate_tokens(prose) / len(prose)
+    assert estimate_tokens(payload) > len(payload) // 4
+    assert estimate_tokens("canción eléctrica") > estimate_tokens("cancion electrica")
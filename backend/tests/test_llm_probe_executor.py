@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import pytest
+from app.core.config import settings
+from app.services.llm_probe_executor import (
+    LLMProbeExecutor,
+    clear_probe_executors,
+    get_probe_executor,
+)
+from app.services.query_discovery_service import QueryDiscoveryService
+
+
+@pytest.fixture(autouse=True)
+def _fast_probe_limits(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PROBE_RATE_PER_SECOND", 1000.0, raising=False)
+    monkeypatch.setattr(settings, "LLM_PROBE_RATE_BURST", 1000, raising=False)
+    clear_probe_executors()
+    yield
+    clear_probe_executors()
+
+
+class FakeLLM:
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.prompts = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, prompt):
+        self.prompts.append(prompt)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            # Respuestas más lentas primero para verificar el orden de salida
+            await asyncio.sleep(self.delay / (1 + len(self.prompts) % 3))
+            if "boom" in prompt:
+                raise RuntimeError("provider error")
+            return f"answer: {prompt}"
+        finally:
+            self.active -= 1
+
+
+@pytest.mark.asyncio
+async def test_run_returns_responses_in_input_order_with_bounded_concurrency():
+    llm = FakeLLM()
+    executor = LLMProbeExecutor(llm, provider="test-order", max_concurrency=8)
+    prompts = [f"query {i}" for i in range(24)]
+
+    started = time.perf_counter()
+    responses = await executor.run(prompts)
+    elapsed = time.perf_counter() - started
+
+    assert responses == [f"answer: {p}" for p in prompts]
+    assert llm.peak == 8
+    assert elapsed < 0.6
+
+
+@pytest.mark.asyncio
+async def test_identical_prompts_are_sent_once_and_errors_keep_their_slot():
+    llm = FakeLLM(delay=0.01)
+    executor = LLMProbeExecutor(llm, provider="test-dedup")
+
+    responses = await executor.run(["best shoes", "best  shoes ", "boom", "best shoes"])
+
+    assert responses[0] == responses[1] == responses[3] == "answer: best shoes"
+    assert isinstance(responses[2], RuntimeError)
+    assert llm.prompts.count("best shoes") == 1
+
+
+@pytest.mark.asyncio
+async def test_services_of_same_audit_share_probe_responses():
+    llm = FakeLLM(delay=0.01)
+    queries = [
+        "¿Cuáles son las mejores tiendas de zapatillas para correr?",
+        "Guía completa de running para principiantes en montaña",
+    ]
+
+    first = await get_probe_executor(42, llm).run(queries)
+    validated = await QueryDiscoveryService._validate_queries(
+        queries, "Acme", "acme.com", llm, audit_id=42
+    )
+
+    assert len(llm.prompts) == 2
+    assert [item["query"] for item in validated] == queries
+    assert [item["response_length"] for item in validated] == [len(r) for r in first]
+    assert get_probe_executor(43, llm) is not get_probe_executor(42, llm)
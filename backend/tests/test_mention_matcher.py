@@ -0,0 +1,92 @@
+import pytest
+from app.services.competitor_citation_service import CompetitorCitationService
+from app.services.mention_matcher import BRAND_KEY, MentionMatcher, clean_domain
+
+
+def test_scan_returns_every_mention_with_position_and_sentence():
+    matcher = MentionMatcher.for_brands(
+        "Acme", "www.acme.com", ["acmecorp.io", "globex.com"]
+    )
+    text = "Top picks. Globex is solid. AcmeCorp and acme win. ACME again"
+
+    mentions = [(m.key, m.term, m.start, m.sentence) for m in matcher.scan(text)]
+
+    assert mentions == [
+        ("globex.com", "globex", 11, 2),
+        ("acmecorp.io", "acmecorp", 28, 3),
+        (BRAND_KEY, "acme", 28, 3),
+        (BRAND_KEY, "acme", 41, 3),
+        (BRAND_KEY, "acme", 51, 4),
+    ]
+    assert set(matcher.first_mentions("nothing here")) == set()
+
+
+def test_aliases_and_domain_variants_share_one_entity():
+    matcher = MentionMatcher.for_brands(
+        "Latent GEO",
+        "latentgeo.io",
+        aliases={BRAND_KEY: ["LGEO"]},
+    )
+
+    first = matcher.first_mentions("Try lgeo. Or latentgeo. Or Latent GEO.")
+
+    assert clean_domain("www.latentgeo.io") == "latentgeo"
+    assert list(first) == [BRAND_KEY]
+    # El nombre principal gana aunque el alias aparezca antes.
+    mention = first[BRAND_KEY]
+    assert (mention.term, mention.sentence, mention.primary) == ("latent geo", 3, True)
+
+    domain_only = matcher.first_mentions("Visit latentgeo today. Or lgeo.")[BRAND_KEY]
+    assert (domain_only.term, domain_only.primary) == ("latentgeo", False)
+
+
+class _DB:
+    def add(self, _obj):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_competitor_analysis_counts_mentions_from_single_scan(monkeypatch):
+    responses = {
+        "q1": "Globex leads. Acme follows.",
+        "q2": "Acme is great. Initech too. Globex also.",
+        "q3": "No brands here at all.",
+    }
+
+    async def llm(prompt):
+        return responses.get(prompt, "analysis")
+
+    async def no_gaps(results, queries, llm_function):
+        return {"has_gaps": False}
+
+    monkeypatch.setattr(
+        CompetitorCitationService, "_analyze_citation_gaps", staticmethod(no_gaps)
+    )
+    monkeypatch.setattr(
+        CompetitorCitationService, "_save_analysis", staticmethod(lambda *a: None)
+    )
+
+    results = await CompetitorCitationService.analyze_competitor_citations(
+        _DB(),
+        audit_id=None,
+        brand_name="Acme",
+        domain="acme.com",
+        competitor_domains=["globex.com", "initech.io", "umbrella.com"],
+        queries=list(responses),
+        llm_function=llm,
+    )
+
+    assert results["your_brand"]["mentions"] == 2
+    assert results["your_brand"]["avg_position"] == 1.5
+    assert [(c["domain"], c["mentions"]) for c in results["competitors"]] == [
+        ("globex.com", 2),
+        ("initech.io", 1),
+    ]
+    assert results["competitors"][0]["avg_position"] == 2
+    assert results["competitors"][1]["name"] == "initech"
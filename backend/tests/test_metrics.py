@@ -0,0 +1,161 @@
+import asyncio
+
+import pytest
+from app.core import metrics
+from app.core.config import settings
+from app.core.external_resilience import ExternalRequestError, run_external_call
+from app.models import Audit, AuditStatus
+
+
+@pytest.fixture(autouse=True)
+def _clean_registry():
+    metrics.REGISTRY.clear()
+    yield
+    metrics.REGISTRY.clear()
+
+
+def test_registry_renders_prometheus_text_format():
+    registry = metrics.MetricsRegistry()
+    requests = registry.counter("demo_requests_total", "Demo.", ("route",))
+    latency = registry.histogram("demo_seconds", "Demo.", buckets=(0.1, 1))
+    requests.inc(route='a"b')
+    requests.inc(2, route='a"b')
+    latency.observe(0.05)
+    latency.observe(3)
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE demo_requests_total counter" in lines
+    assert 'demo_requests_total{route="a\\"b"} 3' in lines
+    assert 'demo_seconds_bucket{le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{le="1"} 1' in lines
+    assert 'demo_seconds_bucket{le="+Inf"} 2' in lines
+    assert "demo_seconds_count 2" in lines
+    assert "demo_seconds_sum 3.05" in lines
+
+
+def test_metric_subclasses_must_implement_render_and_clear():
+    class _Gauge(metrics._Metric):
+        kind = "gauge"
+
+        def render(self):
+            return self._header()
+
+    with pytest.raises(TypeError):
+        _Gauge("test_gauge", "Incomplete metric", [])
+
+
+def test_stage_timer_records_outcome():
+    with metrics.stage_timer("crawl"):
+        pass
+    with pytest.raises(RuntimeError):
+        with metrics.stage_timer("crawl"):
+            raise RuntimeError("boom")
+
+    assert metrics.AUDIT_STAGE_SECONDS.snapshot(stage="crawl", outcome="ok")[0] == 1
+    assert metrics.AUDIT_STAGE_SECONDS.snapshot(stage="crawl", outcome="error")[0] == 1
+
+
+def test_llm_calls_are_labelled_by_prompt_scope():
+    @metrics.with_llm_prompt("report_generation")
+    async def _generate():
+        metrics.record_llm_call(
+            1.5, outcome="ok", prompt_tokens=100, completion_tokens=40
+        )
+        return metrics.current_llm_prompt()
+
+    assert asyncio.run(_generate()) == "report_generation"
+    assert metrics.current_llm_prompt() == "unlabeled"
+    assert metrics.LLM_TOKENS.value(prompt="report_generation", kind="completion") == 40
+    assert metrics.LLM_REQUEST_SECONDS.snapshot(
+        prompt="report_generation", outcome="ok"
+    ) == (1, 1.5)
+
+
+def test_external_calls_record_latency_by_service_and_outcome():
+    async def _ok():
+        return "ok"
+
+    async def _fail():
+        raise ValueError("down")
+
+    asyncio.run(run_external_call("serper-search", _ok))
+    with pytest.raises(ExternalRequestError):
+        asyncio.run(run_external_call("serper-search", _fail))
+
+    series = metrics.EXTERNAL_CALL_SECONDS
+    assert series.snapshot(service="serper-search", outcome="ok")[0] == 1
+    assert series.snapshot(service="serper-search", outcome="error")[0] == 1
+
+
+def test_session_flushes_are_timed(db_session):
+    db_session.add(
+        Audit(
+            url="https://metrics.example.com",
+            domain="metrics.example.com",
+            status=AuditStatus.PENDING,
+        )
+    )
+    db_session.flush()
+
+    assert metrics.DB_FLUSH_SECONDS.snapshot()[0] >= 1
+
+
+def test_metrics_endpoint_exposes_registry_and_honours_token(client, monkeypatch):
+    metrics.record_cache("pagespeed", hit=True)
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'cache_requests_total{cache="pagespeed",result="hit"} 1' in response.text
+
+    monkeypatch.setattr(settings, "METRICS_AUTH_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    authorized = client.get(
+        "/metrics", headers={"Authorization": "Bearer scrape-secret"}
+    )
+    assert authorized.status_code == 200
+
+
+def test_metrics_endpoint_requires_token_outside_development(client, monkeypatch):
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_AUTH_TOKEN", "scrape-secret")
+    authorized = client.get(
+        "/metrics", headers={"Authorization": "Bearer scrape-secret"}
+    )
+    assert authorized.status_code == 200
+
+
+def test_push_to_gateway_groups_by_pool_slot(monkeypatch):
+    import socket
+    import types
+
+    import billiard.process
+    import httpx
+
+    pushed = []
+    monkeypatch.setattr(settings, "METRICS_PUSHGATEWAY_URL", "http://pushgw:9091/")
+    monkeypatch.setattr(
+        httpx,
+        "put",
+        lambda url, **kwargs: pushed.append(url)
+        or httpx.Response(200, request=httpx.Request("PUT", url)),
+    )
+    monkeypatch.setattr(
+        billiard.process, "current_process", lambda: types.SimpleNamespace(index=1)
+    )
+
+    assert metrics.push_to_gateway(force=True) is True
+    # Un hijo reciclado en el mismo slot sobrescribe el grupo en vez de sumar uno.
+    assert metrics.push_to_gateway(force=True) is True
+    assert (
+        pushed
+        == [
+            f"http://pushgw:9091/metrics/job/celery_worker/instance/"
+            f"{socket.gethostname()}:slot1"
+        ]
+        * 2
+    )
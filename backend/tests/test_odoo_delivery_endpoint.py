@@ -387,7 +387,7 @@ def test_odoo_connections_assign_sync_and_drafts_flow(client, db_session, monkey
             "warnings": [],
         }
 
-    async def _fake_sync_audit(self, *, audit, connection):
+    async def _fake_sync_audit(self, *, audit, connection, full=False):
         return {
             "status": "completed",
             "counts_by_model": {"website.page": 4, "blog.post": 2},
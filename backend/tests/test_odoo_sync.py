@@ -0,0 +1,187 @@
+import asyncio
+
+from app.core.config import settings
+from app.integrations.odoo.sync import OdooSyncService
+from app.models import Audit, AuditStatus
+from app.models.odoo import OdooConnection, OdooDraftAction, OdooRecordSnapshot
+
+
+class _FakeOdooClient:
+    def __init__(self, records_by_model):
+        self.records_by_model = records_by_model
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fields_get(self, model_name, **_kwargs):
+        return {field: {"type": "char"} for field in ("id", "name", "website_url")} | {
+            "write_date": {"type": "datetime"},
+            "website_published": {"type": "boolean"},
+        }
+
+    async def search_read(self, model_name, *, domain, fields, limit, order):
+        self.calls.append((model_name, domain, limit))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        records = sorted(
+            self.records_by_model.get(model_name, []), key=lambda r: r["id"]
+        )
+        for field, op, value in domain:
+            if op == ">":
+                records = [r for r in records if r[field] > value]
+            elif op == ">=":
+                records = [r for r in records if r[field] >= value]
+        return [dict(record) for record in records[:limit]]
+
+    async def search(self, model_name, *, domain, limit, order):
+        self.calls.append((model_name, ["ids", *domain], limit))
+        ids = sorted(r["id"] for r in self.records_by_model.get(model_name, []))
+        for _field, _op, value in domain:
+            ids = [record_id for record_id in ids if record_id > value]
+        return ids[:limit]
+
+
+class _FakeClientContext:
+    def __init__(self, client):
+        self.client = client
+
+    async def __aenter__(self):
+        return self.client
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+def _product(record_id, write_date="2026-01-01 00:00:00"):
+    return {
+        "id": record_id,
+        "name": f"Product {record_id}",
+        "website_url": f"/shop/product-{record_id}",
+        "website_published": True,
+        "write_date": write_date,
+    }
+
+
+def _setup(db_session, monkeypatch, records_by_model):
+    audit = Audit(
+        url="https://shop.example.com",
+        domain="shop.example.com",
+        status=AuditStatus.COMPLETED,
+        user_id="test-user",
+        user_email="test@example.com",
+    )
+    connection = OdooConnection(
+        owner_user_id="test-user",
+        base_url="https://shop.example.com",
+        database="prod",
+        expected_email="ops@example.com",
+        api_key="encrypted",
+        capabilities={
+            "models": {name: {"available": True} for name in records_by_model}
+        },
+    )
+    db_session.add_all([audit, connection])
+    db_session.commit()
+
+    client = _FakeOdooClient(records_by_model)
+    service = OdooSyncService(db_session)
+
+    async def _fake_build_client(_connection):
+        return _FakeClientContext(client)
+
+    monkeypatch.setattr(service.connection_service, "build_client", _fake_build_client)
+    return service, client, audit, connection
+
+
+def test_sync_pages_through_all_records_and_fetches_models_concurrently(
+    db_session, monkeypatch
+):
+    monkeypatch.setattr(settings, "ODOO_SYNC_PAGE_SIZE", 100)
+    records = {
+        "product.template": [_product(i) for i in range(1, 251)],
+        "blog.post": [_product(i) for i in range(1, 4)],
+        "website.page": [_product(i) for i in range(1, 4)],
+    }
+    service, client, audit, connection = _setup(db_session, monkeypatch, records)
+
+    summary = asyncio.run(service.sync_audit(audit=audit, connection=connection))
+
+    assert summary["counts_by_model"]["product.template"] == 250
+    assert summary["sync_mode"] == "full"
+    product_calls = [call for call in client.calls if call[0] == "product.template"]
+    assert [call[1] for call in product_calls] == [
+        [],
+        [["id", ">", 100]],
+        [["id", ">", 200]],
+    ]
+    assert client.max_in_flight > 1
+    assert (
+        db_session.query(OdooRecordSnapshot)
+        .filter(OdooRecordSnapshot.audit_id == audit.id)
+        .count()
+        == 256
+    )
+
+
+def test_resync_only_fetches_records_changed_since_watermark(db_session, monkeypatch):
+    records = {"product.template": [_product(1), _product(2)]}
+    service, client, audit, connection = _setup(db_session, monkeypatch, records)
+    asyncio.run(service.sync_audit(audit=audit, connection=connection))
+
+    records["product.template"][1] = _product(2, write_date="2026-02-01 00:00:00")
+    records["product.template"].append(_product(3, write_date="2026-02-02 00:00:00"))
+    client.calls.clear()
+
+    summary = asyncio.run(service.sync_audit(audit=audit, connection=connection))
+
+    assert client.calls[0][1] == [["write_date", ">=", "2026-01-01 00:00:00"]]
+    assert summary["sync_mode"] == "incremental"
+    assert summary["counts_by_model"]["product.template"] == 3
+    assert summary["watermarks"]["product.template"] == "2026-02-02 00:00:00"
+    snapshots = (
+        db_session.query(OdooRecordSnapshot)
+        .filter(OdooRecordSnapshot.audit_id == audit.id)
+        .all()
+    )
+    assert sorted(s.odoo_record_id for s in snapshots) == ["1", "2", "3"]
+
+
+def test_resync_drops_snapshots_of_records_deleted_in_odoo(db_session, monkeypatch):
+    records = {"product.template": [_product(1), _product(2), _product(3)]}
+    service, client, audit, connection = _setup(db_session, monkeypatch, records)
+    asyncio.run(service.sync_audit(audit=audit, connection=connection))
+    deleted = (
+        db_session.query(OdooRecordSnapshot)
+        .filter(OdooRecordSnapshot.odoo_record_id == "2")
+        .one()
+    )
+    draft = OdooDraftAction(
+        connection_id=connection.id,
+        audit_id=audit.id,
+        snapshot_id=deleted.id,
+        action_key="meta:product-2",
+        draft_type="metadata",
+    )
+    db_session.add(draft)
+    db_session.commit()
+
+    del records["product.template"][1]
+    summary = asyncio.run(service.sync_audit(audit=audit, connection=connection))
+
+    assert summary["sync_mode"] == "incremental"
+    assert summary["removed_by_model"] == {"product.template": 1}
+    assert summary["counts_by_model"]["product.template"] == 2
+    assert "/shop/product-2" not in summary["mapped_audit_paths"]
+    remaining = db_session.query(OdooRecordSnapshot).all()
+    assert sorted(s.odoo_record_id for s in remaining) == ["1", "3"]
+    db_session.refresh(draft)
+    assert draft.snapshot_id is None
+
+    records["product.template"].append(_product(2))
+    summary = asyncio.run(
+        service.sync_audit(audit=audit, connection=connection, full=True)
+    )
+    assert summary["sync_mode"] == "full"
+    assert summary["counts_by_model"]["product.template"] == 3
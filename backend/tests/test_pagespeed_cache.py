@@ -0,0 +1,167 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from app.core.config import settings
+from app.core.external_resilience import SharedTokenBucket, TokenBucket
+from app.services import pagespeed_service as pagespeed_module
+from app.services.cache_service import cache
+from app.services.pagespeed_service import PageSpeedService, clear_pagespeed_cache
+
+
+def _result(url, strategy, hours_ago=0):
+    fetch_time = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+    return {
+        "url": url,
+        "strategy": strategy,
+        "performance_score": 90,
+        "metadata": {"fetch_time": fetch_time.isoformat()},
+    }
+
+
+@pytest.fixture
+def fake_psi(monkeypatch):
+    calls = []
+
+    async def _fake_analyze_url(url, api_key=None, strategy="mobile"):
+        calls.append((url, strategy))
+        await asyncio.sleep(0.2)
+        return _result(url, strategy)
+
+    monkeypatch.setattr(settings, "ENABLE_PAGESPEED", True, raising=False)
+    monkeypatch.setattr(settings, "PAGESPEED_CACHE_ENABLED", True, raising=False)
+    monkeypatch.setattr(cache, "enabled", False, raising=False)
+    monkeypatch.setattr(PageSpeedService, "analyze_url", _fake_analyze_url)
+    clear_pagespeed_cache()
+    yield calls
+    clear_pagespeed_cache()
+
+
+@pytest.mark.asyncio
+async def test_analyze_both_strategies_runs_mobile_and_desktop_concurrently(fake_psi):
+    started = time.perf_counter()
+    result = await PageSpeedService.analyze_both_strategies(
+        "https://example.com", api_key="key"
+    )
+    elapsed = time.perf_counter() - started
+
+    assert result["mobile"]["strategy"] == "mobile"
+    assert result["desktop"]["strategy"] == "desktop"
+    assert sorted(strategy for _, strategy in fake_psi) == ["desktop", "mobile"]
+    assert elapsed < 0.35
+
+
+@pytest.mark.asyncio
+async def test_second_audit_of_same_url_reuses_cached_runs(fake_psi):
+    await PageSpeedService.analyze_both_strategies("https://Example.com/#top", "key")
+    cached = await PageSpeedService.analyze_both_strategies(
+        "https://example.com/", "key"
+    )
+
+    assert len(fake_psi) == 2
+    assert cached["mobile"]["performance_score"] == 90
+
+    await PageSpeedService.analyze_both_strategies(
+        "https://example.com/", "key", force_refresh=True
+    )
+    assert len(fake_psi) == 4
+
+
+@pytest.mark.asyncio
+async def test_stale_cached_result_triggers_new_run(fake_psi):
+    url = "https://example.com/pricing"
+    PageSpeedService.store_cached_result(url, "mobile", _result(url, "mobile", 1))
+    assert PageSpeedService.get_cached_result(url, "mobile") is not None
+
+    pagespeed_module._local_result_cache[
+        pagespeed_module.pagespeed_cache_key(url, "mobile")
+    ] = _result(url, "mobile", hours_ago=30)
+    PageSpeedService.store_cached_result(
+        url, "desktop", {"error": "timeout", "strategy": "desktop"}
+    )
+
+    assert PageSpeedService.get_cached_result(url, "mobile") is None
+    assert PageSpeedService.get_cached_result(url, "desktop") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_audits_share_one_lighthouse_run(fake_psi):
+    first, second = await asyncio.gather(
+        PageSpeedService.analyze_both_strategies("https://example.com", "key"),
+        PageSpeedService.analyze_both_strategies("https://example.com", "key"),
+    )
+
+    assert len(fake_psi) == 2
+    assert first == second
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_calls_after_burst():
+    bucket = TokenBucket(rate=20, capacity=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.05, abs=0.01)
+
+    started = time.perf_counter()
+    await bucket.acquire()
+    assert time.perf_counter() - started >= 0.08
+
+
+class _FakeRedisBucket:
+    """Emula el script Lua del bucket compartido (estado por clave)."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.state = {}
+
+    def eval(self, script, numkeys, key, rate, capacity, requested):
+        tokens, updated_at = self.state.get(key, (capacity, self.now))
+        tokens = min(capacity, tokens + max(0, self.now - updated_at) * rate)
+        tokens -= requested
+        self.state[key] = (tokens, self.now)
+        return b"0" if tokens >= 0 else str(-tokens / rate).encode()
+
+
+def test_shared_token_bucket_spends_one_balance_across_processes():
+    redis_client = _FakeRedisBucket()
+    # Dos workers: cada uno con su bucket local, pero la misma clave en Redis.
+    worker_a = SharedTokenBucket(
+        "rate_limit:pagespeed", redis_client, TokenBucket(rate=2, capacity=2)
+    )
+    worker_b = SharedTokenBucket(
+        "rate_limit:pagespeed", redis_client, TokenBucket(rate=2, capacity=2)
+    )
+
+    assert worker_a.reserve() == 0
+    assert worker_b.reserve() == 0
+    assert worker_a.reserve() == pytest.approx(0.5)
+    assert worker_b.reserve() == pytest.approx(1.0)
+
+    redis_client.now += 2
+    assert worker_b.reserve() == 0
+
+
+def test_shared_token_bucket_falls_back_to_local_bucket_on_redis_error():
+    class _BrokenRedis:
+        def eval(self, *args):
+            raise ConnectionError("redis down")
+
+    bucket = SharedTokenBucket(
+        "rate_limit:pagespeed", _BrokenRedis(), TokenBucket(rate=20, capacity=1)
+    )
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.05, abs=0.01)
+
+
+def test_pagespeed_rate_limiter_uses_shared_redis_client(monkeypatch):
+    redis_client = _FakeRedisBucket()
+    monkeypatch.setattr(cache, "enabled", True, raising=False)
+    monkeypatch.setattr(cache, "redis_client", redis_client, raising=False)
+
+    limiter = pagespeed_module.pagespeed_rate_limiter()
+
+    assert limiter.reserve() == 0
+    assert "rate_limit:pagespeed" in redis_client.state
@@ -0,0 +1,166 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from app.core.config import settings
+from app.models import Audit, AuditedPage, AuditStatus
+from app.services.cache_service import cache
+from app.services.pagespeed_job_service import PageSpeedJobService
+from app.services.pagespeed_sampling_service import PageSpeedSamplingService
+from app.services.pagespeed_service import PageSpeedService
+
+
+def _payload(url, strategy, lcp, score=80):
+    return {
+        "url": url,
+        "strategy": strategy,
+        "performance_score": score,
+        "core_web_vitals": {"lcp": lcp, "cls": 0.1, "fcp": 900, "ttfb": 200},
+        "metrics": {"tbt": 150},
+        "metadata": {"fetch_time": datetime.now(timezone.utc).isoformat()},
+    }
+
+
+def test_aggregate_reports_percentiles_per_path_group():
+    urls = [
+        "https://example.com/",
+        "https://example.com/blog/a",
+        "https://example.com/blog/b",
+        "https://example.com/blog/c",
+    ]
+    results = {
+        "mobile": {
+            urls[0]: _payload(urls[0], "mobile", 1000),
+            urls[1]: _payload(urls[1], "mobile", 2000),
+            urls[2]: _payload(urls[2], "mobile", 3000),
+            urls[3]: {"error": "timeout", "strategy": "mobile"},
+        },
+        "desktop": {},
+    }
+
+    summary = PageSpeedSamplingService.aggregate(results, urls)
+
+    blog = summary["strategies"]["mobile"]["/blog/*"]
+    assert blog["samples"] == 2
+    assert blog["lcp"] == {"p50": 2500.0, "p75": 2750.0, "p90": 2900.0}
+    assert summary["strategies"]["mobile"]["*"]["lcp"]["p50"] == 2000.0
+    assert summary["strategies"]["mobile"]["/"]["samples"] == 1
+    assert summary["completed_runs"] == 4
+    assert summary["failed_runs"] == 1
+    assert summary["total_runs"] == 8
+
+
+def test_select_sample_urls_keeps_audited_url_first():
+    sample = PageSpeedSamplingService.select_sample_urls(
+        "https://example.com",
+        [
+            "https://example.com",
+            "https://example.com/products/shoe",
+            "https://example.com/category/shoes",
+            "https://example.com/about",
+        ],
+        3,
+    )
+
+    assert sample[0] == "https://example.com"
+    assert len(sample) == 3
+
+
+@pytest.mark.asyncio
+async def test_run_sample_schedules_urls_concurrently(monkeypatch):
+    active = 0
+    peak = 0
+
+    async def _fake_cached(url, api_key=None, strategy="mobile", force_refresh=False):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        return _payload(url, strategy, 1500)
+
+    monkeypatch.setattr(PageSpeedService, "analyze_url_cached", _fake_cached)
+    seen = []
+
+    async def _on_result(url, strategy, payload):
+        seen.append((url, strategy))
+
+    urls = [f"https://example.com/p{i}" for i in range(3)]
+    results = await PageSpeedSamplingService.run_sample(
+        urls, "key", concurrency=4, on_result=_on_result
+    )
+
+    assert peak == 4
+    assert len(seen) == 6
+    assert set(results["desktop"]) == set(urls)
+
+
+@pytest.mark.asyncio
+async def test_execute_job_stores_site_sample_and_streams_progress(
+    db_session, monkeypatch
+):
+    audit = Audit(
+        url="https://example-sampling.com/",
+        domain="example-sampling.com",
+        status=AuditStatus.COMPLETED,
+        user_id="test-user",
+        user_email="test@example.com",
+    )
+    db_session.add(audit)
+    db_session.commit()
+    db_session.refresh(audit)
+    for path in ("products/a", "blog/post"):
+        db_session.add(
+            AuditedPage(audit_id=audit.id, url=f"https://example-sampling.com/{path}")
+        )
+    db_session.commit()
+
+    job = PageSpeedJobService.queue_job(
+        db_session,
+        audit=audit,
+        requested_by_user_id="test-user",
+        strategy="both",
+        force_refresh=False,
+    )
+
+    async def _fake_cached(url, api_key=None, strategy="mobile", force_refresh=False):
+        return _payload(url, strategy, 2000)
+
+    progress = []
+    original_publish = PageSpeedJobService.publish_status_event
+
+    def _spy_publish(db, audit, **kwargs):
+        if kwargs.get("pagespeed_progress") is not None:
+            progress.append(kwargs["pagespeed_progress"])
+        return original_publish(db, audit, **kwargs)
+
+    async def _no_analysis(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(settings, "DEBUG", True, raising=False)
+    monkeypatch.setattr(settings, "ENABLE_PAGESPEED", True, raising=False)
+    monkeypatch.setattr(settings, "GOOGLE_PAGESPEED_API_KEY", "key", raising=False)
+    monkeypatch.setattr(settings, "PAGESPEED_SAMPLE_SIZE", 3, raising=False)
+    monkeypatch.setattr(cache, "enabled", False, raising=False)
+    monkeypatch.setattr(PageSpeedService, "analyze_url_cached", _fake_cached)
+    monkeypatch.setattr(
+        PageSpeedJobService, "publish_status_event", staticmethod(_spy_publish)
+    )
+    monkeypatch.setattr(
+        "app.services.pipeline_service.PipelineService.generate_pagespeed_analysis",
+        _no_analysis,
+    )
+    monkeypatch.setattr(
+        "app.services.pagespeed_job_service.PageSpeedJobService._notify_pagespeed_completed_if_configured",
+        _no_analysis,
+    )
+
+    job = await PageSpeedJobService.execute_job(db_session, job.id)
+
+    assert job.status == "completed"
+    db_session.refresh(audit)
+    assert audit.pagespeed_data["mobile"]["url"] == "https://example-sampling.com/"
+    site_sample = audit.pagespeed_data["site_sample"]
+    assert len(site_sample["sampled_urls"]) == 3
+    assert site_sample["strategies"]["desktop"]["*"]["samples"] == 3
+    assert [p["completed_runs"] for p in progress] == [1, 2, 3, 4, 5, 6]
@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from app.services import create_pdf as create_pdf_module
 from app.services.pdf_service import PDFService
+from app.services.report_artifacts import ReportArtifacts
 
 
 def _build_page(page_id: int = 1):
@@ -101,16 +102,42 @@ def test_create_comprehensive_pdf_prefers_page_files_and_ignores_noise(
     assert "noise.json" not in page_hints
 
 
+def test_render_comprehensive_pdf_from_memory_writes_only_the_pdf(tmp_path):
+    artifacts = ReportArtifacts(
+        "audit_100",
+        {
+            "ag2_report.md": "# Report\n\nContenido",
+            "fix_plan.json": [],
+            "aggregated_summary.json": {"url": "https://example.com"},
+            "pages/page_1.json": {"url": "https://example.com", "ok": True},
+            "competitors/competitor_1.json": {
+                "url": "https://competitor.example.com",
+                "domain": "competitor.example.com",
+            },
+        },
+    )
+    output_path = tmp_path / "report.pdf"
+
+    result = create_pdf_module.render_comprehensive_pdf(artifacts, str(output_path))
+
+    assert result == str(output_path)
+    assert output_path.read_bytes().startswith(b"%PDF")
+    assert [p.name for p in tmp_path.iterdir()] == ["report.pdf"]
+
+
 @pytest.mark.asyncio
 async def test_generate_comprehensive_pdf_uploads_to_supabase(monkeypatch):
     audit_id = 42
 
-    def _fake_create_pdf(folder_path: str, metadata=None):
-        output = Path(folder_path) / "Reporte_Consolidado_audit_42.pdf"
-        output.write_bytes(b"%PDF-1.4 new")
+    rendered = {}
+
+    def _fake_render_pdf(artifacts, output_path: str, metadata=None):
+        rendered["artifacts"] = artifacts
+        Path(output_path).write_bytes(b"%PDF-1.4 new")
+        return output_path
 
     monkeypatch.setattr(
-        "app.services.pdf_service.create_comprehensive_pdf", _fake_create_pdf
+        "app.services.pdf_service.render_comprehensive_pdf", _fake_render_pdf
     )
     monkeypatch.setattr(
         "app.services.pdf_service.PDFService._upload_pdf_to_supabase",
@@ -137,6 +164,12 @@ async def test_generate_comprehensive_pdf_uploads_to_supabase(monkeypatch):
 
     assert pdf_path == "supabase://audits/42/report.pdf"
     assert getattr(audit, "_generated_pdf_size_bytes", None) == 17
+    artifacts = rendered["artifacts"]
+    assert artifacts.names("pages/page_*.json") == ["pages/page_1.json"]
+    assert artifacts.read("ag2_report.md").startswith("# Report")
+    assert artifacts.read("competitors/competitor_1.json")["domain"] == (
+        "competitor.example.com"
+    )
 
 
 @pytest.mark.asyncio
@@ -152,7 +185,7 @@ async def test_generate_comprehensive_pdf_reraises_renderer_failure(monkeypatch)
         raise RuntimeError("renderer exploded")
 
     monkeypatch.setattr(
-        "app.services.pdf_service.create_comprehensive_pdf",
+        "app.services.pdf_service.render_comprehensive_pdf",
         _fail_create_pdf,
     )
 
@@ -0,0 +1,278 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.config import settings
+from app.models import Audit, AuditStatus, Report
+from app.services import pdf_job_service
+from app.services.pdf_service import PDFService
+from app.services.report_artifacts import ReportArtifacts
+from app.services.supabase_service import SupabaseService
+
+METADATA = {"title": "Reporte", "author": "Auditor GEO"}
+
+
+def _artifacts(markdown="# Reporte\n\nContenido"):
+    return ReportArtifacts(
+        "audit_1",
+        {
+            "ag2_report.md": markdown,
+            "fix_plan.json": [{"issue": "missing h1", "priority": "HIGH"}],
+            "pages/page_1.json": {"url": "https://example.com", "score": 80},
+        },
+    )
+
+
+def test_render_key_is_stable_and_tracks_inputs(monkeypatch):
+    key = PDFService._compute_pdf_render_key("sig-1", _artifacts(), METADATA)
+
+    assert key == PDFService._compute_pdf_render_key("sig-1", _artifacts(), METADATA)
+    assert key != PDFService._compute_pdf_render_key("sig-2", _artifacts(), METADATA)
+    assert key != PDFService._compute_pdf_render_key(
+        "sig-1", _artifacts("# Otro reporte"), METADATA
+    )
+    assert PDFService._compute_pdf_render_key("", _artifacts(), METADATA) == ""
+
+    monkeypatch.setattr(PDFService, "PDF_RENDERER_VERSION", "create_pdf-next")
+    assert key != PDFService._compute_pdf_render_key("sig-1", _artifacts(), METADATA)
+
+
+def test_cached_render_requires_matching_key_and_stored_object(db_session, monkeypatch):
+    audit = Audit(
+        url="https://example.com",
+        domain="example.com",
+        status=AuditStatus.COMPLETED,
+    )
+    db_session.add(audit)
+    db_session.flush()
+    report = Report(
+        audit_id=audit.id,
+        report_type="PDF",
+        file_path=f"supabase://audits/{audit.id}/report.pdf",
+        file_size=2048,
+    )
+    db_session.add(report)
+    PDFService._save_report_marker(
+        audit.id, PDFService.PDF_RENDER_KEY_REPORT_TYPE, "key-1", db=db_session
+    )
+
+    checked_paths = []
+
+    def _exists(bucket, path):
+        checked_paths.append(path)
+        return stored
+
+    monkeypatch.setattr(SupabaseService, "object_exists", _exists)
+
+    stored = True
+    assert PDFService._find_cached_pdf_render(db_session, audit.id, "key-1") is report
+    assert checked_paths == [f"audits/{audit.id}/report.pdf"]
+    assert PDFService._find_cached_pdf_render(db_session, audit.id, "key-2") is None
+
+    stored = False
+    assert PDFService._find_cached_pdf_render(db_session, audit.id, "key-1") is None
+
+    # Un reemplazo fuera del cache invalida la clave guardada.
+    stored = True
+    PDFService._save_report_marker(
+        audit.id, PDFService.PDF_RENDER_KEY_REPORT_TYPE, "", db=db_session
+    )
+    assert PDFService._find_cached_pdf_render(db_session, audit.id, "key-1") is None
+
+
+def test_wait_for_lock_coalesces_until_holder_releases(monkeypatch):
+    attempts = []
+
+    def _acquire(audit_id):
+        attempts.append(audit_id)
+        if len(attempts) < 3:
+            return False, None, "redis"
+        return True, "token", "redis"
+
+    monkeypatch.setattr(pdf_job_service, "acquire_pdf_generation_lock", _acquire)
+
+    acquired, token, mode = asyncio.run(
+        pdf_job_service.wait_for_pdf_generation_lock(7, 5, poll_seconds=0)
+    )
+
+    assert (acquired, token, mode) == (True, "token", "redis")
+    assert attempts == [7, 7, 7]
+
+
+def test_wait_for_lock_gives_up_when_lock_backend_is_unavailable(monkeypatch):
+    attempts = []
+
+    def _acquire(audit_id):
+        attempts.append(audit_id)
+        return False, None, "unavailable"
+
+    monkeypatch.setattr(pdf_job_service, "acquire_pdf_generation_lock", _acquire)
+
+    acquired, _token, mode = asyncio.run(
+        pdf_job_service.wait_for_pdf_generation_lock(7, 5, poll_seconds=0)
+    )
+
+    assert not acquired and mode == "unavailable"
+    assert attempts == [7]
+
+
+def test_comprehensive_pdf_renders_prebuilt_artifacts(monkeypatch):
+    from app.services import pdf_service
+
+    audit = Audit(id=1, url="https://example.com", domain="example.com")
+    prebuilt = _artifacts()
+    rendered = []
+
+    def _render(artifacts, output_path, metadata=None):
+        rendered.append(artifacts)
+        with open(output_path, "wb") as f:
+            f.write(b"%PDF-1.4")
+        return output_path
+
+    def _rebuild(**_kwargs):
+        raise AssertionError("artifacts were already built for the render key")
+
+    monkeypatch.setattr(pdf_service, "render_comprehensive_pdf", _render)
+    monkeypatch.setattr(PDFService, "_build_report_artifacts", staticmethod(_rebuild))
+    monkeypatch.setattr(
+        PDFService,
+        "_upload_pdf_to_supabase",
+        staticmethod(lambda audit_id, pdf_file_path: ("supabase://audits/1", 8)),
+    )
+
+    path = asyncio.run(
+        PDFService.generate_comprehensive_pdf(
+            audit=audit, pages=[], competitors=[], artifacts=prebuilt
+        )
+    )
+
+    assert path == "supabase://audits/1"
+    assert rendered == [prebuilt]
+
+
+def test_unkeyed_render_clears_marker_so_next_request_rerenders(
+    db_session, monkeypatch
+):
+    audit_row = Audit(
+        url="https://example.com",
+        domain="example.com",
+        status=AuditStatus.COMPLETED,
+    )
+    db_session.add(audit_row)
+    db_session.flush()
+    db_session.add(
+        Report(
+            audit_id=audit_row.id,
+            report_type="PDF",
+            file_path=f"supabase://audits/{audit_row.id}/report.pdf",
+            file_size=2048,
+        )
+    )
+    db_session.flush()
+
+    audit = MagicMock()
+    audit.id = audit_row.id
+    audit.url = "https://example.com"
+    audit.target_audit = {"market": "argentina", "geo_score": 72}
+    audit.external_intelligence = {
+        "category": "Education",
+        "market": "argentina",
+        "queries_to_run": ["coding bootcamp argentina"],
+    }
+    audit.search_results = {}
+    audit.competitor_audits = []
+    audit.pagespeed_data = {
+        "mobile": {"metadata": {"fetch_time": "2099-01-01T00:00:00Z"}}
+    }
+    audit.keywords = []
+    audit.backlinks = []
+    audit.rank_trackings = []
+    audit.llm_visibilities = []
+    audit.ai_content_suggestions = []
+    audit.report_markdown = "Persisted report content. " * 10
+    audit.fix_plan = []
+    context = {"signature": "sig-1"}
+
+    monkeypatch.setattr(SupabaseService, "object_exists", lambda bucket, path: True)
+    monkeypatch.setattr(settings, "PDF_ALLOW_DETERMINISTIC_FALLBACK", True)
+
+    def _generate(force_report_refresh=False):
+        return asyncio.run(
+            PDFService.generate_pdf_with_complete_context(
+                db_session,
+                audit.id,
+                force_report_refresh=force_report_refresh,
+                return_details=True,
+            )
+        )
+
+    with patch(
+        "app.services.audit_service.AuditService.get_audit", return_value=audit
+    ), patch(
+        "app.services.audit_service.AuditService.get_audited_pages", return_value=[]
+    ), patch(
+        "app.services.audit_service.CompetitorService.get_competitors",
+        return_value=[],
+    ), patch(
+        "app.services.keyword_service.KeywordService.research_keywords",
+        new_callable=AsyncMock,
+        return_value=[],
+    ), patch(
+        "app.services.backlink_service.BacklinkService.analyze_backlinks",
+        new_callable=AsyncMock,
+        return_value=[],
+    ), patch(
+        "app.services.rank_tracker_service.RankTrackerService.track_rankings",
+        new_callable=AsyncMock,
+        return_value=[],
+    ), patch(
+        "app.services.llm_visibility_service.LLMVisibilityService.check_visibility",
+        new_callable=AsyncMock,
+        return_value=[],
+    ), patch(
+        "app.services.ai_content_service.AIContentService.generate_suggestions",
+        new_callable=AsyncMock,
+        return_value=[],
+    ), patch(
+        "app.services.product_intelligence_service.ProductIntelligenceService.analyze",
+        new_callable=AsyncMock,
+        side_effect=Exception("skip product intelligence during test"),
+    ), patch(
+        "app.services.pipeline_service.PipelineService.generate_report",
+        new_callable=AsyncMock,
+        side_effect=RuntimeError("LLM unavailable"),
+    ), patch(
+        "app.services.pdf_service.PDFService._compute_report_context_signature",
+        side_effect=lambda *args, **kwargs: context["signature"],
+    ), patch(
+        "app.services.pdf_service.PDFService._load_saved_report_signature",
+        return_value="sig-1",
+    ), patch(
+        "app.services.pdf_service.PDFService.generate_comprehensive_pdf",
+        new_callable=AsyncMock,
+        return_value=f"supabase://audits/{audit.id}/report.pdf",
+    ) as mock_render:
+        first = _generate()
+        assert first["generation_mode"] == "report_cache_hit"
+        assert mock_render.await_count == 1
+        assert _generate()["pdf_render_cache_hit"] is True
+        assert mock_render.await_count == 1
+
+        # Refresh forzado con el contexto cambiado y el LLM caído: se sube un
+        # PDF determinístico transitorio sobre el mismo objeto.
+        context["signature"] = "sig-2"
+        forced = _generate(force_report_refresh=True)
+        assert forced["generation_mode"] == "deterministic_fallback_transient"
+        assert mock_render.await_count == 2
+
+        # La misma clave que el primer render ya no sirve el PDF transitorio.
+        context["signature"] = "sig-1"
+        again = _generate()
+
+    assert again["pdf_render_cache_hit"] is False
+    assert mock_render.await_count == 3
+    assert (
+        PDFService._load_report_marker(
+            audit.id, PDFService.PDF_RENDER_KEY_REPORT_TYPE, db=db_session
+        )
+        != ""
+    )
@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+
+from app.services import create_pdf as create_pdf_module
+from app.services.pdf_render_pool import PDFRenderPool, PDFRenderPoolError
+from app.services.report_artifacts import ReportArtifacts
+
+
+def _artifacts():
+    return ReportArtifacts(
+        "audit_pool",
+        {
+            "ag2_report.md": "# Report\n\n| Issue | Pages |\n|---|---:|\n| H1 | 3 |\n",
+            "fix_plan.json": [],
+            "pages/page_1.json": {"url": "https://example.com", "ok": True},
+        },
+    )
+
+
+def test_render_pool_renders_pdf_in_worker_process(tmp_path):
+    pool = PDFRenderPool(max_workers=1, max_tasks_per_worker=2, timeout_seconds=120)
+    output_path = tmp_path / "report.pdf"
+    try:
+        result = pool.render(_artifacts(), str(output_path))
+    finally:
+        pool.shutdown()
+
+    assert result == str(output_path)
+    assert output_path.read_bytes().startswith(b"%PDF")
+
+
+def test_render_pool_falls_back_inline_when_children_are_not_allowed(
+    tmp_path, monkeypatch
+):
+    pool = PDFRenderPool(max_workers=1)
+
+    def _no_children():
+        raise AssertionError("daemonic processes are not allowed to have children")
+
+    monkeypatch.setattr(pool, "_create_executor", _no_children)
+    output_path = tmp_path / "inline.pdf"
+
+    assert pool.render(_artifacts(), str(output_path)) == str(output_path)
+    assert output_path.read_bytes().startswith(b"%PDF")
+    assert pool._get_executor() is None
+
+
+def _slow_render_job(artifacts, output_path, metadata=None):
+    # "hang" simula un render colgado; el otro queda en vuelo en su primer
+    # intento y solo termina si se reintenta.
+    if "hang" in output_path:
+        time.sleep(60)
+    attempt_marker = f"{output_path}.attempt"
+    if not os.path.exists(attempt_marker):
+        open(attempt_marker, "w").close()
+        time.sleep(60)
+    with open(output_path, "wb") as fh:
+        fh.write(b"%PDF-1.4 ok")
+    return output_path
+
+
+def test_render_timeout_retries_innocent_inflight_render(tmp_path, monkeypatch):
+    from app.services import pdf_render_pool
+
+    # spawn: el hijo importa este módulo para deserializar el job.
+    monkeypatch.setattr(pdf_render_pool, "_render_job", _slow_render_job)
+    pool = PDFRenderPool(max_workers=2, start_method="spawn", timeout_seconds=5)
+    results = {}
+
+    def _render(name):
+        try:
+            results[name] = pool.render(_artifacts(), str(tmp_path / f"{name}.pdf"))
+        except Exception as e:  # noqa: BLE001
+            results[name] = e
+
+    hung = threading.Thread(target=_render, args=("hang",))
+    innocent = threading.Thread(target=_render, args=("ok",))
+    try:
+        hung.start()
+        time.sleep(0.5)
+        innocent.start()
+        hung.join(timeout=60)
+        innocent.join(timeout=60)
+    finally:
+        pool.shutdown(wait=False)
+
+    assert isinstance(results["hang"], PDFRenderPoolError)
+    assert results["ok"] == str(tmp_path / "ok.pdf")
+    assert (tmp_path / "ok.pdf").read_bytes() == b"%PDF-1.4 ok"
+
+
+def test_markdown_blocks_are_parsed_once_per_content():
+    create_pdf_module.clear_layout_caches()
+    markdown = "# Title\n\n## Sub\n\n| a | b |\n|:-:|--:|\n| 1 | 2 |\n"
+    pdf = create_pdf_module.PDFReport()
+
+    assert pdf.count_markdown_headings(markdown) == 2
+    pdf.add_page()
+    pdf.write_markdown_text(markdown)
+    pdf.write_markdown_text(markdown)
+
+    cache = create_pdf_module._MARKDOWN_BLOCK_CACHE
+    assert (cache.misses, cache.hits) == (1, 2)
+    assert ("table_sep", (":-:", "--:"), ("C", "R")) in pdf.markdown_blocks(markdown)
+    assert len(create_pdf_module._TABLE_LAYOUT_CACHE) > 0
+
+
+def test_render_pool_size_can_be_pinned_per_process(monkeypatch):
+    from app.core.config import settings
+    from app.services import pdf_render_pool
+
+    monkeypatch.setattr(settings, "PDF_RENDER_POOL_WORKERS", 4)
+    monkeypatch.setattr(pdf_render_pool, "_pool", None)
+    monkeypatch.setattr(pdf_render_pool, "_pool_workers", None)
+
+    assert pdf_render_pool.get_render_pool().max_workers == 4
+
+    # Lo que hace worker_process_init en cada hijo prefork de Celery.
+    pdf_render_pool.set_render_pool_workers(1)
+    monkeypatch.setattr(pdf_render_pool, "_pool", None)
+    assert pdf_render_pool.get_render_pool().max_workers == 1
@@ -1,3 +1,5 @@
+import json
+
 import sqlalchemy as sa
 from app.core.config import settings
 from app.core.database import run_migrations_to_head
@@ -68,3 +70,61 @@ def test_runtime_migration_upgrades_existing_odoo_draft_actions_table(
 
     assert getattr(columns["action_key"]["type"], "length", None) == 500
     assert getattr(columns["target_path"]["type"], "length", None) == 2048
+
+
+def test_runtime_migration_moves_page_audits_out_of_target_audit(tmp_path, monkeypatch):
+    database_path = tmp_path / "runtime-schema-pages.sqlite"
+    database_url = f"sqlite:///{database_path.as_posix()}"
+
+    monkeypatch.setattr(settings, "DATABASE_URL", database_url, raising=False)
+    run_migrations_to_head(database_url)
+
+    target_audit = {
+        "url": "https://example.com",
+        "_individual_page_audits": [
+            {
+                "index": 0,
+                "url": "https://example.com/about",
+                "data": {"structure": {"h1_check": {"status": "pass"}}},
+            }
+        ],
+    }
+    engine = create_engine(database_url)
+    try:
+        with engine.begin() as connection:
+            connection.execute(
+                sa.text(
+                    "INSERT INTO audits (id, url, status, target_audit) "
+                    "VALUES (1, 'https://example.com', 'COMPLETED', :target_audit)"
+                ),
+                {"target_audit": json.dumps(target_audit)},
+            )
+            connection.execute(
+                sa.text("UPDATE alembic_version SET version_num = :version_num"),
+                {"version_num": "0003_ai_content_strategy_runs"},
+            )
+    finally:
+        engine.dispose()
+
+    run_migrations_to_head(database_url)
+
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as connection:
+            stored_target = json.loads(
+                connection.execute(
+                    sa.text("SELECT target_audit FROM audits WHERE id = 1")
+                ).scalar_one()
+            )
+            pages = connection.execute(
+                sa.text("SELECT url, path, h1_score FROM audited_pages")
+            ).all()
+    finally:
+        engine.dispose()
+
+    assert "_individual_page_audits" not in stored_target
+    assert stored_target["url"] == "https://example.com"
+    assert [(row.url, row.path) for row in pages] == [
+        ("https://example.com/about", "/about")
+    ]
+    assert pages[0].h1_score == 100
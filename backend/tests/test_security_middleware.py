@@ -282,6 +282,27 @@ class TestFullMiddlewareStack:
         # 10 health checks should complete quickly
         assert elapsed < 2.0  # Less than 2 seconds
 
+    def test_streaming_response_passes_through_unbuffered(self, app):
+        """SSE-style streams keep their chunks and still get stack headers"""
+        from fastapi.responses import StreamingResponse
+
+        async def events():
+            for i in range(3):
+                yield f"data: {i}\n\n"
+
+        @app.get("/api/v1/stream")
+        async def stream():
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        with TestClient(app) as client:
+            with client.stream("GET", "/api/v1/stream") as response:
+                chunks = list(response.iter_text())
+
+        assert "".join(chunks) == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert "X-Response-Time" in response.headers
+        assert "X-RateLimit-Bucket" in response.headers
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,168 @@
+import asyncio
+import json
+
+import pytest
+from app.core.config import settings
+from app.services.pipeline_service import PipelineService, run_initial_audit
+from app.services.summary_aggregator import SummaryAggregator
+
+
+def _summary(url, h1="pass", author="pass", price=None, semantic=80.0):
+    raw_jsonld = []
+    if price is not None:
+        raw_jsonld.append(
+            json.dumps(
+                {"@type": "Product", "offers": {"price": price, "priceCurrency": "ARS"}}
+            )
+        )
+    return {
+        "url": url,
+        "status": 200,
+        "generated_at": "2026-01-01T00:00:00Z",
+        "structure": {
+            "h1_check": {"status": h1, "details": {"example": f"H1 {url}", "count": 1}},
+            "header_hierarchy": {"issues": []},
+            "semantic_html": {"score_percent": semantic},
+            "list_usage": {"count": 1},
+            "table_usage": {"count": 0},
+        },
+        "content": {
+            "fragment_clarity": {"details": "long_paragraphs=0"},
+            "conversational_tone": {"score": 5},
+            "question_targeting": {"status": "warn"},
+            "text_sample": "texto",
+        },
+        "eeat": {
+            "author_presence": {"status": author},
+            "content_freshness": {"dates_found": []},
+            "citations_and_sources": {"external_links": 2, "authoritative_links": 1},
+        },
+        "schema": {
+            "schema_presence": {"status": "present" if raw_jsonld else "missing"},
+            "schema_types": ["Product"] if raw_jsonld else [],
+            "raw_jsonld": raw_jsonld,
+        },
+    }
+
+
+def test_out_of_order_pages_match_batch_aggregate():
+    summaries = [
+        _summary("https://shop.example/", h1="fail"),
+        _summary("https://shop.example/p/1", price=10),
+        _summary("https://www.shop.example/p/2?ref=x", author="fail", price="12,5"),
+    ]
+    streamed = SummaryAggregator("https://shop.example")
+    for position in (2, 0, 1):
+        streamed.add(summaries[position], position=position)
+
+    batch = PipelineService._aggregate_summaries(summaries, "https://shop.example")
+    aggregate = streamed.aggregate()
+
+    assert aggregate == batch
+    assert aggregate["audited_page_paths"] == ["/", "/p/1", "/p/2"]
+    assert aggregate["structure"]["h1_check"]["status"] == "fail"
+    assert aggregate["eeat"]["author_presence"]["pages_missing_author"] == ["/p/2"]
+    assert streamed.first_summary is summaries[0]
+
+
+def test_site_metrics_count_each_url_once():
+    aggregator = SummaryAggregator("https://shop.example")
+    aggregator.add(_summary("https://shop.example/p/1", price=10, semantic=60.0))
+    aggregator.add(_summary("https://shop.example/p/1/", price=99, semantic=0.0))
+    aggregator.add(_summary("https://shop.example/category/x", semantic=80.0))
+
+    metrics = aggregator.site_metrics()
+
+    assert metrics == PipelineService._compute_site_metrics(
+        [
+            _summary("https://shop.example/p/1", price=10, semantic=60.0),
+            _summary("https://shop.example/category/x", semantic=80.0),
+        ]
+    )
+    assert metrics["pages_analyzed"] == 2
+    assert metrics["avg_price"] == 10.0
+    assert metrics["price_currency"] == "ARS"
+    assert metrics["product_page_count"] == 1
+    assert metrics["category_page_count"] == 1
+    assert len(aggregator) == 3
+
+
+@pytest.mark.asyncio
+async def test_run_initial_audit_streams_pages_in_completion_order(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_CRAWL_PAGES", 10)
+    monkeypatch.setattr(settings, "MAX_AUDIT_PAGES", 10)
+    urls = [f"https://shop.example/p/{i}" for i in range(1, 4)]
+
+    async def crawler(base_url, max_pages):
+        return urls
+
+    async def audit_page(url):
+        # La primera URL termina última.
+        await asyncio.sleep(0.03 * (4 - int(url.rsplit("/", 1)[1])))
+        return _summary(url)
+
+    result = await run_initial_audit(
+        url="https://shop.example/",
+        target_audit=_summary("https://shop.example/"),
+        audit_id=1,
+        llm_function=None,
+        crawler_service=crawler,
+        audit_local_service=audit_page,
+        enable_llm_external_intel=False,
+    )
+
+    target = result["target_audit"]
+    assert target["audited_page_paths"] == ["/", "/p/1", "/p/2", "/p/3"]
+    assert target["site_metrics"]["pages_analyzed"] == 4
+    assert [page["url"] for page in result["page_audits"]] == [
+        "https://shop.example/",
+        *urls,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_initial_audit_aggregates_shard_records_like_summaries():
+    target = _summary("https://shop.example/", h1="fail")
+    pages = [
+        _summary("https://shop.example/p/1", price=10),
+        _summary("https://shop.example/p/2", author="fail", price=12),
+        _summary("https://shop.example/category/x"),
+    ]
+    shard_aggregator = SummaryAggregator("https://shop.example/")
+    shards = [
+        {
+            "records": [
+                shard_aggregator.page_record(summary, position)
+                for position, summary in chunk
+            ],
+            "sample": chunk[0][1],
+        }
+        for chunk in ([(1, pages[0]), (2, pages[1])], [(3, pages[2])])
+    ]
+    # Los registros viajan como JSON por el result backend.
+    shards = json.loads(json.dumps(shards))
+
+    async def _run(prefetched):
+        return await run_initial_audit(
+            url="https://shop.example/",
+            target_audit=json.loads(json.dumps(target)),
+            audit_id=1,
+            llm_function=None,
+            enable_llm_external_intel=False,
+            prefetched_pages=prefetched,
+        )
+
+    from_summaries = await _run({"crawled_urls": [], "summaries": pages})
+    from_records = await _run({"crawled_urls": [], "shards": list(reversed(shards))})
+
+    assert from_records["target_audit"] == from_summaries["target_audit"]
+    assert from_records["target_audit"]["audited_page_paths"] == [
+        "/",
+        "/p/1",
+        "/p/2",
+        "/category/x",
+    ]
+    # Las páginas de los shards ya están persistidas: solo vuelve el objetivo.
+    assert [page["url"] for page in from_records["page_audits"]] == [
+        "https://shop.example/"
+    ]
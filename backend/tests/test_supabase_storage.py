@@ -0,0 +1,130 @@
+import httpx
+import pytest
+from app.core.config import settings
+from app.services import supabase_service
+from app.services.supabase_service import SupabaseService
+
+
+class _FakeBucket:
+    def __init__(self):
+        self.signed_calls = []
+        self.uploads = []
+
+    def create_signed_url(self, path, expiry_seconds):
+        self.signed_calls.append((path, expiry_seconds))
+        return {
+            "signedURL": f"https://x.supabase.co/sign/{path}?n={len(self.signed_calls)}"
+        }
+
+    def upload(self, path, file, file_options):
+        self.uploads.append((path, type(file).__name__, file.read()))
+
+
+@pytest.fixture
+def fake_bucket(monkeypatch):
+    bucket = _FakeBucket()
+
+    class _Storage:
+        def from_(self, _name):
+            return bucket
+
+    class _Client:
+        storage = _Storage()
+
+    monkeypatch.setattr(supabase_service, "SUPABASE_AVAILABLE", True)
+    monkeypatch.setattr(SupabaseService, "_client", _Client())
+    monkeypatch.setattr(settings, "SUPABASE_URL", "https://x.supabase.co")
+    monkeypatch.setattr(settings, "SUPABASE_SERVICE_ROLE_KEY", "service-key")
+    monkeypatch.setattr(settings, "SUPABASE_SIGNED_URL_CACHE_SECONDS", 600)
+    return bucket
+
+
+def test_signed_urls_are_cached_with_safety_margin(fake_bucket, tmp_path):
+    first = SupabaseService.get_signed_url("reports", "audits/1/report.pdf")
+    second = SupabaseService.get_signed_url("reports", "audits/1/report.pdf")
+
+    assert first == second
+    # Firmada por expiry + ventana de cache: siempre válida >= 3600s al servirse.
+    assert fake_bucket.signed_calls == [("audits/1/report.pdf", 4200)]
+
+    pdf = tmp_path / "report.pdf"
+    pdf.write_bytes(b"%PDF-1.4 new")
+    SupabaseService.upload_path("reports", "audits/1/report.pdf", str(pdf))
+
+    assert SupabaseService.get_signed_url("reports", "audits/1/report.pdf") != first
+    assert len(fake_bucket.signed_calls) == 2
+
+
+def test_signed_url_cache_is_bounded_lru_and_prunes_expired(fake_bucket, monkeypatch):
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(supabase_service.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(settings, "SUPABASE_SIGNED_URL_CACHE_MAX_ENTRIES", 2)
+
+    SupabaseService.get_signed_url("reports", "a.pdf")
+    SupabaseService.get_signed_url("reports", "b.pdf")
+    # Un hit refresca "a": al entrar "c" se desaloja "b", la menos usada.
+    SupabaseService.get_signed_url("reports", "a.pdf")
+    SupabaseService.get_signed_url("reports", "c.pdf")
+
+    cached_paths = [key[1] for key in SupabaseService._signed_url_cache]
+    assert cached_paths == ["a.pdf", "c.pdf"]
+
+    # Vencidas se purgan al insertar aunque quede espacio.
+    clock["now"] += 601
+    monkeypatch.setattr(settings, "SUPABASE_SIGNED_URL_CACHE_MAX_ENTRIES", 10)
+    SupabaseService.get_signed_url("reports", "d.pdf")
+
+    assert [key[1] for key in SupabaseService._signed_url_cache] == ["d.pdf"]
+
+
+def test_upload_path_streams_file_handle(fake_bucket, tmp_path):
+    pdf = tmp_path / "report.pdf"
+    pdf.write_bytes(b"%PDF-1.4 body")
+
+    size = SupabaseService.upload_path("reports", "audits/2/report.pdf", str(pdf))
+
+    assert size == len(b"%PDF-1.4 body")
+    assert fake_bucket.uploads == [
+        ("audits/2/report.pdf", "BufferedReader", b"%PDF-1.4 body")
+    ]
+
+
+def test_large_uploads_use_resumable_chunks_and_resume(
+    fake_bucket, tmp_path, monkeypatch
+):
+    payload = bytes(range(256)) * 6 * 1024  # 1.5 MB
+    pdf = tmp_path / "big.pdf"
+    pdf.write_bytes(payload)
+    monkeypatch.setattr(settings, "SUPABASE_RESUMABLE_UPLOAD_THRESHOLD_MB", 1)
+    monkeypatch.setattr(supabase_service, "RESUMABLE_CHUNK_SIZE", 512 * 1024)
+    monkeypatch.setattr(supabase_service.time, "sleep", lambda _s: None)
+
+    received = bytearray()
+    calls = []
+
+    def _handler(request: httpx.Request):
+        calls.append(request.method)
+        if request.method == "POST":
+            assert request.headers["Upload-Length"] == str(len(payload))
+            return httpx.Response(201, headers={"Location": "/upload/abc"})
+        if request.method == "HEAD":
+            return httpx.Response(200, headers={"Upload-Offset": str(len(received))})
+        assert int(request.headers["Upload-Offset"]) == len(received)
+        if calls.count("PATCH") == 2:
+            return httpx.Response(500)  # falla el segundo chunk una vez
+        received.extend(request.content)
+        return httpx.Response(204, headers={"Upload-Offset": str(len(received))})
+
+    real_client = httpx.Client
+    monkeypatch.setattr(
+        httpx,
+        "Client",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(_handler), **kwargs),
+    )
+
+    size = SupabaseService.upload_path("reports", "audits/3/report.pdf", str(pdf))
+
+    assert size == len(payload)
+    assert bytes(received) == payload
+    assert calls == ["POST", "PATCH", "PATCH", "HEAD", "PATCH", "PATCH"]
+    assert fake_bucket.uploads == []
@@ -4,6 +4,7 @@ Tests para los Celery Workers
 
 import asyncio
 import os
+from contextlib import contextmanager
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
@@ -12,7 +13,12 @@ from app.core.config import settings
 from app.models import Audit, AuditPdfJob, AuditStatus
 from app.services.pdf_job_service import PDFJobService
 from app.workers.async_runtime import _worker_async_runtime, run_worker_coroutine
-from app.workers.tasks import generate_pdf_task, run_audit_task, run_pagespeed_task
+from app.workers.tasks import (
+    generate_pdf_task,
+    run_audit_task,
+    run_geo_analysis_task,
+    run_pagespeed_task,
+)
 from fastapi import HTTPException
 from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.orm import Session
@@ -203,6 +209,113 @@ def test_run_pagespeed_task_delegates_to_canonical_job(
     assert result == {"audit_id": audit.id, "job_id": 654, "status": "queued"}
 
 
+def test_run_geo_analysis_task_runs_tools_concurrently_and_merges_partials(
+    db_session: Session, monkeypatch
+):
+    audit = Audit(
+        url="https://geo-task.com",
+        status=AuditStatus.COMPLETED,
+        domain="geo-task.com",
+        report_markdown="# Report",
+        external_intelligence={"category": "Shoes"},
+    )
+    db_session.add(audit)
+    db_session.commit()
+    db_session.refresh(audit)
+
+    # Cada herramienta marca su arranque y espera al resto: en serie la primera
+    # nunca vería arrancar a las otras y se quedaría sin resultado.
+    started = {name: asyncio.Event() for name in ("rank", "backlinks", "visibility")}
+    tool_sessions = []
+
+    async def _start(name, db):
+        tool_sessions.append(db)
+        started[name].set()
+        await asyncio.wait_for(
+            asyncio.gather(*(event.wait() for event in started.values())), 2
+        )
+
+    class _RankTracker:
+        def __init__(self, db):
+            self.db = db
+
+        async def track_rankings(self, audit_id, domain, keywords):
+            await _start("rank", self.db)
+            return [
+                SimpleNamespace(
+                    keyword=keywords[0],
+                    position=3,
+                    top_results=[{"domain": "rival.com"}],
+                )
+            ]
+
+    class _Backlinks:
+        def __init__(self, db):
+            self.db = db
+
+        async def analyze_backlinks(self, audit_id, domain):
+            await _start("backlinks", self.db)
+            # Excede su presupuesto: el reporte sale con los parciales.
+            await asyncio.Event().wait()
+
+    class _Visibility:
+        def __init__(self, db):
+            self.db = db
+
+        async def check_visibility(self, audit_id, brand_name, queries):
+            await _start("visibility", self.db)
+            return [
+                {
+                    "query": "geo-task shoes",
+                    "is_visible": True,
+                    "llm_name": "KIMI",
+                    "citation_text": "geo-task is cited",
+                }
+            ]
+
+    class _Session:
+        """Sesión distinta por llamada que delega en la sesión del test."""
+
+        def __getattr__(self, name):
+            return getattr(db_session, name)
+
+    opened = []
+
+    @contextmanager
+    def _get_db_session():
+        session = _Session()
+        opened.append(session)
+        yield session
+
+    monkeypatch.setattr(
+        "app.services.rank_tracker_service.RankTrackerService", _RankTracker
+    )
+    monkeypatch.setattr("app.services.backlink_service.BacklinkService", _Backlinks)
+    monkeypatch.setattr(
+        "app.services.llm_visibility_service.LLMVisibilityService", _Visibility
+    )
+    monkeypatch.setattr(settings, "GEO_BACKLINKS_TIMEOUT_SECONDS", 0.3)
+    monkeypatch.setattr("app.workers.tasks.get_db_session", _get_db_session)
+
+    with patch(
+        "app.services.pdf_service.PDFService.create_from_audit",
+        return_value="supabase://audits/geo.pdf",
+    ) as mock_pdf, patch("app.workers.tasks.ReportService.create_report"):
+        run_geo_analysis_task.run(audit.id)
+
+    assert all(event.is_set() for event in started.values())
+    # Una sesión propia por herramienta, más las dos de la tarea (lectura y escritura).
+    assert len(tool_sessions) == 3
+    assert len({id(session) for session in tool_sessions}) == 3
+    assert all(session in opened for session in tool_sessions)
+    assert len(opened) == 5
+    db_session.refresh(audit)
+    assert "| geo-task | #3 | rival.com |" in audit.report_markdown
+    assert "*Análisis de enlaces no disponible.*" in audit.report_markdown
+    assert "1/1 (100.0%)" in audit.report_markdown
+    mock_pdf.assert_called_once()
+
+
 def test_worker_async_runtime_reuses_same_loop_for_multiple_coroutines():
     async def _loop_id():
         return id(asyncio.get_running_loop())